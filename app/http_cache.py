@@ -0,0 +1,122 @@
+# app/http_cache.py
+"""
+Réponses HTTP conditionnelles (ETag / 304 Not Modified)
+
+L'ETag d'une page est dérivé :
+- des compteurs de génération des tables qu'elle lit (table data_generation,
+  incrémentés par triggers, voir migrations/add_data_generation.sql) ;
+- de l'URL (chemin + paramètres), de la langue et de l'utilisateur connecté ;
+- d'un identifiant de démarrage (un redéploiement invalide tous les ETags)
+  et du jour courant.
+
+Si le navigateur renvoie le même ETag (If-None-Match), on répond 304 avant
+toute requête métier ou rendu de template.
+
+Usage :
+    @router.get("/api/tags")
+    @conditional_get(*TAG_TABLES)
+    async def api_get_tags(request: Request):
+        ...
+"""
+
+import functools
+import hashlib
+import time
+from typing import Iterable, Optional
+
+from fastapi.encoders import jsonable_encoder
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+from app.models.db_core import get_data_generations
+
+# Tables lues par chaque famille de pages
+RECIPE_TABLES = (
+    "recipe", "recipe_translation", "recipe_ingredient", "recipe_ingredient_translation",
+    "step", "step_translation", "recipe_category", "recipe_tag", "recipe_recipe_type",
+    "recipe_event_type", "category", "tag", "recipe_type", "event_type", "user",
+)
+CATEGORY_TABLES = ("category",)
+TAG_TABLES = ("tag",)
+EVENT_TYPE_TABLES = ("event_type",)
+CALENDAR_TABLES = (
+    "meal_plan", "event", "event_date", "event_recipe", "event_recipe_planning",
+    "recipe", "recipe_translation",
+)
+
+# Change à chaque démarrage : templates et code peuvent avoir changé
+_BUILD_ID = f"{time.time_ns():x}"
+
+# Les pages dépendent de la session : cache privé, revalidation systématique
+CONDITIONAL_CACHE_CONTROL = "private, no-cache"
+
+
+def compute_etag(request: Request, tables: Iterable[str]) -> Optional[str]:
+    """
+    Calcule l'ETag (faible) d'une requête GET
+
+    Returns:
+        ETag, ou None si les compteurs ne sont pas disponibles
+        (migration non appliquée : pas de réponse conditionnelle)
+    """
+    generations = get_data_generations(tables)
+    if generations is None:
+        return None
+
+    session = request.scope.get("session") or {}
+    parts = [
+        _BUILD_ID,
+        # Jour courant : certaines pages dépendent de la date (ex: mois par défaut du calendrier)
+        time.strftime("%Y-%m-%d"),
+        request.url.path,
+        request.url.query,
+        str(session.get("lang", "")),
+        str(session.get("user_id", "")),
+        "admin" if session.get("is_admin") else "",
+    ]
+    parts.extend(f"{table}={generations.get(table, 0)}" for table in sorted(generations))
+    digest = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Vérifie si l'ETag figure dans l'en-tête If-None-Match"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Comparaison faible : on ignore le préfixe W/
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def conditional_get(*tables: str):
+    """
+    Décorateur de route GET : répond 304 si les données n'ont pas changé
+
+    La route décorée doit accepter un paramètre `request: Request`.
+    Les valeurs retournées qui ne sont pas des Response sont converties en JSON.
+    """
+    def decorator(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            request = kwargs.get("request")
+            etag = compute_etag(request, tables) if request is not None else None
+
+            if etag and etag_matches(request, etag):
+                return Response(status_code=304, headers={
+                    "ETag": etag,
+                    "Cache-Control": CONDITIONAL_CACHE_CONTROL,
+                })
+
+            result = await endpoint(*args, **kwargs)
+            response = result if isinstance(result, Response) else JSONResponse(jsonable_encoder(result))
+
+            if etag and response.status_code == 200:
+                response.headers["ETag"] = etag
+                response.headers["Cache-Control"] = CONDITIONAL_CACHE_CONTROL
+            return response
+
+        return wrapper
+    return decorator
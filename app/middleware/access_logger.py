@@ -2,21 +2,33 @@
 Middleware pour logger tous les accès à l'application
 """
 import time
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from app.models import log_access
+from app.middleware.compression import STATE_UNCOMPRESSED_BYTES
 
 
-class AccessLoggerMiddleware(BaseHTTPMiddleware):
+class AccessLoggerMiddleware:
     """
     Middleware qui enregistre tous les accès HTTP dans la base de données
+
+    Middleware ASGI pur : l'accès est enregistré une fois le corps de la
+    réponse entièrement envoyé, ce qui permet de mesurer les octets transférés
+    (après compression) et la taille non compressée de la réponse.
     """
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Capturer l'heure de début
         start_time = time.time()
 
         # Extraire les informations de la requête
+        request = Request(scope)
         client_ip = self._get_client_ip(request)
         user_agent = request.headers.get('user-agent', '')
         referer = request.headers.get('referer', '')
@@ -26,29 +38,43 @@ class AccessLoggerMiddleware(BaseHTTPMiddleware):
         # Extraire la langue depuis les query params
         lang = request.query_params.get('lang', '')
 
-        # Exécuter la requête
-        response = await call_next(request)
+        status_code = 500
+        transfer_size = 0
 
-        # Calculer le temps de réponse
-        response_time_ms = (time.time() - start_time) * 1000
+        async def send_wrapper(message):
+            nonlocal status_code, transfer_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                transfer_size += len(message.get("body", b""))
+            await send(message)
 
-        # Logger l'accès (de manière asynchrone pour ne pas ralentir la réponse)
+        # Exécuter la requête
         try:
-            log_access(
-                ip_address=client_ip,
-                user_agent=user_agent,
-                path=path,
-                method=method,
-                status_code=response.status_code,
-                response_time_ms=response_time_ms,
-                referer=referer,
-                lang=lang
-            )
-        except Exception as e:
-            # Ne pas faire échouer la requête si le logging échoue
-            print(f"Erreur lors du logging d'accès: {e}")
-
-        return response
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Calculer le temps de réponse
+            response_time_ms = (time.time() - start_time) * 1000
+
+            # Taille avant compression (renseignée par CompressionMiddleware)
+            response_size = scope.get("state", {}).get(STATE_UNCOMPRESSED_BYTES, transfer_size)
+
+            try:
+                log_access(
+                    ip_address=client_ip,
+                    user_agent=user_agent,
+                    path=path,
+                    method=method,
+                    status_code=status_code,
+                    response_time_ms=response_time_ms,
+                    referer=referer,
+                    lang=lang,
+                    response_size_bytes=response_size,
+                    transfer_size_bytes=transfer_size
+                )
+            except Exception as e:
+                # Ne pas faire échouer la requête si le logging échoue
+                print(f"Erreur lors du logging d'accès: {e}")
 
     def _get_client_ip(self, request: Request) -> str:
         """
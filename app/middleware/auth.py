@@ -19,7 +19,9 @@ class AuthMiddleware(BaseHTTPMiddleware):
             "/login",
             "/register",
             "/static",
+            "/assets",
             "/health",
+            "/metrics",  # Contrôle admin / jeton dans la route
             "/robots.txt",
         ]
 
@@ -0,0 +1,167 @@
+"""
+Middleware de compression des réponses HTML/JSON (gzip, brotli si disponible)
+
+Middleware ASGI pur (pas BaseHTTPMiddleware) : les réponses en streaming sont
+compressées bloc par bloc, sans être chargées entièrement en mémoire.
+
+La taille non compressée de la réponse est exposée dans
+scope["state"]["response_uncompressed_bytes"] pour AccessLoggerMiddleware.
+"""
+import zlib
+from functools import partial
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli optionnel : gzip uniquement
+    brotli = None
+
+
+# Types de contenu compressés (les images/PDF sont déjà compressés)
+COMPRESSIBLE_TYPES = {
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/csv",
+    "application/json",
+    "application/javascript",
+    "text/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+
+STATE_UNCOMPRESSED_BYTES = "response_uncompressed_bytes"
+
+
+def _accepted_encodings(headers: Headers) -> set:
+    """Encodages acceptés par le client (hors q=0)"""
+    accepted = set()
+    for part in headers.get("accept-encoding", "").split(","):
+        name, _, params = part.partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+class _GzipStream:
+    """Compresseur gzip incrémental"""
+    encoding = "gzip"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        chunk = self._compressor.compress(data)
+        return chunk + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _BrotliStream:
+    """Compresseur brotli incrémental"""
+    encoding = "br"
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        chunk = self._compressor.process(data)
+        return chunk + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class CompressionMiddleware:
+    """
+    Compresse les réponses textuelles au-delà d'une taille minimale
+
+    Args:
+        app: Application ASGI
+        minimum_size: Taille (octets) en dessous de laquelle on ne compresse pas
+        gzip_level: Niveau de compression gzip (1-9)
+        brotli_quality: Qualité brotli (0-11) ; 4-5 est un bon compromis en dynamique
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = _accepted_encodings(Headers(scope=scope))
+        if brotli is not None and "br" in accepted:
+            make_stream = partial(_BrotliStream, self.brotli_quality)
+        elif "gzip" in accepted:
+            make_stream = partial(_GzipStream, self.gzip_level)
+        else:
+            make_stream = None
+
+        state = scope.setdefault("state", {})
+        state[STATE_UNCOMPRESSED_BYTES] = 0
+
+        start_message = None
+        stream = None
+        passthrough = make_stream is None
+
+        async def send_wrapper(message):
+            nonlocal start_message, stream, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+                if (passthrough
+                        or "content-encoding" in headers
+                        or content_type not in COMPRESSIBLE_TYPES
+                        or message["status"] < 200 or message["status"] in (204, 304)):
+                    passthrough = True
+                    await send(message)
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            state[STATE_UNCOMPRESSED_BYTES] += len(body)
+
+            if passthrough:
+                await send(message)
+                return
+
+            if stream is None:
+                # Premier bloc : décider de la compression
+                headers = MutableHeaders(raw=list(start_message["headers"]))
+                declared = headers.get("content-length")
+                too_small = (
+                    (not more_body and len(body) < self.minimum_size)
+                    or (declared is not None and int(declared) < self.minimum_size)
+                )
+                if too_small:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                stream = make_stream()
+                headers["Content-Encoding"] = stream.encoding
+                headers.add_vary_header("Accept-Encoding")
+                compressed = stream.compress(body, final=not more_body)
+                if more_body:
+                    # Longueur finale inconnue : transfert chunké
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(compressed))
+                start_message["headers"] = headers.raw
+                await send(start_message)
+                await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+                return
+
+            compressed = stream.compress(body, final=not more_body)
+            await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,87 @@
+"""
+Middleware de collecte des métriques HTTP (voir app/services/metrics.py)
+"""
+import time
+
+from starlette.routing import Mount
+
+from app.services.metrics import (
+    DB_QUERIES,
+    HTTP_DURATION,
+    HTTP_IN_PROGRESS,
+    HTTP_REQUESTS,
+    registry,
+    start_request_tracking,
+    stop_request_tracking,
+)
+
+# Étiquette des requêtes qui ne correspondent à aucune route (404)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_templates(routes) -> dict:
+    """
+    Associe chaque endpoint à son gabarit de route
+
+    Exemple: event_budget → "/events/{event_id}/budget",
+    fichiers statiques → "/static/{path:path}"
+    """
+    templates = {}
+    for route in routes:
+        if isinstance(route, Mount):
+            templates.setdefault(route.app, route.path + "/{path:path}")
+        elif hasattr(route, "endpoint"):
+            templates.setdefault(route.endpoint, route.path)
+    return templates
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI qui alimente les métriques HTTP
+
+    Le routeur Starlette renseigne scope["endpoint"] ; l'étiquette route est
+    le gabarit correspondant (jamais le chemin brut, dont la cardinalité
+    exploserait avec les identifiants).
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._templates = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token, queries = start_request_tracking()
+        HTTP_IN_PROGRESS.inc()
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start_time
+            HTTP_IN_PROGRESS.dec()
+            stop_request_tracking(token)
+
+            route = self._route_template(scope)
+            HTTP_REQUESTS.inc(method=method, route=route, status=f"{status_code // 100}xx")
+            HTTP_DURATION.observe(duration, method=method, route=route)
+            DB_QUERIES.observe(queries[0], route=route)
+            registry.maybe_flush()
+
+    def _route_template(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        if self._templates is None:
+            self._templates = route_templates(scope["app"].routes)
+        return self._templates.get(endpoint, UNMATCHED_ROUTE)
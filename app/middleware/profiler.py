@@ -0,0 +1,107 @@
+"""
+Middleware de profilage à la demande (voir app/services/request_profiler.py)
+
+cProfile reste activé pendant tout `await self.app(...)` : les coroutines
+des autres requêtes exécutées par la boucle pendant ce temps apparaissent
+dans le profil. Une seule requête est profilée à la fois par processus
+(deux cProfile actifs sur le même thread se remplacent) ; une demande de
+profil reçue pendant un profilage est traitée sans profil.
+"""
+import cProfile
+import threading
+import time
+from urllib.parse import parse_qs
+
+from app.services.request_profiler import (
+    PROFILE_QUERY_PARAM,
+    build_call_tree,
+    new_profile_id,
+    save_profile,
+)
+from app.services.sql_trace import start_trace, stop_trace
+
+_PROFILE_FLAG = PROFILE_QUERY_PARAM.encode("ascii") + b"="
+
+# Profilage en cours dans ce processus (jamais attendu : acquire non bloquant)
+_profiling = threading.Lock()
+
+
+class ProfilerMiddleware:
+    """
+    Middleware ASGI qui profile les requêtes ?__profile=1 des administrateurs
+
+    Doit s'exécuter après SessionMiddleware (scope["session"]). Sans le
+    paramètre, le seul coût est une recherche dans la query string.
+    L'en-tête X-Profile de la réponse donne l'URL du profil enregistré ;
+    il est absent si un autre profilage était déjà en cours.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or _PROFILE_FLAG not in scope.get("query_string", b"")
+            or not self._profile_requested(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if not _profiling.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self._profile(scope, receive, send)
+        finally:
+            _profiling.release()
+
+    async def _profile(self, scope, receive, send):
+        """Exécute la requête sous cProfile et trace SQL, puis enregistre le profil"""
+        profile_id = new_profile_id()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile", f"/admin/profiles/{profile_id}".encode("ascii")))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        token, trace = start_trace()
+        profiler = cProfile.Profile()
+        start_time = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            stop_trace(token)
+            try:
+                save_profile(profile_id, {
+                    "id": profile_id,
+                    "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "query_string": scope.get("query_string", b"").decode("latin-1"),
+                    "status": status_code,
+                    "duration_ms": round(duration_ms, 3),
+                    "sql_count": len(trace.queries),
+                    "sql_total_ms": round(trace.total_ms, 3),
+                    "sql": [query.as_dict() for query in trace.queries],
+                    "sql_summary": trace.summary(),
+                    **build_call_tree(profiler),
+                })
+            except OSError as e:
+                print(f"Erreur lors de l'enregistrement du profil: {e}")
+
+    @staticmethod
+    def _profile_requested(scope) -> bool:
+        """?__profile=1 et administrateur connecté"""
+        params = parse_qs(scope["query_string"].decode("latin-1"))
+        if params.get(PROFILE_QUERY_PARAM, [""])[0] not in ("1", "true"):
+            return False
+        return bool(scope.get("session", {}).get("is_admin"))
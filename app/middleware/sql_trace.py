@@ -0,0 +1,38 @@
+"""
+Middleware de traçage SQL par requête (voir app/services/sql_trace.py)
+"""
+from app.services.sql_trace import log_trace_summary, start_trace, stop_trace
+
+
+class SqlTraceMiddleware:
+    """
+    Middleware ASGI qui associe une trace SQL à chaque requête HTTP
+
+    Ajoute l'en-tête Server-Timing à la réponse (temps SQL cumulé, nombre
+    d'instructions, temps total jusqu'à l'envoi des en-têtes), visible dans
+    l'onglet Réseau des outils de développement du navigateur.
+    N'est installé que si SQL_TRACE est activé.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token, trace = start_trace()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_trace(token)
+            log_trace_summary(scope["method"], scope["path"], trace)
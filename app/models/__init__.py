@@ -10,12 +10,19 @@ organises par domaine fonctionnel.
 from types import SimpleNamespace
 
 # Import des fonctions de base
-from .db_core import get_db, normalize_ingredient_name
+from .db_core import (
+    get_db,
+    normalize_ingredient_name,
+    encode_cursor,
+    decode_cursor,
+    keyset_page,
+)
 
 # Import des fonctions de gestion des recettes
 from .db_recipes import (
     list_recipes,
     list_recipes_by_type,
+    search_recipe_names,
     list_recipes_by_event_types,
     get_recipe_by_slug,
     get_recipe_steps_with_ids,
@@ -27,6 +34,8 @@ from .db_recipes import (
     delete_recipe_language,
     update_recipe_image,
     get_recipe_image_urls,
+    update_recipe_thumbnail,
+    list_recipe_images,
     update_step_image,
     get_step_image_url,
     update_servings_default,
@@ -53,6 +62,7 @@ from .db_events import (
     create_event_type,
     update_event_type,
     list_events,
+    refresh_event_summaries,
     get_event_by_id,
     create_event,
     update_event,
@@ -77,6 +87,7 @@ from .db_events import (
     save_recipe_planning,
     get_recipe_planning,
     copy_event,
+    create_recurring_events,
     get_event_photos,
     add_event_photo,
     delete_event_photo,
@@ -91,7 +102,11 @@ from .db_shopping import (
     update_event_ingredients_actual_total,
     delete_shopping_list_item,
     delete_all_shopping_list_items,
+    get_shopping_list_items_for_recipe,
+    scale_shopping_list_sources,
+    remove_recipe_from_shopping_list,
     regenerate_shopping_list,
+    ensure_shopping_list,
 )
 
 # Import des fonctions de gestion du budget
@@ -182,6 +197,7 @@ from .db_users import (
     get_user_by_id,
     authenticate_user,
     list_users,
+    search_users,
     update_user_password,
     deactivate_user,
     activate_user,
@@ -192,11 +208,13 @@ from .db_users import (
 # Import des fonctions de gestion des participants
 from .db_participants import (
     list_participants,
+    search_participants,
     get_participant_by_id,
     create_participant,
     update_participant,
     delete_participant,
     list_groups,
+    search_groups,
     get_group_by_id,
     create_group,
     update_group,
@@ -248,10 +266,14 @@ __all__ = [
     # Core
     'get_db',
     'normalize_ingredient_name',
+    'encode_cursor',
+    'decode_cursor',
+    'keyset_page',
 
     # Recipes
     'list_recipes',
     'list_recipes_by_type',
+    'search_recipe_names',
     'list_recipes_by_event_types',
     'get_recipe_by_slug',
     'get_recipe_steps_with_ids',
@@ -263,6 +285,8 @@ __all__ = [
     'delete_recipe_language',
     'update_recipe_image',
     'get_recipe_image_urls',
+    'update_recipe_thumbnail',
+    'list_recipe_images',
     'update_servings_default',
     'search_recipes_by_filters',
     'search_recipes_by_ingredients',
@@ -283,6 +307,7 @@ __all__ = [
     'create_event_type',
     'update_event_type',
     'list_events',
+    'refresh_event_summaries',
     'get_event_by_id',
     'create_event',
     'update_event',
@@ -307,6 +332,7 @@ __all__ = [
     'save_recipe_planning',
     'get_recipe_planning',
     'copy_event',
+    'create_recurring_events',
 
     # Shopping
     'get_shopping_list_items',
@@ -316,7 +342,11 @@ __all__ = [
     'update_event_ingredients_actual_total',
     'delete_shopping_list_item',
     'delete_all_shopping_list_items',
+    'get_shopping_list_items_for_recipe',
+    'scale_shopping_list_sources',
+    'remove_recipe_from_shopping_list',
     'regenerate_shopping_list',
+    'ensure_shopping_list',
 
     # Budget
     'get_event_budget_planned',
@@ -395,6 +425,7 @@ __all__ = [
     'get_user_by_id',
     'authenticate_user',
     'list_users',
+    'search_users',
     'update_user_password',
     'deactivate_user',
     'activate_user',
@@ -403,11 +434,13 @@ __all__ = [
 
     # Participants
     'list_participants',
+    'search_participants',
     'get_participant_by_id',
     'create_participant',
     'update_participant',
     'delete_participant',
     'list_groups',
+    'search_groups',
     'get_group_by_id',
     'create_group',
     'update_group',
@@ -454,10 +487,14 @@ db = SimpleNamespace(
     # Core
     get_db=get_db,
     normalize_ingredient_name=normalize_ingredient_name,
+    encode_cursor=encode_cursor,
+    decode_cursor=decode_cursor,
+    keyset_page=keyset_page,
 
     # Recipes
     list_recipes=list_recipes,
     list_recipes_by_type=list_recipes_by_type,
+    search_recipe_names=search_recipe_names,
     list_recipes_by_event_types=list_recipes_by_event_types,
     get_recipe_by_slug=get_recipe_by_slug,
     get_recipe_steps_with_ids=get_recipe_steps_with_ids,
@@ -469,6 +506,8 @@ db = SimpleNamespace(
     delete_recipe_language=delete_recipe_language,
     update_recipe_image=update_recipe_image,
     get_recipe_image_urls=get_recipe_image_urls,
+    update_recipe_thumbnail=update_recipe_thumbnail,
+    list_recipe_images=list_recipe_images,
     update_servings_default=update_servings_default,
     search_recipes_by_filters=search_recipes_by_filters,
     search_recipes_by_ingredients=search_recipes_by_ingredients,
@@ -489,6 +528,7 @@ db = SimpleNamespace(
     create_event_type=create_event_type,
     update_event_type=update_event_type,
     list_events=list_events,
+    refresh_event_summaries=refresh_event_summaries,
     get_event_by_id=get_event_by_id,
     create_event=create_event,
     update_event=update_event,
@@ -513,6 +553,7 @@ db = SimpleNamespace(
     save_recipe_planning=save_recipe_planning,
     get_recipe_planning=get_recipe_planning,
     copy_event=copy_event,
+    create_recurring_events=create_recurring_events,
     get_event_photos=get_event_photos,
     add_event_photo=add_event_photo,
     delete_event_photo=delete_event_photo,
@@ -525,7 +566,11 @@ db = SimpleNamespace(
     update_event_ingredients_actual_total=update_event_ingredients_actual_total,
     delete_shopping_list_item=delete_shopping_list_item,
     delete_all_shopping_list_items=delete_all_shopping_list_items,
+    get_shopping_list_items_for_recipe=get_shopping_list_items_for_recipe,
+    scale_shopping_list_sources=scale_shopping_list_sources,
+    remove_recipe_from_shopping_list=remove_recipe_from_shopping_list,
     regenerate_shopping_list=regenerate_shopping_list,
+    ensure_shopping_list=ensure_shopping_list,
 
     # Budget
     get_event_budget_planned=get_event_budget_planned,
@@ -604,6 +649,7 @@ db = SimpleNamespace(
     get_user_by_id=get_user_by_id,
     authenticate_user=authenticate_user,
     list_users=list_users,
+    search_users=search_users,
     update_user_password=update_user_password,
     deactivate_user=deactivate_user,
     activate_user=activate_user,
@@ -612,11 +658,13 @@ db = SimpleNamespace(
 
     # Participants
     list_participants=list_participants,
+    search_participants=search_participants,
     get_participant_by_id=get_participant_by_id,
     create_participant=create_participant,
     update_participant=update_participant,
     delete_participant=delete_participant,
     list_groups=list_groups,
+    search_groups=search_groups,
     get_group_by_id=get_group_by_id,
     create_group=create_group,
     update_group=update_group,
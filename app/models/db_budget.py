@@ -390,18 +390,13 @@ def save_expense_ingredient_details(expense_id: int, ingredients_data: list):
         # Supprimer les détails existants
         cursor.execute("DELETE FROM expense_ingredient_detail WHERE expense_id = ?", (expense_id,))
 
-        # Insérer les nouveaux détails
+        # Insérer les nouveaux détails (une seule requête préparée pour le lot)
+        rows = []
         for item in ingredients_data:
             planned_total = item['quantity'] * item.get('planned_unit_price', 0) if item.get('planned_unit_price') else None
             actual_total = item['quantity'] * item.get('actual_unit_price', 0) if item.get('actual_unit_price') else None
 
-            cursor.execute("""
-                INSERT INTO expense_ingredient_detail (
-                    expense_id, shopping_list_item_id, ingredient_name,
-                    quantity, unit, planned_unit_price, actual_unit_price,
-                    planned_total, actual_total
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            rows.append((
                 expense_id,
                 item['shopping_list_item_id'],
                 item['ingredient_name'],
@@ -413,6 +408,14 @@ def save_expense_ingredient_details(expense_id: int, ingredients_data: list):
                 actual_total
             ))
 
+        cursor.executemany("""
+            INSERT INTO expense_ingredient_detail (
+                expense_id, shopping_list_item_id, ingredient_name,
+                quantity, unit, planned_unit_price, actual_unit_price,
+                planned_total, actual_total
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+
         conn.commit()
 
 
@@ -327,8 +327,8 @@ def get_ingredient_from_catalog(ingredient_id: int = None, ingredient_name: str
             cursor.execute("""
                 SELECT *
                 FROM ingredient_price_catalog
-                WHERE LOWER(ingredient_name_fr) = LOWER(?)
-                   OR LOWER(ingredient_name_jp) = LOWER(?)
+                WHERE ingredient_name_fr = ? COLLATE NOCASE
+                   OR ingredient_name_jp = ? COLLATE NOCASE
             """, (ingredient_name, ingredient_name))
         else:
             return None
@@ -507,13 +507,12 @@ def bulk_update_ingredient_jp_names(updates: list):
     """
     with get_db() as conn:
         cursor = conn.cursor()
-        for item in updates:
-            cursor.execute("""
-                UPDATE ingredient_price_catalog
-                SET ingredient_name_jp = ?,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (item['jp_name'], item['id']))
+        cursor.executemany("""
+            UPDATE ingredient_price_catalog
+            SET ingredient_name_jp = ?,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, [(item['jp_name'], item['id']) for item in updates])
         conn.commit()
 
 
@@ -4,9 +4,15 @@ Module de base pour la gestion de la base de données
 Contient les utilitaires, la connexion et l'initialisation
 """
 import os
+import json
+import base64
 import sqlite3
 import contextlib
 import unicodedata
+from typing import Optional
+
+from app.services.metrics import track_db_connection
+from app.services.sql_trace import connection_options
 
 
 # ============================================================================
@@ -49,14 +55,74 @@ def normalize_ingredient_name(name: str) -> str:
     return name
 
 
+# ============================================================================
+# PAGINATION PAR CURSEUR (KEYSET)
+# ============================================================================
+
+def encode_cursor(*values) -> str:
+    """
+    Encode la clé de tri de la dernière ligne d'une page en curseur opaque
+
+    Exemple:
+        encode_cursor("Tarte", 42) → "WyJUYXJ0ZSIsIDQyXQ"
+    """
+    raw = json.dumps(list(values), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[tuple]:
+    """
+    Décode un curseur produit par encode_cursor
+
+    Args:
+        cursor: Curseur reçu en paramètre d'URL (None/vide = première page)
+        size: Nombre de valeurs attendues dans la clé
+
+    Returns:
+        Tuple des valeurs de la clé, ou None si absent / invalide
+        (un curseur invalide ramène simplement à la première page)
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        return None
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    return tuple(values)
+
+
+def keyset_page(rows: list, limit: int, *keys: str) -> tuple:
+    """
+    Découpe le résultat d'une requête exécutée avec LIMIT limit + 1
+
+    Args:
+        rows: Lignes retournées (au plus limit + 1)
+        limit: Taille de la page
+        keys: Colonnes formant la clé de tri (ex: "name", "id")
+
+    Returns:
+        (lignes de la page, curseur de la page suivante ou None)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(*(last[k] for k in keys))
+
+
 # ============================================================================
 # CONFIGURATION DE LA BASE DE DONNÉES
 # ============================================================================
 
 # Déterminer le chemin de la base de données selon l'environnement
+# (RECETTE_DB_PATH : autre base, ex. jeu de données des tests de charge)
 env = os.getenv("ENV", "dev")
 db_name = "recette.sqlite3"  # Nom unifié pour dev et prod
-DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "data", db_name))
+DB_PATH = os.path.abspath(os.getenv("RECETTE_DB_PATH") or
+                          os.path.join(os.path.dirname(__file__), "..", "..", "data", db_name))
 
 
 def _init_db():
@@ -80,7 +146,7 @@ def get_db():
     """Context manager pour obtenir une connexion à la base de données"""
     con = None
     try:
-        con = sqlite3.connect(DB_PATH, timeout=30.0, check_same_thread=False)
+        con = sqlite3.connect(DB_PATH, timeout=30.0, check_same_thread=False, **connection_options())
         con.row_factory = sqlite3.Row
 
         # Configurer le busy_timeout pour cette connexion
@@ -96,6 +162,7 @@ def get_db():
             # Si les PRAGMA échouent, on continue quand même
             print(f"Warning: PRAGMA configuration failed: {pragma_error}")
 
+        track_db_connection(con)
         yield con
         con.commit()
     except sqlite3.OperationalError as e:
@@ -117,3 +184,31 @@ def get_db():
                 con.close()
             except:
                 pass
+
+
+# ============================================================================
+# GÉNÉRATIONS DE DONNÉES (réponses HTTP conditionnelles)
+# ============================================================================
+
+def get_data_generations(tables) -> Optional[dict]:
+    """
+    Lit les compteurs de génération des tables demandées
+    (incrémentés par les triggers de migrations/add_data_generation.sql)
+
+    Args:
+        tables: Noms des tables lues par une page
+
+    Returns:
+        Dict {table: génération}, ou None si la migration n'est pas appliquée
+    """
+    tables = list(tables)
+    with get_db() as con:
+        try:
+            rows = con.execute(
+                f"SELECT table_name, generation FROM data_generation "
+                f"WHERE table_name IN ({','.join('?' * len(tables))})",
+                tables
+            ).fetchall()
+        except sqlite3.OperationalError:
+            return None
+    return {row["table_name"]: row["generation"] for row in rows}
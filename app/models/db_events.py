@@ -94,18 +94,198 @@ def update_event_type(event_type_id: int, name_fr: str = None, name_jp: str = No
         return True
 
 
-def list_events(user_id: int = None, lang: str = 'fr'):
+# ============================================================================
+# RÉSUMÉS DÉNORMALISÉS (event_summary, voir migrations/add_event_summary.sql)
+# ============================================================================
+
+# Valeurs agrégées d'un événement (alias e = event).
+# Utilisées pour reconstruire event_summary, et en repli par list_events()
+# tant que la migration n'est pas appliquée.
+_SUMMARY_GROUPS_SQL = """
+    (SELECT GROUP_CONCAT(g.nom, ', ')
+     FROM (SELECT DISTINCT pg.nom
+           FROM event_participant ep
+           JOIN participant_group pg ON ep.added_via_group_id = pg.id
+           WHERE ep.event_id = e.id) g
+    )
+"""
+
+_SUMMARY_GROUPS_RAW_SQL = """
+    (SELECT GROUP_CONCAT(g.id || ':' || g.nom, '||')
+     FROM (SELECT DISTINCT pg.id, pg.nom
+           FROM event_participant ep
+           JOIN participant_group pg ON ep.added_via_group_id = pg.id
+           WHERE ep.event_id = e.id) g
+    )
+"""
+
+_SUMMARY_PARTICIPANTS_SQL = """
+    (SELECT GROUP_CONCAT(
+         CASE WHEN p.prenom IS NOT NULL AND p.prenom != ''
+              THEN p.prenom || ' ' || p.nom
+              ELSE p.nom
+         END, ', ')
+     FROM event_participant ep
+     JOIN participant p ON p.id = ep.participant_id
+     WHERE ep.event_id = e.id
+    )
+"""
+
+_SUMMARY_RECIPES_RAW_SQL = """
+    (SELECT GROUP_CONCAT(r.slug || '::' || COALESCE(rt.name, r.slug), '||')
+     FROM event_recipe er
+     JOIN recipe r ON r.id = er.recipe_id
+     LEFT JOIN recipe_translation rt ON rt.recipe_id = r.id AND rt.lang = {lang}
+     WHERE er.event_id = e.id
+    )
+"""
+
+_SUMMARY_FIRST_PHOTO_SQL = """
+    (SELECT ep.photo_url
+     FROM event_photo ep
+     WHERE ep.event_id = e.id
+     ORDER BY ep.position, ep.id
+     LIMIT 1
+    )
+"""
+
+
+def _has_event_summary(con) -> bool:
+    """Vérifie si la migration add_event_summary.sql a été appliquée"""
+    row = con.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'event_summary'"
+    ).fetchone()
+    return row is not None
+
+
+def _refresh_event_summaries(con, event_ids: list = None) -> int:
+    """
+    Reconstruit en une seule requête les résumés marqués obsolètes par les triggers
+
+    Args:
+        con: Connexion ouverte
+        event_ids: IDs à reconstruire explicitement (None = seulement les résumés obsolètes)
+
+    Returns:
+        Nombre de résumés reconstruits
+    """
+    if event_ids is None:
+        # Lecture seule via l'index partiel : pas d'écriture (ni de verrou)
+        # tant qu'aucun trigger n'a marqué de résumé obsolète
+        if not con.execute("SELECT EXISTS (SELECT 1 FROM event_summary WHERE stale = 1)").fetchone()[0]:
+            return 0
+        target = "SELECT event_id FROM event_summary WHERE stale = 1"
+        params = []
+    else:
+        if not event_ids:
+            return 0
+        target = ",".join("?" * len(event_ids))
+        params = list(event_ids)
+
+    cursor = con.execute(f"""
+        INSERT OR REPLACE INTO event_summary (
+            event_id, groups, groups_raw, participants, participant_count,
+            recipes_raw_fr, recipes_raw_jp, recipe_count, first_photo, stale, updated_at
+        )
+        SELECT
+            e.id,
+            {_SUMMARY_GROUPS_SQL},
+            {_SUMMARY_GROUPS_RAW_SQL},
+            {_SUMMARY_PARTICIPANTS_SQL},
+            (SELECT COUNT(*) FROM event_participant ep WHERE ep.event_id = e.id),
+            {_SUMMARY_RECIPES_RAW_SQL.format(lang="'fr'")},
+            {_SUMMARY_RECIPES_RAW_SQL.format(lang="'jp'")},
+            (SELECT COUNT(*) FROM event_recipe er WHERE er.event_id = e.id),
+            {_SUMMARY_FIRST_PHOTO_SQL},
+            0,
+            CURRENT_TIMESTAMP
+        FROM event e
+        WHERE e.id IN ({target})
+    """, params)
+    return cursor.rowcount
+
+
+def refresh_event_summaries(event_ids: list = None) -> int:
+    """
+    Reconstruit les résumés d'événements (event_summary)
+
+    Les triggers marquent les résumés obsolètes ; list_events() appelle cette
+    reconstruction automatiquement (sans écrire si aucun résumé n'est obsolète). Utile en maintenance après un import massif.
+
+    Args:
+        event_ids: IDs à reconstruire (None = seulement les résumés obsolètes)
+
+    Returns:
+        Nombre de résumés reconstruits (0 si la table n'existe pas)
+    """
+    with get_db() as con:
+        if not _has_event_summary(con):
+            return 0
+        return _refresh_event_summaries(con, event_ids)
+
+
+# Tris proposés par la liste des événements : clé → expression SQL non NULL
+# (la valeur sert de clé de curseur avec e.id)
+EVENT_SORT_EXPRESSIONS = {
+    "event_date": "e.event_date",
+    "name": "e.name COLLATE NOCASE",
+    "event_type": "et.name_fr COLLATE NOCASE",
+    "location": "COALESCE(e.location, '') COLLATE NOCASE",
+    "attendees": "COALESCE(e.attendees, 0)",
+    "budget_planned": "COALESCE(e.budget_planned, 0)",
+}
+
+
+def list_events(user_id: int = None, lang: str = 'fr', limit: int = None, after: tuple = None,
+                search: str = None, sort: str = "event_date", descending: bool = True):
     """
-    Liste tous les événements avec leurs informations de base
+    Liste les événements avec leurs informations de base
+
+    Les groupes, participants, recettes et première photo viennent de la table
+    dénormalisée event_summary (reconstruite à la demande pour les seuls
+    événements modifiés), ce qui évite 5 sous-requêtes corrélées par ligne.
 
     Args:
         user_id: Si fourni, filtre les événements de cet utilisateur uniquement
+        limit: Nombre maximum d'événements (None = tous)
+        after: Clé (sort_key, id) du dernier événement de la page précédente
+               (pagination keyset, voir decode_cursor / keyset_page)
+        search: Texte recherché dans le nom, le lieu, les notes, le type,
+                les participants et les recettes
+        sort: Clé de EVENT_SORT_EXPRESSIONS (défaut : date)
+        descending: Ordre décroissant (défaut, événements récents d'abord)
 
     Returns:
-        Liste des événements triés par date décroissante
+        Liste des événements triés par la clé demandée puis id ; sort_key
+        contient la valeur de tri (curseur : sort_key, id)
     """
+    recipes_lang = 'jp' if lang == 'jp' else 'fr'  # recettes cherchées dans la langue affichée
+    sort_key = EVENT_SORT_EXPRESSIONS.get(sort, EVENT_SORT_EXPRESSIONS["event_date"])
     with get_db() as con:
-        sql = """
+        if _has_event_summary(con):
+            _refresh_event_summaries(con)
+            summary_columns = """
+                s.groups,
+                s.groups_raw,
+                s.participants,
+                CASE WHEN ? = 'jp' THEN s.recipes_raw_jp ELSE s.recipes_raw_fr END AS recipes_raw,
+                s.first_photo
+            """
+            summary_join = "LEFT JOIN event_summary s ON s.event_id = e.id"
+            search_columns = ["s.participants", f"s.recipes_raw_{recipes_lang}"]
+        else:
+            # Repli : migration non appliquée, agrégats calculés ligne par ligne
+            summary_columns = f"""
+                {_SUMMARY_GROUPS_SQL} AS groups,
+                {_SUMMARY_GROUPS_RAW_SQL} AS groups_raw,
+                {_SUMMARY_PARTICIPANTS_SQL} AS participants,
+                {_SUMMARY_RECIPES_RAW_SQL.format(lang='?')} AS recipes_raw,
+                {_SUMMARY_FIRST_PHOTO_SQL} AS first_photo
+            """
+            summary_join = ""
+            search_columns = [_SUMMARY_PARTICIPANTS_SQL, _SUMMARY_RECIPES_RAW_SQL.format(lang=f"'{recipes_lang}'")]
+
+        sql = f"""
             SELECT
                 e.id,
                 e.name,
@@ -121,50 +301,40 @@ def list_events(user_id: int = None, lang: str = 'fr'):
                 et.id AS event_type_id,
                 et.name_fr AS event_type_name_fr,
                 et.name_jp AS event_type_name_jp,
-                (SELECT GROUP_CONCAT(g.nom, ', ')
-                 FROM (SELECT DISTINCT pg.nom
-                       FROM event_participant ep
-                       JOIN participant_group pg ON ep.added_via_group_id = pg.id
-                       WHERE ep.event_id = e.id) g
-                ) AS groups,
-                (SELECT GROUP_CONCAT(g.id || ':' || g.nom, '||')
-                 FROM (SELECT DISTINCT pg.id, pg.nom
-                       FROM event_participant ep
-                       JOIN participant_group pg ON ep.added_via_group_id = pg.id
-                       WHERE ep.event_id = e.id) g
-                ) AS groups_raw,
-                (SELECT GROUP_CONCAT(
-                     CASE WHEN p.prenom IS NOT NULL AND p.prenom != ''
-                          THEN p.prenom || ' ' || p.nom
-                          ELSE p.nom
-                     END, ', ')
-                 FROM event_participant ep
-                 JOIN participant p ON p.id = ep.participant_id
-                 WHERE ep.event_id = e.id
-                ) AS participants,
-                (SELECT GROUP_CONCAT(r.slug || '::' || COALESCE(rt.name, r.slug), '||')
-                 FROM event_recipe er
-                 JOIN recipe r ON r.id = er.recipe_id
-                 LEFT JOIN recipe_translation rt ON rt.recipe_id = r.id AND rt.lang = ?
-                 WHERE er.event_id = e.id
-                ) AS recipes_raw,
-                (SELECT ep.photo_url
-                 FROM event_photo ep
-                 WHERE ep.event_id = e.id
-                 ORDER BY ep.position, ep.id
-                 LIMIT 1
-                ) AS first_photo
+                {sort_key} AS sort_key,
+                {summary_columns}
             FROM event e
             JOIN event_type et ON et.id = e.event_type_id
+            {summary_join}
         """
 
+        params = [lang]
+        conditions = []
+
         if user_id is not None:
-            sql += " WHERE e.user_id = ?"
-            sql += " ORDER BY e.event_date DESC"
-            rows = con.execute(sql, (lang, user_id)).fetchall()
-        else:
-            sql += " ORDER BY e.event_date DESC"
-            rows = con.execute(sql, (lang,)).fetchall()
+            conditions.append("e.user_id = ?")
+            params.append(user_id)
+
+        if search:
+            columns = ["e.name", "e.location", "e.notes", "et.name_fr", "et.name_jp"] + search_columns
+            conditions.append("(" + " OR ".join(f"{column} LIKE ?" for column in columns) + ")")
+            params.extend([f"%{search}%"] * len(columns))
+
+        direction = "DESC" if descending else "ASC"
+        if after is not None:
+            conditions.append(f"({sort_key}, e.id) {'<' if descending else '>'} (?, ?)")
+            params.extend(after)
+
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+
+        sql += f" ORDER BY {sort_key} {direction}, e.id {direction}"
+
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        rows = con.execute(sql, params).fetchall()
 
         return [dict(row) for row in rows]
 
@@ -815,6 +985,91 @@ def get_recipe_planning(event_id: int, lang: str):
         return result
 
 
+_COPY_SOURCE_SQL = """
+    SELECT event_type_id, event_date, location, attendees, notes,
+           budget_planned, currency, user_id, date_debut, date_fin, nombre_jours
+    FROM event
+    WHERE id = ?
+"""
+
+
+def _copy_event_into(cursor, event_id: int, source_event: dict, new_name: str, new_event_type_id: int,
+                     new_date_debut: str, new_date_fin: str, new_location: str = None,
+                     new_attendees: int = None, new_notes: str = None, user_id: int = None) -> int:
+    """
+    Crée la copie d'un événement avec le curseur fourni (sans commit)
+
+    Recettes, dates et planning sont copiés par INSERT ... SELECT : le nombre
+    de requêtes ne dépend pas de la taille de l'événement.
+
+    Returns:
+        ID du nouvel événement
+    """
+    from datetime import datetime
+
+    date_debut_obj = datetime.strptime(new_date_debut, '%Y-%m-%d')
+    date_fin_obj = datetime.strptime(new_date_fin, '%Y-%m-%d')
+    new_nombre_jours = (date_fin_obj - date_debut_obj).days + 1
+
+    # 1. Créer le nouvel événement
+    cursor.execute("""
+        INSERT INTO event (
+            event_type_id, name, event_date, location, attendees, notes,
+            budget_planned, currency, user_id, date_debut, date_fin, nombre_jours
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (
+        new_event_type_id,
+        new_name,
+        new_date_debut,  # event_date = date_debut
+        new_location or source_event['location'],
+        new_attendees or source_event['attendees'],
+        new_notes or source_event['notes'],
+        source_event['budget_planned'],  # Copier budget prévu
+        source_event['currency'],  # Copier devise
+        user_id or source_event['user_id'],
+        new_date_debut,
+        new_date_fin,
+        new_nombre_jours
+    ))
+    new_event_id = cursor.lastrowid
+
+    # 2. Copier toutes les recettes avec leurs quantités
+    cursor.execute("""
+        INSERT INTO event_recipe (event_id, recipe_id, servings_multiplier, position)
+        SELECT ?, recipe_id, servings_multiplier, position
+        FROM event_recipe
+        WHERE event_id = ?
+    """, (new_event_id, event_id))
+
+    # 3. Créer les nouvelles dates (toutes sélectionnées par défaut)
+    cursor.execute("""
+        WITH RECURSIVE days(d) AS (
+            SELECT date(?)
+            UNION ALL
+            SELECT date(d, '+1 day') FROM days WHERE d < date(?)
+        )
+        INSERT INTO event_date (event_id, date, is_selected)
+        SELECT ?, d, 1 FROM days
+    """, (new_date_debut, new_date_fin, new_event_id))
+
+    # 4. Copier l'organisation/planning UNIQUEMENT si même nombre de jours
+    #    Chaque jour source sélectionné est décalé de l'écart entre les dates de début
+    if new_nombre_jours == source_event['nombre_jours']:
+        source_debut = source_event['date_debut'] or source_event['event_date']
+        offset_days = (date_debut_obj - datetime.strptime(source_debut[:10], '%Y-%m-%d')).days
+
+        cursor.execute("""
+            INSERT INTO event_recipe_planning (event_id, recipe_id, event_date_id, position)
+            SELECT ?, p.recipe_id, nd.id, p.position
+            FROM event_recipe_planning p
+            JOIN event_date sd ON sd.id = p.event_date_id AND sd.is_selected = 1
+            JOIN event_date nd ON nd.event_id = ? AND nd.date = date(sd.date, ?)
+            WHERE p.event_id = ?
+        """, (new_event_id, new_event_id, f"{offset_days:+d} days", event_id))
+
+    return new_event_id
+
+
 def copy_event(event_id: int, new_name: str, new_event_type_id: int, new_date_debut: str,
                new_date_fin: str, new_location: str = None, new_attendees: int = None,
                new_notes: str = None, user_id: int = None):
@@ -840,123 +1095,67 @@ def copy_event(event_id: int, new_name: str, new_event_type_id: int, new_date_de
         - Toutes les recettes avec leurs quantités (servings_multiplier)
         - Budget prévu et devise (pas les dépenses effectuées)
         - Organisation/planning uniquement si même nombre de jours
+          (jour source sélectionné + écart entre les dates de début)
     """
     with get_db() as conn:
         cursor = conn.cursor()
 
-        # 1. Récupérer l'événement source
-        cursor.execute("""
-            SELECT event_type_id, event_date, location, attendees, notes,
-                   budget_planned, currency, user_id, date_debut, date_fin, nombre_jours
-            FROM event
-            WHERE id = ?
-        """, (event_id,))
-
-        source_event = cursor.fetchone()
+        source_event = cursor.execute(_COPY_SOURCE_SQL, (event_id,)).fetchone()
         if not source_event:
             return None
 
-        source_event = dict(source_event)
+        new_event_id = _copy_event_into(
+            cursor, event_id, dict(source_event), new_name, new_event_type_id,
+            new_date_debut, new_date_fin, new_location, new_attendees, new_notes, user_id
+        )
 
-        # Calculer le nouveau nombre de jours
-        from datetime import datetime, timedelta
-        date_debut_obj = datetime.strptime(new_date_debut, '%Y-%m-%d')
-        date_fin_obj = datetime.strptime(new_date_fin, '%Y-%m-%d')
-        new_nombre_jours = (date_fin_obj - date_debut_obj).days + 1
+        conn.commit()
+        return new_event_id
 
-        # 2. Créer le nouvel événement
-        cursor.execute("""
-            INSERT INTO event (
-                event_type_id, name, event_date, location, attendees, notes,
-                budget_planned, currency, user_id, date_debut, date_fin, nombre_jours
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            new_event_type_id,
-            new_name,
-            new_date_debut,  # event_date = date_debut
-            new_location or source_event['location'],
-            new_attendees or source_event['attendees'],
-            new_notes or source_event['notes'],
-            source_event['budget_planned'],  # Copier budget prévu
-            source_event['currency'],  # Copier devise
-            user_id or source_event['user_id'],
-            new_date_debut,
-            new_date_fin,
-            new_nombre_jours
-        ))
-
-        new_event_id = cursor.lastrowid
-
-        # 3. Copier toutes les recettes avec leurs quantités
-        cursor.execute("""
-            SELECT recipe_id, servings_multiplier, position
-            FROM event_recipe
-            WHERE event_id = ?
-        """, (event_id,))
-
-        recipes = cursor.fetchall()
-        for recipe in recipes:
-            cursor.execute("""
-                INSERT INTO event_recipe (event_id, recipe_id, servings_multiplier, position)
-                VALUES (?, ?, ?, ?)
-            """, (new_event_id, recipe['recipe_id'], recipe['servings_multiplier'], recipe['position']))
-
-        # 4. Créer les nouvelles dates (toutes sélectionnées par défaut)
-        current_date = date_debut_obj
-        while current_date <= date_fin_obj:
-            cursor.execute("""
-                INSERT INTO event_date (event_id, date, is_selected)
-                VALUES (?, ?, 1)
-            """, (new_event_id, current_date.strftime('%Y-%m-%d')))
-
-            current_date += timedelta(days=1)
-
-        # 5. Copier l'organisation/planning UNIQUEMENT si même nombre de jours
-        if new_nombre_jours == source_event['nombre_jours']:
-            # Récupérer UNIQUEMENT les dates SÉLECTIONNÉES sources (is_selected = 1)
-            cursor.execute("""
-                SELECT id, date
-                FROM event_date
-                WHERE event_id = ? AND is_selected = 1
-                ORDER BY date
-            """, (event_id,))
-            source_dates = list(cursor.fetchall())
-
-            # Récupérer les nouvelles dates (toutes sélectionnées par défaut)
-            cursor.execute("""
-                SELECT id, date
-                FROM event_date
-                WHERE event_id = ?
-                ORDER BY date
-            """, (new_event_id,))
-            new_dates = list(cursor.fetchall())
-
-            # Mapper les anciennes dates sélectionnées vers les nouvelles (par index)
-            date_mapping = {}
-            for i, source_date in enumerate(source_dates):
-                if i < len(new_dates):
-                    date_mapping[source_date['id']] = new_dates[i]['id']
-
-            # Copier la planification
-            cursor.execute("""
-                SELECT recipe_id, event_date_id, position
-                FROM event_recipe_planning
-                WHERE event_id = ?
-            """, (event_id,))
-
-            planning_entries = cursor.fetchall()
-            for entry in planning_entries:
-                old_date_id = entry['event_date_id']
-                new_date_id = date_mapping.get(old_date_id)
-
-                if new_date_id:
-                    cursor.execute("""
-                        INSERT INTO event_recipe_planning (event_id, recipe_id, event_date_id, position)
-                        VALUES (?, ?, ?, ?)
-                    """, (new_event_id, entry['recipe_id'], new_date_id, entry['position']))
+
+def create_recurring_events(event_id: int, new_name: str, new_event_type_id: int, first_date_debut: str,
+                            first_date_fin: str, occurrences: int, interval_days: int = 7,
+                            new_location: str = None, new_attendees: int = None,
+                            new_notes: str = None, user_id: int = None) -> list:
+    """
+    Instancie un événement modèle plusieurs fois à intervalle régulier
+    (ex: tous les dimanches d'une saison), en une seule transaction
+
+    Args:
+        event_id: ID de l'événement modèle
+        first_date_debut: Date de début de la première occurrence
+        first_date_fin: Date de fin de la première occurrence
+        occurrences: Nombre d'événements à créer
+        interval_days: Écart en jours entre deux occurrences (7 = hebdomadaire)
+        (autres paramètres : voir copy_event)
+
+    Returns:
+        Liste des IDs créés (vide si le modèle n'existe pas)
+    """
+    from datetime import datetime, timedelta
+
+    debut = datetime.strptime(first_date_debut, '%Y-%m-%d')
+    fin = datetime.strptime(first_date_fin, '%Y-%m-%d')
+
+    with get_db() as conn:
+        cursor = conn.cursor()
+
+        source_event = cursor.execute(_COPY_SOURCE_SQL, (event_id,)).fetchone()
+        if not source_event:
+            return []
+        source_event = dict(source_event)
+
+        new_event_ids = []
+        for i in range(occurrences):
+            shift = timedelta(days=i * interval_days)
+            new_event_ids.append(_copy_event_into(
+                cursor, event_id, source_event, new_name, new_event_type_id,
+                (debut + shift).strftime('%Y-%m-%d'), (fin + shift).strftime('%Y-%m-%d'),
+                new_location, new_attendees, new_notes, user_id
+            ))
 
         conn.commit()
-        return new_event_id
+        return new_event_ids
 
 
 # ============================================================================
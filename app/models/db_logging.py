@@ -1,16 +1,175 @@
 """
 Module de gestion des logs d'accès
 """
+import bisect
+
+from . import db_core
 from .db_core import get_db
 
+# Bornes supérieures (ms) des seaux de l'histogramme des temps de réponse :
+# colonnes b0..b11 de access_log_hourly (voir migrations/add_access_log_rollup.sql)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf'))
+_BUCKET_COLUMNS = [f"b{i}" for i in range(len(LATENCY_BUCKETS_MS))]
+
+# Durée de conservation des logs bruts : courte quand les agrégats horaires
+# prennent le relais (add_access_log_rollup.sql), sinon les logs bruts restent
+# la seule source des statistiques
+ACCESS_LOG_RETENTION_DAYS = 30
+ACCESS_LOG_RAW_RETENTION_DAYS = 7
+
+# Durée de conservation des agrégats horaires (les logs bruts sont purgés bien avant)
+ACCESS_ROLLUP_RETENTION_DAYS = 365
+
+_HOURLY_UPSERT_SQL = f"""
+    INSERT INTO access_log_hourly (
+        hour, path, status_class, count, sized_count, bytes, transfer_bytes,
+        timed_count, total_time_ms, {', '.join(_BUCKET_COLUMNS)}
+    ) VALUES (
+        strftime('%Y-%m-%d %H:00:00', 'now'), ?, ?, 1, ?, ?, ?, ?, ?,
+        {', '.join('?' * len(_BUCKET_COLUMNS))}
+    )
+    ON CONFLICT (hour, path, status_class) DO UPDATE SET
+        count = count + 1,
+        sized_count = sized_count + excluded.sized_count,
+        bytes = bytes + excluded.bytes,
+        transfer_bytes = transfer_bytes + excluded.transfer_bytes,
+        timed_count = timed_count + excluded.timed_count,
+        total_time_ms = total_time_ms + excluded.total_time_ms,
+        {', '.join(f"{c} = {c} + excluded.{c}" for c in _BUCKET_COLUMNS)}
+"""
+
+_HOURLY_IP_UPSERT_SQL = """
+    INSERT INTO access_log_hourly_ip (hour, ip_address, count, first_access, last_access)
+    VALUES (strftime('%Y-%m-%d %H:00:00', 'now'), ?, 1, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+    ON CONFLICT (hour, ip_address) DO UPDATE SET
+        count = count + 1,
+        last_access = excluded.last_access
+"""
+
+
+def _bucket_sum_sql(i: int) -> str:
+    """
+    Effectif du seau i de l'histogramme, calculé sur les logs bruts
+    (mêmes bornes que bisect_left dans log_access : borne supérieure incluse)
+    """
+    conditions = [f"response_time_ms > {LATENCY_BUCKETS_MS[i - 1]}"] if i else []
+    if LATENCY_BUCKETS_MS[i] != float('inf'):
+        conditions.append(f"response_time_ms <= {LATENCY_BUCKETS_MS[i]}")
+    return f"COALESCE(SUM({' AND '.join(conditions)}), 0)"
+
+
+# Agrégation des logs bruts antérieurs à une date, pour les heures, chemins et
+# classes de statut absents des agrégats (même calcul que la reprise de
+# add_access_log_rollup.sql ; {transfer} : colonne ou NULL)
+_HOURLY_BACKFILL_SQL = f"""
+    INSERT OR IGNORE INTO access_log_hourly (
+        hour, path, status_class, count, sized_count, bytes, transfer_bytes,
+        timed_count, total_time_ms, {', '.join(_BUCKET_COLUMNS)}
+    )
+    SELECT strftime('%Y-%m-%d %H:00:00', accessed_at), path,
+           COALESCE(status_code / 100, 0), COUNT(*),
+           COUNT(response_size_bytes), COALESCE(SUM(response_size_bytes), 0),
+           COALESCE(SUM({{transfer}}), 0),
+           COUNT(response_time_ms), COALESCE(SUM(response_time_ms), 0),
+           {', '.join(_bucket_sum_sql(i) for i in range(len(LATENCY_BUCKETS_MS)))}
+    FROM access_log
+    WHERE accessed_at < datetime('now', '-' || ? || ' days') AND path IS NOT NULL
+    GROUP BY 1, 2, 3
+"""
+
+_HOURLY_IP_BACKFILL_SQL = """
+    INSERT OR IGNORE INTO access_log_hourly_ip (hour, ip_address, count, first_access, last_access)
+    SELECT strftime('%Y-%m-%d %H:00:00', accessed_at), ip_address, COUNT(*),
+           MIN(accessed_at), MAX(accessed_at)
+    FROM access_log
+    WHERE accessed_at < datetime('now', '-' || ? || ' days')
+    GROUP BY 1, 2
+"""
+
+# Début de la période analysée, arrondi à l'heure (clé des agrégats horaires)
+_ROLLUP_SINCE = "strftime('%Y-%m-%d %H:00:00', 'now', '-' || ? || ' hours')"
+
+
+def _has_access_rollup(con) -> bool:
+    """Vérifie si la migration add_access_log_rollup.sql a été appliquée"""
+    row = con.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'access_log_hourly'"
+    ).fetchone()
+    return row is not None
+
+
+# Bases où access_log a la colonne transfer_size_bytes (chemin de la base)
+_transfer_size_dbs = set()
+
+
+def _has_transfer_size(con) -> bool:
+    """
+    Vérifie si la migration add_transfer_size_to_access_log.sql a été appliquée
+
+    Seul le résultat positif est mis en cache (une colonne ajoutée ne
+    disparaît pas) : sans la migration, le PRAGMA est relu à chaque accès
+    et la colonne est prise en compte dès qu'elle est ajoutée.
+    """
+    if db_core.DB_PATH in _transfer_size_dbs:
+        return True
+    columns = {row[1] for row in con.execute("PRAGMA table_info(access_log)")}
+    if 'transfer_size_bytes' not in columns:
+        return False
+    _transfer_size_dbs.add(db_core.DB_PATH)
+    return True
+
+
+def _latency_percentile(buckets: list, q: float):
+    """
+    Estime un percentile du temps de réponse à partir de l'histogramme
+
+    Interpolation linéaire dans le seau qui contient le rang recherché ;
+    pour le dernier seau (non borné), retourne sa borne inférieure.
+
+    Args:
+        buckets: Effectifs des seaux (alignés sur LATENCY_BUCKETS_MS)
+        q: Quantile entre 0 et 1 (0.95 pour p95)
+
+    Returns:
+        Temps estimé en millisecondes, ou None si l'histogramme est vide
+    """
+    total = sum(buckets)
+    if not total:
+        return None
+
+    rank = q * total
+    cumulative = 0
+    for i, n in enumerate(buckets):
+        if n and cumulative + n >= rank:
+            lower = LATENCY_BUCKETS_MS[i - 1] if i else 0
+            upper = LATENCY_BUCKETS_MS[i]
+            if upper == float('inf'):
+                return float(lower)
+            return lower + (upper - lower) * (rank - cumulative) / n
+        cumulative += n
+    return None
+
+
+def _latency_summary(buckets: list) -> dict:
+    """p50 / p95 / p99 d'un histogramme de temps de réponse"""
+    return {
+        'p50': _latency_percentile(buckets, 0.50),
+        'p95': _latency_percentile(buckets, 0.95),
+        'p99': _latency_percentile(buckets, 0.99),
+    }
+
 
 def log_access(ip_address: str, user_agent: str = None, path: str = None,
                method: str = 'GET', status_code: int = None,
                response_time_ms: float = None, referer: str = None,
-               lang: str = None):
+               lang: str = None, response_size_bytes: int = None,
+               transfer_size_bytes: int = None):
     """
     Enregistre un accès à l'application
 
+    Si les agrégats horaires existent (add_access_log_rollup.sql), ils sont
+    mis à jour dans la même transaction que l'insertion du log brut.
+
     Args:
         ip_address: Adresse IP du client
         user_agent: User agent du navigateur
@@ -20,123 +179,351 @@ def log_access(ip_address: str, user_agent: str = None, path: str = None,
         response_time_ms: Temps de réponse en millisecondes
         referer: URL de référence
         lang: Langue de l'interface
+        response_size_bytes: Taille du corps de la réponse avant compression
+        transfer_size_bytes: Octets réellement envoyés (après compression)
     """
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO access_log (ip_address, user_agent, path, method, status_code,
-                                   response_time_ms, referer, lang)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (ip_address, user_agent, path, method, status_code,
-              response_time_ms, referer, lang))
+        if _has_transfer_size(conn):
+            cursor.execute("""
+                INSERT INTO access_log (ip_address, user_agent, path, method, status_code,
+                                       response_time_ms, referer, lang,
+                                       response_size_bytes, transfer_size_bytes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (ip_address, user_agent, path, method, status_code,
+                  response_time_ms, referer, lang,
+                  response_size_bytes, transfer_size_bytes))
+        else:
+            # Sans add_transfer_size_to_access_log.sql : taille transférée non enregistrée
+            cursor.execute("""
+                INSERT INTO access_log (ip_address, user_agent, path, method, status_code,
+                                       response_time_ms, referer, lang, response_size_bytes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (ip_address, user_agent, path, method, status_code,
+                  response_time_ms, referer, lang, response_size_bytes))
+
+        if not _has_access_rollup(conn):
+            return
+
+        cursor.execute(_HOURLY_IP_UPSERT_SQL, (ip_address,))
+        if path is None:
+            return
+
+        sized = response_size_bytes is not None and transfer_size_bytes is not None
+        buckets = [0] * len(LATENCY_BUCKETS_MS)
+        if response_time_ms is not None:
+            buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, response_time_ms)] = 1
+
+        cursor.execute(_HOURLY_UPSERT_SQL, (
+            path,
+            status_code // 100 if status_code else 0,
+            1 if sized else 0,
+            response_size_bytes if sized else 0,
+            transfer_size_bytes if sized else 0,
+            1 if response_time_ms is not None else 0,
+            response_time_ms or 0,
+            *buckets
+        ))
 
 
 def get_access_stats(hours: int = 24):
     """
     Récupère les statistiques d'accès
 
+    Lit les agrégats horaires (access_log_hourly, access_log_hourly_ip) :
+    la période est arrondie à l'heure entière qui la contient. Sans la
+    migration add_access_log_rollup.sql, les logs bruts sont agrégés.
+
     Args:
         hours: Nombre d'heures à analyser (par défaut 24h)
 
     Returns:
-        Dictionnaire avec les statistiques d'accès
+        Dictionnaire avec les statistiques d'accès ; 'latency' contient
+        p50 / p95 / p99 / avg (None sur les logs bruts)
     """
     with get_db() as conn:
+        if not _has_access_rollup(conn):
+            return _get_access_stats_raw(conn, hours)
+
         cursor = conn.cursor()
+        bucket_sums = ', '.join(f"SUM({c}) as {c}" for c in _BUCKET_COLUMNS)
 
-        # Nombre total d'accès
-        cursor.execute("""
-            SELECT COUNT(*) as total
-            FROM access_log
-            WHERE accessed_at >= datetime('now', '-' || ? || ' hours')
+        # Totaux de la période et histogramme global
+        cursor.execute(f"""
+            SELECT COALESCE(SUM(count), 0) as total,
+                   COALESCE(SUM(bytes), 0) as uncompressed_bytes,
+                   COALESCE(SUM(transfer_bytes), 0) as transferred_bytes,
+                   SUM(total_time_ms) / NULLIF(SUM(timed_count), 0) as avg_time,
+                   {bucket_sums}
+            FROM access_log_hourly
+            WHERE hour >= {_ROLLUP_SINCE}
         """, (hours,))
-        total_accesses = cursor.fetchone()['total']
+        totals = cursor.fetchone()
+        latency = _latency_summary([totals[c] or 0 for c in _BUCKET_COLUMNS])
+        latency['avg'] = totals['avg_time']
 
         # Accès par IP
-        cursor.execute("""
-            SELECT ip_address, COUNT(*) as count,
-                   MIN(accessed_at) as first_access,
-                   MAX(accessed_at) as last_access
-            FROM access_log
-            WHERE accessed_at >= datetime('now', '-' || ? || ' hours')
+        cursor.execute(f"""
+            SELECT ip_address, SUM(count) as count,
+                   MIN(first_access) as first_access,
+                   MAX(last_access) as last_access
+            FROM access_log_hourly_ip
+            WHERE hour >= {_ROLLUP_SINCE}
             GROUP BY ip_address
             ORDER BY count DESC
             LIMIT 10
         """, (hours,))
         by_ip = [dict(row) for row in cursor.fetchall()]
 
+        cursor.execute(f"""
+            SELECT COUNT(DISTINCT ip_address) as unique_ips
+            FROM access_log_hourly_ip
+            WHERE hour >= {_ROLLUP_SINCE}
+        """, (hours,))
+        unique_ips = cursor.fetchone()['unique_ips']
+
         # Pages les plus visitées
-        cursor.execute("""
-            SELECT path, COUNT(*) as count
-            FROM access_log
-            WHERE accessed_at >= datetime('now', '-' || ? || ' hours')
-              AND path IS NOT NULL
+        cursor.execute(f"""
+            SELECT path, SUM(count) as count
+            FROM access_log_hourly
+            WHERE hour >= {_ROLLUP_SINCE}
             GROUP BY path
             ORDER BY count DESC
             LIMIT 10
         """, (hours,))
         popular_pages = [dict(row) for row in cursor.fetchall()]
 
-        # Temps de réponse moyen par page
-        cursor.execute("""
-            SELECT path, AVG(response_time_ms) as avg_time, COUNT(*) as count
-            FROM access_log
-            WHERE accessed_at >= datetime('now', '-' || ? || ' hours')
-              AND response_time_ms IS NOT NULL
-              AND path IS NOT NULL
+        # Temps de réponse moyen par page (avec p95 issu de l'histogramme)
+        cursor.execute(f"""
+            SELECT path, SUM(total_time_ms) / SUM(timed_count) as avg_time,
+                   SUM(timed_count) as count, {bucket_sums}
+            FROM access_log_hourly
+            WHERE hour >= {_ROLLUP_SINCE}
             GROUP BY path
+            HAVING SUM(timed_count) > 0
             ORDER BY avg_time DESC
             LIMIT 10
         """, (hours,))
-        slow_pages = [dict(row) for row in cursor.fetchall()]
+        slow_pages = [
+            {
+                'path': row['path'],
+                'avg_time': row['avg_time'],
+                'count': row['count'],
+                'p95': _latency_percentile([row[c] for c in _BUCKET_COLUMNS], 0.95),
+            }
+            for row in cursor.fetchall()
+        ]
+
+        # Pages les plus lourdes (taille avant / après compression)
+        cursor.execute(f"""
+            SELECT path, SUM(bytes) * 1.0 / SUM(sized_count) as avg_size,
+                   SUM(transfer_bytes) * 1.0 / SUM(sized_count) as avg_transfer_size,
+                   SUM(sized_count) as count
+            FROM access_log_hourly
+            WHERE hour >= {_ROLLUP_SINCE}
+            GROUP BY path
+            HAVING SUM(sized_count) > 0
+            ORDER BY avg_size DESC
+            LIMIT 10
+        """, (hours,))
+        heavy_pages = [dict(row) for row in cursor.fetchall()]
 
         return {
-            'total_accesses': total_accesses,
+            'total_accesses': totals['total'],
+            'unique_ips': unique_ips,
             'by_ip': by_ip,
             'popular_pages': popular_pages,
-            'slow_pages': slow_pages
+            'slow_pages': slow_pages,
+            'heavy_pages': heavy_pages,
+            'bandwidth': {
+                'uncompressed_bytes': totals['uncompressed_bytes'],
+                'transferred_bytes': totals['transferred_bytes'],
+            },
+            'latency': latency
         }
 
 
-def cleanup_old_access_logs(days: int = 30):
+def _get_access_stats_raw(conn, hours: int):
+    """
+    Statistiques d'accès agrégées sur les logs bruts (sans agrégats horaires)
+
+    Args:
+        conn: Connexion SQLite
+        hours: Nombre d'heures à analyser
+
+    Returns:
+        Dictionnaire avec les statistiques d'accès
+    """
+    cursor = conn.cursor()
+    # Sans add_transfer_size_to_access_log.sql, la taille transférée est inconnue
+    transfer = "transfer_size_bytes" if _has_transfer_size(conn) else "NULL"
+
+    # Nombre total d'accès
+    cursor.execute("""
+        SELECT COUNT(*) as total
+        FROM access_log
+        WHERE accessed_at >= datetime('now', '-' || ? || ' hours')
+    """, (hours,))
+    total_accesses = cursor.fetchone()['total']
+
+    # Accès par IP
+    cursor.execute("""
+        SELECT ip_address, COUNT(*) as count,
+               MIN(accessed_at) as first_access,
+               MAX(accessed_at) as last_access
+        FROM access_log
+        WHERE accessed_at >= datetime('now', '-' || ? || ' hours')
+        GROUP BY ip_address
+        ORDER BY count DESC
+        LIMIT 10
+    """, (hours,))
+    by_ip = [dict(row) for row in cursor.fetchall()]
+
+    cursor.execute("""
+        SELECT COUNT(DISTINCT ip_address) as unique_ips
+        FROM access_log
+        WHERE accessed_at >= datetime('now', '-' || ? || ' hours')
+    """, (hours,))
+    unique_ips = cursor.fetchone()['unique_ips']
+
+    # Pages les plus visitées
+    cursor.execute("""
+        SELECT path, COUNT(*) as count
+        FROM access_log
+        WHERE accessed_at >= datetime('now', '-' || ? || ' hours')
+          AND path IS NOT NULL
+        GROUP BY path
+        ORDER BY count DESC
+        LIMIT 10
+    """, (hours,))
+    popular_pages = [dict(row) for row in cursor.fetchall()]
+
+    # Temps de réponse moyen par page
+    cursor.execute("""
+        SELECT path, AVG(response_time_ms) as avg_time, COUNT(*) as count
+        FROM access_log
+        WHERE accessed_at >= datetime('now', '-' || ? || ' hours')
+          AND response_time_ms IS NOT NULL
+          AND path IS NOT NULL
+        GROUP BY path
+        ORDER BY avg_time DESC
+        LIMIT 10
+    """, (hours,))
+    slow_pages = [dict(row) for row in cursor.fetchall()]
+
+    # Pages les plus lourdes (taille avant / après compression)
+    cursor.execute(f"""
+        SELECT path, AVG(response_size_bytes) as avg_size,
+               AVG({transfer}) as avg_transfer_size, COUNT(*) as count
+        FROM access_log
+        WHERE accessed_at >= datetime('now', '-' || ? || ' hours')
+          AND response_size_bytes IS NOT NULL
+          AND path IS NOT NULL
+        GROUP BY path
+        ORDER BY avg_size DESC
+        LIMIT 10
+    """, (hours,))
+    heavy_pages = [dict(row) for row in cursor.fetchall()]
+
+    # Bande passante économisée par la compression
+    cursor.execute(f"""
+        SELECT COALESCE(SUM(response_size_bytes), 0) as uncompressed_bytes,
+               COALESCE(SUM({transfer}), 0) as transferred_bytes
+        FROM access_log
+        WHERE accessed_at >= datetime('now', '-' || ? || ' hours')
+          AND response_size_bytes IS NOT NULL
+          AND {transfer} IS NOT NULL
+    """, (hours,))
+    bandwidth = dict(cursor.fetchone())
+
+    return {
+        'total_accesses': total_accesses,
+        'unique_ips': unique_ips,
+        'by_ip': by_ip,
+        'popular_pages': popular_pages,
+        'slow_pages': slow_pages,
+        'heavy_pages': heavy_pages,
+        'bandwidth': bandwidth,
+        'latency': None
+    }
+
+
+def cleanup_old_access_logs(days: int = None, rollup_days: int = ACCESS_ROLLUP_RETENTION_DAYS):
     """
     Nettoie les logs d'accès anciens
 
+    Avec les agrégats horaires, les logs bruts ne servent plus qu'au détail
+    paginé de /access-logs : ils sont conservés peu de temps, les agrégats
+    pendant un an. Les heures à purger sont d'abord reportées dans les
+    agrégats s'il leur en manque (INSERT OR IGNORE : une heure déjà agrégée
+    par log_access n'est pas comptée deux fois). Sans les agrégats, les logs
+    bruts restent la seule source des statistiques et sont gardés plus longtemps.
+
     Args:
-        days: Nombre de jours à conserver (par défaut 30)
+        days: Nombre de jours de logs bruts à conserver (par défaut 7 avec
+              les agrégats horaires, 30 sans)
+        rollup_days: Nombre de jours d'agrégats horaires à conserver (par défaut 365)
 
     Returns:
-        Nombre de lignes supprimées
+        Nombre de logs bruts supprimés
     """
     with get_db() as conn:
         cursor = conn.cursor()
+        has_rollup = _has_access_rollup(conn)
+        if days is None:
+            days = ACCESS_LOG_RAW_RETENTION_DAYS if has_rollup else ACCESS_LOG_RETENTION_DAYS
+
+        if has_rollup:
+            transfer = "transfer_size_bytes" if _has_transfer_size(conn) else "NULL"
+            cursor.execute(_HOURLY_BACKFILL_SQL.format(transfer=transfer), (days,))
+            cursor.execute(_HOURLY_IP_BACKFILL_SQL, (days,))
+
         cursor.execute("""
             DELETE FROM access_log
             WHERE accessed_at < datetime('now', '-' || ? || ' days')
         """, (days,))
         deleted_count = cursor.rowcount
+
+        if has_rollup:
+            for table in ('access_log_hourly', 'access_log_hourly_ip'):
+                cursor.execute(f"""
+                    DELETE FROM {table}
+                    WHERE hour < strftime('%Y-%m-%d %H:00:00', 'now', '-' || ? || ' days')
+                """, (rollup_days,))
         return deleted_count
 
 
-def get_recent_access_logs(limit: int = 50, hours: int = 24):
+def get_recent_access_logs(limit: int = 50, hours: int = 24, after: tuple = None):
     """
     Récupère les logs d'accès récents
 
     Args:
         limit: Nombre maximum de logs à retourner (par défaut 50)
         hours: Nombre d'heures à analyser (par défaut 24)
+        after: Clé (accessed_at, id) du dernier log de la page précédente
+               (pagination keyset, voir decode_cursor / keyset_page)
 
     Returns:
-        Liste des logs d'accès récents
+        Liste des logs d'accès récents (plus récents en premier)
     """
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT ip_address, user_agent, path, method, status_code,
-                   response_time_ms, referer, lang, accessed_at
+        transfer = "transfer_size_bytes" if _has_transfer_size(conn) else "NULL"
+        sql = f"""
+            SELECT id, ip_address, user_agent, path, method, status_code,
+                   response_time_ms, response_size_bytes, {transfer} as transfer_size_bytes,
+                   referer, lang, accessed_at
             FROM access_log
             WHERE accessed_at >= datetime('now', '-' || ? || ' hours')
-            ORDER BY accessed_at DESC
-            LIMIT ?
-        """, (hours, limit))
+        """
+        params = [hours]
+
+        if after is not None:
+            sql += " AND (accessed_at, id) < (?, ?)"
+            params.extend(after)
+
+        sql += " ORDER BY accessed_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+
+        cursor.execute(sql, params)
         return [dict(row) for row in cursor.fetchall()]
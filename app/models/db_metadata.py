@@ -81,12 +81,11 @@ def set_recipe_categories(recipe_id: int, category_ids: list):
         cursor = conn.cursor()
         # Supprimer les anciennes associations
         cursor.execute("DELETE FROM recipe_category WHERE recipe_id = ?", (recipe_id,))
-        # Ajouter les nouvelles
-        for category_id in category_ids:
-            cursor.execute(
-                "INSERT INTO recipe_category (recipe_id, category_id) VALUES (?, ?)",
-                (recipe_id, category_id)
-            )
+        # Ajouter les nouvelles (une seule requête préparée pour le lot)
+        cursor.executemany(
+            "INSERT INTO recipe_category (recipe_id, category_id) VALUES (?, ?)",
+            [(recipe_id, category_id) for category_id in category_ids]
+        )
         conn.commit()
 
 
@@ -96,12 +95,11 @@ def set_recipe_tags(recipe_id: int, tag_ids: list):
         cursor = conn.cursor()
         # Supprimer les anciennes associations
         cursor.execute("DELETE FROM recipe_tag WHERE recipe_id = ?", (recipe_id,))
-        # Ajouter les nouvelles
-        for tag_id in tag_ids:
-            cursor.execute(
-                "INSERT INTO recipe_tag (recipe_id, tag_id) VALUES (?, ?)",
-                (recipe_id, tag_id)
-            )
+        # Ajouter les nouvelles (une seule requête préparée pour le lot)
+        cursor.executemany(
+            "INSERT INTO recipe_tag (recipe_id, tag_id) VALUES (?, ?)",
+            [(recipe_id, tag_id) for tag_id in tag_ids]
+        )
         conn.commit()
 
 
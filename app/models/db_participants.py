@@ -40,6 +40,50 @@ def list_participants(user_id=None, is_admin=False):
         return [dict(row) for row in rows]
 
 
+def search_participants(user_id=None, is_admin=False, query: str = "", limit: int = 20,
+                        offset: int = 0, exclude_event_id: int = None):
+    """
+    Recherche de participants par nom (sélecteurs typeahead)
+
+    Args:
+        user_id: ID de l'utilisateur (None = tous)
+        is_admin: True si l'utilisateur est admin (voit tout)
+        query: Texte recherché dans nom / prénom (vide = tous)
+        limit: Nombre maximum de résultats
+        offset: Décalage pour la pagination
+        exclude_event_id: Exclut les participants déjà inscrits à cet événement
+
+    Returns:
+        Liste des participants (id, nom, prenom, role)
+    """
+    with get_db() as con:
+        sql = "SELECT p.id, p.nom, p.prenom, p.role FROM participant p WHERE 1 = 1"
+        params = []
+
+        if not (is_admin or user_id is None):
+            sql += " AND p.user_id = ?"
+            params.append(user_id)
+
+        if query:
+            sql += " AND (p.nom LIKE ? OR p.prenom LIKE ?)"
+            params.extend([f"%{query}%", f"%{query}%"])
+
+        if exclude_event_id is not None:
+            sql += """
+                AND NOT EXISTS (
+                    SELECT 1 FROM event_participant ep
+                    WHERE ep.event_id = ? AND ep.participant_id = p.id
+                )
+            """
+            params.append(exclude_event_id)
+
+        sql += " ORDER BY p.nom, p.prenom, p.id LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        rows = con.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+
 def get_participant_by_id(participant_id: int):
     """
     Récupère un participant par son ID
@@ -194,6 +238,47 @@ def list_groups(user_id=None, is_admin=False):
         return [dict(row) for row in rows]
 
 
+def search_groups(user_id=None, is_admin=False, query: str = "", limit: int = 20, offset: int = 0):
+    """
+    Recherche de groupes par nom (sélecteurs typeahead)
+
+    Args:
+        user_id: ID de l'utilisateur (None = tous)
+        is_admin: True si l'utilisateur est admin (voit tout)
+        query: Texte recherché dans le nom (vide = tous)
+        limit: Nombre maximum de résultats
+        offset: Décalage pour la pagination
+
+    Returns:
+        Liste des groupes (id, nom, member_count)
+    """
+    with get_db() as con:
+        sql = """
+            SELECT
+                pg.id,
+                pg.nom,
+                (SELECT COUNT(*) FROM participant_group_member pgm
+                 WHERE pgm.group_id = pg.id) AS member_count
+            FROM participant_group pg
+            WHERE 1 = 1
+        """
+        params = []
+
+        if not (is_admin or user_id is None):
+            sql += " AND pg.user_id = ?"
+            params.append(user_id)
+
+        if query:
+            sql += " AND pg.nom LIKE ?"
+            params.append(f"%{query}%")
+
+        sql += " ORDER BY pg.nom, pg.id LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        rows = con.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+
 def get_group_by_id(group_id: int):
     """
     Récupère un groupe par son ID avec le nombre de participants
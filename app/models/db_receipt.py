@@ -169,7 +169,8 @@ def get_receipt_with_matches(receipt_id: int, lang: str = "fr") -> Optional[Dict
         return receipt_dict
 
 
-def list_all_receipts(lang: str = "fr", limit: int = 50, user_id: Optional[int] = None, is_admin: bool = False) -> List[Dict]:
+def list_all_receipts(lang: str = "fr", limit: int = 50, user_id: Optional[int] = None, is_admin: bool = False,
+                      after: Optional[tuple] = None) -> List[Dict]:
     """
     Liste les tickets uploadés (les plus récents en premier)
 
@@ -178,6 +179,8 @@ def list_all_receipts(lang: str = "fr", limit: int = 50, user_id: Optional[int]
         limit: Nombre maximum de résultats
         user_id: Filtre par utilisateur (ignoré si is_admin=True)
         is_admin: Si True, retourne tous les tickets sans filtre
+        after: Clé (upload_date, id) du dernier ticket de la page précédente
+               (pagination keyset, voir decode_cursor / keyset_page)
 
     Returns:
         Liste des receipts avec leurs statistiques
@@ -185,57 +188,46 @@ def list_all_receipts(lang: str = "fr", limit: int = 50, user_id: Optional[int]
     with get_db() as conn:
         cursor = conn.cursor()
 
-        if is_admin:
-            cursor.execute("""
-                SELECT
-                    r.id,
-                    r.filename,
-                    r.receipt_name,
-                    r.store_name,
-                    r.receipt_date,
-                    r.upload_date,
-                    r.processed_at,
-                    r.status,
-                    r.currency,
-                    r.total_items,
-                    r.matched_items,
-                    r.validated_items,
-                    r.error_message,
-                    r.file_path,
-                    u.username,
-                    ROUND(CAST(r.matched_items AS REAL) / NULLIF(r.total_items, 0) * 100, 1) as match_percentage,
-                    ROUND(CAST(r.validated_items AS REAL) / NULLIF(r.total_items, 0) * 100, 1) as validation_percentage
-                FROM receipt_upload_history r
-                LEFT JOIN user u ON r.user_id = u.id
-                ORDER BY r.upload_date DESC
-                LIMIT ?
-            """, (limit,))
-        else:
-            cursor.execute("""
-                SELECT
-                    r.id,
-                    r.filename,
-                    r.receipt_name,
-                    r.store_name,
-                    r.receipt_date,
-                    r.upload_date,
-                    r.processed_at,
-                    r.status,
-                    r.currency,
-                    r.total_items,
-                    r.matched_items,
-                    r.validated_items,
-                    r.error_message,
-                    r.file_path,
-                    u.username,
-                    ROUND(CAST(r.matched_items AS REAL) / NULLIF(r.total_items, 0) * 100, 1) as match_percentage,
-                    ROUND(CAST(r.validated_items AS REAL) / NULLIF(r.total_items, 0) * 100, 1) as validation_percentage
-                FROM receipt_upload_history r
-                LEFT JOIN user u ON r.user_id = u.id
-                WHERE r.user_id = ?
-                ORDER BY r.upload_date DESC
-                LIMIT ?
-            """, (user_id, limit))
+        sql = """
+            SELECT
+                r.id,
+                r.filename,
+                r.receipt_name,
+                r.store_name,
+                r.receipt_date,
+                r.upload_date,
+                r.processed_at,
+                r.status,
+                r.currency,
+                r.total_items,
+                r.matched_items,
+                r.validated_items,
+                r.error_message,
+                r.file_path,
+                u.username,
+                ROUND(CAST(r.matched_items AS REAL) / NULLIF(r.total_items, 0) * 100, 1) as match_percentage,
+                ROUND(CAST(r.validated_items AS REAL) / NULLIF(r.total_items, 0) * 100, 1) as validation_percentage
+            FROM receipt_upload_history r
+            LEFT JOIN user u ON r.user_id = u.id
+        """
+        params = []
+        conditions = []
+
+        if not is_admin:
+            conditions.append("r.user_id = ?")
+            params.append(user_id)
+
+        if after is not None:
+            conditions.append("(r.upload_date, r.id) < (?, ?)")
+            params.extend(after)
+
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+
+        sql += " ORDER BY r.upload_date DESC, r.id DESC LIMIT ?"
+        params.append(limit)
+
+        cursor.execute(sql, params)
 
         return [dict(row) for row in cursor.fetchall()]
 
@@ -5,22 +5,85 @@ from typing import Optional
 from .db_core import get_db
 from app.services.ingredient_aggregator import get_ingredient_aggregator
 from app.services.cost_calculator import compute_estimated_cost_for_ingredient
+from app.services.fragment_cache import invalidate_recipe
 
 
-def list_recipes(lang: str, user_id: int = None):
+def _recipe_columns(con) -> set:
+    """Colonnes de la table recipe (détection des migrations appliquées)"""
+    return {row[1] for row in con.execute("PRAGMA table_info(recipe)").fetchall()}
+
+
+def _has_recipe_counters(con) -> bool:
+    """Vérifie si la migration add_recipe_counters.sql a été appliquée"""
+    return "ingredient_count" in _recipe_columns(con)
+
+
+def _has_content_generation(con) -> bool:
+    """Vérifie si la migration add_recipe_content_generation.sql a été appliquée"""
+    return "content_generation" in _recipe_columns(con)
+
+
+# Tris proposés par la liste des recettes (hors nom) : clé → expression SQL non NULL
+# (la valeur sert de clé de curseur avec r.id)
+RECIPE_SORT_EXPRESSIONS = {
+    "type": "COALESCE(rt.recipe_type, '')",
+    "creator_name": "COALESCE(u.display_name, u.username, '') COLLATE NOCASE",
+    "servings": "r.servings_default",
+}
+
+
+def list_recipes(lang: str, user_id: int = None, limit: int = None, after: tuple = None,
+                 search: str = None, category_ids: list = None, tag_ids: list = None,
+                 recipe_type_id: int = None, sort: str = "name", descending: bool = False):
     """
-    Liste toutes les recettes dans la langue demandée
+    Liste les recettes dans la langue demandée, filtrées et triées en SQL
 
     Args:
         lang: Code de langue ('fr' ou 'jp')
         user_id: ID utilisateur optionnel pour filtrer par créateur
+        limit: Nombre maximum de recettes (None = toutes)
+        after: Clé (sort_key, id) de la dernière recette de la page précédente
+               (pagination keyset, voir decode_cursor / keyset_page)
+        search: Texte recherché dans le nom
+        category_ids: Au moins une de ces catégories
+        tag_ids: Au moins un de ces tags
+        recipe_type_id: Type de recette (recipe_recipe_type)
+        sort: 'name' (défaut), 'type', 'creator_name' ou 'servings'
+        descending: Ordre décroissant
 
     Returns:
-        Liste des recettes avec leurs informations de base
+        Liste des recettes avec leurs informations de base ; sort_key contient
+        la valeur de tri (curseur : sort_key, id)
     """
     other_lang = 'jp' if lang == 'fr' else 'fr'
     with get_db() as con:
-        sql = """
+        columns = _recipe_columns(con)
+        if "ingredient_count" in columns:
+            # Compteurs maintenus par triggers (migrations/add_recipe_counters.sql)
+            counter_columns = """
+                CASE WHEN instr(',' || r.available_langs || ',', ',' || ? || ',') > 0
+                     THEN 1 ELSE 0 END AS has_other_lang,
+                r.ingredient_count,
+                r.step_count
+            """
+            other_lang_join = ""
+        else:
+            # Repli : migration non appliquée, compteurs calculés ligne par ligne
+            counter_columns = """
+                CASE WHEN rt_other.recipe_id IS NOT NULL THEN 1 ELSE 0 END AS has_other_lang,
+                (SELECT COUNT(*) FROM recipe_ingredient ri WHERE ri.recipe_id = r.id) AS ingredient_count,
+                (SELECT COUNT(*) FROM step s WHERE s.recipe_id = r.id AND s.type = 'text') AS step_count
+            """
+            other_lang_join = "LEFT JOIN recipe_translation rt_other ON rt_other.recipe_id = r.id AND rt_other.lang = ?"
+
+        if "sort_name_fr" in columns:
+            # Clé de tri maintenue par triggers et indexée (migrations/add_recipe_sort_name.sql)
+            name_key = "r.sort_name_jp" if lang == 'jp' else "r.sort_name_fr"
+        else:
+            name_key = "COALESCE(rt.name, r.slug) COLLATE NOCASE"
+        sort_key = RECIPE_SORT_EXPRESSIONS.get(sort, name_key)
+
+        sql = f"""
             SELECT
                 r.id,
                 r.slug,
@@ -34,29 +97,112 @@ def list_recipes(lang: str, user_id: int = None):
                 rt.recipe_type AS type,
                 r.user_id,
                 COALESCE(u.display_name, u.username) AS creator_name,
-                CASE WHEN rt_other.recipe_id IS NOT NULL THEN 1 ELSE 0 END AS has_other_lang,
-                (SELECT COUNT(*) FROM recipe_ingredient ri WHERE ri.recipe_id = r.id) AS ingredient_count,
-                (SELECT COUNT(*) FROM step s WHERE s.recipe_id = r.id AND s.type = 'text') AS step_count
+                {sort_key} AS sort_key,
+                {counter_columns}
             FROM recipe r
             LEFT JOIN recipe_translation rt ON rt.recipe_id = r.id AND rt.lang = ?
-            LEFT JOIN recipe_translation rt_other ON rt_other.recipe_id = r.id AND rt_other.lang = ?
+            {other_lang_join}
             LEFT JOIN user u ON u.id = r.user_id
         """
 
-        params = [lang, other_lang]
+        # Ordre des paramètres : has_other_lang (compteurs) ou jointure rt_other (repli)
+        if other_lang_join:
+            params = [lang, other_lang]
+        else:
+            params = [other_lang, lang]
+        conditions = []
 
         # Ajouter le filtre par créateur si spécifié
         if user_id is not None:
-            sql += " WHERE r.user_id = ?"
+            conditions.append("r.user_id = ?")
             params.append(user_id)
 
-        sql += " ORDER BY name COLLATE NOCASE"
+        if search:
+            conditions.append(f"{name_key} LIKE ?")
+            params.append(f"%{search}%")
+
+        # Au moins une des catégories / un des tags sélectionnés
+        for table, column, ids in (("recipe_category", "category_id", category_ids),
+                                   ("recipe_tag", "tag_id", tag_ids)):
+            if ids:
+                placeholders = ", ".join("?" * len(ids))
+                conditions.append(
+                    f"EXISTS (SELECT 1 FROM {table} f WHERE f.recipe_id = r.id AND f.{column} IN ({placeholders}))"
+                )
+                params.extend(ids)
+
+        if recipe_type_id is not None:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM recipe_recipe_type rrt WHERE rrt.recipe_id = r.id AND rrt.recipe_type_id = ?)"
+            )
+            params.append(recipe_type_id)
+
+        # Reprendre après la dernière recette de la page précédente
+        direction = "DESC" if descending else "ASC"
+        if after is not None:
+            conditions.append(f"({sort_key}, r.id) {'<' if descending else '>'} (?, ?)")
+            params.extend(after)
+
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+
+        sql += f" ORDER BY {sort_key} {direction}, r.id {direction}"
+
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
 
         rows = con.execute(sql, params).fetchall()
         # Convertir les Row en dictionnaires pour le JSON
         return [dict(row) for row in rows]
 
 
+def search_recipe_names(lang: str, query: str = "", limit: int = 20, offset: int = 0,
+                        exclude_id: int = None):
+    """
+    Recherche légère de recettes par nom (sélecteurs typeahead)
+
+    Contrairement à list_recipes, ne calcule ni compteurs ni jointures
+    annexes : seulement id, slug, nom et nombre de personnes.
+
+    Args:
+        lang: Code de langue ('fr' ou 'jp')
+        query: Texte recherché dans le nom (vide = toutes les recettes)
+        limit: Nombre maximum de résultats
+        offset: Décalage pour la pagination
+        exclude_id: ID de recette à exclure (ex: la recette en cours d'édition)
+
+    Returns:
+        Liste de dictionnaires (id, slug, name, servings)
+    """
+    with get_db() as con:
+        sql = """
+            SELECT
+                r.id,
+                r.slug,
+                COALESCE(rt.name, r.slug) AS name,
+                r.servings_default AS servings
+            FROM recipe r
+            LEFT JOIN recipe_translation rt ON rt.recipe_id = r.id AND rt.lang = ?
+            WHERE 1 = 1
+        """
+        params = [lang]
+
+        if query:
+            sql += " AND COALESCE(rt.name, r.slug) LIKE ?"
+            params.append(f"%{query}%")
+
+        if exclude_id is not None:
+            sql += " AND r.id != ?"
+            params.append(exclude_id)
+
+        sql += " ORDER BY name COLLATE NOCASE, r.id LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        rows = con.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+
 def list_recipes_by_type(recipe_type: str, lang: str):
     """
     Liste toutes les recettes d'un type donné dans la langue demandée
@@ -140,11 +286,18 @@ def get_recipe_by_slug(slug: str, lang: str):
         lang: Code de langue ('fr' ou 'jp')
 
     Returns:
-        Tuple (recipe, ingredients, steps) ou None si non trouvée
+        Tuple (recipe, ingredients, steps) ou None si non trouvée.
+        recipe['content_generation'] vaut None sans la migration
+        add_recipe_content_generation.sql (clé du cache de fragments)
     """
     with get_db() as con:
+        if _has_content_generation(con):
+            generation_column = "r.content_generation"
+        else:
+            generation_column = "NULL AS content_generation"
+
         # Récupérer la recette
-        recipe_sql = """
+        recipe_sql = f"""
             SELECT
                 r.id,
                 r.slug,
@@ -160,7 +313,8 @@ def get_recipe_by_slug(slug: str, lang: str):
                 rt.tips,
                 r.user_id,
                 u.username AS creator_username,
-                u.display_name AS creator_display_name
+                u.display_name AS creator_display_name,
+                {generation_column}
             FROM recipe r
             LEFT JOIN recipe_translation rt ON rt.recipe_id = r.id AND rt.lang = ?
             LEFT JOIN user u ON u.id = r.user_id
@@ -480,6 +634,8 @@ def update_recipe_complete(recipe_id: int, lang: str, data: dict):
                         (new_step_id, lang, step.get('text', ''))
                     )
 
+    invalidate_recipe(recipe_id)
+
 
 def update_step_image(step_id: int, image_url: Optional[str]):
     """
@@ -494,6 +650,8 @@ def update_step_image(step_id: int, image_url: Optional[str]):
             "UPDATE step SET image_url = ? WHERE id = ?",
             (image_url, step_id)
         )
+        row = con.execute("SELECT recipe_id FROM step WHERE id = ?", (step_id,)).fetchone()
+    invalidate_recipe(row['recipe_id'] if row else None)
 
 
 def get_step_image_url(step_id: int) -> Optional[str]:
@@ -557,7 +715,8 @@ def delete_recipe(slug: str):
         # Supprimer la recette
         con.execute("DELETE FROM recipe WHERE id = ?", (recipe_id,))
 
-        return True
+    invalidate_recipe(recipe_id)
+    return True
 
 
 def delete_recipe_language(recipe_id: int, lang: str):
@@ -592,7 +751,8 @@ def delete_recipe_language(recipe_id: int, lang: str):
             (recipe_id, lang)
         )
 
-        return result.rowcount > 0
+    invalidate_recipe(recipe_id)
+    return result.rowcount > 0
 
 
 def update_recipe_image(recipe_id: int, image_url: str, thumbnail_url: str):
@@ -611,6 +771,7 @@ def update_recipe_image(recipe_id: int, image_url: str, thumbnail_url: str):
             WHERE id = ?
         """
         con.execute(sql, (image_url, thumbnail_url, recipe_id))
+    invalidate_recipe(recipe_id)
 
 
 def get_recipe_image_urls(recipe_id: int) -> tuple:
@@ -631,6 +792,48 @@ def get_recipe_image_urls(recipe_id: int) -> tuple:
         return None, None
 
 
+def update_recipe_thumbnail(recipe_id: int, image_url: str, thumbnail_url: str) -> bool:
+    """
+    Enregistre l'URL du thumbnail généré pour l'image d'une recette
+
+    La mise à jour n'a lieu que si l'image n'a pas changé entre-temps
+    (la génération des variantes est asynchrone).
+
+    Args:
+        recipe_id: ID de la recette
+        image_url: URL de l'image à partir de laquelle le thumbnail a été généré
+        thumbnail_url: URL du thumbnail généré
+
+    Returns:
+        True si la recette a été mise à jour
+    """
+    with get_db() as con:
+        cursor = con.execute(
+            "UPDATE recipe SET thumbnail_url = ? WHERE id = ? AND image_url = ?",
+            (thumbnail_url, recipe_id, image_url)
+        )
+
+    invalidate_recipe(recipe_id)
+    return cursor.rowcount > 0
+
+
+def list_recipe_images() -> list:
+    """
+    Liste les recettes possédant une image (pour la régénération des variantes)
+
+    Returns:
+        Liste de dictionnaires (id, image_url, thumbnail_url)
+    """
+    with get_db() as con:
+        rows = con.execute("""
+            SELECT id, image_url, thumbnail_url
+            FROM recipe
+            WHERE image_url IS NOT NULL AND image_url != ''
+            ORDER BY id
+        """).fetchall()
+        return [dict(row) for row in rows]
+
+
 def update_servings_default(recipe_id: int, servings: int):
     """
     Met à jour le nombre de personnes par défaut
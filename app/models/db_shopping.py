@@ -1,7 +1,40 @@
 """
 Module de gestion des listes de courses
 """
+from typing import Callable
+
 from .db_core import get_db
+from app.services.single_flight import single_flight
+
+
+def _has_item_sources(con) -> bool:
+    """Vérifie si la migration add_shopping_list_item_source.sql a été appliquée"""
+    row = con.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'shopping_list_item_source'"
+    ).fetchone()
+    return row is not None
+
+
+def _load_item_sources(con, event_id: int) -> dict:
+    """
+    Recettes sources de toutes les lignes d'un événement, en une requête
+
+    Returns:
+        {item_id: [{'recipe_id', 'recipe_name', 'quantity', 'unit'}, ...]}
+    """
+    rows = con.execute("""
+        SELECT s.item_id, s.recipe_id, s.recipe_name, s.quantity, s.unit
+        FROM shopping_list_item_source s
+        JOIN shopping_list_item sli ON sli.id = s.item_id
+        WHERE sli.event_id = ?
+        ORDER BY s.item_id, s.position
+    """, (event_id,)).fetchall()
+
+    sources = {}
+    for row in rows:
+        source = dict(row)
+        sources.setdefault(source.pop('item_id'), []).append(source)
+    return sources
 
 
 def get_shopping_list_items(event_id: int, lang: str = "fr"):
@@ -44,21 +77,27 @@ def get_shopping_list_items(event_id: int, lang: str = "fr"):
                 sli.planned_unit_price,
                 sli.actual_total_price
             FROM shopping_list_item sli
+            -- COLLATE NOCASE (et non LOWER()) : jointure par idx_ingredient_catalog_name_fr
             LEFT JOIN ingredient_price_catalog ipc
-                ON LOWER(sli.ingredient_name) = LOWER(ipc.ingredient_name_fr)
+                ON ipc.ingredient_name_fr = sli.ingredient_name COLLATE NOCASE
             WHERE sli.event_id = ?
             ORDER BY sli.position, sli.ingredient_name
         """, (lang, event_id))
 
+        rows = cursor.fetchall()
+        sources = _load_item_sources(conn, event_id) if _has_item_sources(conn) else None
+
         items = []
-        for row in cursor.fetchall():
+        for row in rows:
             item = dict(row)
             # Utiliser le nom traduit pour l'affichage
             item['ingredient_name'] = item['ingredient_name_display']
             del item['ingredient_name_display']
 
-            # Déserialiser le JSON des recettes sources
-            if item['source_recipes']:
+            if sources is not None:
+                item['source_recipes'] = sources.get(item['id'], [])
+            elif item['source_recipes']:
+                # Avant migration : désérialiser le JSON des recettes sources
                 import json
                 item['source_recipes'] = json.loads(item['source_recipes'])
             items.append(item)
@@ -75,23 +114,22 @@ def save_shopping_list_items(event_id: int, items: list):
 
     with get_db() as conn:
         cursor = conn.cursor()
+        normalized_sources = _has_item_sources(conn)
 
         # Supprimer les items existants pour cet événement
+        # (leurs sources sont supprimées par le trigger shopping_list_item_source_cascade)
         cursor.execute("DELETE FROM shopping_list_item WHERE event_id = ?", (event_id,))
 
-        # Insérer les nouveaux items
-        for position, item in enumerate(items):
-            # Sérialiser les recettes sources en JSON
-            source_recipes_json = json.dumps(item.get('source_recipes', []))
-
-            cursor.execute("""
-                INSERT INTO shopping_list_item (
-                    event_id, ingredient_name,
-                    needed_quantity, needed_unit,
-                    purchase_quantity, purchase_unit,
-                    is_checked, notes, source_recipes, position
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+        # Insérer les nouveaux items (une seule requête préparée pour le lot)
+        cursor.executemany("""
+            INSERT INTO shopping_list_item (
+                event_id, ingredient_name,
+                needed_quantity, needed_unit,
+                purchase_quantity, purchase_unit,
+                is_checked, notes, source_recipes, position
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
                 event_id,
                 item['ingredient_name'],
                 item.get('total_quantity'),  # needed_quantity
@@ -100,9 +138,34 @@ def save_shopping_list_items(event_id: int, items: list):
                 item.get('purchase_unit'),    # purchase_unit (initialement = needed)
                 False,                        # is_checked
                 item.get('notes', ''),
-                source_recipes_json,
+                # Recettes sources : table fille, ou JSON avant migration
+                None if normalized_sources else json.dumps(item.get('source_recipes', [])),
                 position
-            ))
+            )
+            for position, item in enumerate(items)
+        ])
+
+        if normalized_sources:
+            # Retrouver l'ID de chaque ligne par sa position, puis charger toutes les sources en lot
+            item_ids = dict(cursor.execute(
+                "SELECT position, id FROM shopping_list_item WHERE event_id = ?", (event_id,)
+            ).fetchall())
+            cursor.executemany("""
+                INSERT INTO shopping_list_item_source
+                    (item_id, recipe_id, recipe_name, quantity, unit, position)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [
+                (
+                    item_ids[position],
+                    source.get('recipe_id'),
+                    source.get('recipe_name'),
+                    source.get('quantity'),
+                    source.get('unit'),
+                    source_position
+                )
+                for position, item in enumerate(items)
+                for source_position, source in enumerate(item.get('source_recipes', []))
+            ])
 
         conn.commit()
 
@@ -234,16 +297,227 @@ def delete_all_shopping_list_items(event_id: int):
         return cursor.rowcount
 
 
-def regenerate_shopping_list(event_id: int, lang: str = "fr"):
+def get_shopping_list_items_for_recipe(event_id: int, recipe_id: int) -> list:
+    """
+    Lignes de la liste de courses d'un événement issues d'une recette
+
+    Returns:
+        Liste de dictionnaires (id, ingredient_name, quantity, unit) :
+        quantity / unit sont la part de la recette dans la ligne
+    """
+    with get_db() as conn:
+        if not _has_item_sources(conn):
+            return []
+        rows = conn.execute("""
+            SELECT sli.id, sli.ingredient_name, s.quantity, s.unit
+            FROM shopping_list_item_source s
+            JOIN shopping_list_item sli ON sli.id = s.item_id
+            WHERE s.recipe_id = ? AND sli.event_id = ?
+            ORDER BY sli.position
+        """, (recipe_id, event_id)).fetchall()
+        return [dict(row) for row in rows]
+
+
+def _recompute_item_quantities(conn, item_ids: list, lang: str):
+    """
+    Recalcule needed_quantity / purchase_quantity des lignes depuis leurs sources
+    (dans la transaction de l'appelant, après modification des sources)
+
+    Comme à la génération de la liste, la quantité à acheter repart de la
+    quantité nécessaire.
+    """
+    from app.services.ingredient_aggregator import get_ingredient_aggregator
+
+    if not item_ids:
+        return
+    aggregator = get_ingredient_aggregator()
+    placeholders = ','.join('?' * len(item_ids))
+    names = dict(conn.execute(
+        f"SELECT id, ingredient_name FROM shopping_list_item WHERE id IN ({placeholders})", item_ids
+    ).fetchall())
+    sources = {}
+    for item_id, quantity, unit in conn.execute(f"""
+        SELECT item_id, quantity, unit FROM shopping_list_item_source
+        WHERE item_id IN ({placeholders})
+        ORDER BY item_id, position
+    """, item_ids).fetchall():
+        sources.setdefault(item_id, []).append({'quantity': quantity, 'unit': unit})
+
+    updates = []
+    for item_id, name in names.items():
+        quantity, unit = aggregator.total_from_sources(name, sources.get(item_id, []), lang)
+        updates.append((quantity, unit, quantity, unit, item_id))
+    conn.executemany("""
+        UPDATE shopping_list_item
+        SET needed_quantity = ?, needed_unit = ?,
+            purchase_quantity = ?, purchase_unit = ?,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """, updates)
+
+
+def scale_shopping_list_sources(event_id: int, recipe_id: int, ratio: float, lang: str = "fr"):
+    """
+    Multiplie les quantités d'une recette dans les sources de la liste de courses
+    (ex: changement de servings_multiplier) et recalcule le total des lignes
+    concernées, dans la même transaction
+
+    Returns:
+        Nombre de sources mises à jour, ou None si les sources ne sont pas
+        normalisées (migration non appliquée : la liste doit être régénérée)
+    """
+    with get_db() as conn:
+        if not _has_item_sources(conn):
+            return None
+        item_ids = [row[0] for row in conn.execute("""
+            SELECT DISTINCT s.item_id
+            FROM shopping_list_item_source s
+            JOIN shopping_list_item sli ON sli.id = s.item_id
+            WHERE s.recipe_id = ? AND sli.event_id = ? AND s.quantity IS NOT NULL
+        """, (recipe_id, event_id)).fetchall()]
+        if not item_ids:
+            return 0
+
+        placeholders = ','.join('?' * len(item_ids))
+        cursor = conn.execute(f"""
+            UPDATE shopping_list_item_source
+            SET quantity = quantity * ?
+            WHERE recipe_id = ? AND quantity IS NOT NULL AND item_id IN ({placeholders})
+        """, [ratio, recipe_id] + item_ids)
+        updated = cursor.rowcount
+        _recompute_item_quantities(conn, item_ids, lang)
+        conn.commit()
+        return updated
+
+
+def remove_recipe_from_shopping_list(event_id: int, recipe_id: int, lang: str = "fr"):
+    """
+    Retire une recette des sources de la liste de courses d'un événement
+    Les lignes qui ne provenaient que de cette recette sont supprimées, le
+    total des autres est recalculé (même transaction)
+
+    Returns:
+        Nombre de lignes supprimées, ou None si les sources ne sont pas
+        normalisées (migration non appliquée : la liste doit être régénérée)
+    """
+    with get_db() as conn:
+        if not _has_item_sources(conn):
+            return None
+        item_ids = [row[0] for row in conn.execute("""
+            SELECT DISTINCT s.item_id
+            FROM shopping_list_item_source s
+            JOIN shopping_list_item sli ON sli.id = s.item_id
+            WHERE s.recipe_id = ? AND sli.event_id = ?
+        """, (recipe_id, event_id)).fetchall()]
+        if not item_ids:
+            return 0
+
+        placeholders = ','.join('?' * len(item_ids))
+        conn.execute(
+            f"DELETE FROM shopping_list_item_source WHERE recipe_id = ? AND item_id IN ({placeholders})",
+            [recipe_id] + item_ids
+        )
+        cursor = conn.execute(f"""
+            DELETE FROM shopping_list_item
+            WHERE id IN ({placeholders})
+              AND NOT EXISTS (SELECT 1 FROM shopping_list_item_source s WHERE s.item_id = shopping_list_item.id)
+        """, item_ids)
+        deleted = cursor.rowcount
+        remaining = [row[0] for row in conn.execute(
+            f"SELECT id FROM shopping_list_item WHERE id IN ({placeholders})", item_ids
+        ).fetchall()]
+        _recompute_item_quantities(conn, remaining, lang)
+        conn.commit()
+        return deleted
+
+
+def regenerate_shopping_list(event_id: int, lang: str = "fr", recipes_data: list = None):
     """
     Régénère la liste de courses pour un événement
     (utile si l'utilisateur veut recalculer depuis les recettes)
+
+    Les régénérations simultanées d'un même événement qui chargent elles-mêmes
+    les recettes sont regroupées (single-flight, clé par événement : les lignes
+    de shopping_list_item ne dépendent pas de la langue) : un seul DELETE +
+    réinsertion est exécuté et les appels concurrents reçoivent son résultat.
+    Un appel qui fournit recipes_data (relues après une écriture) attend la
+    fin de la régénération en cours puis exécute la sienne : ses données ne
+    sont jamais remplacées par celles d'un calcul plus ancien.
+
+    Pour l'affichage d'une liste, utiliser ensure_shopping_list() : la
+    régénération n'y a lieu que si la liste enregistrée est obsolète.
+
+    Args:
+        event_id: ID de l'événement
+        lang: Code de langue
+        recipes_data: Recettes déjà chargées par l'appelant (optionnel)
+    """
+    key = ("shopping_list", event_id)
+    if recipes_data is not None:
+        return single_flight.do_exclusive(key, _regenerate_shopping_list, event_id, lang, recipes_data)
+    return single_flight.do(key, _regenerate_shopping_list, event_id, lang)
+
+
+def ensure_shopping_list(event_id: int, lang: str, is_stale: Callable[[list], bool],
+                         recipes_data: list = None) -> list:
+    """
+    Retourne la liste de courses d'un événement, régénérée seulement si elle est obsolète
+
+    La lecture, le test is_stale() et la régénération s'exécutent dans un même
+    calcul single-flight (même clé que regenerate_shopping_list) : les
+    ouvertures simultanées de la liste partagent une seule vérification et au
+    plus un DELETE + réinsertion. Un appel arrivé après une régénération
+    relit la liste et la trouve à jour.
+
+    Un calcul lancé dans une autre langue n'est pas partagé : l'appel attend
+    sa fin puis refait la vérification dans sa propre langue.
+
+    Args:
+        event_id: ID de l'événement
+        lang: Code de langue
+        is_stale: is_stale(items) → True si la liste enregistrée doit être régénérée
+        recipes_data: Recettes déjà chargées par l'appelant (optionnel)
+
+    Returns:
+        Items de la liste (cf. get_shopping_list_items), partagés entre les
+        appels simultanés : ne pas les modifier
     """
+    key = ("shopping_list", event_id)
+    while True:
+        built_lang, items = single_flight.do(
+            key, _ensure_shopping_list, event_id, lang, is_stale, recipes_data
+        )
+        if built_lang == lang:
+            return items
+
+
+def _ensure_shopping_list(event_id: int, lang: str, is_stale: Callable[[list], bool],
+                          recipes_data: list = None):
+    """Relit la liste et la régénère si is_stale(items) : (langue, items)"""
+    from .db_events import get_event_recipes_with_ingredients
+
+    items = get_shopping_list_items(event_id, lang)
+    if not is_stale(items):
+        return lang, items
+
+    if recipes_data is None:
+        recipes_data = get_event_recipes_with_ingredients(event_id, lang)
+    if not items and not recipes_data:
+        # Ni liste ni recettes : rien à écrire
+        return lang, items
+
+    _regenerate_shopping_list(event_id, lang, recipes_data)
+    return lang, get_shopping_list_items(event_id, lang)
+
+
+def _regenerate_shopping_list(event_id: int, lang: str, recipes_data: list = None):
+    """Agrège les ingrédients des recettes et écrase la liste de courses"""
     from app.services.ingredient_aggregator import get_ingredient_aggregator
     from .db_events import get_event_recipes_with_ingredients
 
     # Récupérer les recettes avec leurs ingrédients
-    recipes_data = get_event_recipes_with_ingredients(event_id, lang)
+    if recipes_data is None:
+        recipes_data = get_event_recipes_with_ingredients(event_id, lang)
 
     # Agréger les ingrédients
     aggregator = get_ingredient_aggregator()
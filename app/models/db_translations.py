@@ -2,6 +2,19 @@
 Module de gestion des traductions de recettes
 """
 from .db_core import get_db
+from app.services.fragment_cache import invalidate_recipe
+
+
+def _ingredient_recipe_id(con, ingredient_id: int):
+    """Recette d'un ingrédient (pour invalider le cache de fragments)"""
+    row = con.execute("SELECT recipe_id FROM recipe_ingredient WHERE id = ?", (ingredient_id,)).fetchone()
+    return row['recipe_id'] if row else None
+
+
+def _step_recipe_id(con, step_id: int):
+    """Recette d'une étape (pour invalider le cache de fragments)"""
+    row = con.execute("SELECT recipe_id FROM step WHERE id = ?", (step_id,)).fetchone()
+    return row['recipe_id'] if row else None
 
 
 def insert_recipe_translation(recipe_id: int, lang: str, name: str, recipe_type: str):
@@ -20,6 +33,7 @@ def insert_recipe_translation(recipe_id: int, lang: str, name: str, recipe_type:
             VALUES (?, ?, ?, ?)
         """
         con.execute(sql, (recipe_id, lang, name, recipe_type))
+    invalidate_recipe(recipe_id)
 
 
 def insert_ingredient_translation(ingredient_id: int, lang: str, name: str, unit: str, notes: str = ''):
@@ -39,6 +53,8 @@ def insert_ingredient_translation(ingredient_id: int, lang: str, name: str, unit
             VALUES (?, ?, ?, ?, ?)
         """
         con.execute(sql, (ingredient_id, lang, name, unit, notes))
+        recipe_id = _ingredient_recipe_id(con, ingredient_id)
+    invalidate_recipe(recipe_id)
 
 
 def insert_step_translation(step_id: int, lang: str, text: str):
@@ -56,6 +72,8 @@ def insert_step_translation(step_id: int, lang: str, text: str):
             VALUES (?, ?, ?)
         """
         con.execute(sql, (step_id, lang, text))
+        recipe_id = _step_recipe_id(con, step_id)
+    invalidate_recipe(recipe_id)
 
 
 def update_ingredient_translation(ingredient_id: int, lang: str, name: str, unit: str, notes: str = None):
@@ -76,6 +94,8 @@ def update_ingredient_translation(ingredient_id: int, lang: str, name: str, unit
             WHERE recipe_ingredient_id = ? AND lang = ?
         """
         con.execute(sql, (name, unit, notes, ingredient_id, lang))
+        recipe_id = _ingredient_recipe_id(con, ingredient_id)
+    invalidate_recipe(recipe_id)
 
 
 def update_ingredient_quantity(ingredient_id: int, quantity: float):
@@ -93,6 +113,8 @@ def update_ingredient_quantity(ingredient_id: int, quantity: float):
             WHERE id = ?
         """
         con.execute(sql, (quantity, ingredient_id))
+        recipe_id = _ingredient_recipe_id(con, ingredient_id)
+    invalidate_recipe(recipe_id)
 
 
 def update_step_translation(step_id: int, lang: str, text: str):
@@ -111,6 +133,8 @@ def update_step_translation(step_id: int, lang: str, text: str):
             WHERE step_id = ? AND lang = ?
         """
         con.execute(sql, (text, step_id, lang))
+        recipe_id = _step_recipe_id(con, step_id)
+    invalidate_recipe(recipe_id)
 
 
 def update_recipe_type(recipe_id: int, lang: str, recipe_type: str):
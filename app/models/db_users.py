@@ -222,6 +222,29 @@ def list_users():
         return [dict(row) for row in cursor.fetchall()]
 
 
+def search_users(query: str = "", limit: int = 20, offset: int = 0):
+    """
+    Recherche d'utilisateurs par nom (sélecteurs typeahead)
+
+    Args:
+        query: Texte recherché dans username / display_name (vide = tous)
+        limit: Nombre maximum de résultats
+        offset: Décalage pour la pagination
+
+    Returns:
+        Liste des utilisateurs (id, username, display_name)
+    """
+    with get_db() as conn:
+        sql = "SELECT id, username, display_name FROM user"
+        params = []
+        if query:
+            sql += " WHERE username LIKE ? OR display_name LIKE ?"
+            params.extend([f"%{query}%", f"%{query}%"])
+        sql += " ORDER BY username LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+        return [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+
 def update_user_password(user_id: int, new_password: str):
     """
     Change le mot de passe d'un utilisateur
@@ -0,0 +1,75 @@
+# app/routes/backup_routes.py
+"""
+Sauvegardes à chaud de la base depuis l'administration (administrateurs)
+"""
+import os
+
+from fastapi import APIRouter, Form, Query, Request
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, RedirectResponse
+
+from config import Config
+from app.models import db_core
+from app.services.db_backup import backup_status, is_backup_name, list_backups, start_background_backup
+from app.template_config import templates
+
+router = APIRouter()
+
+
+def _is_admin(request: Request) -> bool:
+    return bool(request.session.get("user_id") and request.session.get("is_admin"))
+
+
+@router.get("/admin/backups", response_class=HTMLResponse)
+async def admin_backups(request: Request, lang: str = Query("fr")):
+    """Liste des sauvegardes et lancement d'une sauvegarde"""
+    if not _is_admin(request):
+        return RedirectResponse(url=f"/recipes?lang={lang}", status_code=303)
+
+    return templates.TemplateResponse(
+        "admin_backups.html",
+        {
+            "request": request,
+            "lang": lang,
+            "backups": list_backups(),
+            "status": backup_status(),
+            "backup_dir": Config.BACKUP_DIR,
+            "keep": Config.BACKUP_KEEP,
+        }
+    )
+
+
+@router.post("/admin/backups")
+async def admin_start_backup(request: Request, compress: bool = Form(False)):
+    """
+    Lance une sauvegarde en arrière-plan (progression : /admin/backups/status)
+    """
+    if not _is_admin(request):
+        return JSONResponse({"error": "forbidden"}, status_code=403)
+
+    if not start_background_backup(db_core.DB_PATH, compress=compress):
+        return JSONResponse({"started": False, "status": backup_status()}, status_code=409)
+    return JSONResponse({"started": True, "status": backup_status()}, status_code=202)
+
+
+@router.get("/admin/backups/status")
+async def admin_backup_status(request: Request):
+    """Progression de la sauvegarde en cours ou résultat de la dernière"""
+    if not _is_admin(request):
+        return JSONResponse({"error": "forbidden"}, status_code=403)
+    return JSONResponse(backup_status())
+
+
+@router.get("/admin/backups/{name}")
+async def admin_download_backup(request: Request, name: str, lang: str = Query("fr")):
+    """Téléchargement d'une sauvegarde"""
+    if not _is_admin(request):
+        return RedirectResponse(url=f"/recipes?lang={lang}", status_code=303)
+
+    backup = next((b for b in list_backups() if b["name"] == name), None) if is_backup_name(name) else None
+    if not backup:
+        return RedirectResponse(url=f"/admin/backups?lang={lang}", status_code=303)
+    return FileResponse(
+        os.path.join(Config.BACKUP_DIR, name),
+        filename=name,
+        media_type="application/gzip" if backup["compressed"] else "application/vnd.sqlite3",
+    )
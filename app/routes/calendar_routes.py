@@ -18,6 +18,7 @@ from app.models import (
     get_db,
 )
 from app.template_config import templates
+from app.http_cache import conditional_get, CALENDAR_TABLES
 
 router = APIRouter()
 
@@ -55,6 +56,7 @@ async def calendar_page(request: Request, lang: str = "fr"):
 # ---------------------------------------------------------------------------
 
 @router.get("/api/calendar/month")
+@conditional_get(*CALENDAR_TABLES)
 async def api_calendar_month(
     request: Request,
     year: int = Query(None),
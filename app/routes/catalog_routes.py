@@ -3,8 +3,8 @@ Routes pour la gestion du catalogue des prix des ingrédients
 """
 from fastapi import APIRouter, Request, Form, UploadFile
 from fastapi.responses import RedirectResponse, FileResponse
-from fastapi.templating import Jinja2Templates
 from app.models import db
+from app.template_config import templates
 from app.services.translation_service import auto_translate_new_catalog_entries, get_translation_service
 from typing import Optional
 import re
@@ -17,7 +17,6 @@ def _has_japanese_chars(text: str) -> bool:
     return bool(re.search(r'[぀-ヿ一-鿿＀-￯]', text))
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/ingredient-catalog")
@@ -358,28 +357,40 @@ async def delete_unit_conversion(
 # VISUALISATION DES LOGS D'ACCÈS
 # ============================================================================
 
+ACCESS_LOGS_PAGE_SIZE = 50
+
+
 @router.get("/access-logs")
 async def access_logs(
     request: Request,
     lang: str = "fr",
-    time_range: int = 24
+    time_range: int = 24,
+    cursor: Optional[str] = None
 ):
     """
     Page de visualisation des logs d'accès
+    (statistiques lues dans les agrégats horaires ; le détail des logs
+    bruts récents est paginé par curseur accessed_at + id)
     """
     # Récupérer les statistiques pour la période demandée
     stats = db.get_access_stats(hours=time_range)
 
-    # Récupérer les 50 derniers logs de la période
-    recent_logs = db.get_recent_access_logs(limit=50, hours=time_range)
+    # Récupérer une page des derniers logs de la période
+    recent_logs = db.get_recent_access_logs(
+        limit=ACCESS_LOGS_PAGE_SIZE + 1, hours=time_range, after=db.decode_cursor(cursor, 2)
+    )
+    recent_logs, next_cursor = db.keyset_page(recent_logs, ACCESS_LOGS_PAGE_SIZE, 'accessed_at', 'id')
 
     # Récupérer les statistiques de performance côté client
     # DÉSACTIVÉ: Nécessite table client_performance_log (migration non appliquée en prod)
     client_stats = {}  # db.get_client_performance_stats(hours=time_range)
 
-    # Calculer le temps de réponse moyen
+    # Temps de réponse moyen : issu des agrégats horaires, sinon recalculé
+    # à partir des pages les plus lentes (logs bruts)
     avg_response_time = None
-    if stats['slow_pages']:
+    if stats['latency']:
+        avg_response_time = stats['latency']['avg']
+    elif stats['slow_pages']:
         total_time = sum(page['avg_time'] * page['count'] for page in stats['slow_pages'])
         total_count = sum(page['count'] for page in stats['slow_pages'])
         if total_count > 0:
@@ -392,6 +403,8 @@ async def access_logs(
         "stats": stats,
         "client_stats": client_stats,
         "recent_logs": recent_logs,
+        "next_cursor": next_cursor,
+        "is_first_page": not cursor,
         "avg_response_time": avg_response_time
     })
 
@@ -400,13 +413,18 @@ async def access_logs(
 # GESTION DES TICKETS DE CAISSE (RECEIPT UPLOAD)
 # ============================================================================
 
+RECEIPTS_PAGE_SIZE = 100
+
+
 @router.get("/receipt-list")
 async def receipt_list(
     request: Request,
-    lang: str = "fr"
+    lang: str = "fr",
+    cursor: Optional[str] = None
 ):
     """
     Page de liste des tickets de caisse (filtrée par utilisateur, sauf admin)
+    Paginée par curseur upload_date + id
     """
     user_id = request.session.get('user_id')
     is_admin = request.session.get('is_admin', False)
@@ -414,12 +432,16 @@ async def receipt_list(
     if not user_id:
         return RedirectResponse(url=f"/login?lang={lang}", status_code=303)
 
-    receipts = db.list_all_receipts(lang=lang, limit=100, user_id=user_id, is_admin=is_admin)
+    receipts = db.list_all_receipts(lang=lang, limit=RECEIPTS_PAGE_SIZE + 1, user_id=user_id,
+                                    is_admin=is_admin, after=db.decode_cursor(cursor, 2))
+    receipts, next_cursor = db.keyset_page(receipts, RECEIPTS_PAGE_SIZE, 'upload_date', 'id')
 
     return templates.TemplateResponse("receipt_list.html", {
         "request": request,
         "lang": lang,
         "receipts": receipts,
+        "next_cursor": next_cursor,
+        "is_first_page": not cursor,
         "is_admin": is_admin
     })
 
@@ -448,11 +470,10 @@ async def receipt_upload_process(
     """
     Traite l'upload d'un ticket de caisse PDF
     """
-    import tempfile
     import os
-    import shutil
     import uuid
     from app.services.receipt_extractor import get_receipt_extractor
+    from app.services.upload_service import stream_upload_to_file
     from app.services.ingredient_matcher import get_ingredient_matcher
     from config import Config
 
@@ -478,12 +499,11 @@ async def receipt_upload_process(
     else:
         suffix = '.pdf'
 
-    # Sauvegarder temporairement le fichier
+    # Écrire le fichier par blocs directement dans data/receipts/
+    # (renommé une fois l'ID du ticket connu, sans recopie)
+    temp_path = str(Config.RECEIPTS_DIR / f"upload_{uuid.uuid4().hex}{suffix}")
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
-            content = await pdf_file.read()
-            temp_file.write(content)
-            temp_path = temp_file.name
+        await stream_upload_to_file(pdf_file, temp_path, Config.MAX_RECEIPT_SIZE)
 
         # Extraire le contenu du fichier
         extractor = get_receipt_extractor()
@@ -511,8 +531,7 @@ async def receipt_upload_process(
         # Conserver le fichier dans data/receipts/ avec un nom unique
         unique_name = f"receipt_{receipt_id}_{uuid.uuid4().hex[:8]}{suffix}"
         dest_path = Config.RECEIPTS_DIR / unique_name
-        shutil.copy2(temp_path, dest_path)
-        os.unlink(temp_path)
+        os.replace(temp_path, dest_path)
 
         # Mettre à jour le file_path en BDD
         from app.models.db_core import get_db as get_db_conn
@@ -542,7 +561,7 @@ async def receipt_upload_process(
         logger.error(f"Erreur lors du traitement du ticket: {e}", exc_info=True)
 
         # Nettoyer le fichier temporaire en cas d'erreur
-        if 'temp_path' in locals() and os.path.exists(temp_path):
+        if os.path.exists(temp_path):
             os.unlink(temp_path)
 
         return templates.TemplateResponse("receipt_upload.html", {
@@ -1,13 +1,15 @@
 # app/routes/event_routes.py
 from fastapi import APIRouter, Request, Form, HTTPException, UploadFile, File
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
 from datetime import datetime
 
 from app.models import db
 from app.models.db_core import get_db
-from app.services.ingredient_aggregator import get_ingredient_aggregator
 from app.services.cost_calculator import compute_estimated_cost_for_ingredient
+from app.services.image_service import event_photo_thumbnail_url
+from app.services.single_flight import single_flight
 from app.template_config import templates
 
 router = APIRouter()
@@ -25,23 +27,44 @@ def _check_event_access(event: dict, request: Request):
 # Routes pour la gestion des événements
 # ============================================================================
 
-@router.get("/events", response_class=HTMLResponse)
-async def events_list(request: Request, lang: str = "fr"):
+# Nombre d'événements par page (pagination keyset sur date + id)
+EVENTS_PAGE_SIZE = 50
+
+
+def _list_events_page(request: Request, lang: str, cursor: Optional[str], limit: int = EVENTS_PAGE_SIZE,
+                      search: Optional[str] = None, sort_by: str = "event_date", sort_order: str = "desc"):
     """
-    Affiche la liste des événements
+    Charge une page d'événements visibles par l'utilisateur, enrichis pour l'affichage
     - L'utilisateur 'admin' voit tous les événements
     - Les autres utilisateurs voient uniquement leurs événements
+
+    Recherche et tri sont appliqués en SQL : le curseur n'est valable que pour
+    les mêmes paramètres.
+
+    Returns:
+        (événements de la page, curseur de la page suivante ou None)
     """
     user_id = request.session.get('user_id')
     is_admin = bool(request.session.get('is_admin', False))
 
+    options = {
+        "limit": limit + 1,
+        "after": db.decode_cursor(cursor, 2),
+        "search": (search or "").strip() or None,
+        "sort": sort_by,
+        "descending": sort_order != "asc",
+    }
     if is_admin:
-        events = db.list_events(lang=lang)
+        events = db.list_events(lang=lang, **options)
     else:
-        events = db.list_events(user_id=user_id, lang=lang)
+        events = db.list_events(user_id=user_id, lang=lang, **options)
+    events, next_cursor = db.keyset_page(events, limit, 'sort_key', 'id')
 
     # Enrichir chaque événement
     for ev in events:
+        # Miniature de la première photo (l'original reste affiché en grand)
+        ev["first_photo_thumb"] = event_photo_thumbnail_url(ev.get("first_photo"))
+
         # groups_data (pour Plats servis)
         raw = ev.pop("groups_raw", None)
         ev["groups_data"] = []
@@ -54,13 +77,22 @@ async def events_list(request: Request, lang: str = "fr"):
         # recipes_data (slug + nom pour liens cliquables)
         recipes_raw = ev.pop("recipes_raw", None)
         ev["recipes_data"] = []
-        ev["recipes"] = ""  # pour la recherche texte
         if recipes_raw:
             for part in recipes_raw.split("||"):
                 if "::" in part:
                     slug, name = part.split("::", 1)
                     ev["recipes_data"].append({"slug": slug, "name": name})
-            ev["recipes"] = " · ".join(r["name"] for r in ev["recipes_data"])
+
+    return events, next_cursor
+
+
+@router.get("/events", response_class=HTMLResponse)
+async def events_list(request: Request, lang: str = "fr"):
+    """
+    Affiche la première page de la liste des événements
+    (les pages suivantes sont chargées via /api/events/page)
+    """
+    events, next_cursor = _list_events_page(request, lang, None)
 
     event_types = db.list_event_types()
 
@@ -70,11 +102,29 @@ async def events_list(request: Request, lang: str = "fr"):
             "request": request,
             "lang": lang,
             "events": events,
+            "next_cursor": next_cursor,
             "event_types": event_types
         }
     )
 
 
+@router.get("/api/events/page")
+async def api_events_page(request: Request, lang: str = "fr", cursor: Optional[str] = None,
+                          search: Optional[str] = None, sort_by: str = "event_date", sort_order: str = "desc"):
+    """
+    Page de la liste des événements (pagination keyset)
+
+    Sans curseur : première page pour la recherche et le tri donnés
+    (changement côté client).
+
+    Returns:
+        {"items": [...], "next_cursor": "..." ou null}
+    """
+    events, next_cursor = _list_events_page(request, lang, cursor, search=search, sort_by=sort_by,
+                                            sort_order=sort_order)
+    return {"items": events, "next_cursor": next_cursor}
+
+
 @router.get("/events/new", response_class=HTMLResponse)
 async def event_new(
     request: Request,
@@ -101,11 +151,8 @@ async def event_new(
             "prefill_date_fin": date_fin or date_debut,
             "from_page": from_page,
             "recipes": [],
-            "all_recipes": [],
             "has_shopping_list": False,
             "event_participants": [],
-            "all_participants": [],
-            "all_groups": [],
         }
     )
 
@@ -183,24 +230,18 @@ async def event_detail(
     _check_event_access(event, request)
 
     recipes = db.get_event_recipes(event_id, lang)
-    all_recipes = db.list_recipes(lang)
     event_types = db.list_event_types()
     event_dates = db.get_event_dates(event_id)
 
     shopping_list_items = db.get_shopping_list_items(event_id, lang)
     has_shopping_list = len(shopping_list_items) > 0
 
-    user_id = request.session.get('user_id')
-    is_admin = bool(request.session.get('is_admin', False))
-
+    # Recettes, participants et groupes à ajouter : chargés à la demande
+    # via /api/typeahead/* quand l'utilisateur ouvre le sélecteur
     try:
         event_participants = db.get_event_participants(event_id)
-        all_participants = db.list_participants(user_id=user_id, is_admin=is_admin)
-        all_groups = db.list_groups(user_id=user_id, is_admin=is_admin)
     except Exception:
         event_participants = []
-        all_participants = []
-        all_groups = []
 
     event_photos = db.get_event_photos(event_id)
 
@@ -216,11 +257,8 @@ async def event_detail(
             "prefill_date_fin": "",
             "from_page": from_page,
             "recipes": recipes,
-            "all_recipes": all_recipes,
             "has_shopping_list": has_shopping_list,
             "event_participants": event_participants,
-            "all_participants": all_participants,
-            "all_groups": all_groups,
             "event_photos": event_photos,
         }
     )
@@ -315,9 +353,7 @@ async def event_update(
 
             if recipes_data:
                 # Régénérer la liste de courses avec les nouvelles quantités
-                aggregator = get_ingredient_aggregator()
-                aggregated_ingredients = aggregator.aggregate_ingredients(recipes_data, lang)
-                db.save_shopping_list_items(event_id, aggregated_ingredients)
+                db.regenerate_shopping_list(event_id, lang, recipes_data)
 
     redirect_url = f"/events/{event_id}?lang={lang}"
     if from_page:
@@ -325,6 +361,10 @@ async def event_update(
     return RedirectResponse(url=redirect_url, status_code=303)
 
 
+# Nombre maximal d'événements créés depuis un modèle (1 an hebdomadaire)
+EVENT_RECURRENCE_MAX = 52
+
+
 @router.get("/events/{event_id}/copy", response_class=HTMLResponse)
 async def event_copy_form(request: Request, event_id: int, lang: str = "fr"):
     """
@@ -350,7 +390,8 @@ async def event_copy_form(request: Request, event_id: int, lang: str = "fr"):
             "lang": lang,
             "source_event": source_event,
             "event_types": event_types,
-            "source_recipes": source_recipes
+            "source_recipes": source_recipes,
+            "recurrence_max": EVENT_RECURRENCE_MAX
         }
     )
 
@@ -366,13 +407,36 @@ async def event_copy_create(
     date_fin: str = Form(...),
     location: str = Form(""),
     attendees: int = Form(...),
-    notes: str = Form("")
+    notes: str = Form(""),
+    occurrences: int = Form(1),
+    interval_days: int = Form(7)
 ):
     """
     Crée une copie d'un événement existant avec de nouvelles valeurs
+    Si occurrences > 1, l'événement sert de modèle : une copie est créée tous les
+    interval_days jours à partir des dates saisies (en une seule transaction)
     """
     user_id = request.session.get('user_id')
 
+    if occurrences > 1:
+        if occurrences > EVENT_RECURRENCE_MAX or interval_days < 1:
+            raise HTTPException(status_code=400, detail="Répétition invalide")
+
+        db.create_recurring_events(
+            event_id=source_event_id,
+            new_name=name,
+            new_event_type_id=event_type_id,
+            first_date_debut=date_debut,
+            first_date_fin=date_fin,
+            occurrences=occurrences,
+            interval_days=interval_days,
+            new_location=location if location else None,
+            new_attendees=attendees if attendees else None,
+            new_notes=notes if notes else None,
+            user_id=user_id
+        )
+        return RedirectResponse(url=f"/events?lang={lang}", status_code=303)
+
     # Créer la copie de l'événement
     new_event_id = db.copy_event(
         event_id=source_event_id,
@@ -501,8 +565,11 @@ async def event_remove_recipe(
     _check_event_access(event, request)
     db.remove_recipe_from_event(event_id, recipe_id)
 
-    # Supprimer la shopping list existante car les recettes ont changé
-    db.delete_all_shopping_list_items(event_id)
+    # Retirer la recette de la liste de courses (les autres lignes gardent
+    # leur état coché et leurs prix) ; sans sources normalisées, la liste
+    # est supprimée et sera régénérée
+    if db.remove_recipe_from_shopping_list(event_id, recipe_id, lang) is None:
+        db.delete_all_shopping_list_items(event_id)
 
     return RedirectResponse(
         url=f"/events/{event_id}?lang={lang}",
@@ -525,10 +592,21 @@ async def event_update_recipe_servings(
     if not event:
         raise HTTPException(status_code=404, detail="Événement non trouvé")
     _check_event_access(event, request)
+    old_multiplier = next(
+        (r['servings_multiplier'] for r in db.get_event_recipes(event_id, lang) if r['id'] == recipe_id), None
+    )
     db.update_event_recipe_servings(event_id, recipe_id, servings_multiplier)
 
-    # Supprimer la shopping list existante car les quantités ont changé
-    db.delete_all_shopping_list_items(event_id)
+    # Mettre à l'échelle la part de la recette dans la liste de courses ;
+    # sans sources normalisées (ou ancien multiplicateur inconnu), la liste
+    # est supprimée et sera régénérée
+    scaled = None
+    if old_multiplier:
+        scaled = db.scale_shopping_list_sources(
+            event_id, recipe_id, servings_multiplier / old_multiplier, lang
+        )
+    if scaled is None:
+        db.delete_all_shopping_list_items(event_id)
 
     return RedirectResponse(
         url=f"/events/{event_id}?lang={lang}",
@@ -553,37 +631,31 @@ async def event_shopping_list(request: Request, event_id: int, lang: str = "fr",
     _check_event_access(event, request)
 
     # Récupérer les recettes pour affichage dans la langue demandée
-    recipes_data = db.get_event_recipes_with_ingredients(event_id, lang)
-
-    # Vérifier si une liste existe déjà
-    saved_items = db.get_shopping_list_items(event_id, lang)
-
-    # Détecter si on doit régénérer (pas de liste OU changement de langue)
-    needs_regeneration = not saved_items or regenerate
-
-    # Vérifier si la langue a changé en comparant les noms de recettes
-    if saved_items and not regenerate and recipes_data:
-        # Si le premier ingrédient a des source_recipes, vérifier la langue
-        for item in saved_items:
-            if item.get('source_recipes'):
-                stored_recipe_names = {s['recipe_name'] for s in item['source_recipes']}
-                current_recipe_names = {r['recipe_name'] for r in recipes_data}
-                # Si aucun nom ne correspond, c'est que la langue a changé
-                if not stored_recipe_names & current_recipe_names:
-                    needs_regeneration = True
-                break
-
-    # Si pas de liste ou régénération nécessaire, créer une nouvelle liste
-    if needs_regeneration:
-        # Agréger les ingrédients depuis les recettes
-        aggregator = get_ingredient_aggregator()
-        aggregated_ingredients = aggregator.aggregate_ingredients(recipes_data, lang)
-
-        # Sauvegarder dans la base de données
-        db.save_shopping_list_items(event_id, aggregated_ingredients)
-
-        # Recharger les items sauvegardés
-        saved_items = db.get_shopping_list_items(event_id, lang)
+    # (chargements simultanés du même événement regroupés, résultat en lecture seule)
+    recipes_data = await run_in_threadpool(
+        single_flight.do, ("event_recipes", event_id, lang),
+        db.get_event_recipes_with_ingredients, event_id, lang
+    )
+
+    def needs_regeneration(saved_items: list) -> bool:
+        """Pas de liste, régénération demandée ou liste enregistrée dans une autre langue"""
+        if not saved_items or regenerate:
+            return True
+        if recipes_data:
+            # Le premier ingrédient qui a des source_recipes indique la langue
+            for item in saved_items:
+                if item.get('source_recipes'):
+                    stored_recipe_names = {s['recipe_name'] for s in item['source_recipes']}
+                    current_recipe_names = {r['recipe_name'] for r in recipes_data}
+                    # Si aucun nom ne correspond, c'est que la langue a changé
+                    return not stored_recipe_names & current_recipe_names
+        return False
+
+    # Vérification et régénération éventuelle en un seul calcul partagé :
+    # plusieurs ouvertures simultanées ne réécrivent la liste qu'une fois
+    saved_items = await run_in_threadpool(
+        db.ensure_shopping_list, event_id, lang, needs_regeneration, recipes_data
+    )
 
     return templates.TemplateResponse(
         "shopping_list.html",
@@ -732,55 +804,33 @@ async def event_regenerate_shopping_list(request: Request, event_id: int, lang:
 # Routes API pour la gestion du budget
 # ============================================================================
 
-@router.get("/events/{event_id}/budget")
-async def event_budget_view(request: Request, event_id: int, lang: str = "fr"):
-    """
-    Affiche la page de gestion du budget pour un événement
-    """
-    event = db.get_event_by_id(event_id)
-    if not event:
-        raise HTTPException(status_code=404, detail="Événement non trouvé")
-    _check_event_access(event, request)
+def _budget_currency(lang: str) -> str:
+    """Devise affichée sur la page budget (selon la langue de l'interface)"""
+    return 'EUR' if lang == 'fr' else 'JPY'
 
-    # Récupérer les catégories de dépenses
-    categories = db.list_expense_categories(lang)
 
-    # Récupérer les dépenses existantes
-    expenses = db.get_event_expenses(event_id, lang)
-
-    # Récupérer le résumé budgétaire
-    budget_summary = db.get_event_budget_summary(event_id)
+def _load_budget_shopping_list(event_id: int, lang: str) -> list:
+    """
+    Charge la liste de courses de la page budget, la (ré)génère si besoin
+    et calcule le prix de chaque ingrédient
 
-    # Récupérer la liste de courses
-    shopping_list = db.get_shopping_list_items(event_id, lang)
+    Appelée via single_flight : le résultat est partagé entre les requêtes
+    simultanées sur le même événement et ne doit pas être modifié.
+    """
+    def needs_regeneration(items: list) -> bool:
+        """Liste vide, ou enregistrée dans l'autre langue (caractères japonais)"""
+        if not items:
+            return True
+        has_japanese = any(ord(char) > 0x3000 for char in items[0]['ingredient_name'])
+        return (lang == 'fr' and has_japanese) or (lang == 'jp' and not has_japanese)
 
-    # Si la liste est vide, essayer de la générer depuis les recettes de l'événement
-    if not shopping_list:
-        recipes_data = db.get_event_recipes_with_ingredients(event_id, lang)
-        if recipes_data:
-            aggregator = get_ingredient_aggregator()
-            aggregated_ingredients = aggregator.aggregate_ingredients(recipes_data, lang)
-            db.save_shopping_list_items(event_id, aggregated_ingredients)
-            shopping_list = db.get_shopping_list_items(event_id, lang)
-    # Vérifier si la liste doit être régénérée pour la bonne langue
-    elif shopping_list:
-        # Vérifier si la liste contient des caractères japonais
-        first_item_name = shopping_list[0]['ingredient_name'] if shopping_list else ''
-        has_japanese = any(ord(char) > 0x3000 for char in first_item_name)
-        needs_regen = (lang == 'fr' and has_japanese) or (lang == 'jp' and not has_japanese)
-
-        if needs_regen:
-            # Régénérer la liste dans la bonne langue
-            recipes_data = db.get_event_recipes_with_ingredients(event_id, lang)
-            if recipes_data:
-                aggregator = get_ingredient_aggregator()
-                aggregated_ingredients = aggregator.aggregate_ingredients(recipes_data, lang)
-                db.save_shopping_list_items(event_id, aggregated_ingredients)
-                shopping_list = db.get_shopping_list_items(event_id, lang)
+    # Liste (ré)générée si besoin, vérification partagée avec la page liste de courses ;
+    # copie des items : ceux de ensure_shopping_list sont partagés
+    shopping_list = [dict(item) for item in db.ensure_shopping_list(event_id, lang, needs_regeneration)]
 
     # Enrichir chaque ingrédient avec son prix calculé pour la quantité demandée
     # Utiliser la langue de l'interface pour déterminer la devise à afficher
-    currency = 'EUR' if lang == 'fr' else 'JPY'
+    currency = _budget_currency(lang)
 
     with get_db() as conn:
         for item in shopping_list:
@@ -817,6 +867,37 @@ async def event_budget_view(request: Request, event_id: int, lang: str = "fr"):
                 item['total_price'] = None
                 item['cost_status'] = None
 
+    return shopping_list
+
+
+@router.get("/events/{event_id}/budget")
+async def event_budget_view(request: Request, event_id: int, lang: str = "fr"):
+    """
+    Affiche la page de gestion du budget pour un événement
+    """
+    event = db.get_event_by_id(event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Événement non trouvé")
+    _check_event_access(event, request)
+
+    # Récupérer les catégories de dépenses
+    categories = db.list_expense_categories(lang)
+
+    # Récupérer les dépenses existantes
+    expenses = db.get_event_expenses(event_id, lang)
+
+    # Récupérer le résumé budgétaire
+    budget_summary = db.get_event_budget_summary(event_id)
+
+    # Liste de courses chiffrée : les ouvertures simultanées de la page
+    # partagent la même régénération et le même calcul des coûts
+    shopping_list = await run_in_threadpool(
+        single_flight.do, ("budget_shopping_list", event_id, lang),
+        _load_budget_shopping_list, event_id, lang
+    )
+
+    currency = _budget_currency(lang)
+
     return templates.TemplateResponse(
         "event_budget.html",
         {
@@ -1488,7 +1569,7 @@ async def event_planning_save(
 
 @router.post("/api/events/{event_id}/photos/upload")
 async def upload_event_photo(request: Request, event_id: int, file: UploadFile = File(...)):
-    from app.services.image_service import save_event_photo
+    from app.services.image_service import save_event_photo_upload, schedule_event_photo_variants
     user_id = request.session.get('user_id')
     if not user_id:
         return JSONResponse({"error": "Non authentifié"}, status_code=401)
@@ -1498,9 +1579,10 @@ async def upload_event_photo(request: Request, event_id: int, file: UploadFile =
         return JSONResponse({"error": "Maximum 2 photos par événement"}, status_code=400)
 
     try:
-        file_data = await file.read()
-        photo_url = save_event_photo(file_data, file.filename)
+        photo_url = await save_event_photo_upload(file)
         photo_id = db.add_event_photo(event_id, photo_url)
+        # Thumbnail de la liste des événements, généré en arrière-plan
+        schedule_event_photo_variants(photo_url)
         return JSONResponse({"id": photo_id, "photo_url": photo_url})
     except ValueError as e:
         return JSONResponse({"error": str(e)}, status_code=400)
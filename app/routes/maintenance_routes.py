@@ -0,0 +1,55 @@
+# app/routes/maintenance_routes.py
+"""
+Maintenance de la base depuis l'administration (administrateurs)
+"""
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+
+from config import Config
+from app.services.db_maintenance import TASKS, database_stats, load_state, run_maintenance
+from app.template_config import templates
+
+router = APIRouter()
+
+
+def _is_admin(request: Request) -> bool:
+    return bool(request.session.get("user_id") and request.session.get("is_admin"))
+
+
+@router.get("/admin/maintenance", response_class=HTMLResponse)
+async def admin_maintenance(request: Request, lang: str = Query("fr")):
+    """État de la base (tailles, WAL, pages libres) et dernier passage de maintenance"""
+    if not _is_admin(request):
+        return RedirectResponse(url=f"/recipes?lang={lang}", status_code=303)
+
+    return templates.TemplateResponse(
+        "admin_maintenance.html",
+        {
+            "request": request,
+            "lang": lang,
+            "stats": database_stats(),
+            "report": load_state().get("last_report"),
+            "tasks": TASKS,
+            "enabled": Config.MAINTENANCE_ENABLED,
+            "interval_hours": Config.MAINTENANCE_INTERVAL_HOURS,
+            "idle_seconds": Config.MAINTENANCE_IDLE_SECONDS,
+        }
+    )
+
+
+@router.post("/admin/maintenance")
+def admin_run_maintenance(request: Request, task: str = Query(None)):
+    """
+    Lance la maintenance immédiatement (toutes les tâches, ou ?task=checkpoint…)
+
+    Exécutée dans le pool de threads : la boucle d'événements reste libre.
+    """
+    if not _is_admin(request):
+        return JSONResponse({"error": "forbidden"}, status_code=403)
+    if task is not None and task not in TASKS:
+        return JSONResponse({"error": f"tâche inconnue : {task}"}, status_code=400)
+
+    report = run_maintenance([task] if task else TASKS, trigger="manual")
+    if report is None:
+        return JSONResponse({"error": "maintenance déjà en cours"}, status_code=409)
+    return JSONResponse(report)
@@ -0,0 +1,37 @@
+# app/routes/metrics_routes.py
+"""
+Exposition des métriques au format Prometheus (/metrics)
+
+Accès réservé aux administrateurs connectés, ou à un collecteur présentant
+le jeton METRICS_TOKEN (en-tête Authorization: Bearer <jeton>).
+"""
+import hmac
+
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from config import Config
+from app.services.metrics import PROMETHEUS_CONTENT_TYPE, registry
+
+router = APIRouter()
+
+
+def _metrics_authorized(request: Request) -> bool:
+    """Administrateur en session, ou jeton de collecteur valide"""
+    if request.session.get("is_admin"):
+        return True
+    if not Config.METRICS_TOKEN:
+        return False
+    authorization = request.headers.get("authorization", "")
+    return hmac.compare_digest(authorization, f"Bearer {Config.METRICS_TOKEN}")
+
+
+@router.get("/metrics")
+async def metrics(request: Request):
+    """
+    Métriques de tous les workers (compteurs, jauges, histogrammes)
+    """
+    if not _metrics_authorized(request):
+        return PlainTextResponse("Accès réservé aux administrateurs", status_code=403)
+
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
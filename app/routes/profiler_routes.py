@@ -0,0 +1,50 @@
+# app/routes/profiler_routes.py
+"""
+Consultation des profils de requêtes (?__profile=1, administrateurs)
+"""
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+
+from app.services.request_profiler import list_profiles, load_profile
+from app.template_config import templates
+
+router = APIRouter()
+
+
+@router.get("/admin/profiles", response_class=HTMLResponse)
+async def admin_profiles(request: Request, lang: str = Query("fr")):
+    """Liste des profils enregistrés (admins uniquement)"""
+    if not request.session.get("user_id") or not request.session.get("is_admin"):
+        return RedirectResponse(url=f"/recipes?lang={lang}", status_code=303)
+
+    return templates.TemplateResponse(
+        "admin_profiles.html",
+        {"request": request, "lang": lang, "profiles": list_profiles(), "profile": None}
+    )
+
+
+@router.get("/admin/profiles/{profile_id}")
+async def admin_profile_detail(
+    request: Request,
+    profile_id: str,
+    lang: str = Query("fr"),
+    format: str = Query("html")
+):
+    """
+    Détail d'un profil : arbre d'appels, fonctions coûteuses et trace SQL
+    (format=json pour le profil brut)
+    """
+    if not request.session.get("user_id") or not request.session.get("is_admin"):
+        return RedirectResponse(url=f"/recipes?lang={lang}", status_code=303)
+
+    profile = load_profile(profile_id)
+    if not profile:
+        return RedirectResponse(url=f"/admin/profiles?lang={lang}", status_code=303)
+
+    if format == "json":
+        return JSONResponse(profile)
+
+    return templates.TemplateResponse(
+        "admin_profiles.html",
+        {"request": request, "lang": lang, "profiles": None, "profile": profile}
+    )
@@ -2,6 +2,7 @@
 from fastapi import APIRouter, Request, Query, UploadFile, File, Form
 from fastapi.responses import HTMLResponse, JSONResponse
 from typing import Optional
+from markupsafe import Markup
 import tempfile
 import shutil
 import os
@@ -11,38 +12,132 @@ from app.services.recipe_importer import import_recipe_from_csv
 from app.services.translation_service import get_translation_service, auto_translate_new_catalog_entries
 from app.services.conversion_service import get_conversion_service
 from app.services.web_recipe_importer import get_web_recipe_importer
+from app.services.fragment_cache import fragment_cache, invalidate_recipe
 from app.template_config import templates
+from app.http_cache import conditional_get, RECIPE_TABLES, CATEGORY_TABLES, TAG_TABLES, EVENT_TYPE_TABLES
 
 router = APIRouter()
 
-# --------------------------------------------------------------------
-# Liste des recettes
-# --------------------------------------------------------------------
-@router.get("/recipes", response_class=HTMLResponse)
-async def recipes_list(request: Request, lang: str = Query("fr"), creator_id: Optional[str] = Query(None)):
-    """Affiche la liste de toutes les recettes dans la langue demandée"""
-    # Convertir creator_id en int si ce n'est pas une chaîne vide
-    user_id_filter = int(creator_id) if creator_id and creator_id.strip() else None
-    rows = db.list_recipes(lang, user_id=user_id_filter)
+# Nombre de recettes par page (pagination keyset sur nom + id)
+RECIPES_PAGE_SIZE = 60
+
+
+def _id_list(value: Optional[str]) -> list:
+    """'3,7' → [3, 7] (valeurs invalides ignorées)"""
+    return [int(v) for v in (value or "").split(",") if v.strip().isdigit()]
+
+
+def _recipe_filters(search: Optional[str] = None, categories: Optional[str] = None, tags: Optional[str] = None,
+                    recipe_type: Optional[str] = None, sort_by: str = "name", sort_order: str = "asc") -> dict:
+    """Paramètres d'URL de la liste des recettes → arguments de db.list_recipes"""
+    return {
+        "search": (search or "").strip() or None,
+        "category_ids": _id_list(categories),
+        "tag_ids": _id_list(tags),
+        "recipe_type_id": int(recipe_type) if recipe_type and recipe_type.isdigit() else None,
+        "sort": sort_by,
+        "descending": sort_order == "desc",
+    }
+
+
+def _list_recipes_page(lang: str, user_id: Optional[int], cursor: Optional[str], limit: int = RECIPES_PAGE_SIZE,
+                       filters: Optional[dict] = None):
+    """
+    Charge une page de recettes enrichies (catégories, tags, types de recette)
+
+    Recherche, filtres et tri sont appliqués en SQL (voir _recipe_filters) :
+    le curseur n'est valable que pour les mêmes filtres.
+
+    Returns:
+        (recettes de la page, curseur de la page suivante ou None)
+    """
+    rows = db.list_recipes(lang, user_id=user_id, limit=limit + 1, after=db.decode_cursor(cursor, 2),
+                           **(filters or {}))
+    rows, next_cursor = db.keyset_page(rows, limit, 'sort_key', 'id')
 
     # Enrichir chaque recette avec ses catégories, tags et types de recette
     for recipe in rows:
         recipe['categories'] = db.get_recipe_categories(recipe['id'])
         recipe['tags'] = db.get_recipe_tags(recipe['id'])
         recipe['recipe_types'] = db.get_recipe_recipe_types(recipe['id'])
+    return rows, next_cursor
+
+
+def _render_fragment(recipe_id: Optional[int], generation: Optional[int], lang: str, name: str,
+                     template_name: str, context: dict) -> Markup:
+    """Rend un composant de la page recette via le cache de fragments"""
+    def render():
+        return templates.get_template(template_name).render(lang=lang, **context)
+
+    if not recipe_id:
+        return Markup(render())
+    return Markup(fragment_cache.get_or_render(recipe_id, lang, name, render, generation))
+
+
+# --------------------------------------------------------------------
+# Liste des recettes
+# --------------------------------------------------------------------
+@router.get("/recipes", response_class=HTMLResponse)
+@conditional_get(*RECIPE_TABLES)
+async def recipes_list(
+    request: Request,
+    lang: str = Query("fr"),
+    creator_id: Optional[str] = Query(None),
+    search: Optional[str] = Query(None),
+    categories: Optional[str] = Query(None),
+    tags: Optional[str] = Query(None),
+    recipe_type: Optional[str] = Query(None),
+    sort_by: str = Query("name"),
+    sort_order: str = Query("asc")
+):
+    """Affiche la première page des recettes (filtres et tri de l'URL appliqués)"""
+    # Convertir creator_id en int si ce n'est pas une chaîne vide
+    user_id_filter = int(creator_id) if creator_id and creator_id.strip() else None
+    filters = _recipe_filters(search, categories, tags, recipe_type, sort_by, sort_order)
+    rows, next_cursor = _list_recipes_page(lang, user_id_filter, None, filters=filters)
 
     # Récupérer la liste des utilisateurs pour le filtre
     users = db.list_users()
 
     return templates.TemplateResponse(
         "recipes_list.html",
-        {"request": request, "lang": lang, "rows": rows, "users": users, "creator_id": user_id_filter}
+        {"request": request, "lang": lang, "rows": rows, "users": users, "creator_id": user_id_filter,
+         "next_cursor": next_cursor}
     )
 
+
+@router.get("/api/recipes/page")
+async def api_recipes_page(
+    lang: str = Query("fr"),
+    creator_id: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(RECIPES_PAGE_SIZE, ge=1, le=200),
+    search: Optional[str] = Query(None),
+    categories: Optional[str] = Query(None),
+    tags: Optional[str] = Query(None),
+    recipe_type: Optional[str] = Query(None),
+    sort_by: str = Query("name"),
+    sort_order: str = Query("asc")
+):
+    """
+    Page de la liste des recettes (pagination keyset)
+
+    Sans curseur : première page pour les filtres donnés (changement de filtre
+    ou de tri côté client).
+
+    Returns:
+        {"items": [...], "next_cursor": "..." ou null}
+    """
+    user_id_filter = int(creator_id) if creator_id and creator_id.strip() else None
+    filters = _recipe_filters(search, categories, tags, recipe_type, sort_by, sort_order)
+    rows, next_cursor = _list_recipes_page(lang, user_id_filter, cursor, limit, filters)
+    return {"items": rows, "next_cursor": next_cursor}
+
 # --------------------------------------------------------------------
 # Détail d'une recette
 # --------------------------------------------------------------------
 @router.get("/recipe/{slug}", response_class=HTMLResponse)
+@conditional_get(*RECIPE_TABLES)
 async def recipe_detail(request: Request, slug: str, lang: str = Query("fr"), event_id: Optional[int] = Query(None), from_event: Optional[int] = Query(None)):
     """Affiche le détail d'une recette"""
     # Priorité à from_event si fourni, sinon event_id (pour compatibilité)
@@ -66,11 +161,16 @@ async def recipe_detail(request: Request, slug: str, lang: str = Query("fr"), ev
     # Vérifier si une traduction existe dans la langue actuelle
     has_translation = db.check_translation_exists(recipe_id, lang) if recipe_id else False
 
-    # Récupérer la liste des utilisateurs pour le sélecteur
-    all_users = db.list_users()
+    # Les sélecteurs "créateur" et "lier à une recette" sont chargés à la demande
+    # via /api/typeahead/* (la page ne dépend plus du nombre total de recettes)
 
-    # Récupérer toutes les recettes pour le select "lier à une recette"
-    all_recipes_for_link = db.list_recipes(lang)
+    # Tableau des ingrédients et étapes : HTML rendu une fois par génération de la recette
+    ingredient_rows_html = _render_fragment(
+        recipe_id, rec["content_generation"], lang, "ingredients", "components/recipe_ingredient_rows.html", {"ings": ings}
+    )
+    steps_html = _render_fragment(
+        recipe_id, rec["content_generation"], lang, "steps", "components/recipe_steps.html", {"steps": steps_with_ids}
+    )
 
     return templates.TemplateResponse(
         "recipe_detail.html",
@@ -83,8 +183,8 @@ async def recipe_detail(request: Request, slug: str, lang: str = Query("fr"), ev
             "steps": steps_with_ids,  # Utiliser steps_with_ids au lieu de steps
             "has_translation": has_translation,
             "event_id": event_context,
-            "all_users": all_users,
-            "all_recipes_for_link": all_recipes_for_link
+            "ingredient_rows_html": ingredient_rows_html,
+            "steps_html": steps_html
         }
     )
 
@@ -427,7 +527,9 @@ async def upload_recipe_image(slug: str, file: UploadFile = File(...)):
     Returns:
         JSON avec les URLs de l'image et du thumbnail
     """
-    from app.services.image_service import save_recipe_image, delete_recipe_image
+    from app.services.image_service import (
+        save_recipe_image_upload, delete_recipe_image, schedule_recipe_image_variants
+    )
 
     # Vérifier que la recette existe
     recipe_id = db.get_recipe_id_by_slug(slug)
@@ -438,18 +540,18 @@ async def upload_recipe_image(slug: str, file: UploadFile = File(...)):
         )
 
     try:
-        # Lire le fichier uploadé
-        file_data = await file.read()
-
         # Récupérer les anciennes URLs pour les supprimer
         old_image_url, old_thumbnail_url = db.get_recipe_image_urls(recipe_id)
 
-        # Sauvegarder la nouvelle image
-        image_url, thumbnail_url = save_recipe_image(file_data, file.filename)
+        # Écrire la nouvelle image sur disque par blocs
+        image_url, thumbnail_url = await save_recipe_image_upload(file)
 
         # Mettre à jour la base de données
         db.update_recipe_image(recipe_id, image_url, thumbnail_url)
 
+        # Générer thumbnail / taille moyenne / WebP en arrière-plan
+        schedule_recipe_image_variants(recipe_id, image_url)
+
         # Supprimer les anciennes images si elles existaient
         if old_image_url:
             delete_recipe_image(old_image_url, old_thumbnail_url)
@@ -537,14 +639,11 @@ async def upload_step_image_temporary(file: UploadFile = File(...)):
     Returns:
         JSON avec l'URL de l'image
     """
-    from app.services.image_service import save_step_image
+    from app.services.image_service import save_step_image_upload
 
     try:
-        # Lire le fichier uploadé
-        file_data = await file.read()
-
-        # Sauvegarder l'image
-        image_url = save_step_image(file_data, file.filename)
+        # Écrire l'image sur disque par blocs
+        image_url = await save_step_image_upload(file)
 
         return JSONResponse({
             "success": True,
@@ -576,17 +675,14 @@ async def upload_step_image(step_id: int, file: UploadFile = File(...)):
     Returns:
         JSON avec l'URL de l'image
     """
-    from app.services.image_service import save_step_image, delete_step_image
+    from app.services.image_service import save_step_image_upload, delete_step_image
 
     try:
-        # Lire le fichier uploadé
-        file_data = await file.read()
-
         # Récupérer l'ancienne URL pour la supprimer
         old_image_url = db.get_step_image_url(step_id)
 
-        # Sauvegarder la nouvelle image
-        image_url = save_step_image(file_data, file.filename)
+        # Écrire la nouvelle image sur disque par blocs
+        image_url = await save_step_image_upload(file)
 
         # Mettre à jour la base de données
         db.update_step_image(step_id, image_url)
@@ -768,13 +864,15 @@ async def recipe_cost(request: Request, slug: str, lang: str = Query("fr"), serv
 # ============================================================================
 
 @router.get("/api/categories")
-async def api_get_categories():
+@conditional_get(*CATEGORY_TABLES)
+async def api_get_categories(request: Request):
     """Récupère toutes les catégories disponibles"""
     return db.get_all_categories()
 
 
 @router.get("/api/tags")
-async def api_get_tags():
+@conditional_get(*TAG_TABLES)
+async def api_get_tags(request: Request):
     """Récupère tous les tags disponibles"""
     return db.get_all_tags()
 
@@ -944,7 +1042,8 @@ async def api_delete_tag(tag_id: int):
 # ============================================================================
 
 @router.get("/api/event-types")
-async def api_get_event_types():
+@conditional_get(*EVENT_TYPE_TABLES)
+async def api_get_event_types(request: Request):
     """Récupère tous les types d'événements disponibles"""
     return db.get_all_event_types()
 
@@ -1294,6 +1393,7 @@ async def save_pdf_recipe(request: Request, lang: str = Query("fr")):
                 )
 
             con.commit()
+            invalidate_recipe(recipe_id)
             _, needs_translation = db.sync_ingredients_from_recipes()
             auto_translate_new_catalog_entries(needs_translation)
 
@@ -1490,6 +1590,7 @@ async def save_url_recipe(request: Request, lang: str = Query("fr")):
                 )
 
             con.commit()
+            invalidate_recipe(recipe_id)
             _, needs_translation = db.sync_ingredients_from_recipes()
             auto_translate_new_catalog_entries(needs_translation)
 
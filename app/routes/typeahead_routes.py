@@ -0,0 +1,111 @@
+# app/routes/typeahead_routes.py
+"""
+API JSON paginée pour les sélecteurs avec recherche (typeahead)
+
+Les pages (détail recette, détail événement) chargent ces listes à la demande
+au lieu d'embarquer toutes les recettes / participants / groupes dans le HTML.
+
+Format de réponse commun :
+    {"items": [...], "offset": 0, "limit": 20, "has_more": true}
+"""
+from typing import Callable, Optional
+
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import JSONResponse
+
+from app.models import db
+
+router = APIRouter()
+
+TYPEAHEAD_DEFAULT_LIMIT = 20
+TYPEAHEAD_MAX_LIMIT = 50
+
+
+def _paginate(search: Callable, limit: int, offset: int, **kwargs) -> dict:
+    """
+    Exécute une recherche paginée en demandant un élément de plus que la page
+    pour savoir s'il reste des résultats (sans COUNT(*) séparé)
+    """
+    rows = search(limit=limit + 1, offset=offset, **kwargs)
+    return {
+        "items": rows[:limit],
+        "offset": offset,
+        "limit": limit,
+        "has_more": len(rows) > limit,
+    }
+
+
+@router.get("/api/typeahead/recipes")
+async def typeahead_recipes(
+    request: Request,
+    q: str = "",
+    lang: str = "fr",
+    limit: int = Query(TYPEAHEAD_DEFAULT_LIMIT, ge=1, le=TYPEAHEAD_MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    exclude_id: Optional[int] = None
+):
+    """
+    Recherche de recettes par nom (lien ingrédient → recette, ajout à un événement)
+    """
+    if not request.session.get('user_id'):
+        return JSONResponse({"error": "Non authentifié"}, status_code=401)
+
+    return _paginate(db.search_recipe_names, limit, offset,
+                     lang=lang, query=q.strip(), exclude_id=exclude_id)
+
+
+@router.get("/api/typeahead/users")
+async def typeahead_users(
+    request: Request,
+    q: str = "",
+    limit: int = Query(TYPEAHEAD_DEFAULT_LIMIT, ge=1, le=TYPEAHEAD_MAX_LIMIT),
+    offset: int = Query(0, ge=0)
+):
+    """
+    Recherche d'utilisateurs (sélecteur du créateur d'une recette)
+    """
+    if not request.session.get('user_id'):
+        return JSONResponse({"error": "Non authentifié"}, status_code=401)
+
+    return _paginate(db.search_users, limit, offset, query=q.strip())
+
+
+@router.get("/api/typeahead/participants")
+async def typeahead_participants(
+    request: Request,
+    q: str = "",
+    limit: int = Query(TYPEAHEAD_DEFAULT_LIMIT, ge=1, le=TYPEAHEAD_MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    exclude_event_id: Optional[int] = None
+):
+    """
+    Recherche de participants visibles par l'utilisateur connecté
+    (exclut ceux déjà inscrits à exclude_event_id)
+    """
+    user_id = request.session.get('user_id')
+    if not user_id:
+        return JSONResponse({"error": "Non authentifié"}, status_code=401)
+    is_admin = bool(request.session.get('is_admin', False))
+
+    return _paginate(db.search_participants, limit, offset,
+                     user_id=user_id, is_admin=is_admin, query=q.strip(),
+                     exclude_event_id=exclude_event_id)
+
+
+@router.get("/api/typeahead/groups")
+async def typeahead_groups(
+    request: Request,
+    q: str = "",
+    limit: int = Query(TYPEAHEAD_DEFAULT_LIMIT, ge=1, le=TYPEAHEAD_MAX_LIMIT),
+    offset: int = Query(0, ge=0)
+):
+    """
+    Recherche de groupes de participants visibles par l'utilisateur connecté
+    """
+    user_id = request.session.get('user_id')
+    if not user_id:
+        return JSONResponse({"error": "Non authentifié"}, status_code=401)
+    is_admin = bool(request.session.get('is_admin', False))
+
+    return _paginate(db.search_groups, limit, offset,
+                     user_id=user_id, is_admin=is_admin, query=q.strip())
@@ -4,6 +4,7 @@ from typing import Dict, List, Tuple, Optional
 import re
 from groq import Groq
 import os
+from app.services.metrics import llm_call
 
 
 # Table de conversion d'unités de base (multiplicateur pour convertir vers l'unité de base)
@@ -248,16 +249,17 @@ class ConversionService:
         prompt = self._build_ai_prompt(ingredient, ratio, lang)
 
         try:
-            response = self.client.chat.completions.create(
-                model="openai/gpt-oss-120b",
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }],
-                temperature=0.3,
-                max_tokens=200,
-                reasoning_effort="low"
-            )
+            with llm_call("ConversionService"):
+                response = self.client.chat.completions.create(
+                    model="openai/gpt-oss-120b",
+                    messages=[{
+                        "role": "user",
+                        "content": prompt
+                    }],
+                    temperature=0.3,
+                    max_tokens=200,
+                    reasoning_effort="low"
+                )
 
             # Parser la réponse de l'IA
             ai_response = response.choices[0].message.content
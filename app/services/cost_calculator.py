@@ -67,12 +67,13 @@ def compute_estimated_cost_for_ingredient(
 
     # -----------------------------
     # 1) Charger toutes les lignes IPC pour cet ingrédient
+    #    (COLLATE NOCASE plutôt que LOWER() : utilise idx_ingredient_catalog_name_fr)
     # -----------------------------
     ipc_rows = conn.execute(
         f"""
         SELECT id, ingredient_name_fr, unit_fr, unit_jp, {price_field} AS price, qty, conversion_category
         FROM ingredient_price_catalog
-        WHERE LOWER(ingredient_name_fr) = LOWER(?)
+        WHERE ingredient_name_fr = ? COLLATE NOCASE
         """,
         (ingredient_name_fr,),
     ).fetchall()
@@ -0,0 +1,233 @@
+"""
+Sauvegardes à chaud de la base SQLite (API de sauvegarde en ligne)
+
+Copier le fichier recette.sqlite3 pendant que l'application écrit peut
+produire une copie incohérente (mode WAL : une partie des données est
+encore dans recette.sqlite3-wal). backup_database() utilise
+sqlite3.Connection.backup : la copie se fait par étapes de
+BACKUP_PAGES_PER_STEP pages, avec une pause entre deux étapes pendant
+laquelle les écritures de l'application passent. Une transaction de
+lecture maintenue pendant toute la copie fige l'instantané WAL copié :
+les écritures concurrentes ne font pas recommencer la copie, et la
+sauvegarde reflète l'état de la base à son démarrage.
+
+La sauvegarde est écrite dans un fichier temporaire, vérifiée
+(PRAGMA quick_check), éventuellement compressée (gzip) puis renommée :
+un fichier recette_AAAAMMJJ_HHMMSS.sqlite3[.gz] de BACKUP_DIR est
+toujours complet. Seules les BACKUP_KEEP plus récentes sont conservées
+(les autres fichiers du répertoire ne sont jamais supprimés).
+
+start_background_backup() lance la sauvegarde dans un thread (page
+d'administration) ; backup_status() donne sa progression. Cet état est
+propre au processus : avec plusieurs workers, la progression n'est
+visible que depuis le worker qui exécute la sauvegarde.
+"""
+
+import gzip
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from config import Config
+from app.services.metrics import DB_BACKUPS
+
+BACKUP_PREFIX = "recette_"
+_BACKUP_NAME = re.compile(r"^recette_\d{8}_\d{6}(?:_\d+)?\.sqlite3(?:\.gz)?$")
+
+_lock = threading.Lock()
+_state = {"running": False}
+
+
+def is_backup_name(name: str) -> bool:
+    """Nom de fichier produit par backup_database() (rotation, téléchargement)"""
+    return bool(_BACKUP_NAME.match(name))
+
+
+def _new_backup_path(directory: str, compress: bool) -> str:
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    suffix = ".sqlite3.gz" if compress else ".sqlite3"
+    path = os.path.join(directory, f"{BACKUP_PREFIX}{stamp}{suffix}")
+    counter = 1
+    while os.path.exists(path):
+        path = os.path.join(directory, f"{BACKUP_PREFIX}{stamp}_{counter}{suffix}")
+        counter += 1
+    return path
+
+
+def backup_database(
+    source: str,
+    directory: str = None,
+    output: str = None,
+    compress: bool = False,
+    keep: int = None,
+    pages: int = None,
+    sleep: float = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> dict:
+    """
+    Sauvegarde cohérente de la base sans bloquer les écritures
+
+    Args:
+        source: Chemin de la base à sauvegarder
+        directory: Répertoire des sauvegardes (défaut: Config.BACKUP_DIR)
+        output: Fichier de destination explicite (pas de rotation ;
+                compressé si le nom se termine par .gz)
+        compress: Compresser en gzip
+        keep: Nombre de sauvegardes conservées (défaut: Config.BACKUP_KEEP, 0 = toutes)
+        pages: Pages copiées par étape (défaut: Config.BACKUP_PAGES_PER_STEP)
+        sleep: Pause entre deux étapes, en secondes (défaut: Config.BACKUP_STEP_SLEEP)
+        progress: Appelée après chaque étape avec (pages copiées, pages totales)
+
+    Returns:
+        {"name", "path", "size", "pages", "steps", "compressed", "duration_ms", "removed"}
+
+    Raises:
+        sqlite3.Error: échec de la copie
+        RuntimeError: copie non intègre (quick_check)
+    """
+    directory = directory or Config.BACKUP_DIR
+    pages = pages or Config.BACKUP_PAGES_PER_STEP
+    sleep = Config.BACKUP_STEP_SLEEP if sleep is None else sleep
+    if output:
+        compress = output.endswith(".gz")
+        path = output
+    else:
+        path = _new_backup_path(directory, compress)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = path + ".part"
+
+    start = time.perf_counter()
+    steps = 0
+
+    def on_step(status, remaining, total):
+        nonlocal steps
+        steps += 1
+        if progress:
+            progress(total - remaining, total)
+
+    try:
+        src = sqlite3.connect(source, timeout=30, isolation_level=None)
+        dst = sqlite3.connect(temp_path)
+        try:
+            # Transaction de lecture ouverte pendant toute la copie : l'instantané
+            # WAL reste figé. Sans elle, chaque écriture d'une autre connexion
+            # (log_access à chaque requête) fait recommencer la copie depuis le
+            # début, qui n'aboutit jamais sous trafic continu. Les écrivains ne
+            # sont pas bloqués (mode WAL).
+            src.execute("BEGIN")
+            src.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            src.backup(dst, pages=pages, progress=on_step, sleep=sleep)
+            src.execute("COMMIT")
+            # Fichier autonome : pas de -wal à joindre à la sauvegarde
+            dst.execute("PRAGMA journal_mode=DELETE")
+            check = dst.execute("PRAGMA quick_check").fetchone()[0]
+            page_count = dst.execute("PRAGMA page_count").fetchone()[0]
+        finally:
+            dst.close()
+            src.close()
+        if check != "ok":
+            raise RuntimeError(f"Sauvegarde non intègre : {check}")
+
+        if compress:
+            with open(temp_path, "rb") as f_in, gzip.open(temp_path + ".gz", "wb", compresslevel=6) as f_out:
+                shutil.copyfileobj(f_in, f_out, 1024 * 1024)
+            os.unlink(temp_path)
+            os.replace(temp_path + ".gz", path)
+        else:
+            os.replace(temp_path, path)
+    except Exception:
+        DB_BACKUPS.inc(outcome="error")
+        for leftover in (temp_path, temp_path + ".gz", temp_path + "-journal"):
+            if os.path.exists(leftover):
+                os.unlink(leftover)
+        raise
+
+    DB_BACKUPS.inc(outcome="ok")
+    keep = Config.BACKUP_KEEP if keep is None else keep
+    removed = rotate_backups(os.path.dirname(os.path.abspath(path)), keep) if not output and keep else []
+    return {
+        "name": os.path.basename(path),
+        "path": path,
+        "size": os.path.getsize(path),
+        "pages": page_count,
+        "steps": steps,
+        "compressed": compress,
+        "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+        "removed": removed,
+    }
+
+
+def list_backups(directory: str = None) -> List[dict]:
+    """Sauvegardes du répertoire, de la plus récente à la plus ancienne"""
+    directory = directory or Config.BACKUP_DIR
+    if not os.path.isdir(directory):
+        return []
+    backups = []
+    for name in sorted((n for n in os.listdir(directory) if is_backup_name(n)), reverse=True):
+        stat = os.stat(os.path.join(directory, name))
+        backups.append({
+            "name": name,
+            "size": stat.st_size,
+            "created_at": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+            "compressed": name.endswith(".gz"),
+        })
+    return backups
+
+
+def rotate_backups(directory: str, keep: int) -> List[str]:
+    """Supprime les sauvegardes au-delà des `keep` plus récentes ; retourne les noms supprimés"""
+    removed = []
+    for backup in list_backups(directory)[keep:]:
+        os.unlink(os.path.join(directory, backup["name"]))
+        removed.append(backup["name"])
+    return removed
+
+
+# ============================================================================
+# SAUVEGARDE EN ARRIÈRE-PLAN (page d'administration)
+# ============================================================================
+
+def backup_status() -> dict:
+    """Progression de la sauvegarde en cours, ou résultat de la dernière"""
+    with _lock:
+        return dict(_state)
+
+
+def start_background_backup(source: str, **options) -> bool:
+    """
+    Lance backup_database() dans un thread
+
+    Returns:
+        False si une sauvegarde est déjà en cours dans ce processus
+    """
+    with _lock:
+        if _state["running"]:
+            return False
+        _state.clear()
+        _state.update({
+            "running": True,
+            "started_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "copied": 0,
+            "total": 0,
+        })
+
+    def on_progress(copied, total):
+        with _lock:
+            _state.update(copied=copied, total=total)
+
+    def run():
+        try:
+            result = backup_database(source, progress=on_progress, **options)
+            update = {"result": result}
+        except Exception as e:
+            update = {"error": str(e)}
+        with _lock:
+            _state.update(update, running=False)
+
+    threading.Thread(target=run, name="db-backup", daemon=True).start()
+    return True
@@ -0,0 +1,410 @@
+"""
+Maintenance périodique de la base SQLite
+
+run_maintenance() enchaîne, sur la base db_core.DB_PATH :
+
+- purge : suppression des logs d'accès anciens (cleanup_old_access_logs),
+  première source de pages libérées ; 7 jours conservés quand les agrégats
+  horaires existent (add_access_log_rollup.sql), 30 jours sinon ;
+- vacuum : PRAGMA incremental_vacuum, rend au système les pages libres
+  (base en auto_vacuum=INCREMENTAL, voir enable_incremental_vacuum) ;
+- analyze : ANALYZE borné (analysis_limit) puis PRAGMA optimize, pour que
+  le planificateur dispose de statistiques à jour ;
+- checkpoint : PRAGMA wal_checkpoint(TRUNCATE), recopie le WAL dans la
+  base et le ramène à zéro octet. Avec des lecteurs actifs, le
+  checkpoint ne peut pas aller au bout (busy) : il est retenté au
+  passage suivant.
+
+Le planificateur (start_scheduler, lancé au démarrage de l'application)
+ne travaille que pendant les périodes creuses : aucune requête en cours
+dans le processus et aucun accès journalisé (access_log, tous workers
+confondus) depuis MAINTENANCE_IDLE_SECONDS. Il lance la maintenance
+complète toutes les MAINTENANCE_INTERVAL_HOURS heures, et un checkpoint
+seul dès que le WAL dépasse MAINTENANCE_WAL_CHECKPOINT_MB.
+
+Avec plusieurs workers, un seul processus (celui qui obtient le verrou
+MAINTENANCE_LOCK_PATH) fait tourner le planificateur et publie les
+jauges de taille : les jauges étant additionnées entre workers, elles
+ne doivent être renseignées que par un seul. L'heure du dernier passage
+et le dernier rapport sont conservés dans MAINTENANCE_STATE_PATH.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Iterable, Optional
+
+from config import Config
+from app.services.metrics import (
+    DB_CHECKPOINT_AGE, DB_FILE_BYTES, DB_FREELIST_PAGES, DB_MAINTENANCE_DURATION,
+    DB_MAINTENANCE_RUNS, DB_WAL_FRAMES, HTTP_IN_PROGRESS, registry,
+)
+
+logger = logging.getLogger(__name__)
+
+TASKS = ("purge", "vacuum", "analyze", "checkpoint")
+
+# Lignes examinées par index lors de ANALYZE (statistiques approchées, passage rapide)
+ANALYSIS_LIMIT = 1000
+
+# Attente maximale d'un verrou pendant la maintenance (ms) : mieux vaut
+# reporter une tâche que bloquer les requêtes de l'application
+BUSY_TIMEOUT_MS = 2000
+
+_AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+_WAL_HEADER_BYTES = 32
+_WAL_FRAME_HEADER_BYTES = 24
+
+_run_lock = threading.Lock()
+_scheduler = {"thread": None, "stop": None, "lock_file": None}
+
+
+def _db_path() -> str:
+    from app.models import db_core
+    return db_core.DB_PATH
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    con = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+    con.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    return con
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+# ============================================================================
+# ÉTAT DE LA BASE ET MÉTRIQUES
+# ============================================================================
+
+def database_stats(path: str = None) -> dict:
+    """
+    Tailles des fichiers et état de la base
+
+    Returns:
+        {
+            "db_bytes", "wal_bytes", "shm_bytes", "page_size", "page_count",
+            "freelist_count", "auto_vacuum", "journal_mode",
+            "wal_frames": cadres présents dans le WAL (retard de checkpoint),
+            "last_checkpoint", "checkpoint_age_seconds": dernier checkpoint
+                TRUNCATE complet (None si inconnu)
+        }
+    """
+    path = path or _db_path()
+    con = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        page_size = con.execute("PRAGMA page_size").fetchone()[0]
+        page_count = con.execute("PRAGMA page_count").fetchone()[0]
+        freelist_count = con.execute("PRAGMA freelist_count").fetchone()[0]
+        auto_vacuum = con.execute("PRAGMA auto_vacuum").fetchone()[0]
+        journal_mode = con.execute("PRAGMA journal_mode").fetchone()[0]
+    finally:
+        con.close()
+
+    wal_bytes = _file_size(path + "-wal")
+    state = load_state()
+    last_checkpoint = state.get("last_checkpoint")
+    return {
+        "db_bytes": _file_size(path),
+        "wal_bytes": wal_bytes,
+        "shm_bytes": _file_size(path + "-shm"),
+        "page_size": page_size,
+        "page_count": page_count,
+        "freelist_count": freelist_count,
+        "auto_vacuum": _AUTO_VACUUM_MODES.get(auto_vacuum, str(auto_vacuum)),
+        "journal_mode": journal_mode,
+        "wal_frames": max(0, wal_bytes - _WAL_HEADER_BYTES) // (page_size + _WAL_FRAME_HEADER_BYTES),
+        "last_checkpoint": datetime.fromtimestamp(last_checkpoint).strftime("%Y-%m-%d %H:%M:%S")
+        if last_checkpoint else None,
+        "checkpoint_age_seconds": round(time.time() - last_checkpoint) if last_checkpoint else None,
+    }
+
+
+def update_metrics(path: str = None) -> dict:
+    """Publie les jauges de taille et de retard de checkpoint ; retourne database_stats()"""
+    stats = database_stats(path)
+    for name in ("db", "wal", "shm"):
+        DB_FILE_BYTES.set(stats[f"{name}_bytes"], file=name)
+    DB_FREELIST_PAGES.set(stats["freelist_count"])
+    DB_WAL_FRAMES.set(stats["wal_frames"])
+    if stats["checkpoint_age_seconds"] is not None:
+        DB_CHECKPOINT_AGE.set(stats["checkpoint_age_seconds"])
+    # Sans requête, l'instantané du worker ne serait pas réécrit (périodes creuses)
+    registry.maybe_flush()
+    return stats
+
+
+def load_state() -> dict:
+    """Dernier passage de maintenance ({} si aucun)"""
+    try:
+        with open(Config.MAINTENANCE_STATE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(**values):
+    state = load_state()
+    state.update(values)
+    temp_path = Config.MAINTENANCE_STATE_PATH + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, Config.MAINTENANCE_STATE_PATH)
+
+
+# ============================================================================
+# TÂCHES
+# ============================================================================
+
+def _task_purge(con: sqlite3.Connection) -> dict:
+    from app.models import cleanup_old_access_logs
+    from app.models.db_logging import (
+        ACCESS_LOG_RAW_RETENTION_DAYS, ACCESS_LOG_RETENTION_DAYS, _has_access_rollup,
+    )
+    # Sans agrégats horaires, les logs bruts sont la seule source des statistiques
+    days = ACCESS_LOG_RAW_RETENTION_DAYS if _has_access_rollup(con) else ACCESS_LOG_RETENTION_DAYS
+    return {"deleted": cleanup_old_access_logs(days), "retention_days": days}
+
+
+def _task_vacuum(con: sqlite3.Connection) -> dict:
+    if con.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        return {"skipped": "auto_vacuum n'est pas INCREMENTAL (scripts/db_maintenance.py --enable-auto-vacuum)"}
+    before = con.execute("PRAGMA freelist_count").fetchone()[0]
+    if before:
+        # executescript : le PRAGMA libère une page par pas d'exécution, et
+        # execute() s'arrête au premier pas faute de ligne retournée
+        con.executescript("PRAGMA incremental_vacuum;")
+    after = con.execute("PRAGMA freelist_count").fetchone()[0]
+    return {"freed_pages": before - after, "freelist_count": after}
+
+
+def _task_analyze(con: sqlite3.Connection) -> dict:
+    con.execute(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}")
+    con.execute("ANALYZE")
+    con.execute("PRAGMA optimize")
+    return {"analysis_limit": ANALYSIS_LIMIT}
+
+
+def _task_checkpoint(con: sqlite3.Connection) -> dict:
+    busy, log_frames, checkpointed = con.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    if log_frames == -1:
+        return {"skipped": "base hors mode WAL"}
+    if not busy:
+        _save_state(last_checkpoint=time.time())
+    return {"busy": bool(busy), "wal_frames": log_frames, "checkpointed": checkpointed}
+
+
+_TASK_FUNCTIONS = {
+    "purge": _task_purge,
+    "vacuum": _task_vacuum,
+    "analyze": _task_analyze,
+    "checkpoint": _task_checkpoint,
+}
+
+
+def run_maintenance(tasks: Iterable[str] = TASKS, trigger: str = "manual") -> Optional[dict]:
+    """
+    Exécute les tâches de maintenance sur db_core.DB_PATH, dans l'ordre de TASKS
+
+    Une tâche en échec (verrou, erreur SQLite) n'empêche pas les suivantes.
+
+    Args:
+        tasks: Tâches à exécuter (sous-ensemble de TASKS)
+        trigger: Origine du passage ("manual", "schedule", "wal", "cli"), conservée dans le rapport
+
+    Returns:
+        {"started_at", "trigger", "duration_ms", "before", "after",
+         "tasks": [{"task", "outcome": ok|busy|skipped|error, "duration_ms", ...}]}
+        ou None si une maintenance est déjà en cours dans ce processus
+
+    Raises:
+        ValueError: tâche inconnue
+    """
+    tasks = list(tasks)
+    unknown = [task for task in tasks if task not in _TASK_FUNCTIONS]
+    if unknown:
+        raise ValueError(f"Tâche(s) de maintenance inconnue(s) : {', '.join(unknown)}")
+    if not _run_lock.acquire(blocking=False):
+        return None
+
+    try:
+        path = _db_path()
+        start = time.perf_counter()
+        report = {
+            "started_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "trigger": trigger,
+            "before": database_stats(path),
+            "tasks": [],
+        }
+        con = _connect(path)
+        try:
+            for task in TASKS:
+                if task not in tasks:
+                    continue
+                task_start = time.perf_counter()
+                try:
+                    result = _TASK_FUNCTIONS[task](con)
+                    outcome = "skipped" if "skipped" in result else "busy" if result.get("busy") else "ok"
+                except sqlite3.Error as e:
+                    result, outcome = {"error": str(e)}, "error"
+                    logger.warning(f"⚠️  Maintenance {task} : {e}")
+                duration = time.perf_counter() - task_start
+                DB_MAINTENANCE_RUNS.inc(task=task, outcome=outcome)
+                DB_MAINTENANCE_DURATION.observe(duration, task=task)
+                report["tasks"].append({"task": task, "outcome": outcome,
+                                        "duration_ms": round(duration * 1000, 1), **result})
+        finally:
+            con.close()
+
+        report["after"] = database_stats(path)
+        report["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        values = {"last_report": report}
+        if set(TASKS) <= set(tasks):
+            values["last_run"] = time.time()
+        _save_state(**values)
+        return report
+    finally:
+        _run_lock.release()
+
+
+def enable_incremental_vacuum(path: str = None) -> dict:
+    """
+    Passe la base en auto_vacuum=INCREMENTAL (opération ponctuelle)
+
+    Le mode ne peut changer que par un VACUUM complet, qui réécrit la base
+    sous verrou exclusif : à lancer hors des heures d'utilisation.
+
+    Returns:
+        {"changed", "db_bytes_before", "db_bytes_after", "duration_ms"}
+    """
+    path = path or _db_path()
+    con = _connect(path)
+    try:
+        if con.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return {"changed": False}
+        before = _file_size(path)
+        start = time.perf_counter()
+        con.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        con.execute("VACUUM")
+        con.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    finally:
+        con.close()
+    return {
+        "changed": True,
+        "db_bytes_before": before,
+        "db_bytes_after": _file_size(path),
+        "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+# ============================================================================
+# PLANIFICATEUR (périodes creuses)
+# ============================================================================
+
+def seconds_since_last_access(path: str = None) -> Optional[float]:
+    """Secondes depuis le dernier accès journalisé (None si aucun ou table absente)"""
+    path = path or _db_path()
+    try:
+        con = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=BUSY_TIMEOUT_MS / 1000)
+        try:
+            row = con.execute(
+                "SELECT (julianday('now') - julianday(MAX(accessed_at))) * 86400 FROM access_log").fetchone()
+        finally:
+            con.close()
+    except sqlite3.Error:
+        return None
+    return row[0]
+
+
+def is_idle(path: str = None) -> bool:
+    """Aucune requête en cours dans ce processus ni accès récent (tous workers)"""
+    if HTTP_IN_PROGRESS.get():
+        return False
+    elapsed = seconds_since_last_access(path)
+    return elapsed is None or elapsed >= Config.MAINTENANCE_IDLE_SECONDS
+
+
+def scheduler_tick() -> Optional[str]:
+    """
+    Un passage du planificateur
+
+    Returns:
+        Action lancée ("maintenance", "checkpoint") ou None
+    """
+    stats = update_metrics()
+    if not is_idle():
+        return None
+
+    last_run = load_state().get("last_run")
+    if last_run is None or time.time() - last_run >= Config.MAINTENANCE_INTERVAL_HOURS * 3600:
+        report = run_maintenance(trigger="schedule")
+        action = "maintenance"
+    elif stats["wal_bytes"] >= Config.MAINTENANCE_WAL_CHECKPOINT_MB * 1024 * 1024:
+        report = run_maintenance(["checkpoint"], trigger="wal")
+        action = "checkpoint"
+    else:
+        return None
+
+    if report:
+        logger.info(f"🧹 Maintenance de la base ({action}) : "
+                    + ", ".join(f"{t['task']}={t['outcome']}" for t in report["tasks"]))
+        update_metrics()
+    return action
+
+
+def _acquire_leadership() -> Optional[object]:
+    """Verrou exclusif non bloquant : un seul worker planifie la maintenance"""
+    lock_file = open(Config.MAINTENANCE_LOCK_PATH, "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def start_scheduler() -> bool:
+    """
+    Démarre le planificateur dans un thread (si ce processus obtient le verrou)
+
+    Returns:
+        True si le planificateur tourne dans ce processus
+    """
+    if _scheduler["thread"] is not None:
+        return True
+    lock_file = _acquire_leadership()
+    if lock_file is None:
+        return False
+
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(Config.MAINTENANCE_CHECK_SECONDS):
+            try:
+                scheduler_tick()
+            except Exception as e:
+                logger.error(f"❌ Planificateur de maintenance : {e}")
+
+    _scheduler.update(stop=stop, lock_file=lock_file,
+                      thread=threading.Thread(target=loop, name="db-maintenance", daemon=True))
+    _scheduler["thread"].start()
+    return True
+
+
+def stop_scheduler():
+    """Arrête le planificateur et libère le verrou"""
+    if _scheduler["thread"] is None:
+        return
+    _scheduler["stop"].set()
+    _scheduler["thread"].join(timeout=5)
+    _scheduler["lock_file"].close()
+    _scheduler.update(thread=None, stop=None, lock_file=None)
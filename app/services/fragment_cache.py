@@ -0,0 +1,125 @@
+"""
+Cache des fragments HTML rendus pour les pages recette
+
+Le tableau des ingrédients et la liste des étapes de recipe_detail.html sont
+rendus par Jinja à chaque affichage alors que les données changent rarement.
+Les fragments rendus sont conservés dans un LRU borné en mémoire, indexé par
+(recipe_id, lang, génération de la recette, nom du fragment).
+
+Génération d'une recette :
+- recipe.content_generation, avancée par triggers pour cette seule recette
+  (migrations/add_recipe_content_generation.sql) et lue par la requête qui
+  charge déjà la recette (get_recipe_by_slug) : une écriture sur une recette
+  n'invalide pas les fragments des autres ;
+- compteur local incrémenté par invalidate_recipe() (appelé par les fonctions
+  d'écriture), seul repère quand la migration n'est pas appliquée.
+
+Une entrée devenue obsolète n'est jamais relue : elle sort du LRU naturellement.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from app.services.metrics import CACHE_BYTES, CACHE_REQUESTS
+
+# Mémoire maximale occupée par les fragments (taille UTF-8 du HTML)
+FRAGMENT_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
+
+class FragmentCache:
+    """LRU de fragments HTML avec plafond mémoire (thread-safe)"""
+
+    def __init__(self, max_bytes: int = FRAGMENT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._sizes: Dict[Tuple, int] = {}
+        self._generations: Dict[int, int] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get_or_render(self, recipe_id: int, lang: str, name: str, render: Callable[[], str],
+                      generation: Optional[int] = None) -> str:
+        """
+        Retourne le fragment en cache, ou le rend et le met en cache
+
+        Args:
+            recipe_id: ID de la recette
+            lang: Code de langue
+            name: Nom du fragment (ex: 'ingredients', 'steps')
+            render: Fonction sans argument produisant le HTML
+            generation: recipe.content_generation de la recette (None sans la migration)
+
+        Returns:
+            HTML du fragment
+        """
+        with self._lock:
+            key = (recipe_id, lang, generation, self._generations.get(recipe_id, 0), name)
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                CACHE_REQUESTS.inc(cache="fragment", result="hit")
+                return html
+            self._misses += 1
+        CACHE_REQUESTS.inc(cache="fragment", result="miss")
+
+        # Rendu hors verrou : deux rendus concurrents produisent le même HTML
+        html = render()
+        size = len(html.encode("utf-8"))
+        if size > self.max_bytes:
+            return html
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = html
+                self._sizes[key] = size
+                self._bytes += size
+            while self._bytes > self.max_bytes:
+                old_key, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(old_key)
+            CACHE_BYTES.set(self._bytes, cache="fragment")
+        return html
+
+    def invalidate_recipe(self, recipe_id: int):
+        """Invalide tous les fragments d'une recette (toutes langues)"""
+        with self._lock:
+            self._generations[recipe_id] = self._generations.get(recipe_id, 0) + 1
+            for key in [k for k in self._entries if k[0] == recipe_id]:
+                del self._entries[key]
+                self._bytes -= self._sizes.pop(key)
+            CACHE_BYTES.set(self._bytes, cache="fragment")
+
+    def clear(self):
+        """Vide le cache et remet les statistiques à zéro"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            CACHE_BYTES.set(0, cache="fragment")
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> dict:
+        """Statistiques : taux de succès et mémoire occupée"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+fragment_cache = FragmentCache()
+
+
+def invalidate_recipe(recipe_id: int):
+    """Invalide les fragments d'une recette (appelé après chaque écriture)"""
+    if recipe_id:
+        fragment_cache.invalidate_recipe(recipe_id)
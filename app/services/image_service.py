@@ -1,27 +1,57 @@
-"""Service de gestion des images de recettes - Version sans Pillow"""
+"""
+Service de gestion des images de recettes
+
+Les originaux sont enregistrés tels quels ; les variantes (thumbnail, taille
+moyenne, WebP) sont générées en arrière-plan avec Pillow s'il est installé.
+Sans Pillow, le thumbnail reste l'image originale.
+"""
 
 import os
 import uuid
 import shutil
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional
+
+from app.services.upload_service import stream_upload_to_file
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow optionnel
+    Image = None
+    ImageOps = None
+
+logger = logging.getLogger(__name__)
 
 # Configuration
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.gif'}
 
+# Variantes générées : nom -> côté maximal en pixels
+IMAGE_VARIANTS = {
+    'thumb': 320,    # Listes, calendrier, événements
+    'medium': 960,   # Page de détail d'une recette
+}
+VARIANT_FORMATS = ('webp', 'jpg')  # Le premier format est celui enregistré en base
+VARIANT_QUALITY = 82
+VARIANT_WORKERS = 2
+
 # Chemins des répertoires d'images
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 IMAGES_DIR = BASE_DIR / "static" / "images" / "recipes"
 THUMBNAILS_DIR = BASE_DIR / "static" / "images" / "recipes" / "thumbnails"
 STEPS_IMAGES_DIR = BASE_DIR / "static" / "images" / "steps"
 EVENTS_IMAGES_DIR = BASE_DIR / "static" / "images" / "events"
+EVENTS_THUMBNAILS_DIR = BASE_DIR / "static" / "images" / "events" / "thumbnails"
 
 # Créer les répertoires s'ils n'existent pas
 IMAGES_DIR.mkdir(parents=True, exist_ok=True)
 THUMBNAILS_DIR.mkdir(parents=True, exist_ok=True)
 STEPS_IMAGES_DIR.mkdir(parents=True, exist_ok=True)
 EVENTS_IMAGES_DIR.mkdir(parents=True, exist_ok=True)
+EVENTS_THUMBNAILS_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def is_allowed_file(filename: str) -> bool:
@@ -38,68 +68,334 @@ def is_allowed_file(filename: str) -> bool:
     return ext in ALLOWED_EXTENSIONS
 
 
-def save_recipe_image(file_data: bytes, filename: str) -> Tuple[str, str]:
+async def save_recipe_image_upload(file) -> Tuple[str, str]:
     """
-    Sauvegarde une image de recette (version simple sans redimensionnement)
+    Sauvegarde une image de recette uploadée (l'original, sans redimensionnement)
+
+    Le fichier est écrit par blocs sur disque : le contenu n'est jamais
+    chargé entièrement en mémoire et l'upload est interrompu dès MAX_FILE_SIZE.
 
     Args:
-        file_data: Données du fichier image
-        filename: Nom original du fichier
+        file: Fichier uploadé (UploadFile)
 
     Returns:
         Tuple (url_image, url_thumbnail) - URLs relatives pour la base de données
-        Note: Dans cette version, thumbnail = image (même fichier)
+        Note: thumbnail = image tant que les variantes ne sont pas générées
+        (cf. schedule_recipe_image_variants)
 
     Raises:
         ValueError: Si le fichier est invalide
     """
-    # Vérifier l'extension
-    if not is_allowed_file(filename):
+    if not is_allowed_file(file.filename or ''):
         raise ValueError(f"Extension de fichier non autorisée. Formats acceptés: {', '.join(ALLOWED_EXTENSIONS)}")
 
-    # Vérifier la taille
-    if len(file_data) > MAX_FILE_SIZE:
-        raise ValueError(f"Fichier trop volumineux. Taille maximale: {MAX_FILE_SIZE // (1024*1024)}MB")
+    image_filename = f"{uuid.uuid4().hex[:12]}{Path(file.filename).suffix.lower()}"
+    await stream_upload_to_file(file, IMAGES_DIR / image_filename, MAX_FILE_SIZE)
+
+    image_url = f"/static/images/recipes/{image_filename}"
+    return image_url, image_url
+
+
+def delete_recipe_image(image_url: Optional[str], thumbnail_url: Optional[str]):
+    """
+    Supprime les fichiers image d'une recette (original et variantes)
+
+    Args:
+        image_url: URL de l'image principale
+        thumbnail_url: URL du thumbnail (les variantes sont retrouvées à partir de l'image)
+    """
+    if image_url:
+        image_path = BASE_DIR / image_url.lstrip('/')
+        if image_path.exists():
+            image_path.unlink()
+
+        for variant_path in _variant_paths(image_path).values():
+            if variant_path.exists():
+                variant_path.unlink()
+
+
+# --------------------------------------------------------------------
+# Variantes d'images (thumbnail, taille moyenne, WebP)
+# --------------------------------------------------------------------
+
+def _variant_paths(image_path: Path) -> Dict[str, Path]:
+    """
+    Chemins des variantes d'une image, indexés par 'nom.format'
+
+    Les variantes sont rangées dans le sous-répertoire thumbnails/ de l'image.
+    Ex: recipes/abc.jpg -> recipes/thumbnails/abc_thumb.webp, abc_medium.jpg, ...
+        events/def.png  -> events/thumbnails/def_thumb.webp, ...
+    """
+    return {
+        f"{name}.{fmt}": image_path.parent / "thumbnails" / f"{image_path.stem}_{name}.{fmt}"
+        for name in IMAGE_VARIANTS
+        for fmt in VARIANT_FORMATS
+    }
+
+
+def _path_to_url(path: Path) -> str:
+    """Convertit un chemin sous BASE_DIR en URL relative"""
+    return "/" + path.relative_to(BASE_DIR).as_posix()
+
 
-    # Générer un nom de fichier unique
-    unique_id = uuid.uuid4().hex[:12]
-    file_extension = Path(filename).suffix.lower()
-    image_filename = f"{unique_id}{file_extension}"
+def variants_available() -> bool:
+    """Indique si la génération de variantes est possible (Pillow installé)"""
+    return Image is not None
 
-    # Chemins complets
-    image_path = IMAGES_DIR / image_filename
 
+def generate_image_variants(image_url: str) -> Optional[Dict[str, str]]:
+    """
+    Génère les variantes d'une image (recette ou photo d'événement)
+
+    Fonction de niveau module pour être exécutée dans le pool de processus.
+    Chaque fichier est écrit dans un fichier temporaire puis renommé
+    (un lecteur ne voit jamais de variante à moitié écrite).
+
+    Args:
+        image_url: URL relative de l'image originale
+
+    Returns:
+        Dictionnaire {'thumb.webp': url, 'thumb.jpg': url, ...}
+        ou None si Pillow n'est pas disponible ou l'image est illisible
+    """
+    if Image is None:
+        return None
+
+    image_path = BASE_DIR / image_url.lstrip('/')
     try:
-        # Sauvegarder l'image telle quelle
-        with open(image_path, 'wb') as f:
-            f.write(file_data)
+        with Image.open(image_path) as source:
+            source = ImageOps.exif_transpose(source)
+            if source.mode not in ('RGB', 'L'):
+                source = source.convert('RGBA')
+                background = Image.new('RGB', source.size, (255, 255, 255))
+                background.paste(source, mask=source.split()[-1])
+                source = background
+
+            urls = {}
+            paths = _variant_paths(image_path)
+            for name, max_side in IMAGE_VARIANTS.items():
+                variant = source.copy()
+                variant.thumbnail((max_side, max_side), Image.LANCZOS)
+                for fmt in VARIANT_FORMATS:
+                    target = paths[f"{name}.{fmt}"]
+                    tmp_path = target.with_name(f".{target.name}.tmp")
+                    if fmt == 'webp':
+                        variant.save(tmp_path, 'WEBP', quality=VARIANT_QUALITY, method=4)
+                    else:
+                        variant.save(tmp_path, 'JPEG', quality=VARIANT_QUALITY,
+                                     optimize=True, progressive=True)
+                    os.replace(tmp_path, target)
+                    urls[f"{name}.{fmt}"] = _path_to_url(target)
+            return urls
+
+    except Exception as e:
+        logger.error(f"Erreur lors de la génération des variantes de {image_url}: {e}")
+        return None
+
+
+def has_image_variants(image_url: str) -> bool:
+    """Vérifie que toutes les variantes d'une image existent sur disque"""
+    image_path = BASE_DIR / image_url.lstrip('/')
+    return all(path.exists() for path in _variant_paths(image_path).values())
+
+
+def thumbnail_url_for(variants: Dict[str, str]) -> str:
+    """URL à enregistrer en base comme thumbnail (premier format de VARIANT_FORMATS)"""
+    return variants[f"thumb.{VARIANT_FORMATS[0]}"]
+
 
-        # Retourner les URLs relatives (pour stocker dans la DB)
-        # Note: pas de thumbnail séparé dans cette version simplifiée
-        image_url = f"/static/images/recipes/{image_filename}"
-        thumbnail_url = image_url  # Même URL pour le thumbnail
+# Pool de processus partagé (créé à la première utilisation)
+_variant_pool = None
+_variant_pool_lock = threading.Lock()
 
-        return image_url, thumbnail_url
 
+def _get_variant_pool() -> ProcessPoolExecutor:
+    """Retourne le pool de processus de génération des variantes"""
+    global _variant_pool
+    with _variant_pool_lock:
+        if _variant_pool is None:
+            _variant_pool = ProcessPoolExecutor(max_workers=VARIANT_WORKERS)
+        return _variant_pool
+
+
+def _record_recipe_variants(recipe_id: int, image_url: str, variants: Optional[Dict[str, str]]):
+    """Enregistre le thumbnail généré (ignoré si l'image a changé entre-temps)"""
+    if not variants:
+        return
+    from app.models import db
+    db.update_recipe_thumbnail(recipe_id, image_url, thumbnail_url_for(variants))
+
+
+def schedule_recipe_image_variants(recipe_id: int, image_url: str):
+    """
+    Planifie la génération des variantes d'une image de recette
+
+    Ne bloque pas la requête : la génération a lieu dans le pool de processus
+    et le thumbnail est enregistré en base une fois les fichiers écrits.
+
+    Args:
+        recipe_id: ID de la recette
+        image_url: URL relative de l'image originale
+    """
+    if not variants_available():
+        return
+
+    def _on_done(future):
+        try:
+            _record_recipe_variants(recipe_id, image_url, future.result())
+        except Exception as e:
+            logger.error(f"Variantes de la recette {recipe_id} non enregistrées: {e}")
+
+    try:
+        _get_variant_pool().submit(generate_image_variants, image_url).add_done_callback(_on_done)
     except Exception as e:
-        # Nettoyer en cas d'erreur
-        if image_path.exists():
-            image_path.unlink()
-        raise ValueError(f"Erreur lors de la sauvegarde de l'image: {str(e)}")
+        # Pool indisponible : l'image originale reste utilisée comme thumbnail
+        logger.warning(f"Impossible de planifier les variantes de {image_url}: {e}")
 
 
-def delete_recipe_image(image_url: Optional[str], thumbnail_url: Optional[str]):
+def schedule_event_photo_variants(photo_url: str):
     """
-    Supprime les fichiers image d'une recette
+    Planifie la génération des variantes d'une photo d'événement
+
+    Rien n'est enregistré en base : la liste des événements retrouve le
+    thumbnail sur disque (event_photo_thumbnail_url).
 
     Args:
-        image_url: URL de l'image principale
-        thumbnail_url: URL du thumbnail (ignoré dans cette version)
+        photo_url: URL relative de la photo originale
     """
-    if image_url:
-        image_path = BASE_DIR / image_url.lstrip('/')
-        if image_path.exists():
-            image_path.unlink()
+    if not variants_available():
+        return
+
+    def _on_done(future):
+        try:
+            if not future.result():
+                logger.error(f"Variantes de la photo {photo_url} non générées")
+        except Exception as e:
+            logger.error(f"Variantes de la photo {photo_url} non générées: {e}")
+
+    try:
+        _get_variant_pool().submit(generate_image_variants, photo_url).add_done_callback(_on_done)
+    except Exception as e:
+        logger.warning(f"Impossible de planifier les variantes de {photo_url}: {e}")
+
+
+def event_photo_thumbnail_url(photo_url: Optional[str]) -> Optional[str]:
+    """
+    URL du thumbnail d'une photo d'événement, ou de l'original tant qu'il n'est pas généré
+
+    Args:
+        photo_url: URL relative de la photo originale
+
+    Returns:
+        URL du thumbnail (premier format de VARIANT_FORMATS) ou photo_url
+    """
+    if not photo_url:
+        return photo_url
+    thumb_path = _variant_paths(BASE_DIR / photo_url.lstrip('/'))[f"thumb.{VARIANT_FORMATS[0]}"]
+    return _path_to_url(thumb_path) if thumb_path.exists() else photo_url
+
+
+def regenerate_missing_variants(force: bool = False) -> Dict[str, int]:
+    """
+    Régénère en masse les variantes manquantes des images de recettes
+
+    Args:
+        force: Régénère aussi les variantes déjà présentes
+
+    Returns:
+        Statistiques {'total', 'generated', 'skipped', 'failed'}
+    """
+    from app.models import db
+
+    stats = {'total': 0, 'generated': 0, 'skipped': 0, 'failed': 0}
+    if not variants_available():
+        logger.warning("Pillow n'est pas installé : aucune variante générée")
+        return stats
+
+    recipes = db.list_recipe_images()
+    stats['total'] = len(recipes)
+
+    todo = []
+    for recipe in recipes:
+        image_path = BASE_DIR / recipe['image_url'].lstrip('/')
+        if not image_path.exists():
+            stats['failed'] += 1
+            continue
+        if not force and has_image_variants(recipe['image_url']):
+            # Fichiers présents : s'assurer que la base pointe bien sur le thumbnail
+            expected = _path_to_url(_variant_paths(image_path)[f"thumb.{VARIANT_FORMATS[0]}"])
+            if recipe['thumbnail_url'] != expected:
+                db.update_recipe_thumbnail(recipe['id'], recipe['image_url'], expected)
+            stats['skipped'] += 1
+            continue
+        todo.append(recipe)
+
+    image_urls = [recipe['image_url'] for recipe in todo]
+    for recipe, variants in zip(todo, _get_variant_pool().map(generate_image_variants, image_urls)):
+        if variants:
+            _record_recipe_variants(recipe['id'], recipe['image_url'], variants)
+            stats['generated'] += 1
+        else:
+            stats['failed'] += 1
+
+    return stats
+
+
+def regenerate_missing_event_variants(force: bool = False) -> Dict[str, int]:
+    """
+    Régénère en masse les variantes manquantes des photos d'événements
+
+    Args:
+        force: Régénère aussi les variantes déjà présentes
+
+    Returns:
+        Statistiques {'total', 'generated', 'skipped', 'failed'}
+    """
+    stats = {'total': 0, 'generated': 0, 'skipped': 0, 'failed': 0}
+    if not variants_available():
+        logger.warning("Pillow n'est pas installé : aucune variante générée")
+        return stats
+
+    photo_urls = [
+        _path_to_url(path) for path in sorted(EVENTS_IMAGES_DIR.iterdir())
+        if path.is_file() and is_allowed_file(path.name)
+    ]
+    stats['total'] = len(photo_urls)
+
+    todo = []
+    for photo_url in photo_urls:
+        if not force and has_image_variants(photo_url):
+            stats['skipped'] += 1
+        else:
+            todo.append(photo_url)
+
+    for variants in _get_variant_pool().map(generate_image_variants, todo):
+        stats['generated' if variants else 'failed'] += 1
+
+    return stats
+
+
+def image_variant_url(thumbnail_url: Optional[str], name: str = 'thumb', fmt: Optional[str] = None) -> Optional[str]:
+    """
+    Déduit l'URL d'une autre variante à partir du thumbnail enregistré en base
+
+    Si le thumbnail n'est pas une variante générée (Pillow absent, génération
+    en cours), l'URL est renvoyée telle quelle (image originale).
+
+    Args:
+        thumbnail_url: URL du thumbnail stockée en base
+        name: Nom de la variante ('thumb', 'medium')
+        fmt: Format souhaité ('webp', 'jpg') ; par défaut celui du thumbnail
+
+    Returns:
+        URL de la variante
+    """
+    if not thumbnail_url:
+        return thumbnail_url
+    stem, dot, ext = thumbnail_url.rpartition('.')
+    if not dot or not stem.endswith('_thumb') or '/thumbnails/' not in stem:
+        return thumbnail_url
+    return f"{stem[:-len('_thumb')]}_{name}.{fmt or ext}"
 
 
 def get_default_image_url() -> str:
@@ -112,13 +408,12 @@ def get_default_image_url() -> str:
     return "/static/images/recipe-placeholder.jpg"
 
 
-def save_step_image(file_data: bytes, filename: str) -> str:
+async def save_step_image_upload(file) -> str:
     """
-    Sauvegarde une image d'étape de recette
+    Sauvegarde une image d'étape uploadée, écrite par blocs sur disque
 
     Args:
-        file_data: Données du fichier image
-        filename: Nom original du fichier
+        file: Fichier uploadé (UploadFile)
 
     Returns:
         URL relative de l'image pour la base de données
@@ -126,36 +421,13 @@ def save_step_image(file_data: bytes, filename: str) -> str:
     Raises:
         ValueError: Si le fichier est invalide
     """
-    # Vérifier l'extension
-    if not is_allowed_file(filename):
+    if not is_allowed_file(file.filename or ''):
         raise ValueError(f"Extension de fichier non autorisée. Formats acceptés: {', '.join(ALLOWED_EXTENSIONS)}")
 
-    # Vérifier la taille
-    if len(file_data) > MAX_FILE_SIZE:
-        raise ValueError(f"Fichier trop volumineux. Taille maximale: {MAX_FILE_SIZE // (1024*1024)}MB")
-
-    # Générer un nom de fichier unique
-    unique_id = uuid.uuid4().hex[:12]
-    file_extension = Path(filename).suffix.lower()
-    image_filename = f"step_{unique_id}{file_extension}"
-
-    # Chemin complet
-    image_path = STEPS_IMAGES_DIR / image_filename
-
-    try:
-        # Sauvegarder l'image
-        with open(image_path, 'wb') as f:
-            f.write(file_data)
-
-        # Retourner l'URL relative
-        image_url = f"/static/images/steps/{image_filename}"
-        return image_url
+    image_filename = f"step_{uuid.uuid4().hex[:12]}{Path(file.filename).suffix.lower()}"
+    await stream_upload_to_file(file, STEPS_IMAGES_DIR / image_filename, MAX_FILE_SIZE)
 
-    except Exception as e:
-        # Nettoyer en cas d'erreur
-        if image_path.exists():
-            image_path.unlink()
-        raise ValueError(f"Erreur lors de la sauvegarde de l'image: {str(e)}")
+    return f"/static/images/steps/{image_filename}"
 
 
 def delete_step_image(image_url: Optional[str]):
@@ -171,31 +443,29 @@ def delete_step_image(image_url: Optional[str]):
             image_path.unlink()
 
 
-def save_event_photo(file_data: bytes, filename: str) -> str:
+async def save_event_photo_upload(file) -> str:
     """
-    Sauvegarde une photo d'événement.
+    Sauvegarde une photo d'événement uploadée, écrite par blocs sur disque.
 
     Returns:
         URL relative de la photo (ex: /static/images/events/uuid.jpg)
     """
-    if not is_allowed_file(filename):
+    if not is_allowed_file(file.filename or ''):
         raise ValueError(f"Extension non autorisée. Formats acceptés : {', '.join(ALLOWED_EXTENSIONS)}")
-    if len(file_data) > MAX_FILE_SIZE:
-        raise ValueError(f"Fichier trop volumineux (max {MAX_FILE_SIZE // (1024*1024)} MB)")
 
-    ext = Path(filename).suffix.lower()
-    unique_name = f"{uuid.uuid4().hex}{ext}"
-    photo_path = EVENTS_IMAGES_DIR / unique_name
-
-    with open(photo_path, "wb") as f:
-        f.write(file_data)
+    unique_name = f"{uuid.uuid4().hex}{Path(file.filename).suffix.lower()}"
+    await stream_upload_to_file(file, EVENTS_IMAGES_DIR / unique_name, MAX_FILE_SIZE)
 
     return f"/static/images/events/{unique_name}"
 
 
 def delete_event_photo_file(photo_url: Optional[str]):
-    """Supprime le fichier photo d'un événement."""
+    """Supprime le fichier photo d'un événement et ses variantes."""
     if photo_url:
         photo_path = BASE_DIR / photo_url.lstrip('/')
         if photo_path.exists():
             photo_path.unlink()
+
+        for variant_path in _variant_paths(photo_path).values():
+            if variant_path.exists():
+                variant_path.unlink()
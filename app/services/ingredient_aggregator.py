@@ -304,6 +304,50 @@ class IngredientAggregator:
                 # Pour les autres unités (cuillères, tasses, etc.), garder 1 décimale
                 return (round(quantity, 1), standard_unit)
 
+    def _purchase_quantity(self, total_standard: float, standard_unit: Optional[str], lang: str) -> tuple:
+        """
+        Quantité d'achat d'un total exprimé en unité standard
+
+        Returns:
+            Tuple (quantité_achat, unité_achat traduite) ; (None, "") si pas de quantité
+        """
+        if total_standard <= 0:
+            return (None, "")
+        if standard_unit:
+            purchase_qty, purchase_unit = self.convert_to_purchase_unit(total_standard, standard_unit)
+            # Traduire l'unité dans la langue demandée
+            return (purchase_qty, self.translate_unit(purchase_unit, lang))
+        # Ingrédient sans unité (ex: œufs, nombre d'items)
+        # Arrondir AU SUPÉRIEUR car on ne peut pas acheter 2.3 œufs
+        import math
+        return (math.ceil(total_standard), "")
+
+    def total_from_sources(self, ingredient_name: str, sources: List[Dict], lang: str = "fr") -> tuple:
+        """
+        Recalcule la quantité d'achat d'une ligne depuis ses recettes sources
+        (même calcul que aggregate_ingredients, ex: après mise à l'échelle d'une recette)
+
+        Args:
+            ingredient_name: Nom de l'ingrédient (ligne de la liste de courses)
+            sources: Sources de la ligne ({'quantity', 'unit'}, quantités déjà multipliées)
+            lang: Langue
+
+        Returns:
+            Tuple (quantité_achat, unité_achat)
+        """
+        total_standard = 0
+        standard_unit = None
+        for source in sources:
+            if not source.get("quantity"):
+                continue
+            std_quantity, std_unit = self.convert_to_standard_unit(
+                source["quantity"], (source.get("unit") or "").strip(), ingredient_name
+            )
+            if standard_unit is None:
+                standard_unit = std_unit
+            total_standard += std_quantity
+        return self._purchase_quantity(total_standard, standard_unit, lang)
+
     def aggregate_ingredients(
         self,
         recipes_ingredients: List[Dict],
@@ -411,23 +455,9 @@ class IngredientAggregator:
             display_name = normalized_name
 
             # Convertir vers unité d'achat
-            if data["total_quantity_standard"] > 0:
-                if data["standard_unit"]:
-                    purchase_qty, purchase_unit = self.convert_to_purchase_unit(
-                        data["total_quantity_standard"],
-                        data["standard_unit"]
-                    )
-                    # Traduire l'unité dans la langue demandée
-                    purchase_unit = self.translate_unit(purchase_unit, lang)
-                else:
-                    # Ingrédient sans unité (ex: œufs, nombre d'items)
-                    # Arrondir AU SUPÉRIEUR car on ne peut pas acheter 2.3 œufs
-                    import math
-                    purchase_qty = math.ceil(data["total_quantity_standard"])
-                    purchase_unit = ""
-            else:
-                purchase_qty = None
-                purchase_unit = ""
+            purchase_qty, purchase_unit = self._purchase_quantity(
+                data["total_quantity_standard"], data["standard_unit"], lang
+            )
 
             # Traduire aussi les unités dans source_recipes
             translated_sources = []
@@ -9,6 +9,7 @@ from app.models.db_core import get_db, normalize_ingredient_name
 from groq import Groq
 import os
 import json
+from app.services.metrics import llm_call
 
 logger = logging.getLogger(__name__)
 
@@ -135,22 +136,23 @@ EXEMPLES:
         try:
             logger.info(f"Requête IA pour matcher: {receipt_item_name}")
 
-            response = self.groq_client.chat.completions.create(
-                model="openai/gpt-oss-120b",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Tu es un assistant spécialisé dans l'identification d'ingrédients. Tu retournes UNIQUEMENT du JSON valide."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.1,
-                max_tokens=500,
-                reasoning_effort="low"
-            )
+            with llm_call("IngredientMatcher"):
+                response = self.groq_client.chat.completions.create(
+                    model="openai/gpt-oss-120b",
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "Tu es un assistant spécialisé dans l'identification d'ingrédients. Tu retournes UNIQUEMENT du JSON valide."
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    temperature=0.1,
+                    max_tokens=500,
+                    reasoning_effort="low"
+                )
 
             content = response.choices[0].message.content.strip()
 
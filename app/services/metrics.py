@@ -0,0 +1,404 @@
+"""
+Registre de métriques en mémoire (compteurs, jauges, histogrammes)
+
+Exposé au format texte Prometheus par /metrics (réservé aux administrateurs).
+
+Plusieurs workers uvicorn : chaque processus écrit périodiquement un
+instantané JSON de ses métriques dans un répertoire partagé (un fichier par
+PID, remplacé atomiquement). /metrics fusionne les instantanés :
+- compteurs et histogrammes sont additionnés, y compris ceux des workers
+  arrêtés (les totaux restent monotones) ;
+- les jauges ne sont additionnées que pour les processus encore vivants.
+
+Métriques applicatives :
+- requêtes HTTP par gabarit de route (ex: /events/{event_id}/budget) ;
+- connexions SQLite ouvertes et requêtes SQL par requête HTTP ;
+- latence des appels LLM par service ;
+- succès / échecs des caches.
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import Config
+
+# Bornes (secondes) des histogrammes de durée de requête HTTP
+HTTP_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Bornes des histogrammes de nombre de requêtes SQL par requête HTTP
+DB_QUERIES_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+# Bornes (secondes) des histogrammes de latence des appels LLM
+LLM_DURATION_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+# Bornes (secondes) des histogrammes de durée des tâches de maintenance de la base
+MAINTENANCE_DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+# Intervalle minimal entre deux écritures de l'instantané d'un worker
+FLUSH_INTERVAL_SECONDS = 5.0
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Metric:
+    """Métrique nommée avec étiquettes (valeurs indexées par tuple d'étiquettes)"""
+
+    kind = None
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help_text: str, labelnames: Iterable[str]):
+        self._registry = registry
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames) or any(n not in labels for n in self.labelnames):
+            raise ValueError(f"{self.name} attend les étiquettes {self.labelnames}, reçu {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+
+class Counter(_Metric):
+    """Compteur monotone"""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._registry._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Valeur instantanée (peut monter et descendre)"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._registry._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._registry._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        """Valeur courante dans ce processus (0 si jamais renseignée)"""
+        key = self._key(labels)
+        with self._registry._lock:
+            return self._values.get(key, 0.0)
+
+
+class Histogram(_Metric):
+    """
+    Histogramme à seaux fixes
+
+    Valeur par jeu d'étiquettes : [effectif de chaque seau..., effectif +Inf, somme]
+    (effectifs non cumulés, cumulés au rendu).
+    """
+
+    kind = "histogram"
+
+    def __init__(self, registry, name, help_text, labelnames, buckets: Iterable[float]):
+        super().__init__(registry, name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._registry._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Mesure la durée (secondes) du bloc"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+
+class MetricsRegistry:
+    """Ensemble des métriques d'un processus (thread-safe)"""
+
+    def __init__(self, multiprocess_dir: Optional[str] = None,
+                 flush_interval: float = FLUSH_INTERVAL_SECONDS):
+        self.multiprocess_dir = multiprocess_dir
+        self.flush_interval = flush_interval
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+
+    def _register(self, cls, name, help_text, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(self, name, help_text, labelnames, **kwargs)
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = HTTP_DURATION_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    # ------------------------------------------------------------------
+    # Instantanés et agrégation multi-workers
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> dict:
+        """Copie sérialisable (JSON) des métriques du processus"""
+        with self._lock:
+            return {
+                name: {
+                    "type": metric.kind,
+                    "help": metric.help,
+                    "labelnames": list(metric.labelnames),
+                    "buckets": list(getattr(metric, "buckets", ())),
+                    "values": [
+                        [list(key), list(value) if isinstance(value, list) else value]
+                        for key, value in metric._values.items()
+                    ],
+                }
+                for name, metric in self._metrics.items()
+            }
+
+    def _snapshot_path(self, pid: int) -> str:
+        return os.path.join(self.multiprocess_dir, f"metrics-{pid}.json")
+
+    def flush(self):
+        """Écrit l'instantané du processus dans le répertoire partagé"""
+        if not self.multiprocess_dir:
+            return
+        os.makedirs(self.multiprocess_dir, exist_ok=True)
+        path = self._snapshot_path(os.getpid())
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+        self._last_flush = time.monotonic()
+
+    def maybe_flush(self):
+        """Écrit l'instantané si le dernier date de plus de flush_interval"""
+        if self.multiprocess_dir and time.monotonic() - self._last_flush >= self.flush_interval:
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Erreur lors de l'écriture des métriques: {e}")
+
+    def _peer_snapshots(self) -> List[Tuple[bool, dict]]:
+        """Instantanés des autres workers : [(processus vivant, instantané)]"""
+        if not self.multiprocess_dir or not os.path.isdir(self.multiprocess_dir):
+            return []
+        own = os.getpid()
+        snapshots = []
+        for filename in os.listdir(self.multiprocess_dir):
+            if not (filename.startswith("metrics-") and filename.endswith(".json")):
+                continue
+            try:
+                pid = int(filename[len("metrics-"):-len(".json")])
+            except ValueError:
+                continue
+            if pid == own:
+                continue
+            try:
+                with open(os.path.join(self.multiprocess_dir, filename), encoding="utf-8") as f:
+                    snapshots.append((_pid_alive(pid), json.load(f)))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def collect(self) -> dict:
+        """Métriques fusionnées du processus courant et des autres workers"""
+        merged = self.snapshot()
+        for name in merged:
+            merged[name]["values"] = {tuple(k): v for k, v in merged[name]["values"]}
+
+        for alive, snapshot in self._peer_snapshots():
+            for name, metric in snapshot.items():
+                if metric["type"] == "gauge" and not alive:
+                    continue
+                target = merged.setdefault(name, dict(metric, values={}))
+                if target["type"] != metric["type"] or target["buckets"] != metric["buckets"]:
+                    continue
+                for key, value in metric["values"]:
+                    key = tuple(key)
+                    current = target["values"].get(key)
+                    if current is None:
+                        target["values"][key] = value
+                    elif isinstance(value, list):
+                        target["values"][key] = [a + b for a, b in zip(current, value)]
+                    else:
+                        target["values"][key] = current + value
+        return merged
+
+    def render(self) -> str:
+        """Métriques fusionnées au format texte Prometheus"""
+        lines = []
+        for name, metric in sorted(self.collect().items()):
+            lines.append(f"# HELP {name} {_escape_help(metric['help'])}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+            labelnames = metric["labelnames"]
+            for key, value in sorted(metric["values"].items()):
+                labels = list(zip(labelnames, key))
+                if metric["type"] != "histogram":
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(list(metric["buckets"]) + ["+Inf"], value[:-1]):
+                    cumulative += count
+                    le = bound if bound == "+Inf" else _format_value(bound)
+                    lines.append(f"{name}_bucket{_format_labels(labels + [('le', le)])} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value[-1])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: list) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+# ============================================================================
+# REGISTRE DU PROCESSUS ET MÉTRIQUES APPLICATIVES
+# ============================================================================
+
+registry = MetricsRegistry(multiprocess_dir=Config.METRICS_DIR if Config.WORKERS > 1 else None)
+
+HTTP_REQUESTS = registry.counter(
+    "recette_http_requests_total", "Requêtes HTTP traitées", ("method", "route", "status"))
+HTTP_DURATION = registry.histogram(
+    "recette_http_request_duration_seconds", "Durée des requêtes HTTP", ("method", "route"),
+    buckets=HTTP_DURATION_BUCKETS)
+HTTP_IN_PROGRESS = registry.gauge(
+    "recette_http_requests_in_progress", "Requêtes HTTP en cours de traitement")
+
+DB_CONNECTIONS = registry.counter(
+    "recette_db_connections_total", "Connexions SQLite ouvertes par get_db()")
+DB_QUERIES = registry.histogram(
+    "recette_db_queries_per_request", "Requêtes SQL exécutées par requête HTTP", ("route",),
+    buckets=DB_QUERIES_BUCKETS)
+
+LLM_DURATION = registry.histogram(
+    "recette_llm_call_duration_seconds", "Durée des appels aux API LLM", ("service", "outcome"),
+    buckets=LLM_DURATION_BUCKETS)
+
+CACHE_REQUESTS = registry.counter(
+    "recette_cache_requests_total", "Consultations des caches applicatifs", ("cache", "result"))
+CACHE_BYTES = registry.gauge(
+    "recette_cache_bytes", "Mémoire occupée par les caches applicatifs", ("cache",))
+
+DB_BACKUPS = registry.counter(
+    "recette_db_backups_total", "Sauvegardes à chaud de la base", ("outcome",))
+
+# Maintenance de la base : jauges publiées par le seul worker qui planifie
+# la maintenance (voir app/services/db_maintenance.py)
+DB_FILE_BYTES = registry.gauge(
+    "recette_db_file_bytes", "Taille des fichiers de la base (db, wal, shm)", ("file",))
+DB_FREELIST_PAGES = registry.gauge(
+    "recette_db_freelist_pages", "Pages libres de la base (récupérables par incremental_vacuum)")
+DB_WAL_FRAMES = registry.gauge(
+    "recette_db_wal_frames", "Cadres présents dans le WAL (retard de checkpoint)")
+DB_CHECKPOINT_AGE = registry.gauge(
+    "recette_db_checkpoint_age_seconds", "Secondes depuis le dernier checkpoint TRUNCATE complet")
+DB_MAINTENANCE_RUNS = registry.counter(
+    "recette_db_maintenance_runs_total", "Tâches de maintenance de la base", ("task", "outcome"))
+DB_MAINTENANCE_DURATION = registry.histogram(
+    "recette_db_maintenance_duration_seconds", "Durée des tâches de maintenance de la base", ("task",),
+    buckets=MAINTENANCE_DURATION_BUCKETS)
+
+
+# Compteur de requêtes SQL de la requête HTTP en cours (None hors requête)
+_request_queries: ContextVar[Optional[list]] = ContextVar("request_queries", default=None)
+
+
+def start_request_tracking():
+    """
+    Démarre le comptage des requêtes SQL de la requête HTTP courante
+
+    Returns:
+        (jeton pour stop_request_tracking, compteur [nombre de requêtes])
+    """
+    queries = [0]
+    return _request_queries.set(queries), queries
+
+
+def stop_request_tracking(token):
+    _request_queries.reset(token)
+
+
+def track_db_connection(con):
+    """
+    Comptabilise une connexion ouverte par get_db()
+
+    Pendant une requête HTTP, chaque instruction SQL exécutée sur la
+    connexion est comptée (set_trace_callback).
+    """
+    DB_CONNECTIONS.inc()
+    queries = _request_queries.get()
+    if queries is not None:
+        def count_statement(_statement, queries=queries):
+            queries[0] += 1
+        con.set_trace_callback(count_statement)
+
+
+@contextmanager
+def llm_call(service: str):
+    """
+    Mesure la durée d'un appel LLM (outcome = ok / error)
+
+    Exemple:
+        with llm_call("TranslationService"):
+            response = self.client.chat.completions.create(...)
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        LLM_DURATION.observe(time.perf_counter() - start, service=service, outcome=outcome)
@@ -0,0 +1,304 @@
+"""
+Application versionnée des migrations SQL (migrations/manifest.txt)
+
+Les migrations sont appliquées dans l'ordre du manifeste et enregistrées
+dans la table schema_migrations avec la somme de contrôle (SHA-256) du
+fichier : une migration appliquée dont le fichier a changé depuis est
+signalée et bloque l'application des suivantes.
+
+Chaque migration est exécutée dans une transaction, avec son
+enregistrement dans schema_migrations : en cas d'erreur, rien n'est
+conservé. Les instructions BEGIN/COMMIT présentes dans les anciens
+fichiers sont ignorées. En mode simulation (dry_run), toutes les
+migrations en attente sont exécutées puis annulées.
+
+Une base dont les migrations ont été appliquées à la main avant
+l'introduction de schema_migrations est d'abord marquée comme à jour
+(mark_applied, commande `scripts/migrate.py baseline`) ; une nouvelle base
+est créée depuis scripts/schema.sql (`scripts/migrate.py init`), le
+manifeste ne s'appliquant pas depuis une base vide.
+
+check_schema() est la vérification rapide faite au démarrage : migrations
+en attente ou modifiées, et index de performance absents.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+MIGRATIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "migrations"))
+MANIFEST_NAME = "manifest.txt"
+
+# Migrations dont tous les index doivent exister (vérifiés au démarrage)
+# (dans l'ordre : un DROP INDEX retire l'index créé par une migration précédente)
+PERFORMANCE_INDEX_MIGRATIONS = (
+    "add_performance_indexes.sql", "add_keyset_pagination_indexes.sql", "add_recipe_sort_name.sql",
+)
+
+_CREATE_INDEX = re.compile(r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", re.IGNORECASE)
+_DROP_INDEX = re.compile(r"DROP\s+INDEX\s+(?:IF\s+EXISTS\s+)?(\w+)", re.IGNORECASE)
+_LEADING_COMMENTS = re.compile(r"^(?:\s*--[^\n]*(?:\n|$))*")
+_TRANSACTION_CONTROL = re.compile(r"^(?:BEGIN|COMMIT|END|ROLLBACK)(?:\s+TRANSACTION)?\s*;$", re.IGNORECASE)
+
+
+@dataclass
+class Migration:
+    """Fichier de migration listé dans le manifeste"""
+    name: str
+    path: str
+    checksum: str
+
+    def read(self) -> str:
+        with open(self.path, encoding="utf-8") as f:
+            return f.read()
+
+
+def load_manifest(directory: str = MIGRATIONS_DIR) -> List[Migration]:
+    """
+    Migrations du manifeste, dans l'ordre d'application
+
+    Raises:
+        FileNotFoundError: si un fichier listé n'existe pas
+    """
+    with open(os.path.join(directory, MANIFEST_NAME), encoding="utf-8") as f:
+        names = [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+    migrations = []
+    for name in names:
+        path = os.path.join(directory, name)
+        with open(path, "rb") as f:
+            checksum = hashlib.sha256(f.read()).hexdigest()
+        migrations.append(Migration(name, path, checksum))
+    return migrations
+
+
+def split_statements(sql: str) -> List[str]:
+    """
+    Découpe un script en instructions (corps de triggers compris)
+
+    Les instructions de contrôle de transaction (BEGIN, COMMIT, END,
+    ROLLBACK) sont écartées : la transaction est gérée par le runner.
+    """
+    statements, buffer = [], ""
+    for line in sql.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statement = _LEADING_COMMENTS.sub("", buffer).strip()
+            buffer = ""
+            if statement and not _TRANSACTION_CONTROL.match(statement):
+                statements.append(statement)
+    if _LEADING_COMMENTS.sub("", buffer).strip():
+        statements.append(buffer.strip())
+    return statements
+
+
+def ensure_migrations_table(con: sqlite3.Connection):
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            name TEXT PRIMARY KEY,
+            checksum TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            duration_ms REAL,
+            baseline INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+
+def _applied(con: sqlite3.Connection) -> Optional[Dict[str, str]]:
+    """{nom: somme de contrôle} des migrations appliquées, None si la table n'existe pas"""
+    try:
+        return dict(con.execute("SELECT name, checksum FROM schema_migrations").fetchall())
+    except sqlite3.OperationalError:
+        return None
+
+
+def get_status(con: sqlite3.Connection, directory: str = MIGRATIONS_DIR) -> dict:
+    """
+    État des migrations de la base
+
+    Returns:
+        {
+            "tracked": table schema_migrations présente,
+            "applied": [noms], "pending": [noms], "modified": [noms],
+            "unknown": [noms appliqués absents du manifeste]
+        }
+    """
+    migrations = load_manifest(directory)
+    applied = _applied(con)
+    recorded = applied or {}
+    names = {m.name for m in migrations}
+    return {
+        "tracked": applied is not None,
+        "applied": [m.name for m in migrations if m.name in recorded],
+        "pending": [m.name for m in migrations if m.name not in recorded],
+        "modified": [m.name for m in migrations if m.name in recorded and recorded[m.name] != m.checksum],
+        "unknown": sorted(name for name in recorded if name not in names),
+    }
+
+
+def apply_migrations(con: sqlite3.Connection, directory: str = MIGRATIONS_DIR, dry_run: bool = False,
+                     target: str = None) -> List[dict]:
+    """
+    Applique les migrations en attente, dans l'ordre du manifeste
+
+    Le manifeste réel ne s'applique pas depuis une base vide (les plus
+    anciennes migrations supposent des tables créées hors manifeste) : une
+    nouvelle base est créée par `scripts/migrate.py init` (scripts/schema.sql
+    puis mark_applied), une base existante non suivie est marquée par
+    `scripts/migrate.py baseline` ; seules les migrations ajoutées ensuite
+    passent par cette fonction.
+
+    Args:
+        con: Connexion à la base
+        dry_run: Exécuter puis tout annuler (vérifie que les migrations passent)
+        target: Dernière migration à appliquer (None = toutes)
+
+    Returns:
+        [{"name", "duration_ms", "statements"}] des migrations exécutées
+
+    Raises:
+        RuntimeError: base existante non suivie, migration appliquée modifiée,
+                      cible inconnue, ou échec d'une migration (sa transaction
+                      est annulée)
+    """
+    migrations = load_manifest(directory)
+    if target is not None and target not in {m.name for m in migrations}:
+        raise RuntimeError(f"Migration inconnue : {target}")
+
+    if _applied(con) is None and con.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'").fetchone()[0]:
+        raise RuntimeError("Base existante sans schema_migrations : marquer d'abord les migrations "
+                           "déjà appliquées (mark_applied)")
+
+    isolation_level = con.isolation_level
+    con.isolation_level = None
+    if dry_run:
+        con.execute("BEGIN")
+    try:
+        ensure_migrations_table(con)
+        applied = _applied(con)
+        modified = [m.name for m in migrations if m.name in applied and applied[m.name] != m.checksum]
+        if modified:
+            raise RuntimeError(f"Migrations appliquées puis modifiées : {', '.join(modified)}")
+
+        pending = []
+        for migration in migrations:
+            if migration.name not in applied:
+                pending.append(migration)
+            if migration.name == target:
+                break
+
+        return [_apply_one(con, migration, own_transaction=not dry_run) for migration in pending]
+    finally:
+        if dry_run and con.in_transaction:
+            con.execute("ROLLBACK")
+        con.isolation_level = isolation_level
+
+
+def _apply_one(con: sqlite3.Connection, migration: Migration, own_transaction: bool) -> dict:
+    statements = split_statements(migration.read())
+    start = time.perf_counter()
+    if own_transaction:
+        con.execute("BEGIN")
+    try:
+        for statement in statements:
+            con.execute(statement)
+        duration_ms = (time.perf_counter() - start) * 1000
+        con.execute(
+            "INSERT INTO schema_migrations (name, checksum, duration_ms) VALUES (?, ?, ?)",
+            (migration.name, migration.checksum, round(duration_ms, 3)),
+        )
+        if own_transaction:
+            con.execute("COMMIT")
+    except sqlite3.Error as e:
+        if own_transaction and con.in_transaction:
+            con.execute("ROLLBACK")
+        raise RuntimeError(f"{migration.name} : {e}") from e
+    return {"name": migration.name, "duration_ms": round(duration_ms, 3), "statements": len(statements)}
+
+
+def mark_applied(con: sqlite3.Connection, directory: str = MIGRATIONS_DIR, until: str = None) -> List[str]:
+    """
+    Marque les migrations comme appliquées sans les exécuter (base existante)
+
+    Les sommes de contrôle déjà enregistrées sont mises à jour.
+
+    Args:
+        until: Dernière migration à marquer (None = tout le manifeste)
+
+    Returns:
+        Noms des migrations marquées
+    """
+    migrations = load_manifest(directory)
+    if until is not None:
+        names = [m.name for m in migrations]
+        if until not in names:
+            raise RuntimeError(f"Migration inconnue : {until}")
+        migrations = migrations[:names.index(until) + 1]
+    ensure_migrations_table(con)
+    con.executemany(
+        """INSERT INTO schema_migrations (name, checksum, baseline) VALUES (?, ?, 1)
+           ON CONFLICT(name) DO UPDATE SET checksum = excluded.checksum""",
+        [(m.name, m.checksum) for m in migrations],
+    )
+    con.commit()
+    return [m.name for m in migrations]
+
+
+def expected_indexes(directory: str = MIGRATIONS_DIR) -> Dict[str, str]:
+    """{index: migration} des index créés (et non supprimés ensuite) par PERFORMANCE_INDEX_MIGRATIONS"""
+    indexes = {}
+    for name in PERFORMANCE_INDEX_MIGRATIONS:
+        path = os.path.join(directory, name)
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            sql = f.read()
+        for index in _CREATE_INDEX.findall(sql):
+            indexes[index] = name
+        for index in _DROP_INDEX.findall(sql):
+            indexes.pop(index, None)
+    return indexes
+
+
+def check_schema(path: str, directory: str = MIGRATIONS_DIR) -> List[str]:
+    """
+    Vérification rapide au démarrage (lecture seule)
+
+    Returns:
+        Problèmes détectés (liste vide si le schéma est à jour)
+    """
+    if not os.path.exists(path):
+        return [f"Base de données absente : {path}"]
+    problems = []
+    try:
+        con = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            existing = {row[0] for row in con.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            missing = {}
+            for index, migration in sorted(expected_indexes(directory).items()):
+                if index not in existing:
+                    missing.setdefault(migration, []).append(index)
+            for migration, indexes in missing.items():
+                problems.append(f"{len(indexes)} index de performance absent(s) ({migration}) : "
+                                f"{', '.join(indexes)}")
+
+            status = get_status(con, directory)
+            if not status["tracked"]:
+                problems.append("Table schema_migrations absente : lancer scripts/migrate.py baseline "
+                                "(base à jour) puis scripts/migrate.py apply")
+            else:
+                if status["pending"]:
+                    problems.append(f"{len(status['pending'])} migration(s) en attente : "
+                                    f"{', '.join(status['pending'])}")
+                if status["modified"]:
+                    problems.append(f"Migration(s) modifiée(s) après application : "
+                                    f"{', '.join(status['modified'])}")
+        finally:
+            con.close()
+    except (sqlite3.Error, OSError) as e:
+        problems.append(f"Vérification du schéma impossible : {e}")
+    return problems
@@ -6,12 +6,75 @@ Utilise PyPDF2 pour l'extraction de texte et Groq pour l'analyse IA
 import PyPDF2
 import json
 import logging
-from typing import Dict, Optional
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_EXCEPTION
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional
 from groq import Groq
 import os
+from app.services.metrics import llm_call
 
 logger = logging.getLogger(__name__)
 
+# Configuration de l'extraction
+MAX_PDF_PAGES = 300              # Au-delà, le PDF est tronqué (livres de cuisine entiers)
+EXTRACTION_TIMEOUT = 60          # Secondes max pour l'extraction de toutes les pages
+PARALLEL_MIN_PAGES = 8           # En dessous, l'extraction reste dans le processus courant
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+TEXT_CACHE_MAX_ENTRIES = 32      # Nombre de PDF gardés en cache (clé = hash du fichier)
+MAX_PROMPT_CHARS = 12000         # Taille max du texte envoyé à l'IA par requête
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[str]:
+    """
+    Extrait le texte des pages [start, end) d'un PDF
+
+    Fonction de niveau module pour pouvoir être exécutée dans un processus
+    du pool (chaque worker ouvre son propre lecteur PyPDF2).
+    """
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return [(pdf_reader.pages[i].extract_text() or "") for i in range(start, end)]
+
+
+def _file_sha256(pdf_path: str) -> str:
+    """Calcule le hash SHA-256 d'un fichier par blocs (sans le charger en mémoire)"""
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Pool de processus partagé (créé à la première utilisation)
+_process_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Retourne le pool de processus partagé pour l'extraction des pages"""
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+        return _process_pool
+
+
+def _reset_process_pool():
+    """Abandonne un pool cassé ou bloqué (il sera recréé au prochain appel)"""
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
+
+# Cache LRU du texte extrait, indexé par hash du contenu du fichier
+_text_cache: "OrderedDict[str, List[str]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
 
 class PDFRecipeExtractor:
     """Extracteur de recettes depuis des fichiers PDF"""
@@ -21,6 +84,80 @@ class PDFRecipeExtractor:
         api_key = os.getenv("GROQ_API_KEY")
         self.groq_client = Groq(api_key=api_key) if api_key else None
 
+    def extract_pages_from_pdf(self, pdf_path: str) -> List[str]:
+        """
+        Extrait le texte de chaque page d'un fichier PDF
+
+        - Résultat mis en cache par hash du fichier (ré-analyse instantanée)
+        - Pages extraites en parallèle dans un pool de processus pour les gros PDF
+        - Nombre de pages plafonné à MAX_PDF_PAGES, durée à EXTRACTION_TIMEOUT
+
+        Args:
+            pdf_path: Chemin vers le fichier PDF
+
+        Returns:
+            Liste des textes de page (chaîne vide pour une page sans texte)
+
+        Raises:
+            TimeoutError: Si l'extraction dépasse EXTRACTION_TIMEOUT
+        """
+        file_hash = _file_sha256(pdf_path)
+        with _cache_lock:
+            if file_hash in _text_cache:
+                _text_cache.move_to_end(file_hash)
+                logger.info(f"Texte du PDF trouvé en cache ({file_hash[:12]})")
+                return list(_text_cache[file_hash])
+
+        with open(pdf_path, 'rb') as file:
+            page_count = len(PyPDF2.PdfReader(file).pages)
+
+        if page_count > MAX_PDF_PAGES:
+            logger.warning(f"PDF de {page_count} pages tronqué à {MAX_PDF_PAGES} pages")
+            page_count = MAX_PDF_PAGES
+
+        if page_count < PARALLEL_MIN_PAGES or MAX_WORKERS < 2:
+            pages = _extract_page_range(pdf_path, 0, page_count)
+        else:
+            pages = self._extract_pages_parallel(pdf_path, page_count)
+
+        with _cache_lock:
+            _text_cache[file_hash] = pages
+            _text_cache.move_to_end(file_hash)
+            while len(_text_cache) > TEXT_CACHE_MAX_ENTRIES:
+                _text_cache.popitem(last=False)
+
+        return list(pages)
+
+    def _extract_pages_parallel(self, pdf_path: str, page_count: int) -> List[str]:
+        """Répartit les pages en tranches contiguës sur le pool de processus"""
+        chunk_size = -(-page_count // MAX_WORKERS)  # Division entière arrondie au supérieur
+        ranges = [(start, min(start + chunk_size, page_count))
+                  for start in range(0, page_count, chunk_size)]
+
+        try:
+            pool = _get_process_pool()
+            futures = [pool.submit(_extract_page_range, pdf_path, start, end)
+                       for start, end in ranges]
+        except (BrokenProcessPool, RuntimeError) as e:
+            # Pool indisponible (ex: environnement sans fork) : extraction séquentielle
+            logger.warning(f"Pool de processus indisponible ({e}), extraction séquentielle")
+            _reset_process_pool()
+            return _extract_page_range(pdf_path, 0, page_count)
+
+        done, not_done = wait(futures, timeout=EXTRACTION_TIMEOUT, return_when=FIRST_EXCEPTION)
+        if not_done:
+            for future in not_done:
+                future.cancel()
+            if any(not f.done() for f in not_done):
+                # Un worker est bloqué sur une page : on repart d'un pool neuf
+                _reset_process_pool()
+            raise TimeoutError(f"Extraction du PDF interrompue après {EXTRACTION_TIMEOUT}s")
+
+        pages = []
+        for future in futures:
+            pages.extend(future.result())
+        return pages
+
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """
         Extrait le texte brut d'un fichier PDF
@@ -32,37 +169,80 @@ class PDFRecipeExtractor:
             Texte extrait du PDF
         """
         try:
-            text = ""
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n\n"
-
-            logger.info(f"Texte extrait du PDF ({len(text)} caractères)")
+            pages = self.extract_pages_from_pdf(pdf_path)
+            text = "\n\n".join(page for page in pages if page)
+
+            logger.info(f"Texte extrait du PDF ({len(pages)} pages, {len(text)} caractères)")
             return text.strip()
 
         except Exception as e:
             logger.error(f"Erreur lors de l'extraction du PDF: {e}")
             raise
 
-    def analyze_recipe_with_ai(self, text: str, target_lang: str = "fr") -> Optional[Dict]:
+    def iter_text_chunks(self, pages: List[str], max_chars: int = MAX_PROMPT_CHARS) -> Iterator[str]:
         """
-        Analyse le texte de la recette avec l'IA Groq pour extraire les informations structurées
+        Regroupe les pages en blocs de texte de taille bornée pour l'IA
+
+        Les pages sont consommées dans l'ordre et accumulées jusqu'à max_chars ;
+        une page plus longue que max_chars est découpée sur les lignes (et une
+        ligne plus longue que max_chars, en tranches de max_chars).
+        Permet d'analyser un livre entier recette par recette au lieu
+        d'envoyer tout le texte dans un seul prompt (extract_recipes_from_pdf).
 
         Args:
-            text: Texte brut de la recette
+            pages: Textes de page (cf. extract_pages_from_pdf)
+            max_chars: Taille maximale d'un bloc
+
+        Yields:
+            Blocs de texte à analyser séparément
+        """
+        buffer: List[str] = []
+        size = 0
+        for page in pages:
+            page = page.strip()
+            if not page:
+                continue
+
+            if size and size + len(page) > max_chars:
+                yield "\n\n".join(buffer)
+                buffer, size = [], 0
+
+            if len(page) <= max_chars:
+                buffer.append(page)
+                size += len(page) + 2
+                continue
+
+            # Page trop longue : découpage ligne par ligne, et une ligne plus
+            # longue que max_chars (texte extrait sans retours) en tranches
+            part: List[str] = []
+            part_size = 0
+            for line in page.splitlines():
+                for start in range(0, max(len(line), 1), max_chars):
+                    piece = line[start:start + max_chars]
+                    if part_size and part_size + len(piece) > max_chars:
+                        yield "\n".join(part)
+                        part, part_size = [], 0
+                    part.append(piece)
+                    part_size += len(piece) + 1
+            if part:
+                tail = "\n".join(part)
+                buffer, size = [tail], len(tail) + 2
+
+        if buffer:
+            yield "\n\n".join(buffer)
+
+    def build_recipe_prompt(self, text: str, target_lang: str = "fr") -> str:
+        """
+        Construit le prompt d'extraction envoyé à l'IA pour un bloc de texte
+
+        Args:
+            text: Texte brut de la recette (ou d'un bloc de pages)
             target_lang: Langue cible ('fr' ou 'jp')
 
         Returns:
-            Dictionnaire avec les données structurées de la recette
+            Prompt complet
         """
-        if not self.groq_client:
-            logger.error("Client Groq non initialisé")
-            return None
-
-        prompt = f"""Tu es un expert en extraction de recettes de cuisine. Analyse le texte suivant et extrait les informations de manière structurée.
+        return f"""Tu es un expert en extraction de recettes de cuisine. Analyse le texte suivant et extrait les informations de manière structurée.
 
 IMPORTANT:
 - Détecte automatiquement la langue du texte (français ou japonais)
@@ -95,25 +275,43 @@ Retourne UNIQUEMENT un objet JSON valide avec cette structure exacte (sans texte
   "country": "code ISO 2 lettres du pays d'origine (ex: fr, jp, it, cn, kr, th, us, de, es, pt, vn, in, mx, ma, lb, gr, be, gb, tr) ou null"
 }}"""
 
+    def analyze_recipe_with_ai(self, text: str, target_lang: str = "fr") -> Optional[Dict]:
+        """
+        Analyse le texte de la recette avec l'IA Groq pour extraire les informations structurées
+
+        Args:
+            text: Texte brut de la recette
+            target_lang: Langue cible ('fr' ou 'jp')
+
+        Returns:
+            Dictionnaire avec les données structurées de la recette
+        """
+        if not self.groq_client:
+            logger.error("Client Groq non initialisé")
+            return None
+
+        prompt = self.build_recipe_prompt(text, target_lang)
+
         try:
             logger.info("Envoi de la requête à Groq pour analyse...")
 
-            response = self.groq_client.chat.completions.create(
-                model="openai/gpt-oss-120b",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Tu es un assistant spécialisé dans l'extraction de recettes de cuisine. Tu retournes UNIQUEMENT du JSON valide, sans aucun texte supplémentaire."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.1,
-                max_tokens=4000,
-                reasoning_effort="low"
-            )
+            with llm_call("PDFRecipeExtractor"):
+                response = self.groq_client.chat.completions.create(
+                    model="openai/gpt-oss-120b",
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "Tu es un assistant spécialisé dans l'extraction de recettes de cuisine. Tu retournes UNIQUEMENT du JSON valide, sans aucun texte supplémentaire."
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    temperature=0.1,
+                    max_tokens=4000,
+                    reasoning_effort="low"
+                )
 
             # Extraire le contenu de la réponse
             content = response.choices[0].message.content.strip()
@@ -152,18 +350,48 @@ Retourne UNIQUEMENT un objet JSON valide avec cette structure exacte (sans texte
         Returns:
             Dictionnaire avec les données structurées de la recette
         """
-        # 1. Extraire le texte du PDF
-        text = self.extract_text_from_pdf(pdf_path)
-
+        # 1. Extraire le texte du PDF page par page
+        pages = self.extract_pages_from_pdf(pdf_path)
+        text = "\n\n".join(page.strip() for page in pages if page.strip())
         if not text:
             logger.error("Aucun texte extrait du PDF")
             return None
 
-        # 2. Analyser avec l'IA
+        # 2. Analyser avec l'IA le texte complet s'il tient dans un prompt,
+        #    sinon le premier bloc (une recette tient sur quelques pages)
+        if len(text) > MAX_PROMPT_CHARS:
+            first_chunk = next(self.iter_text_chunks(pages))
+            logger.warning(
+                f"Texte du PDF trop long ({len(text)} caractères) : seuls les "
+                f"{len(first_chunk)} premiers sont analysés, "
+                f"{len(text) - len(first_chunk)} ignorés"
+            )
+            text = first_chunk
+
         recipe_data = self.analyze_recipe_with_ai(text, target_lang)
 
         return recipe_data
 
+    def extract_recipes_from_pdf(self, pdf_path: str, target_lang: str = "fr") -> Iterator[Dict]:
+        """
+        Extrait toutes les recettes d'un PDF volumineux (livre de cuisine)
+
+        Chaque bloc de pages est analysé séparément ; les blocs pour lesquels
+        l'IA ne trouve pas de recette sont ignorés.
+
+        Args:
+            pdf_path: Chemin vers le fichier PDF
+            target_lang: Langue cible ('fr' ou 'jp')
+
+        Yields:
+            Dictionnaires de recettes structurées, dans l'ordre du PDF
+        """
+        pages = self.extract_pages_from_pdf(pdf_path)
+        for chunk in self.iter_text_chunks(pages):
+            recipe_data = self.analyze_recipe_with_ai(chunk, target_lang)
+            if recipe_data and recipe_data.get('name'):
+                yield recipe_data
+
 
 # Instance singleton
 _extractor = None
@@ -12,6 +12,7 @@ from pathlib import Path
 import requests
 import time
 from config import Config
+from app.services.metrics import llm_call
 
 logger = logging.getLogger(__name__)
 
@@ -152,13 +153,15 @@ EXEMPLES:
 
             # Appel API REST
             logger.info("Envoi de la requête à Gemini API REST...")
-            response = requests.post(url, json=payload, timeout=60)
+            with llm_call("ReceiptExtractor"):
+                response = requests.post(url, json=payload, timeout=60)
 
             # Gestion du quota dépassé (429)
             if response.status_code == 429:
                 logger.warning("Quota dépassé (429), retry dans 60 secondes...")
                 time.sleep(60)
-                response = requests.post(url, json=payload, timeout=60)
+                with llm_call("ReceiptExtractor"):
+                    response = requests.post(url, json=payload, timeout=60)
 
             response.raise_for_status()
 
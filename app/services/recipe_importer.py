@@ -4,6 +4,7 @@ import re
 import unicodedata
 
 from app.models.db_core import DB_PATH
+from app.services.fragment_cache import invalidate_recipe
 
 
 def slugify(text: str) -> str:
@@ -179,6 +180,7 @@ def import_recipe_from_csv(file_path: str):
             cur.execute("INSERT INTO step_translation (step_id, lang, text) VALUES (?, ?, ?)", (step_id, recipe_lang, step_text))
         
         con.commit()
+        invalidate_recipe(recipe_id)
         print(f"✅ Import réussi : {recipe_title} ({recipe_lang}) - {len(ingredients)} ingrédients, {len(steps)} étapes")
         
     except Exception as e:
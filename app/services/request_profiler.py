@@ -0,0 +1,160 @@
+"""
+Profilage à la demande d'une requête HTTP (administrateurs)
+
+Un administrateur ajoute ?__profile=1 à une URL : cette requête seule est
+exécutée sous cProfile, avec une trace SQL (voir sql_trace.py). Le profil
+(arbre d'appels, fonctions les plus coûteuses, instructions SQL) est écrit
+en JSON dans PROFILES_DIR et consultable sous /admin/profiles.
+
+Les routes sont pour la plupart des coroutines exécutées dans la boucle
+d'événements : cProfile, activé sur ce thread, voit leur code. Le travail
+délégué au threadpool (run_in_threadpool) apparaît comme une attente ; les
+requêtes concurrentes traitées par la même boucle pendant le profilage
+peuvent apparaître dans l'arbre. Une seule requête est profilée à la fois
+par processus : les autres demandes de profil passent sans être profilées.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import re
+import time
+import uuid
+from collections import defaultdict
+from typing import List, Optional
+
+from config import Config
+
+PROFILE_QUERY_PARAM = "__profile"
+
+# Nombre de profils conservés (les plus anciens sont supprimés)
+PROFILES_KEEP = 50
+
+# Branches de l'arbre en dessous de cette part du temps total : élaguées
+TREE_MIN_FRACTION = 0.005
+TREE_MAX_DEPTH = 40
+
+# Fonctions listées par temps propre décroissant
+TOP_FUNCTIONS = 30
+
+_PROFILE_ID = re.compile(r"^[0-9]{8}-[0-9]{6}-[0-9a-f]{8}$")
+_BASE_DIR = str(Config.BASE_DIR) + os.sep
+
+
+def _function_label(func: tuple) -> str:
+    """'app/models/db_events.py:120(get_event_by_id)' (chemins raccourcis)"""
+    filename, line, name = func
+    if filename == "~":
+        return name
+    if filename.startswith(_BASE_DIR):
+        filename = filename[len(_BASE_DIR):]
+    elif "site-packages" + os.sep in filename:
+        filename = filename.split("site-packages" + os.sep, 1)[1]
+    return f"{filename}:{line}({name})"
+
+
+def build_call_tree(profile: cProfile.Profile, min_fraction: float = TREE_MIN_FRACTION,
+                    max_depth: int = TREE_MAX_DEPTH) -> dict:
+    """
+    Arbre d'appels et fonctions les plus coûteuses d'un profil cProfile
+
+    cProfile agrège par couple (appelant, appelé) : l'arbre est reconstruit
+    à partir de ces arêtes, en partant des fonctions sans appelant.
+
+    Returns:
+        {'total_ms', 'tree': [noeuds], 'top': [fonctions]}
+        noeud = {'function', 'calls', 'cumulative_ms', 'own_ms', 'children'}
+    """
+    stats = pstats.Stats(profile).stats
+    callees = defaultdict(dict)
+    for func, (_cc, _nc, _tt, _ct, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge
+
+    roots = [func for func, (_cc, _nc, _tt, _ct, callers) in stats.items() if not callers]
+    total = sum(stats[func][3] for func in roots) or 1e-9
+    threshold = total * min_fraction
+
+    def node(func, calls, own, cumulative, path, depth):
+        children = []
+        if depth < max_depth:
+            for child, (_cc, nc, tt, ct) in sorted(callees.get(func, {}).items(), key=lambda e: -e[1][3]):
+                if ct < threshold or child in path:
+                    continue
+                children.append(node(child, nc, tt, ct, path | {child}, depth + 1))
+        return {
+            "function": _function_label(func),
+            "calls": calls,
+            "cumulative_ms": round(cumulative * 1000, 3),
+            "own_ms": round(own * 1000, 3),
+            "children": children,
+        }
+
+    tree = [
+        node(func, stats[func][1], stats[func][2], stats[func][3], {func}, 0)
+        for func in sorted(roots, key=lambda f: -stats[f][3])
+        if stats[func][3] >= threshold
+    ]
+    top = [
+        {
+            "function": _function_label(func),
+            "calls": nc,
+            "own_ms": round(tt * 1000, 3),
+            "cumulative_ms": round(ct * 1000, 3),
+        }
+        for func, (_cc, nc, tt, ct, _callers) in sorted(stats.items(), key=lambda e: -e[1][2])[:TOP_FUNCTIONS]
+    ]
+    return {"total_ms": round(total * 1000, 3), "tree": tree, "top": top}
+
+
+# ============================================================================
+# STOCKAGE DES PROFILS
+# ============================================================================
+
+def new_profile_id() -> str:
+    """Identifiant triable par date : '20261019-142501-1a2b3c4d'"""
+    return time.strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:8]
+
+
+def _profile_path(profile_id: str) -> str:
+    return os.path.join(Config.PROFILES_DIR, f"{profile_id}.json")
+
+
+def save_profile(profile_id: str, profile: dict):
+    """Écrit un profil et supprime les plus anciens au-delà de PROFILES_KEEP"""
+    os.makedirs(Config.PROFILES_DIR, exist_ok=True)
+    with open(_profile_path(profile_id), "w", encoding="utf-8") as f:
+        json.dump(profile, f, ensure_ascii=False)
+
+    files = sorted(f for f in os.listdir(Config.PROFILES_DIR) if f.endswith(".json"))
+    for filename in files[:-PROFILES_KEEP]:
+        try:
+            os.unlink(os.path.join(Config.PROFILES_DIR, filename))
+        except OSError:
+            pass
+
+
+def list_profiles() -> List[dict]:
+    """Profils enregistrés (plus récents en premier), sans l'arbre d'appels"""
+    if not os.path.isdir(Config.PROFILES_DIR):
+        return []
+    profiles = []
+    for filename in sorted(os.listdir(Config.PROFILES_DIR), reverse=True):
+        if not filename.endswith(".json"):
+            continue
+        profile = load_profile(filename[:-len(".json")])
+        if profile:
+            profiles.append({k: v for k, v in profile.items() if k not in ("tree", "top", "sql")})
+    return profiles
+
+
+def load_profile(profile_id: str) -> Optional[dict]:
+    """Profil par identifiant (None si inconnu ou identifiant invalide)"""
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    try:
+        with open(_profile_path(profile_id), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
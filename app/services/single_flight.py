@@ -0,0 +1,124 @@
+"""
+Regroupement des calculs identiques simultanés (single-flight)
+
+Quand plusieurs requêtes demandent en même temps le même calcul coûteux
+(ex: deux personnes ouvrent la liste de courses du même événement), seul le
+premier appel exécute la fonction ; les appels concurrents de même clé
+attendent et reçoivent le même résultat (ou la même exception).
+
+Rien n'est mis en cache : dès que le calcul est terminé, l'appel suivant
+relance un nouveau calcul.
+
+Usage :
+    items = single_flight.do(("shopping_list", event_id, lang), _regenerate, event_id, lang)
+
+Le résultat est partagé entre les appelants : il ne doit pas être modifié.
+
+Un appel qui fournit ses propres données (ex: recettes relues juste après
+une écriture) ne doit pas recevoir le résultat d'un calcul commencé avant
+cette écriture : do_exclusive() attend la fin du calcul en cours puis
+exécute le sien, sans le partager.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """Calcul en cours, attendu par un ou plusieurs appelants"""
+
+    def __init__(self, shared: bool = True):
+        self.done = threading.Event()
+        self.shared = shared
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """Exécute une seule fois les appels concurrents portant la même clé"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self._executed = 0
+        self._shared = 0
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        """
+        Exécute fn(*args, **kwargs), ou attend le calcul identique déjà en cours
+
+        Args:
+            key: Clé du calcul, ex: ("shopping_list", event_id, lang)
+            fn: Fonction à exécuter
+
+        Returns:
+            Résultat de fn (partagé entre les appelants concurrents)
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is None:
+                    call = self._calls[key] = _Call()
+                    self._executed += 1
+                    leader = True
+                    break
+                if call.shared:
+                    self._shared += 1
+                    leader = False
+                    break
+            # Calcul exclusif en cours : attendre sa fin puis réessayer
+            call.done.wait()
+
+        if leader:
+            return self._run(key, call, fn, args, kwargs)
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def do_exclusive(self, key: Hashable, fn: Callable, *args, **kwargs):
+        """
+        Exécute fn(*args, **kwargs) après le calcul en cours de même clé, sans partage
+
+        Pour les appels dont les arguments portent des données plus récentes
+        que celles d'un calcul déjà lancé : le calcul en cours se termine,
+        puis celui-ci s'exécute (les appels de même clé arrivés entre-temps
+        l'attendent sans partager son résultat).
+
+        Returns:
+            Résultat de fn
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is None:
+                    call = self._calls[key] = _Call(shared=False)
+                    self._executed += 1
+                    break
+            call.done.wait()
+        return self._run(key, call, fn, args, kwargs)
+
+    def _run(self, key: Hashable, call: _Call, fn: Callable, args: tuple, kwargs: dict):
+        """Exécute le calcul enregistré sous `key` et réveille les appels en attente"""
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> dict:
+        """Nombre de calculs exécutés et d'appels ayant partagé un calcul en cours"""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executed": self._executed,
+                "shared": self._shared,
+            }
+
+
+single_flight = SingleFlight()
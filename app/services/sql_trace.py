@@ -0,0 +1,296 @@
+"""
+Traçage des requêtes SQL par requête HTTP et journal des requêtes lentes
+
+Activé par la variable d'environnement SQL_TRACE=true (désactivé par défaut) :
+- get_db() ouvre alors ses connexions avec TracingConnection, dont les
+  curseurs chronomètrent chaque instruction (exécution + lecture des lignes)
+  et comptent les lignes lues ou modifiées ;
+- SqlTraceMiddleware associe une trace à chaque requête HTTP et ajoute
+  l'en-tête Server-Timing (temps SQL, nombre de requêtes, temps total) ;
+- les instructions plus longues que SLOW_QUERY_MS sont écrites dans
+  SLOW_QUERY_LOG_PATH avec leur plan (EXPLAIN QUERY PLAN).
+
+Désactivé, le coût se limite à un test booléen à l'ouverture de connexion.
+"""
+
+import logging
+import re
+import sqlite3
+import time
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from typing import List, Optional
+
+from config import Config
+
+# Nombre d'instructions les plus lentes détaillées dans le journal par requête
+TRACE_SUMMARY_TOP = 5
+
+_slow_logger = logging.getLogger("recette.slow_sql")
+_trace_logger = logging.getLogger("recette.sql_trace")
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Forme normalisée d'une instruction (regroupement dans les traces)
+
+    Espaces compactés, littéraux remplacés par ?, listes IN (?, ?, ...)
+    réduites à (?...) quel que soit le nombre de paramètres.
+
+    Exemple:
+        "SELECT * FROM recipe  WHERE id IN (?, ?, ?) AND lang = 'fr'"
+        → "SELECT * FROM recipe WHERE id IN (?...) AND lang = ?"
+    """
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    return _PARAM_LIST.sub("(?...)", sql)
+
+
+class QueryRecord:
+    """Une instruction exécutée : texte, paramètres, durée et lignes"""
+
+    __slots__ = ("sql", "params", "duration_ms", "rows")
+
+    def __init__(self, sql: str, params, duration_ms: float, rows: int):
+        self.sql = sql
+        self.params = params
+        self.duration_ms = duration_ms
+        self.rows = rows
+
+    def as_dict(self) -> dict:
+        return {
+            "sql": normalize_sql(self.sql),
+            "duration_ms": round(self.duration_ms, 3),
+            "rows": self.rows,
+        }
+
+
+class SqlTrace:
+    """Instructions SQL exécutées pendant une requête HTTP"""
+
+    def __init__(self):
+        self.queries: List[QueryRecord] = []
+        self.started = time.perf_counter()
+
+    @property
+    def total_ms(self) -> float:
+        return sum(q.duration_ms for q in self.queries)
+
+    def server_timing(self) -> str:
+        """Valeur de l'en-tête Server-Timing"""
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        return (
+            f'db;dur={self.total_ms:.1f};desc="{len(self.queries)} SQL", '
+            f'total;dur={elapsed_ms:.1f}'
+        )
+
+    def summary(self) -> List[dict]:
+        """Instructions normalisées regroupées : nombre, durée cumulée, lignes"""
+        grouped = {}
+        for query in self.queries:
+            key = normalize_sql(query.sql)
+            entry = grouped.setdefault(key, {"sql": key, "count": 0, "duration_ms": 0.0, "rows": 0})
+            entry["count"] += 1
+            entry["duration_ms"] += query.duration_ms
+            entry["rows"] += query.rows
+        return sorted(grouped.values(), key=lambda e: e["duration_ms"], reverse=True)
+
+
+_current_trace: ContextVar[Optional[SqlTrace]] = ContextVar("sql_trace", default=None)
+
+
+def start_trace():
+    """Démarre une trace pour la requête courante : (jeton, trace)"""
+    trace = SqlTrace()
+    return _current_trace.set(trace), trace
+
+
+def stop_trace(token):
+    _current_trace.reset(token)
+
+
+def current_trace() -> Optional[SqlTrace]:
+    return _current_trace.get()
+
+
+# ============================================================================
+# CONNEXIONS TRACÉES
+# ============================================================================
+
+class TracingCursor(sqlite3.Cursor):
+    """Curseur qui chronomètre l'exécution et la lecture des lignes"""
+
+    _record = None
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._begin(sql, parameters, start)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._begin(sql, None, start)
+
+    def _begin(self, sql, parameters, start):
+        self._finish()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._record = QueryRecord(sql, parameters, elapsed_ms, max(self.rowcount, 0))
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.queries.append(self._record)
+
+    def _finish(self):
+        """Clôt l'instruction en cours (à la suivante ou en fin de lecture)"""
+        record, self._record = self._record, None
+        if record is not None and record.duration_ms >= Config.SLOW_QUERY_MS:
+            log_slow_query(self.connection, record)
+
+    def _timed_fetch(self, fetch, *args):
+        start = time.perf_counter()
+        rows = fetch(*args)
+        if self._record is not None:
+            self._record.duration_ms += (time.perf_counter() - start) * 1000
+        return rows
+
+    def fetchone(self):
+        row = self._timed_fetch(super().fetchone)
+        if self._record is not None:
+            if row is None:
+                self._finish()
+            else:
+                self._record.rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed_fetch(super().fetchmany, size if size is not None else self.arraysize)
+        if self._record is not None:
+            self._record.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed_fetch(super().fetchall)
+        if self._record is not None:
+            self._record.rows += len(rows)
+            self._finish()
+        return rows
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+
+class TracingConnection(sqlite3.Connection):
+    """
+    Connexion dont les curseurs sont des TracingCursor
+
+    Un curseur dont les lignes n'ont pas toutes été lues (fetchone unique)
+    est enregistré au commit ou à la fermeture de la connexion : la
+    connexion garde une référence sur ses curseurs (elle vit le temps
+    d'un get_db()).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cursors = []
+
+    def cursor(self, factory=TracingCursor):
+        cursor = super().cursor(factory)
+        self._cursors.append(cursor)
+        return cursor
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def _finish_cursors(self):
+        for cursor in self._cursors:
+            cursor._finish()
+        self._cursors.clear()
+
+    def commit(self):
+        self._finish_cursors()
+        super().commit()
+
+    def close(self):
+        self._finish_cursors()
+        super().close()
+
+
+def connection_options() -> dict:
+    """
+    Arguments supplémentaires de sqlite3.connect() pour get_db()
+
+    Connexion tracée si SQL_TRACE est activé, ou si une trace est en cours
+    (requête profilée par un administrateur, voir request_profiler.py).
+    """
+    if Config.SQL_TRACE or _current_trace.get() is not None:
+        return {"factory": TracingConnection}
+    return {}
+
+
+# ============================================================================
+# JOURNAL DES REQUÊTES LENTES
+# ============================================================================
+
+def _slow_log() -> logging.Logger:
+    """Logger des requêtes lentes, avec son fichier dédié (configuré au premier appel)"""
+    if not _slow_logger.handlers:
+        handler = RotatingFileHandler(Config.SLOW_QUERY_LOG_PATH, maxBytes=5 * 1024 * 1024, backupCount=3)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        _slow_logger.addHandler(handler)
+        _slow_logger.setLevel(logging.WARNING)
+    return _slow_logger
+
+
+def explain_query_plan(con, sql: str, parameters=None) -> List[str]:
+    """Lignes de EXPLAIN QUERY PLAN (liste vide si non applicable)"""
+    if not sql.lstrip().upper().startswith(("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")):
+        return []
+    try:
+        rows = sqlite3.Connection.execute(con, f"EXPLAIN QUERY PLAN {sql}", parameters or ()).fetchall()
+    except sqlite3.Error:
+        return []
+    return [row[3] for row in rows]
+
+
+def log_slow_query(con, record: QueryRecord):
+    """Écrit une instruction lente et son plan dans le journal des requêtes lentes"""
+    plan = explain_query_plan(con, record.sql, record.params) if record.params is not None else []
+    lines = [f"{record.duration_ms:.1f} ms, {record.rows} lignes : {normalize_sql(record.sql)}"]
+    lines.extend(f"    {step}" for step in plan)
+    try:
+        _slow_log().warning("\n".join(lines))
+    except OSError as e:
+        print(f"Erreur lors de l'écriture du journal des requêtes lentes: {e}")
+
+
+def log_trace_summary(method: str, path: str, trace: SqlTrace):
+    """Détail d'une trace au niveau DEBUG (instructions les plus coûteuses)"""
+    if not _trace_logger.isEnabledFor(logging.DEBUG):
+        return
+    lines = [f"{method} {path} : {len(trace.queries)} requêtes SQL, {trace.total_ms:.1f} ms"]
+    for entry in trace.summary()[:TRACE_SUMMARY_TOP]:
+        lines.append(f"    {entry['count']}x {entry['duration_ms']:.1f} ms {entry['rows']} lignes : {entry['sql']}")
+    _trace_logger.debug("\n".join(lines))
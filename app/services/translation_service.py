@@ -5,6 +5,7 @@ import os
 from typing import Optional, List, Dict
 from groq import Groq
 import json
+from app.services.metrics import llm_call
 
 class TranslationService:
     """Service pour traduire des recettes via l'API Groq"""
@@ -30,12 +31,13 @@ class TranslationService:
         """
         try:
             # Test simple avec une requête minimaliste
-            response = self.client.chat.completions.create(
-                messages=[{"role": "user", "content": "ping"}],
-                model=self.model,
-                max_tokens=5,
-                **self.model_kwargs
-            )
+            with llm_call("TranslationService"):
+                response = self.client.chat.completions.create(
+                    messages=[{"role": "user", "content": "ping"}],
+                    model=self.model,
+                    max_tokens=5,
+                    **self.model_kwargs
+                )
             return True
         except Exception as e:
             print(f"Erreur lors de la vérification de l'API Groq: {e}")
@@ -60,13 +62,14 @@ Réponds UNIQUEMENT avec la traduction, sans aucune explication ou formatage.
 
 Titre: {title}"""
 
-            response = self.client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=self.model,
-                temperature=0.3,
-                max_tokens=100,
-                **self.model_kwargs
-            )
+            with llm_call("TranslationService"):
+                response = self.client.chat.completions.create(
+                    messages=[{"role": "user", "content": prompt}],
+                    model=self.model,
+                    temperature=0.3,
+                    max_tokens=100,
+                    **self.model_kwargs
+                )
 
             translated = response.choices[0].message.content.strip()
             return translated
@@ -120,13 +123,14 @@ Règles:
 Ingrédients à traduire:
 {json.dumps(items_to_translate, ensure_ascii=False)}"""
 
-            response = self.client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=self.model,
-                temperature=0.3,
-                max_tokens=1500,
-                **self.model_kwargs
-            )
+            with llm_call("TranslationService"):
+                response = self.client.chat.completions.create(
+                    messages=[{"role": "user", "content": prompt}],
+                    model=self.model,
+                    temperature=0.3,
+                    max_tokens=1500,
+                    **self.model_kwargs
+                )
 
             # Nettoyer la réponse et parser le JSON
             import re
@@ -218,13 +222,14 @@ Format attendu: ["traduction étape 1", "traduction étape 2", ...]
 Étapes à traduire:
 {json.dumps(steps, ensure_ascii=False)}"""
 
-            response = self.client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=self.model,
-                temperature=0.3,
-                max_tokens=2000,
-                **self.model_kwargs
-            )
+            with llm_call("TranslationService"):
+                response = self.client.chat.completions.create(
+                    messages=[{"role": "user", "content": prompt}],
+                    model=self.model,
+                    temperature=0.3,
+                    max_tokens=2000,
+                    **self.model_kwargs
+                )
 
             # Nettoyer la réponse et parser le JSON
             import re
@@ -288,14 +293,15 @@ Règles:
 
 Réponds UNIQUEMENT avec un mot: "LIQUIDE" ou "SOLIDE"."""
 
-            response = self.client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=self.model,
-                temperature=0.1,  # Très faible pour cohérence
-                # 150 tokens : marge pour le raisonnement interne du modèle avant la réponse finale
-                max_tokens=150,
-                **self.model_kwargs
-            )
+            with llm_call("TranslationService"):
+                response = self.client.chat.completions.create(
+                    messages=[{"role": "user", "content": prompt}],
+                    model=self.model,
+                    temperature=0.1,  # Très faible pour cohérence
+                    # 150 tokens : marge pour le raisonnement interne du modèle avant la réponse finale
+                    max_tokens=150,
+                    **self.model_kwargs
+                )
 
             result = response.choices[0].message.content.strip().upper()
 
@@ -353,14 +359,15 @@ Règles de décision:
 
 Réponds UNIQUEMENT avec un mot: "VOLUME", "POIDS" ou "UNITE"."""
 
-            response = self.client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=self.model,
-                temperature=0.1,  # Très faible pour cohérence
-                # 150 tokens : marge pour le raisonnement interne du modèle avant la réponse finale
-                max_tokens=150,
-                **self.model_kwargs
-            )
+            with llm_call("TranslationService"):
+                response = self.client.chat.completions.create(
+                    messages=[{"role": "user", "content": prompt}],
+                    model=self.model,
+                    temperature=0.1,  # Très faible pour cohérence
+                    # 150 tokens : marge pour le raisonnement interne du modèle avant la réponse finale
+                    max_tokens=150,
+                    **self.model_kwargs
+                )
 
             result = response.choices[0].message.content.strip().upper()
 
@@ -0,0 +1,67 @@
+"""
+Service d'écriture des fichiers uploadés
+
+Les uploads sont recopiés par blocs directement dans leur répertoire final :
+- la mémoire utilisée reste de l'ordre d'un bloc, quelle que soit la taille
+- l'upload est interrompu dès que la taille maximale est dépassée
+- le fichier est écrit sous un nom temporaire puis renommé (os.replace),
+  un lecteur ne voit donc jamais de fichier incomplet
+"""
+
+import os
+from pathlib import Path
+from typing import Optional
+
+from fastapi import UploadFile
+
+# Taille des blocs lus depuis l'upload
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def _size_error(max_size: int) -> ValueError:
+    """Erreur de dépassement de taille (message identique à l'ancienne validation)"""
+    return ValueError(f"Fichier trop volumineux. Taille maximale: {max_size // (1024*1024)}MB")
+
+
+async def stream_upload_to_file(upload: UploadFile, dest_path: Path, max_size: Optional[int] = None) -> int:
+    """
+    Écrit un fichier uploadé sur disque par blocs, avec renommage atomique
+
+    Args:
+        upload: Fichier uploadé (FastAPI)
+        dest_path: Chemin final du fichier
+        max_size: Taille maximale en octets (None = illimitée)
+
+    Returns:
+        Nombre d'octets écrits
+
+    Raises:
+        ValueError: Si le fichier dépasse max_size
+    """
+    dest_path = Path(dest_path)
+
+    # Rejet immédiat si la taille est déjà connue
+    known_size = getattr(upload, 'size', None)
+    if max_size is not None and known_size is not None and known_size > max_size:
+        raise _size_error(max_size)
+
+    tmp_path = dest_path.with_name(f".{dest_path.name}.part")
+    written = 0
+    try:
+        with open(tmp_path, 'wb') as out:
+            while True:
+                chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if max_size is not None and written > max_size:
+                    raise _size_error(max_size)
+                out.write(chunk)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        # Ne jamais laisser de fichier partiel
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+    return written
@@ -8,6 +8,7 @@ from bs4 import BeautifulSoup
 import json
 from typing import Optional, Dict, Any
 from groq import Groq
+from app.services.metrics import llm_call
 
 
 class WebRecipeImporter:
@@ -115,22 +116,23 @@ Réponds UNIQUEMENT avec le JSON, sans texte avant ou après."""
 
         try:
             # Appel à l'API Groq
-            chat_completion = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Tu es un assistant expert en extraction de recettes culinaires. Tu réponds toujours avec du JSON valide."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model="openai/gpt-oss-120b",
-                temperature=0.3,
-                max_tokens=2000,
-                reasoning_effort="low"
-            )
+            with llm_call("WebRecipeImporter"):
+                chat_completion = self.client.chat.completions.create(
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "Tu es un assistant expert en extraction de recettes culinaires. Tu réponds toujours avec du JSON valide."
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    model="openai/gpt-oss-120b",
+                    temperature=0.3,
+                    max_tokens=2000,
+                    reasoning_effort="low"
+                )
 
             # Extraire la réponse
             response_text = chat_completion.choices[0].message.content.strip()
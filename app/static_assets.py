@@ -0,0 +1,183 @@
+# app/static_assets.py
+"""
+Assets statiques versionnés (sans étape de build)
+
+Au démarrage, les fichiers CSS/JS de static/ sont hashés : chaque fichier est
+servi sous /assets/<chemin>.<hash>.<ext> avec un cache navigateur d'un an
+(Cache-Control: immutable). Les versions gzip (et brotli si le module est
+installé) sont précalculées dans ASSET_CACHE_DIR.
+
+Dans les templates : <script src="{{ asset('css/alpine.min.js') }}"></script>
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, PlainTextResponse, Response
+
+try:
+    import brotli
+except ImportError:  # brotli optionnel : seul gzip est précalculé
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+STATIC_DIR = BASE_DIR / "static"
+ASSET_CACHE_DIR = BASE_DIR / "data" / "static_assets"
+ASSETS_URL_PREFIX = "/assets"
+
+# Fichiers versionnés (relatifs à STATIC_DIR)
+FINGERPRINTED_PATTERNS = ("css/*.css", "css/*.js", "js/*.js")
+HASH_LENGTH = 12
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_MEDIA_TYPES = {
+    ".js": "application/javascript",
+    ".css": "text/css",
+}
+
+
+class AssetManifest:
+    """Table de correspondance chemin logique <-> nom de fichier hashé"""
+
+    def __init__(self, static_dir: Path = STATIC_DIR, cache_dir: Path = ASSET_CACHE_DIR):
+        self.static_dir = Path(static_dir)
+        self.cache_dir = Path(cache_dir)
+        self.urls: Dict[str, str] = {}       # 'css/alpine.min.js' -> '/assets/css/alpine.min.<hash>.js'
+        self.files: Dict[str, Dict] = {}     # 'css/alpine.min.<hash>.js' -> infos du fichier
+
+    def build(self) -> "AssetManifest":
+        """Hashe les fichiers et précalcule les versions compressées"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for pattern in FINGERPRINTED_PATTERNS:
+            for path in sorted(self.static_dir.glob(pattern)):
+                self._add(path)
+        logger.info(f"📦 {len(self.files)} assets statiques versionnés")
+        return self
+
+    def _add(self, path: Path):
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+        logical = path.relative_to(self.static_dir).as_posix()
+        hashed = f"{logical[:-len(path.suffix)]}.{digest}{path.suffix}"
+
+        encodings = {"gzip": self._precompress(hashed, ".gz", data, "gzip")}
+        if brotli is not None:
+            encodings["br"] = self._precompress(hashed, ".br", data, "br")
+
+        self.urls[logical] = f"{ASSETS_URL_PREFIX}/{hashed}"
+        self.files[hashed] = {
+            "path": path,
+            "digest": digest,
+            "media_type": _MEDIA_TYPES.get(path.suffix, "application/octet-stream"),
+            "encodings": {k: v for k, v in encodings.items() if v is not None},
+        }
+
+    def _precompress(self, hashed: str, suffix: str, data: bytes, encoding: str) -> Optional[Path]:
+        """
+        Écrit la version compressée d'un asset (une seule fois par hash)
+
+        Écriture dans un fichier temporaire puis renommage : plusieurs workers
+        peuvent démarrer en même temps sans se gêner.
+        """
+        target = self.cache_dir / (hashed.replace("/", "__") + suffix)
+        if target.exists():
+            return target
+        compressed = gzip.compress(data, 9, mtime=0) if encoding == "gzip" else brotli.compress(data, quality=11)
+        if len(compressed) >= len(data):
+            return None
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(compressed)
+        os.replace(tmp_path, target)
+        return target
+
+    def url(self, logical_path: str) -> str:
+        """URL versionnée d'un asset (ou URL /static classique s'il est inconnu)"""
+        logical_path = logical_path.lstrip("/")
+        return self.urls.get(logical_path, f"/static/{logical_path}")
+
+
+_manifest: Optional[AssetManifest] = None
+_manifest_lock = threading.Lock()
+
+
+def get_asset_manifest() -> AssetManifest:
+    """Retourne le manifeste (construit au premier appel)"""
+    global _manifest
+    with _manifest_lock:
+        if _manifest is None:
+            _manifest = AssetManifest().build()
+        return _manifest
+
+
+def asset(logical_path: str) -> str:
+    """Helper Jinja : URL versionnée d'un fichier de static/"""
+    return get_asset_manifest().url(logical_path)
+
+
+def _etag(digest: str, encoding: Optional[str]) -> str:
+    """ETag fort propre à chaque représentation (identité, gzip, brotli)"""
+    return f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Comparaison faible de If-None-Match (liste d'ETags ou *) avec l'ETag servi"""
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _choose_encoding(accept_encoding: str, available: Dict[str, Path]) -> Optional[str]:
+    """Choisit brotli puis gzip selon l'en-tête Accept-Encoding du client"""
+    accepted = {part.split(";")[0].strip().lower() for part in accept_encoding.split(",")}
+    for encoding in ("br", "gzip"):
+        if encoding in available and encoding in accepted:
+            return encoding
+    return None
+
+
+class AssetFiles:
+    """
+    Application ASGI servant les assets versionnés (à monter sur /assets)
+
+    Les URL contiennent le hash du contenu : la réponse peut être gardée en
+    cache indéfiniment par le navigateur. Chaque représentation (identité,
+    gzip, brotli) a son propre ETag, les octets envoyés n'étant pas les mêmes.
+    """
+
+    async def __call__(self, scope, receive, send):
+        assert scope["type"] == "http"
+        manifest = get_asset_manifest()
+        entry = manifest.files.get(scope["path"].lstrip("/"))
+
+        if entry is None or scope["method"] not in ("GET", "HEAD"):
+            response = PlainTextResponse("Not Found", status_code=404)
+            await response(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = _choose_encoding(request_headers.get("accept-encoding", ""), entry["encodings"])
+        headers = {
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+            "ETag": _etag(entry["digest"], encoding),
+            "Vary": "Accept-Encoding",
+        }
+
+        if _etag_matches(request_headers.get("if-none-match", ""), headers["ETag"]):
+            response = Response(status_code=304, headers=headers)
+            await response(scope, receive, send)
+            return
+
+        path = entry["path"]
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            path = entry["encodings"][encoding]
+
+        response = FileResponse(path, media_type=entry["media_type"], headers=headers, stat_result=os.stat(path))
+        await response(scope, receive, send)
@@ -5,6 +5,9 @@ from fastapi.templating import Jinja2Templates
 from jinja2 import pass_context
 from pathlib import Path
 
+from app.services.image_service import image_variant_url
+from app.static_assets import asset
+
 # Configuration des templates
 TEMPLATES_DIR = str((Path(__file__).resolve().parent / "templates"))
 templates = Jinja2Templates(directory=TEMPLATES_DIR)
@@ -116,3 +119,9 @@ def S(ctx, key: str):
     return TRANSLATIONS.get(lang, {}).get(key, key)
 
 templates.env.globals["S"] = S
+
+# Variantes d'images (thumbnail, taille moyenne, WebP)
+templates.env.filters["image_variant"] = image_variant_url
+
+# URLs versionnées des assets statiques (cache long terme)
+templates.env.globals["asset"] = asset
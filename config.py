@@ -24,6 +24,7 @@ class Config:
     # Stockage des tickets de caisse (PDFs)
     RECEIPTS_DIR = BASE_DIR / "data" / "receipts"
     RECEIPTS_DIR.mkdir(exist_ok=True)
+    MAX_RECEIPT_SIZE = int(os.getenv("MAX_RECEIPT_SIZE_MB", "20")) * 1024 * 1024
 
     # Base de données (nom unifié)
     DB_PATH = str(DATA_DIR / "recette.sqlite3")
@@ -44,6 +45,37 @@ class Config:
     GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 
+    # Métriques (/metrics) : instantanés partagés entre workers uvicorn
+    # et jeton optionnel pour un collecteur Prometheus (Authorization: Bearer)
+    METRICS_DIR = os.getenv("METRICS_DIR", str(DATA_DIR / "metrics"))
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+    # Traçage SQL par requête (en-tête Server-Timing) et journal des requêtes lentes
+    SQL_TRACE = os.getenv("SQL_TRACE", "False").lower() == "true"
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+    SLOW_QUERY_LOG_PATH = os.getenv("SLOW_QUERY_LOG_PATH", str(BASE_DIR / "logs" / "slow_queries.log"))
+
+    # Profils des requêtes ?__profile=1 (administrateurs)
+    PROFILES_DIR = os.getenv("PROFILES_DIR", str(DATA_DIR / "profiles"))
+
+    # Sauvegardes à chaud (API de sauvegarde SQLite) : répertoire, nombre de
+    # sauvegardes conservées, pages copiées par étape et pause entre étapes
+    BACKUP_DIR = os.getenv("BACKUP_DIR", str(BASE_DIR / "backups"))
+    BACKUP_KEEP = int(os.getenv("BACKUP_KEEP", "10"))
+    BACKUP_PAGES_PER_STEP = int(os.getenv("BACKUP_PAGES_PER_STEP", "1024"))
+    BACKUP_STEP_SLEEP = float(os.getenv("BACKUP_STEP_SLEEP", "0.02"))
+
+    # Maintenance de la base en période creuse (ANALYZE, checkpoint, incremental_vacuum) :
+    # intervalle entre deux passages complets, inactivité requise, taille de WAL
+    # déclenchant un checkpoint, période de vérification
+    MAINTENANCE_ENABLED = os.getenv("MAINTENANCE_ENABLED", "True").lower() == "true"
+    MAINTENANCE_INTERVAL_HOURS = float(os.getenv("MAINTENANCE_INTERVAL_HOURS", "24"))
+    MAINTENANCE_IDLE_SECONDS = float(os.getenv("MAINTENANCE_IDLE_SECONDS", "120"))
+    MAINTENANCE_WAL_CHECKPOINT_MB = float(os.getenv("MAINTENANCE_WAL_CHECKPOINT_MB", "16"))
+    MAINTENANCE_CHECK_SECONDS = float(os.getenv("MAINTENANCE_CHECK_SECONDS", "60"))
+    MAINTENANCE_STATE_PATH = os.getenv("MAINTENANCE_STATE_PATH", str(DATA_DIR / "maintenance.json"))
+    MAINTENANCE_LOCK_PATH = os.getenv("MAINTENANCE_LOCK_PATH", str(DATA_DIR / "maintenance.lock"))
+
     # Logs
     LOG_LEVEL = os.getenv("LOG_LEVEL", "info" if ENV == "prod" else "debug")
     LOG_PATH = os.getenv("LOG_PATH", str(BASE_DIR / "logs" / "recette.log"))
@@ -51,4 +83,5 @@ class Config:
 
 # Créer les répertoires nécessaires
 os.makedirs(os.path.dirname(Config.LOG_PATH), exist_ok=True)
+os.makedirs(os.path.dirname(Config.SLOW_QUERY_LOG_PATH), exist_ok=True)
 os.makedirs(Config.DATA_DIR, exist_ok=True)
@@ -15,8 +15,13 @@ from app.services.conversion_service import init_conversion_service
 from app.services.web_recipe_importer import init_web_recipe_importer
 from app.middleware.auth import AuthMiddleware
 from app.middleware.access_logger import AccessLoggerMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.sql_trace import SqlTraceMiddleware
+from app.middleware.profiler import ProfilerMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.template_config import templates
+from app.static_assets import AssetFiles, ASSETS_URL_PREFIX, get_asset_manifest
 
 # Configuration du logging
 if Config.ENV == "prod":
@@ -75,6 +80,9 @@ else:
 # LangSessionMiddleware : s'exécute après SessionMiddleware (LIFO) pour accéder à la session
 app.add_middleware(LangSessionMiddleware)
 
+# Profilage à la demande (?__profile=1, admins) : s'exécute après SessionMiddleware
+app.add_middleware(ProfilerMiddleware)
+
 # Ajouter le middleware de session
 app.add_middleware(
     SessionMiddleware,
@@ -83,6 +91,20 @@ app.add_middleware(
     max_age=86400,  # 24 heures
 )
 
+# Compression gzip/brotli des réponses HTML/JSON
+# Ajouté avant AccessLoggerMiddleware : le logger voit les octets compressés
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+# Traçage SQL par requête : en-tête Server-Timing et journal des requêtes lentes
+if Config.SQL_TRACE:
+    app.add_middleware(SqlTraceMiddleware)
+    logger.info(f"🔍 Traçage SQL activé (requêtes lentes ≥ {Config.SLOW_QUERY_MS:.0f} ms)")
+
+# Métriques HTTP par gabarit de route (exposées par /metrics)
+# Ajouté avant AccessLoggerMiddleware : l'écriture du log d'accès n'est pas
+# comptée dans les requêtes SQL de la requête
+app.add_middleware(MetricsMiddleware)
+
 # Ajouter le middleware de logging des accès
 app.add_middleware(AccessLoggerMiddleware)
 logger.info("📊 Logging des accès activé")
@@ -108,9 +130,38 @@ if Config.GROQ_API_KEY:
 else:
     logger.warning("⚠️  Clé API Groq non configurée - l'import de recettes depuis URL est désactivé")
 
+# Vérification rapide du schéma au démarrage : migrations en attente, index manquants
+@app.on_event("startup")
+def check_database_schema():
+    from app.models.db_core import DB_PATH
+    from app.services.migration_runner import check_schema
+    problems = check_schema(DB_PATH)
+    for problem in problems:
+        logger.warning(f"⚠️  Schéma : {problem}")
+    if not problems:
+        logger.info("✅ Schéma de la base à jour")
+
+# Maintenance de la base en période creuse (un seul worker, voir app/services/db_maintenance.py)
+@app.on_event("startup")
+def start_database_maintenance():
+    if not Config.MAINTENANCE_ENABLED:
+        return
+    from app.services.db_maintenance import start_scheduler
+    if start_scheduler():
+        logger.info("✅ Planificateur de maintenance de la base démarré")
+
+@app.on_event("shutdown")
+def stop_database_maintenance():
+    from app.services.db_maintenance import stop_scheduler
+    stop_scheduler()
+
 # Montage des fichiers statiques
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+# Assets versionnés (hash dans le nom, cache navigateur immutable, gzip/brotli précalculés)
+get_asset_manifest()
+app.mount(ASSETS_URL_PREFIX, AssetFiles(), name="assets")
+
 # Import et montage des routes
 from app.routes.recipe_routes import router as recipe_router
 from app.routes.auth_routes import router as auth_router
@@ -119,7 +170,12 @@ from app.routes.catalog_routes import router as catalog_router
 from app.routes.conversion_routes import router as conversion_router
 from app.routes.participant_routes import router as participant_router
 from app.routes.calendar_routes import router as calendar_router
+from app.routes.typeahead_routes import router as typeahead_router
 from app.routes.mobile_routes import router as mobile_router
+from app.routes.metrics_routes import router as metrics_router
+from app.routes.profiler_routes import router as profiler_router
+from app.routes.backup_routes import router as backup_router
+from app.routes.maintenance_routes import router as maintenance_router
 # NOTE: monitoring_routes désactivé (nécessite table client_performance_log)
 # from app.routes.monitoring_routes import router as monitoring_router
 
@@ -130,7 +186,12 @@ app.include_router(catalog_router)
 app.include_router(conversion_router)
 app.include_router(participant_router)
 app.include_router(calendar_router)
+app.include_router(typeahead_router)
 app.include_router(mobile_router)
+app.include_router(metrics_router)
+app.include_router(profiler_router)
+app.include_router(backup_router)
+app.include_router(maintenance_router)
 # app.include_router(monitoring_router)
 
 # Page d'accueil : redirection vers la liste des recettes avec la langue de session
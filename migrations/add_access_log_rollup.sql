@@ -0,0 +1,97 @@
+-- Migration: add_access_log_rollup.sql
+-- Date: 2026-10-19
+-- Description: Agrégats horaires des logs d'accès
+--              get_access_stats() parcourait toutes les lignes brutes de la
+--              période (jusqu'à 30 jours) à chaque affichage de /access-logs.
+--              log_access() alimente désormais, dans la même transaction,
+--              des compteurs par heure : la page ne lit plus que ces agrégats,
+--              et les lignes brutes peuvent être purgées rapidement tandis que
+--              les agrégats sont conservés un an.
+-- Prérequis: add_access_logs.sql, add_response_size_to_access_log.sql,
+--            add_transfer_size_to_access_log.sql
+
+-- ============================================================================
+-- Table access_log_hourly : une ligne par (heure, chemin, classe de statut)
+-- ============================================================================
+
+-- Histogramme des temps de réponse : bornes supérieures (ms) des seaux
+-- b0..b11 = 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, +inf
+-- (doivent rester alignées sur LATENCY_BUCKETS_MS dans db_logging.py)
+CREATE TABLE IF NOT EXISTS access_log_hourly (
+    hour TEXT NOT NULL,                   -- Début de l'heure (UTC, 'YYYY-MM-DD HH:00:00')
+    path TEXT NOT NULL,
+    status_class INTEGER NOT NULL,        -- 2, 3, 4, 5 (0 = statut inconnu)
+    count INTEGER NOT NULL DEFAULT 0,
+    sized_count INTEGER NOT NULL DEFAULT 0,   -- Accès dont la taille est connue
+    bytes INTEGER NOT NULL DEFAULT 0,         -- Somme des tailles avant compression
+    transfer_bytes INTEGER NOT NULL DEFAULT 0,
+    timed_count INTEGER NOT NULL DEFAULT 0,   -- Accès dont le temps est connu
+    total_time_ms REAL NOT NULL DEFAULT 0,
+    b0 INTEGER NOT NULL DEFAULT 0,
+    b1 INTEGER NOT NULL DEFAULT 0,
+    b2 INTEGER NOT NULL DEFAULT 0,
+    b3 INTEGER NOT NULL DEFAULT 0,
+    b4 INTEGER NOT NULL DEFAULT 0,
+    b5 INTEGER NOT NULL DEFAULT 0,
+    b6 INTEGER NOT NULL DEFAULT 0,
+    b7 INTEGER NOT NULL DEFAULT 0,
+    b8 INTEGER NOT NULL DEFAULT 0,
+    b9 INTEGER NOT NULL DEFAULT 0,
+    b10 INTEGER NOT NULL DEFAULT 0,
+    b11 INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (hour, path, status_class)
+) WITHOUT ROWID;
+
+-- ============================================================================
+-- Table access_log_hourly_ip : accès par (heure, adresse IP)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS access_log_hourly_ip (
+    hour TEXT NOT NULL,
+    ip_address TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    first_access TIMESTAMP,
+    last_access TIMESTAMP,
+    PRIMARY KEY (hour, ip_address)
+) WITHOUT ROWID;
+
+-- ============================================================================
+-- Reprise des logs bruts existants
+-- ============================================================================
+
+INSERT OR IGNORE INTO access_log_hourly (
+    hour, path, status_class, count, sized_count, bytes, transfer_bytes,
+    timed_count, total_time_ms, b0, b1, b2, b3, b4, b5, b6, b7, b8, b9, b10, b11
+)
+SELECT
+    strftime('%Y-%m-%d %H:00:00', accessed_at),
+    path,
+    COALESCE(status_code / 100, 0),
+    COUNT(*),
+    COUNT(response_size_bytes),
+    COALESCE(SUM(response_size_bytes), 0),
+    COALESCE(SUM(transfer_size_bytes), 0),
+    COUNT(response_time_ms),
+    COALESCE(SUM(response_time_ms), 0),
+    COALESCE(SUM(response_time_ms <= 5), 0),
+    COALESCE(SUM(response_time_ms > 5 AND response_time_ms <= 10), 0),
+    COALESCE(SUM(response_time_ms > 10 AND response_time_ms <= 25), 0),
+    COALESCE(SUM(response_time_ms > 25 AND response_time_ms <= 50), 0),
+    COALESCE(SUM(response_time_ms > 50 AND response_time_ms <= 100), 0),
+    COALESCE(SUM(response_time_ms > 100 AND response_time_ms <= 250), 0),
+    COALESCE(SUM(response_time_ms > 250 AND response_time_ms <= 500), 0),
+    COALESCE(SUM(response_time_ms > 500 AND response_time_ms <= 1000), 0),
+    COALESCE(SUM(response_time_ms > 1000 AND response_time_ms <= 2500), 0),
+    COALESCE(SUM(response_time_ms > 2500 AND response_time_ms <= 5000), 0),
+    COALESCE(SUM(response_time_ms > 5000 AND response_time_ms <= 10000), 0),
+    COALESCE(SUM(response_time_ms > 10000), 0)
+FROM access_log
+WHERE path IS NOT NULL
+GROUP BY 1, 2, 3;
+
+INSERT OR IGNORE INTO access_log_hourly_ip (hour, ip_address, count, first_access, last_access)
+SELECT strftime('%Y-%m-%d %H:00:00', accessed_at), ip_address, COUNT(*), MIN(accessed_at), MAX(accessed_at)
+FROM access_log
+GROUP BY 1, 2;
+
+SELECT 'Tables access_log_hourly et access_log_hourly_ip créées avec succès' as status;
@@ -0,0 +1,416 @@
+-- Migration: add_data_generation.sql
+-- Date: 2026-10-19
+-- Description: Compteurs de génération par table pour les réponses HTTP conditionnelles
+--              Chaque INSERT / UPDATE / DELETE sur une table suivie incrémente
+--              son compteur. app/http_cache.py construit l'ETag d'une page à
+--              partir des générations des tables qu'elle lit (+ langue, utilisateur)
+--              et répond 304 Not Modified sans requêter ni rendre le template.
+
+-- ============================================================================
+-- Table data_generation
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS data_generation (
+    table_name TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO data_generation (table_name, generation) VALUES
+    ('recipe', 0),
+    ('recipe_translation', 0),
+    ('recipe_ingredient', 0),
+    ('recipe_ingredient_translation', 0),
+    ('step', 0),
+    ('step_translation', 0),
+    ('recipe_category', 0),
+    ('recipe_tag', 0),
+    ('recipe_recipe_type', 0),
+    ('recipe_event_type', 0),
+    ('category', 0),
+    ('tag', 0),
+    ('recipe_type', 0),
+    ('event_type', 0),
+    ('event', 0),
+    ('event_date', 0),
+    ('event_recipe', 0),
+    ('event_recipe_planning', 0),
+    ('meal_plan', 0),
+    ('user', 0);
+
+-- ============================================================================
+-- Recettes
+-- ============================================================================
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_insert
+AFTER INSERT ON recipe
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_update
+AFTER UPDATE ON recipe
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_delete
+AFTER DELETE ON recipe
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_translation_insert
+AFTER INSERT ON recipe_translation
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_translation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_translation_update
+AFTER UPDATE ON recipe_translation
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_translation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_translation_delete
+AFTER DELETE ON recipe_translation
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_translation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_ingredient_insert
+AFTER INSERT ON recipe_ingredient
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_ingredient';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_ingredient_update
+AFTER UPDATE ON recipe_ingredient
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_ingredient';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_ingredient_delete
+AFTER DELETE ON recipe_ingredient
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_ingredient';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_ingredient_translation_insert
+AFTER INSERT ON recipe_ingredient_translation
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_ingredient_translation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_ingredient_translation_update
+AFTER UPDATE ON recipe_ingredient_translation
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_ingredient_translation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_ingredient_translation_delete
+AFTER DELETE ON recipe_ingredient_translation
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_ingredient_translation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_step_insert
+AFTER INSERT ON step
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'step';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_step_update
+AFTER UPDATE ON step
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'step';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_step_delete
+AFTER DELETE ON step
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'step';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_step_translation_insert
+AFTER INSERT ON step_translation
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'step_translation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_step_translation_update
+AFTER UPDATE ON step_translation
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'step_translation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_step_translation_delete
+AFTER DELETE ON step_translation
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'step_translation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_category_insert
+AFTER INSERT ON recipe_category
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_category';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_category_update
+AFTER UPDATE ON recipe_category
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_category';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_category_delete
+AFTER DELETE ON recipe_category
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_category';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_tag_insert
+AFTER INSERT ON recipe_tag
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_tag';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_tag_update
+AFTER UPDATE ON recipe_tag
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_tag';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_tag_delete
+AFTER DELETE ON recipe_tag
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_tag';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_recipe_type_insert
+AFTER INSERT ON recipe_recipe_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_recipe_type';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_recipe_type_update
+AFTER UPDATE ON recipe_recipe_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_recipe_type';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_recipe_type_delete
+AFTER DELETE ON recipe_recipe_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_recipe_type';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_event_type_insert
+AFTER INSERT ON recipe_event_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_event_type';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_event_type_update
+AFTER UPDATE ON recipe_event_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_event_type';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_event_type_delete
+AFTER DELETE ON recipe_event_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_event_type';
+END;
+
+-- ============================================================================
+-- Métadonnées (catégories, tags, types)
+-- ============================================================================
+
+CREATE TRIGGER IF NOT EXISTS data_generation_category_insert
+AFTER INSERT ON category
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'category';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_category_update
+AFTER UPDATE ON category
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'category';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_category_delete
+AFTER DELETE ON category
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'category';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_tag_insert
+AFTER INSERT ON tag
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'tag';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_tag_update
+AFTER UPDATE ON tag
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'tag';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_tag_delete
+AFTER DELETE ON tag
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'tag';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_type_insert
+AFTER INSERT ON recipe_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_type';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_type_update
+AFTER UPDATE ON recipe_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_type';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_recipe_type_delete
+AFTER DELETE ON recipe_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_type';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_event_type_insert
+AFTER INSERT ON event_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_type';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_event_type_update
+AFTER UPDATE ON event_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_type';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_event_type_delete
+AFTER DELETE ON event_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_type';
+END;
+
+-- ============================================================================
+-- Événements et calendrier
+-- ============================================================================
+
+CREATE TRIGGER IF NOT EXISTS data_generation_event_insert
+AFTER INSERT ON event
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_event_update
+AFTER UPDATE ON event
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_event_delete
+AFTER DELETE ON event
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_event_date_insert
+AFTER INSERT ON event_date
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_date';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_event_date_update
+AFTER UPDATE ON event_date
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_date';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_event_date_delete
+AFTER DELETE ON event_date
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_date';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_event_recipe_insert
+AFTER INSERT ON event_recipe
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_recipe';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_event_recipe_update
+AFTER UPDATE ON event_recipe
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_recipe';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_event_recipe_delete
+AFTER DELETE ON event_recipe
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_recipe';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_event_recipe_planning_insert
+AFTER INSERT ON event_recipe_planning
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_recipe_planning';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_event_recipe_planning_update
+AFTER UPDATE ON event_recipe_planning
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_recipe_planning';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_event_recipe_planning_delete
+AFTER DELETE ON event_recipe_planning
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_recipe_planning';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_meal_plan_insert
+AFTER INSERT ON meal_plan
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'meal_plan';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_meal_plan_update
+AFTER UPDATE ON meal_plan
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'meal_plan';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_meal_plan_delete
+AFTER DELETE ON meal_plan
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'meal_plan';
+END;
+
+-- ============================================================================
+-- Utilisateurs
+-- ============================================================================
+
+CREATE TRIGGER IF NOT EXISTS data_generation_user_insert
+AFTER INSERT ON user
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'user';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_user_update
+AFTER UPDATE ON user
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'user';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_user_delete
+AFTER DELETE ON user
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'user';
+END;
+
+SELECT 'Compteurs de génération créés avec succès' as status;
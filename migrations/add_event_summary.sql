@@ -0,0 +1,179 @@
+-- Migration: add_event_summary.sql
+-- Date: 2026-10-19
+-- Description: Résumés dénormalisés des événements pour la liste /events
+--              list_events() lisait 5 sous-requêtes corrélées par événement
+--              (groupes, participants, recettes, première photo). Ces valeurs
+--              sont désormais précalculées dans event_summary.
+--
+-- Fonctionnement:
+--   - Les triggers ci-dessous ne recalculent rien : ils marquent seulement le
+--     résumé de l'événement concerné comme obsolète (stale = 1).
+--   - refresh_event_summaries() (db_events.py) reconstruit en une requête les
+--     résumés obsolètes juste avant la lecture de la liste.
+--   - La liste des événements devient un simple parcours indexé + jointure.
+
+-- ============================================================================
+-- Table event_summary
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS event_summary (
+    event_id INTEGER PRIMARY KEY,
+    groups TEXT,                          -- "Famille, Amis"
+    groups_raw TEXT,                      -- "1:Famille||2:Amis"
+    participants TEXT,                    -- "Jean Dupont, Marie"
+    participant_count INTEGER NOT NULL DEFAULT 0,
+    recipes_raw_fr TEXT,                  -- "slug::Nom FR||slug2::Nom FR 2"
+    recipes_raw_jp TEXT,                  -- "slug::名前||..."
+    recipe_count INTEGER NOT NULL DEFAULT 0,
+    first_photo TEXT,
+    stale INTEGER NOT NULL DEFAULT 1,     -- 1 = à reconstruire
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (event_id) REFERENCES event(id) ON DELETE CASCADE
+);
+
+-- Index partiel : retrouve instantanément les résumés à reconstruire
+CREATE INDEX IF NOT EXISTS idx_event_summary_stale
+ON event_summary(event_id) WHERE stale = 1;
+
+-- Index utilisés par les triggers de propagation (participant, groupe, recette)
+CREATE INDEX IF NOT EXISTS idx_event_recipe_recipe ON event_recipe(recipe_id);
+
+-- ============================================================================
+-- Triggers : événement
+-- ============================================================================
+
+CREATE TRIGGER IF NOT EXISTS event_summary_event_insert
+AFTER INSERT ON event
+BEGIN
+    INSERT INTO event_summary (event_id, stale) VALUES (NEW.id, 1)
+    ON CONFLICT(event_id) DO UPDATE SET stale = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS event_summary_event_delete
+AFTER DELETE ON event
+BEGIN
+    DELETE FROM event_summary WHERE event_id = OLD.id;
+END;
+
+-- ============================================================================
+-- Triggers : participants de l'événement
+-- ============================================================================
+
+CREATE TRIGGER IF NOT EXISTS event_summary_participant_insert
+AFTER INSERT ON event_participant
+BEGIN
+    INSERT INTO event_summary (event_id, stale) VALUES (NEW.event_id, 1)
+    ON CONFLICT(event_id) DO UPDATE SET stale = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS event_summary_participant_update
+AFTER UPDATE ON event_participant
+BEGIN
+    UPDATE event_summary SET stale = 1 WHERE event_id IN (OLD.event_id, NEW.event_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS event_summary_participant_delete
+AFTER DELETE ON event_participant
+BEGIN
+    UPDATE event_summary SET stale = 1 WHERE event_id = OLD.event_id;
+END;
+
+-- Renommage d'un participant ou d'un groupe : tous ses événements
+CREATE TRIGGER IF NOT EXISTS event_summary_participant_rename
+AFTER UPDATE OF nom, prenom ON participant
+BEGIN
+    UPDATE event_summary SET stale = 1
+    WHERE event_id IN (SELECT event_id FROM event_participant WHERE participant_id = NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS event_summary_group_rename
+AFTER UPDATE OF nom ON participant_group
+BEGIN
+    UPDATE event_summary SET stale = 1
+    WHERE event_id IN (SELECT event_id FROM event_participant WHERE added_via_group_id = NEW.id);
+END;
+
+-- ============================================================================
+-- Triggers : recettes de l'événement
+-- ============================================================================
+
+CREATE TRIGGER IF NOT EXISTS event_summary_recipe_insert
+AFTER INSERT ON event_recipe
+BEGIN
+    INSERT INTO event_summary (event_id, stale) VALUES (NEW.event_id, 1)
+    ON CONFLICT(event_id) DO UPDATE SET stale = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS event_summary_recipe_update
+AFTER UPDATE OF event_id, recipe_id ON event_recipe
+BEGIN
+    UPDATE event_summary SET stale = 1 WHERE event_id IN (OLD.event_id, NEW.event_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS event_summary_recipe_delete
+AFTER DELETE ON event_recipe
+BEGIN
+    UPDATE event_summary SET stale = 1 WHERE event_id = OLD.event_id;
+END;
+
+-- Renommage / traduction d'une recette : tous les événements qui l'utilisent
+CREATE TRIGGER IF NOT EXISTS event_summary_recipe_slug
+AFTER UPDATE OF slug ON recipe
+BEGIN
+    UPDATE event_summary SET stale = 1
+    WHERE event_id IN (SELECT event_id FROM event_recipe WHERE recipe_id = NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS event_summary_recipe_translation_insert
+AFTER INSERT ON recipe_translation
+BEGIN
+    UPDATE event_summary SET stale = 1
+    WHERE event_id IN (SELECT event_id FROM event_recipe WHERE recipe_id = NEW.recipe_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS event_summary_recipe_translation_update
+AFTER UPDATE OF name ON recipe_translation
+BEGIN
+    UPDATE event_summary SET stale = 1
+    WHERE event_id IN (SELECT event_id FROM event_recipe WHERE recipe_id = NEW.recipe_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS event_summary_recipe_translation_delete
+AFTER DELETE ON recipe_translation
+BEGIN
+    UPDATE event_summary SET stale = 1
+    WHERE event_id IN (SELECT event_id FROM event_recipe WHERE recipe_id = OLD.recipe_id);
+END;
+
+-- ============================================================================
+-- Triggers : photos de l'événement
+-- ============================================================================
+
+CREATE TRIGGER IF NOT EXISTS event_summary_photo_insert
+AFTER INSERT ON event_photo
+BEGIN
+    INSERT INTO event_summary (event_id, stale) VALUES (NEW.event_id, 1)
+    ON CONFLICT(event_id) DO UPDATE SET stale = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS event_summary_photo_update
+AFTER UPDATE OF photo_url, position ON event_photo
+BEGIN
+    UPDATE event_summary SET stale = 1 WHERE event_id = NEW.event_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS event_summary_photo_delete
+AFTER DELETE ON event_photo
+BEGIN
+    UPDATE event_summary SET stale = 1 WHERE event_id = OLD.event_id;
+END;
+
+-- ============================================================================
+-- Initialisation : tous les événements existants sont à construire
+-- (le premier appel à list_events() remplit les résumés)
+-- ============================================================================
+
+INSERT OR IGNORE INTO event_summary (event_id, stale)
+SELECT id, 1 FROM event;
+
+SELECT 'Table event_summary et triggers créés avec succès' as status;
@@ -0,0 +1,53 @@
+-- Migration: add_keyset_pagination_indexes.sql
+-- Date: 2026-10-19
+-- Description: Index composites pour la pagination par curseur (keyset)
+--              Chaque index couvre exactement la clé de tri stable utilisée par
+--              la requête paginée, terminée par l'id pour départager les égalités.
+--              La page N coûte alors le même prix que la page 1 (pas d'OFFSET).
+
+-- ============================================================================
+-- RECETTES : tri par nom (insensible à la casse) puis id
+-- ============================================================================
+
+-- Utilisé par: list_recipes() dans db_recipes.py
+-- ORDER BY name COLLATE NOCASE, r.id
+CREATE INDEX IF NOT EXISTS idx_recipe_translation_lang_name_recipe
+ON recipe_translation(lang, name COLLATE NOCASE, recipe_id);
+
+-- ============================================================================
+-- ÉVÉNEMENTS : tri par date décroissante puis id
+-- ============================================================================
+
+-- Utilisé par: list_events() dans db_events.py (admin, sans filtre)
+-- ORDER BY e.event_date DESC, e.id DESC
+CREATE INDEX IF NOT EXISTS idx_event_date_id
+ON event(event_date DESC, id DESC);
+
+-- Utilisé par: list_events() filtré par utilisateur
+CREATE INDEX IF NOT EXISTS idx_event_user_date_id
+ON event(user_id, event_date DESC, id DESC);
+
+-- ============================================================================
+-- TICKETS DE CAISSE : tri par date d'upload décroissante puis id
+-- ============================================================================
+
+-- Utilisé par: list_all_receipts() dans db_receipt.py
+CREATE INDEX IF NOT EXISTS idx_receipt_upload_date_id
+ON receipt_upload_history(upload_date DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_receipt_user_upload_date_id
+ON receipt_upload_history(user_id, upload_date DESC, id DESC);
+
+-- ============================================================================
+-- LOGS D'ACCÈS : tri par date d'accès décroissante puis id
+-- ============================================================================
+
+-- Utilisé par: get_recent_access_logs() dans db_logging.py
+CREATE INDEX IF NOT EXISTS idx_access_log_accessed_at_id
+ON access_log(accessed_at DESC, id DESC);
+
+-- ============================================================================
+-- Statistiques
+-- ============================================================================
+
+SELECT 'Index de pagination keyset créés avec succès' as status;
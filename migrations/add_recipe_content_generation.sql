@@ -0,0 +1,144 @@
+-- Migration: add_recipe_content_generation.sql
+-- Date: 2026-10-19
+-- Description: Génération propre à chaque recette pour le cache de fragments
+--              (app/services/fragment_cache.py). Les fragments de
+--              recipe_detail.html (ingrédients, étapes) étaient indexés sur
+--              les compteurs globaux de data_generation : la moindre écriture
+--              sur une recette invalidait les fragments de toutes les autres.
+--              recipe.content_generation n'avance que pour les recettes dont
+--              le contenu affiché change, y compris le nom ou le slug d'une
+--              recette liée à un ingrédient.
+
+-- ============================================================================
+-- Colonne
+-- ============================================================================
+
+ALTER TABLE recipe ADD COLUMN content_generation INTEGER NOT NULL DEFAULT 0;
+
+-- Recettes qui utilisent une recette donnée comme ingrédient (triggers ci-dessous)
+CREATE INDEX IF NOT EXISTS idx_recipe_ingredient_linked_recipe
+ON recipe_ingredient(linked_recipe_id) WHERE linked_recipe_id IS NOT NULL;
+
+-- ============================================================================
+-- Triggers : ingrédients
+-- ============================================================================
+
+CREATE TRIGGER IF NOT EXISTS recipe_generation_ingredient_insert
+AFTER INSERT ON recipe_ingredient
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1 WHERE id = NEW.recipe_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_generation_ingredient_update
+AFTER UPDATE ON recipe_ingredient
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id IN (OLD.recipe_id, NEW.recipe_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_generation_ingredient_delete
+AFTER DELETE ON recipe_ingredient
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1 WHERE id = OLD.recipe_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_generation_ingredient_translation_insert
+AFTER INSERT ON recipe_ingredient_translation
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id = (SELECT recipe_id FROM recipe_ingredient WHERE id = NEW.recipe_ingredient_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_generation_ingredient_translation_update
+AFTER UPDATE ON recipe_ingredient_translation
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id IN (SELECT recipe_id FROM recipe_ingredient
+                 WHERE id IN (OLD.recipe_ingredient_id, NEW.recipe_ingredient_id));
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_generation_ingredient_translation_delete
+AFTER DELETE ON recipe_ingredient_translation
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id = (SELECT recipe_id FROM recipe_ingredient WHERE id = OLD.recipe_ingredient_id);
+END;
+
+-- ============================================================================
+-- Triggers : étapes
+-- ============================================================================
+
+CREATE TRIGGER IF NOT EXISTS recipe_generation_step_insert
+AFTER INSERT ON step
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1 WHERE id = NEW.recipe_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_generation_step_update
+AFTER UPDATE ON step
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id IN (OLD.recipe_id, NEW.recipe_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_generation_step_delete
+AFTER DELETE ON step
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1 WHERE id = OLD.recipe_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_generation_step_translation_insert
+AFTER INSERT ON step_translation
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id = (SELECT recipe_id FROM step WHERE id = NEW.step_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_generation_step_translation_update
+AFTER UPDATE ON step_translation
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id IN (SELECT recipe_id FROM step WHERE id IN (OLD.step_id, NEW.step_id));
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_generation_step_translation_delete
+AFTER DELETE ON step_translation
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id = (SELECT recipe_id FROM step WHERE id = OLD.step_id);
+END;
+
+-- ============================================================================
+-- Triggers : recettes liées (nom et slug affichés dans le tableau des ingrédients)
+-- ============================================================================
+
+CREATE TRIGGER IF NOT EXISTS recipe_generation_linked_slug
+AFTER UPDATE OF slug ON recipe
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id IN (SELECT recipe_id FROM recipe_ingredient WHERE linked_recipe_id = NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_generation_linked_translation_insert
+AFTER INSERT ON recipe_translation
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id IN (SELECT recipe_id FROM recipe_ingredient WHERE linked_recipe_id = NEW.recipe_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_generation_linked_translation_update
+AFTER UPDATE ON recipe_translation
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id IN (SELECT recipe_id FROM recipe_ingredient
+                 WHERE linked_recipe_id IN (OLD.recipe_id, NEW.recipe_id));
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_generation_linked_translation_delete
+AFTER DELETE ON recipe_translation
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id IN (SELECT recipe_id FROM recipe_ingredient WHERE linked_recipe_id = OLD.recipe_id);
+END;
+
+SELECT 'Génération de contenu des recettes ajoutée avec succès' as status;
@@ -0,0 +1,119 @@
+-- Migration: add_recipe_counters.sql
+-- Date: 2026-10-19
+-- Description: Compteurs maintenus sur la table recipe pour list_recipes()
+--              ingredient_count, step_count (étapes texte) et available_langs
+--              étaient recalculés par sous-requêtes corrélées / jointure pour
+--              chaque recette à chaque affichage de /recipes.
+--              Ils sont désormais tenus à jour par triggers.
+-- Prérequis: add_step_images.sql (colonne step.type)
+
+-- ============================================================================
+-- Colonnes
+-- ============================================================================
+
+ALTER TABLE recipe ADD COLUMN ingredient_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE recipe ADD COLUMN step_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE recipe ADD COLUMN available_langs TEXT NOT NULL DEFAULT '';  -- ex: "fr,jp"
+
+-- ============================================================================
+-- Triggers : ingrédients
+-- ============================================================================
+
+CREATE TRIGGER IF NOT EXISTS recipe_counter_ingredient_insert
+AFTER INSERT ON recipe_ingredient
+BEGIN
+    UPDATE recipe SET ingredient_count = ingredient_count + 1 WHERE id = NEW.recipe_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_counter_ingredient_delete
+AFTER DELETE ON recipe_ingredient
+BEGIN
+    UPDATE recipe SET ingredient_count = ingredient_count - 1 WHERE id = OLD.recipe_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_counter_ingredient_move
+AFTER UPDATE OF recipe_id ON recipe_ingredient
+WHEN OLD.recipe_id IS NOT NEW.recipe_id
+BEGIN
+    UPDATE recipe SET ingredient_count = ingredient_count - 1 WHERE id = OLD.recipe_id;
+    UPDATE recipe SET ingredient_count = ingredient_count + 1 WHERE id = NEW.recipe_id;
+END;
+
+-- ============================================================================
+-- Triggers : étapes (seules les étapes de type 'text' sont comptées)
+-- ============================================================================
+
+CREATE TRIGGER IF NOT EXISTS recipe_counter_step_insert
+AFTER INSERT ON step
+WHEN NEW.type = 'text'
+BEGIN
+    UPDATE recipe SET step_count = step_count + 1 WHERE id = NEW.recipe_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_counter_step_delete
+AFTER DELETE ON step
+WHEN OLD.type = 'text'
+BEGIN
+    UPDATE recipe SET step_count = step_count - 1 WHERE id = OLD.recipe_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_counter_step_update
+AFTER UPDATE OF recipe_id, type ON step
+BEGIN
+    UPDATE recipe SET step_count = step_count - 1
+    WHERE id = OLD.recipe_id AND OLD.type = 'text';
+    UPDATE recipe SET step_count = step_count + 1
+    WHERE id = NEW.recipe_id AND NEW.type = 'text';
+END;
+
+-- ============================================================================
+-- Triggers : langues disponibles (liste triée, séparée par des virgules)
+-- ============================================================================
+
+CREATE TRIGGER IF NOT EXISTS recipe_counter_translation_insert
+AFTER INSERT ON recipe_translation
+BEGIN
+    UPDATE recipe SET available_langs = COALESCE((
+        SELECT GROUP_CONCAT(lang, ',') FROM (
+            SELECT lang FROM recipe_translation WHERE recipe_id = NEW.recipe_id ORDER BY lang
+        )
+    ), '')
+    WHERE id = NEW.recipe_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_counter_translation_delete
+AFTER DELETE ON recipe_translation
+BEGIN
+    UPDATE recipe SET available_langs = COALESCE((
+        SELECT GROUP_CONCAT(lang, ',') FROM (
+            SELECT lang FROM recipe_translation WHERE recipe_id = OLD.recipe_id ORDER BY lang
+        )
+    ), '')
+    WHERE id = OLD.recipe_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_counter_translation_update
+AFTER UPDATE OF recipe_id, lang ON recipe_translation
+BEGIN
+    UPDATE recipe SET available_langs = COALESCE((
+        SELECT GROUP_CONCAT(lang, ',') FROM (
+            SELECT lang FROM recipe_translation WHERE recipe_id = recipe.id ORDER BY lang
+        )
+    ), '')
+    WHERE id IN (OLD.recipe_id, NEW.recipe_id);
+END;
+
+-- ============================================================================
+-- Backfill des recettes existantes
+-- ============================================================================
+
+UPDATE recipe SET
+    ingredient_count = (SELECT COUNT(*) FROM recipe_ingredient ri WHERE ri.recipe_id = recipe.id),
+    step_count = (SELECT COUNT(*) FROM step s WHERE s.recipe_id = recipe.id AND s.type = 'text'),
+    available_langs = COALESCE((
+        SELECT GROUP_CONCAT(lang, ',') FROM (
+            SELECT lang FROM recipe_translation rt WHERE rt.recipe_id = recipe.id ORDER BY lang
+        )
+    ), '');
+
+SELECT 'Compteurs de recettes ajoutés avec succès' as status;
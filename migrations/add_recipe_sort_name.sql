@@ -0,0 +1,105 @@
+-- Migration: add_recipe_sort_name.sql
+-- Date: 2026-10-19
+-- Description: Clé de tri par langue pour la liste paginée des recettes
+--              list_recipes() trie sur COALESCE(rt.name, r.slug) : une
+--              expression calculée après la jointure, qu'aucun index ne couvre
+--              (plan : SCAN r + USE TEMP B-TREE FOR ORDER BY, à chaque page).
+--              recipe.sort_name_fr / sort_name_jp contiennent cette valeur,
+--              toujours renseignée (slug à défaut de traduction) et tenue à
+--              jour par triggers ; les index (sort_name_xx, id) servent à la
+--              fois le tri et la reprise après le curseur.
+--              Remplace idx_recipe_translation_lang_name_recipe, jamais utilisé.
+
+-- ============================================================================
+-- Colonnes
+-- ============================================================================
+
+ALTER TABLE recipe ADD COLUMN sort_name_fr TEXT NOT NULL DEFAULT '' COLLATE NOCASE;
+ALTER TABLE recipe ADD COLUMN sort_name_jp TEXT NOT NULL DEFAULT '' COLLATE NOCASE;
+
+-- ============================================================================
+-- Triggers
+-- ============================================================================
+
+CREATE TRIGGER IF NOT EXISTS recipe_sort_name_insert
+AFTER INSERT ON recipe
+BEGIN
+    UPDATE recipe SET
+        sort_name_fr = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = NEW.id AND lang = 'fr'), NEW.slug),
+        sort_name_jp = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = NEW.id AND lang = 'jp'), NEW.slug)
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_sort_name_slug
+AFTER UPDATE OF slug ON recipe
+BEGIN
+    UPDATE recipe SET
+        sort_name_fr = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = NEW.id AND lang = 'fr'), NEW.slug),
+        sort_name_jp = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = NEW.id AND lang = 'jp'), NEW.slug)
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_sort_name_translation_insert
+AFTER INSERT ON recipe_translation
+BEGIN
+    UPDATE recipe SET
+        sort_name_fr = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = recipe.id AND lang = 'fr'), slug),
+        sort_name_jp = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = recipe.id AND lang = 'jp'), slug)
+    WHERE id = NEW.recipe_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_sort_name_translation_update
+AFTER UPDATE OF recipe_id, lang, name ON recipe_translation
+BEGIN
+    UPDATE recipe SET
+        sort_name_fr = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = recipe.id AND lang = 'fr'), slug),
+        sort_name_jp = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = recipe.id AND lang = 'jp'), slug)
+    WHERE id IN (OLD.recipe_id, NEW.recipe_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS recipe_sort_name_translation_delete
+AFTER DELETE ON recipe_translation
+BEGIN
+    UPDATE recipe SET
+        sort_name_fr = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = recipe.id AND lang = 'fr'), slug),
+        sort_name_jp = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = recipe.id AND lang = 'jp'), slug)
+    WHERE id = OLD.recipe_id;
+END;
+
+-- ============================================================================
+-- Backfill des recettes existantes
+-- ============================================================================
+
+UPDATE recipe SET
+    sort_name_fr = COALESCE((SELECT name FROM recipe_translation
+                             WHERE recipe_id = recipe.id AND lang = 'fr'), slug),
+    sort_name_jp = COALESCE((SELECT name FROM recipe_translation
+                             WHERE recipe_id = recipe.id AND lang = 'jp'), slug);
+
+-- ============================================================================
+-- Index
+-- ============================================================================
+
+-- Utilisé par: list_recipes() dans db_recipes.py
+-- ORDER BY r.sort_name_xx, r.id (collation NOCASE de la colonne)
+CREATE INDEX IF NOT EXISTS idx_recipe_sort_name_fr ON recipe(sort_name_fr, id);
+CREATE INDEX IF NOT EXISTS idx_recipe_sort_name_jp ON recipe(sort_name_jp, id);
+
+-- Utilisé par: list_recipes() filtré par créateur
+CREATE INDEX IF NOT EXISTS idx_recipe_user_sort_name_fr ON recipe(user_id, sort_name_fr, id);
+CREATE INDEX IF NOT EXISTS idx_recipe_user_sort_name_jp ON recipe(user_id, sort_name_jp, id);
+
+-- Le tri ne passe plus par recipe_translation
+DROP INDEX IF EXISTS idx_recipe_translation_lang_name_recipe;
+
+SELECT 'Clés de tri des recettes ajoutées avec succès' as status;
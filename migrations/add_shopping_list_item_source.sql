@@ -0,0 +1,57 @@
+-- Migration: add_shopping_list_item_source.sql
+-- Date: 2026-10-19
+-- Description: Recettes sources des lignes de liste de courses en table fille
+--              shopping_list_item.source_recipes contenait un JSON
+--              ([{recipe_id, recipe_name, quantity, unit}, ...]) désérialisé
+--              à chaque lecture. Les sources sont désormais des lignes
+--              indexées : "quelles lignes viennent de la recette X" devient
+--              une simple requête, sans parcourir ni parser les blobs.
+-- Prérequis: add_shopping_list_items.sql
+
+-- ============================================================================
+-- Table shopping_list_item_source
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS shopping_list_item_source (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    item_id INTEGER NOT NULL,
+    recipe_id INTEGER,
+    recipe_name TEXT,                     -- Nom dans la langue de génération de la liste
+    quantity REAL,                        -- Quantité ajustée (NULL = sans quantité précise)
+    unit TEXT,
+    position INTEGER NOT NULL DEFAULT 0,  -- Ordre d'affichage des sources d'une ligne
+    FOREIGN KEY (item_id) REFERENCES shopping_list_item(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_shopping_list_item_source_item
+ON shopping_list_item_source(item_id, position);
+
+CREATE INDEX IF NOT EXISTS idx_shopping_list_item_source_recipe
+ON shopping_list_item_source(recipe_id, item_id);
+
+-- Les clés étrangères ne sont pas activées sur les connexions (PRAGMA foreign_keys) :
+-- la suppression en cascade est assurée par trigger
+CREATE TRIGGER IF NOT EXISTS shopping_list_item_source_cascade
+AFTER DELETE ON shopping_list_item
+BEGIN
+    DELETE FROM shopping_list_item_source WHERE item_id = OLD.id;
+END;
+
+-- ============================================================================
+-- Reprise des données JSON existantes
+-- ============================================================================
+
+INSERT INTO shopping_list_item_source (item_id, recipe_id, recipe_name, quantity, unit, position)
+SELECT
+    sli.id,
+    json_extract(j.value, '$.recipe_id'),
+    json_extract(j.value, '$.recipe_name'),
+    json_extract(j.value, '$.quantity'),
+    json_extract(j.value, '$.unit'),
+    j.key
+FROM shopping_list_item sli, json_each(sli.source_recipes) j
+WHERE sli.source_recipes IS NOT NULL AND json_valid(sli.source_recipes);
+
+UPDATE shopping_list_item SET source_recipes = NULL WHERE source_recipes IS NOT NULL;
+
+SELECT 'Table shopping_list_item_source créée avec succès' as status;
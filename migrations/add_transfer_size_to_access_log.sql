@@ -0,0 +1,18 @@
+-- Migration: Ajout de la taille transférée (après compression) dans les logs d'accès
+-- Date: 2026-10-19
+-- Description: response_size_bytes = taille avant compression,
+--              transfer_size_bytes = octets réellement envoyés au client (gzip/brotli)
+--              Permet de mesurer la bande passante économisée sur mobile
+-- Prérequis: add_response_size_to_access_log.sql
+
+-- ============================================================================
+-- Ajout de la colonne transfer_size_bytes
+-- ============================================================================
+
+ALTER TABLE access_log ADD COLUMN transfer_size_bytes INTEGER;
+
+-- ============================================================================
+-- Statistiques
+-- ============================================================================
+
+SELECT 'Colonne transfer_size_bytes ajoutée avec succès' as status;
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Sauvegarde à chaud de la base (API de sauvegarde SQLite)
+
+Produit un instantané cohérent de la base, même pendant que l'application
+écrit, sans l'arrêter (voir app/services/db_backup.py).
+
+Usage:
+    python scripts/backup_db.py                         # backups/recette_<date>.sqlite3
+    python scripts/backup_db.py --gzip --keep 30
+    python scripts/backup_db.py --output /tmp/recette_sync.sqlite3.gz
+    python scripts/backup_db.py --list
+"""
+
+import argparse
+import os
+import sys
+
+# Ajouter le répertoire parent au path pour importer les modules
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import Config
+from app.models import db_core
+from app.services.db_backup import backup_database, list_backups
+
+GREEN = '\033[92m'
+RED = '\033[91m'
+RESET = '\033[0m'
+
+
+def _size(size: int) -> str:
+    for unit in ("o", "Ko", "Mo", "Go"):
+        if size < 1024 or unit == "Go":
+            return f"{size:.0f} {unit}" if unit == "o" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def _print_progress(copied: int, total: int):
+    width = 30
+    done = int(width * copied / total) if total else width
+    sys.stdout.write(f"\r   [{'█' * done}{'·' * (width - done)}] {copied}/{total} pages")
+    sys.stdout.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sauvegarde à chaud de la base SQLite")
+    parser.add_argument("--db", default=db_core.DB_PATH, help=f"Base à sauvegarder (défaut: {db_core.DB_PATH})")
+    parser.add_argument("--dir", default=Config.BACKUP_DIR, help=f"Répertoire des sauvegardes (défaut: {Config.BACKUP_DIR})")
+    parser.add_argument("--output", help="Fichier de destination explicite (pas de rotation, .gz = compressé)")
+    parser.add_argument("--gzip", action="store_true", help="Compresser la sauvegarde")
+    parser.add_argument("--keep", type=int, default=Config.BACKUP_KEEP,
+                        help=f"Sauvegardes conservées, 0 = toutes (défaut: {Config.BACKUP_KEEP})")
+    parser.add_argument("--pages", type=int, default=Config.BACKUP_PAGES_PER_STEP,
+                        help=f"Pages copiées par étape (défaut: {Config.BACKUP_PAGES_PER_STEP})")
+    parser.add_argument("--sleep", type=float, default=Config.BACKUP_STEP_SLEEP,
+                        help=f"Pause entre deux étapes en secondes (défaut: {Config.BACKUP_STEP_SLEEP})")
+    parser.add_argument("--list", action="store_true", help="Lister les sauvegardes existantes")
+    parser.add_argument("--quiet", action="store_true", help="Pas de barre de progression")
+    args = parser.parse_args()
+
+    if args.list:
+        for backup in list_backups(args.dir):
+            print(f"  {backup['created_at']}  {_size(backup['size']):>10}  {backup['name']}")
+        return
+
+    if not os.path.exists(args.db):
+        parser.error(f"base introuvable : {args.db}")
+
+    print(f"💾 Sauvegarde de {args.db}")
+    try:
+        result = backup_database(
+            args.db, directory=args.dir, output=args.output, compress=args.gzip, keep=args.keep,
+            pages=args.pages, sleep=args.sleep, progress=None if args.quiet else _print_progress,
+        )
+    except Exception as e:
+        print(f"\n{RED}❌ Échec de la sauvegarde : {e}{RESET}")
+        sys.exit(1)
+
+    if not args.quiet:
+        print()
+    print(f"{GREEN}✓ {result['path']} ({_size(result['size'])}, {result['pages']} pages, "
+          f"{result['steps']} étapes, {result['duration_ms'] / 1000:.1f} s){RESET}")
+    for name in result["removed"]:
+        print(f"   🗑️  {name} (rotation)")
+
+
+if __name__ == "__main__":
+    main()
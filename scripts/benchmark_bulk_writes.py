@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Benchmark des écritures en lot : INSERT ligne par ligne vs executemany / INSERT ... SELECT
+
+Mesure le débit (lignes/s) de :
+- save_shopping_list_items() pour une liste de courses de 300 items ;
+- copy_event() pour un événement de 10 recettes sur 7 jours (planning complet).
+
+La référence "ligne par ligne" reproduit l'ancienne boucle de cursor.execute().
+
+Usage:
+    python scripts/benchmark_bulk_writes.py
+    python scripts/benchmark_bulk_writes.py --items 1000 --runs 50
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import db_core
+from app.models.db_events import copy_event
+from app.models.db_shopping import save_shopping_list_items
+
+# Schéma minimal des tables écrites
+SCHEMA = """
+    CREATE TABLE event (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, event_type_id INTEGER NOT NULL,
+        name TEXT NOT NULL, event_date DATE NOT NULL, location TEXT,
+        attendees INTEGER DEFAULT 1, notes TEXT, budget_planned REAL, currency TEXT,
+        user_id INTEGER, date_debut DATE, date_fin DATE, nombre_jours INTEGER DEFAULT 1
+    );
+    CREATE TABLE event_recipe (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, event_id INTEGER NOT NULL,
+        recipe_id INTEGER NOT NULL, servings_multiplier REAL DEFAULT 1.0,
+        position INTEGER DEFAULT 0, UNIQUE(event_id, recipe_id)
+    );
+    CREATE TABLE event_date (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, event_id INTEGER NOT NULL,
+        date DATE NOT NULL, is_selected BOOLEAN DEFAULT 1, UNIQUE(event_id, date)
+    );
+    CREATE TABLE event_recipe_planning (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, event_id INTEGER NOT NULL,
+        recipe_id INTEGER NOT NULL, event_date_id INTEGER NOT NULL,
+        position INTEGER NOT NULL DEFAULT 0, UNIQUE(event_id, recipe_id, event_date_id)
+    );
+    CREATE TABLE shopping_list_item (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, event_id INTEGER NOT NULL,
+        ingredient_name TEXT NOT NULL, needed_quantity REAL, needed_unit TEXT,
+        purchase_quantity REAL, purchase_unit TEXT, is_checked BOOLEAN DEFAULT 0,
+        notes TEXT, source_recipes TEXT, position INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX idx_shopping_list_event ON shopping_list_item(event_id);
+"""
+
+SHOPPING_INSERT_SQL = """
+    INSERT INTO shopping_list_item (
+        event_id, ingredient_name, needed_quantity, needed_unit,
+        purchase_quantity, purchase_unit, is_checked, notes, source_recipes, position
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def populate(path: str, nb_recipes: int, nb_days: int) -> int:
+    """Crée l'événement source (recettes + planning complet) et retourne son ID"""
+    con = sqlite3.connect(path)
+    con.executescript(SCHEMA)
+    cur = con.execute("""
+        INSERT INTO event (event_type_id, name, event_date, attendees, user_id,
+                           date_debut, date_fin, nombre_jours)
+        VALUES (1, 'Source', '2026-07-01', 8, 1, '2026-07-01', date('2026-07-01', ?), ?)
+    """, (f"+{nb_days - 1} days", nb_days))
+    event_id = cur.lastrowid
+    con.executemany(
+        "INSERT INTO event_recipe (event_id, recipe_id, servings_multiplier, position) VALUES (?, ?, 1.5, ?)",
+        [(event_id, r + 1, r) for r in range(nb_recipes)]
+    )
+    con.executemany(
+        "INSERT INTO event_date (event_id, date, is_selected) VALUES (?, date('2026-07-01', ?), 1)",
+        [(event_id, f"+{d} days") for d in range(nb_days)]
+    )
+    con.execute("""
+        INSERT INTO event_recipe_planning (event_id, recipe_id, event_date_id, position)
+        SELECT ?, er.recipe_id, ed.id, er.position
+        FROM event_recipe er, event_date ed
+        WHERE er.event_id = ? AND ed.event_id = ?
+    """, (event_id, event_id, event_id))
+    con.commit()
+    con.close()
+    return event_id
+
+
+def make_items(nb_items: int) -> list:
+    """Items agrégés tels que produits par IngredientAggregator"""
+    return [
+        {
+            'ingredient_name': f"ingrédient {i}",
+            'total_quantity': 100 + i,
+            'purchase_unit': 'g',
+            'notes': '',
+            'source_recipes': [{'recipe_name': f"Recette {i % 10}", 'quantity': 100 + i, 'unit': 'g'}],
+        }
+        for i in range(nb_items)
+    ]
+
+
+def save_row_by_row(event_id: int, items: list):
+    """Référence : ancienne implémentation (un cursor.execute par item)"""
+    with db_core.get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM shopping_list_item WHERE event_id = ?", (event_id,))
+        for position, item in enumerate(items):
+            cursor.execute(SHOPPING_INSERT_SQL, (
+                event_id, item['ingredient_name'], item.get('total_quantity'), item.get('purchase_unit'),
+                item.get('total_quantity'), item.get('purchase_unit'), False, item.get('notes', ''),
+                json.dumps(item.get('source_recipes', [])), position
+            ))
+        conn.commit()
+
+
+def copy_row_by_row(event_id: int, nb_days: int):
+    """Référence : copie recette par recette, date par date, entrée de planning par entrée"""
+    with db_core.get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO event (event_type_id, name, event_date, attendees, user_id,
+                               date_debut, date_fin, nombre_jours)
+            VALUES (1, 'Copie', '2026-08-01', 8, 1, '2026-08-01', date('2026-08-01', ?), ?)
+        """, (f"+{nb_days - 1} days", nb_days))
+        new_event_id = cursor.lastrowid
+        for recipe in cursor.execute(
+            "SELECT recipe_id, servings_multiplier, position FROM event_recipe WHERE event_id = ?", (event_id,)
+        ).fetchall():
+            cursor.execute(
+                "INSERT INTO event_recipe (event_id, recipe_id, servings_multiplier, position) VALUES (?, ?, ?, ?)",
+                (new_event_id, recipe['recipe_id'], recipe['servings_multiplier'], recipe['position'])
+            )
+        for d in range(nb_days):
+            cursor.execute(
+                "INSERT INTO event_date (event_id, date, is_selected) VALUES (?, date('2026-08-01', ?), 1)",
+                (new_event_id, f"+{d} days")
+            )
+        source_dates = cursor.execute(
+            "SELECT id FROM event_date WHERE event_id = ? ORDER BY date", (event_id,)).fetchall()
+        new_dates = cursor.execute(
+            "SELECT id FROM event_date WHERE event_id = ? ORDER BY date", (new_event_id,)).fetchall()
+        mapping = {s['id']: n['id'] for s, n in zip(source_dates, new_dates)}
+        for entry in cursor.execute(
+            "SELECT recipe_id, event_date_id, position FROM event_recipe_planning WHERE event_id = ?", (event_id,)
+        ).fetchall():
+            cursor.execute(
+                "INSERT INTO event_recipe_planning (event_id, recipe_id, event_date_id, position) VALUES (?, ?, ?, ?)",
+                (new_event_id, entry['recipe_id'], mapping[entry['event_date_id']], entry['position'])
+            )
+        conn.commit()
+
+
+def timed(label: str, rows: int, runs: int, fn, *args):
+    """Exécute fn plusieurs fois et affiche le débit médian"""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(*args)
+        durations.append(time.perf_counter() - start)
+    median = statistics.median(durations)
+    print(f"  {label:<34} {median * 1000:8.2f} ms  {rows / median:12,.0f} lignes/s")
+    return median
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des écritures en lot (executemany / INSERT ... SELECT)")
+    parser.add_argument("--items", type=int, default=300, help="Items de la liste de courses (défaut: 300)")
+    parser.add_argument("--recipes", type=int, default=10, help="Recettes de l'événement copié (défaut: 10)")
+    parser.add_argument("--days", type=int, default=7, help="Jours de l'événement copié (défaut: 7)")
+    parser.add_argument("--runs", type=int, default=20, help="Nombre de mesures (défaut: 20)")
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".sqlite3")
+    os.close(fd)
+    try:
+        event_id = populate(path, args.recipes, args.days)
+        db_core.DB_PATH = path
+
+        items = make_items(args.items)
+        print(f"\n🛒 save_shopping_list_items() : {args.items} items")
+        before = timed("ligne par ligne", args.items, args.runs, save_row_by_row, event_id, items)
+        after = timed("executemany", args.items, args.runs, save_shopping_list_items, event_id, items)
+        print(f"  ✅ Gain : x{before / after:.1f}")
+
+        copied_rows = args.recipes + args.days + args.recipes * args.days
+        print(f"\n📅 copy_event() : {args.recipes} recettes x {args.days} jours ({copied_rows} lignes copiées)")
+        before = timed("ligne par ligne", copied_rows, args.runs, copy_row_by_row, event_id, args.days)
+        after = timed("INSERT ... SELECT", copied_rows, args.runs, copy_event,
+                      event_id, "Copie", 1, "2026-08-01",
+                      (date(2026, 8, 1) + timedelta(days=args.days - 1)).isoformat())
+        print(f"  ✅ Gain : x{before / after:.1f}")
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
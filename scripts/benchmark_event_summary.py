@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark de list_events() : sous-requêtes corrélées vs table event_summary
+
+Crée une base temporaire (1000 événements x 20 participants par défaut),
+mesure list_events() sans la migration add_event_summary.sql, puis avec.
+
+Usage:
+    python scripts/benchmark_event_summary.py
+    python scripts/benchmark_event_summary.py --events 5000 --participants 30
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+# Ajouter le répertoire parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import db_core
+from app.models.db_events import list_events
+
+MIGRATION = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "migrations", "add_event_summary.sql"
+)
+
+# Schéma minimal des tables lues par list_events()
+SCHEMA = """
+    CREATE TABLE event_type (id INTEGER PRIMARY KEY, name_fr TEXT, name_jp TEXT);
+    CREATE TABLE event (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, event_type_id INTEGER NOT NULL,
+        name TEXT NOT NULL, event_date DATE NOT NULL, location TEXT,
+        attendees INTEGER DEFAULT 1, notes TEXT, created_at TIMESTAMP, updated_at TIMESTAMP,
+        currency TEXT, budget_planned REAL, user_id INTEGER
+    );
+    CREATE TABLE participant (id INTEGER PRIMARY KEY AUTOINCREMENT, nom TEXT NOT NULL, prenom TEXT);
+    CREATE TABLE participant_group (id INTEGER PRIMARY KEY AUTOINCREMENT, nom TEXT NOT NULL);
+    CREATE TABLE event_participant (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, event_id INTEGER NOT NULL,
+        participant_id INTEGER NOT NULL, added_via_group_id INTEGER,
+        UNIQUE(event_id, participant_id)
+    );
+    CREATE INDEX idx_ep_event ON event_participant(event_id);
+    CREATE TABLE recipe (id INTEGER PRIMARY KEY AUTOINCREMENT, slug TEXT UNIQUE NOT NULL);
+    CREATE TABLE recipe_translation (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, recipe_id INTEGER NOT NULL,
+        lang TEXT NOT NULL, name TEXT NOT NULL, UNIQUE(recipe_id, lang)
+    );
+    CREATE TABLE event_recipe (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, event_id INTEGER NOT NULL,
+        recipe_id INTEGER NOT NULL, position INTEGER DEFAULT 0, UNIQUE(event_id, recipe_id)
+    );
+    CREATE INDEX idx_event_recipe_event ON event_recipe(event_id);
+    CREATE TABLE event_photo (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, event_id INTEGER NOT NULL,
+        photo_url TEXT NOT NULL, position INTEGER DEFAULT 0
+    );
+    CREATE INDEX idx_event_photo_event ON event_photo(event_id);
+    CREATE INDEX idx_event_date_id ON event(event_date DESC, id DESC);
+"""
+
+
+def populate(path: str, nb_events: int, nb_participants: int, nb_recipes: int = 5):
+    """Remplit la base de test"""
+    con = sqlite3.connect(path)
+    con.executescript(SCHEMA)
+    con.execute("INSERT INTO event_type (id, name_fr, name_jp) VALUES (1, 'Repas', '食事')")
+    con.executemany("INSERT INTO participant_group (nom) VALUES (?)",
+                    [(f"Groupe {i}",) for i in range(10)])
+    con.executemany("INSERT INTO participant (nom, prenom) VALUES (?, ?)",
+                    [(f"Nom{i}", f"Prénom{i}") for i in range(500)])
+    con.executemany("INSERT INTO recipe (slug) VALUES (?)", [(f"recette-{i}",) for i in range(200)])
+    con.executemany(
+        "INSERT INTO recipe_translation (recipe_id, lang, name) VALUES (?, ?, ?)",
+        [(i + 1, lang, f"Recette {i} {lang}") for i in range(200) for lang in ("fr", "jp")]
+    )
+
+    for e in range(nb_events):
+        cur = con.execute(
+            "INSERT INTO event (event_type_id, name, event_date, user_id) VALUES (1, ?, date('2020-01-01', ?), 1)",
+            (f"Événement {e}", f"+{e} days")
+        )
+        event_id = cur.lastrowid
+        con.executemany(
+            "INSERT INTO event_participant (event_id, participant_id, added_via_group_id) VALUES (?, ?, ?)",
+            [(event_id, (e * 7 + p) % 500 + 1, (p % 10) + 1 if p % 2 else None) for p in range(nb_participants)]
+        )
+        con.executemany(
+            "INSERT INTO event_recipe (event_id, recipe_id, position) VALUES (?, ?, ?)",
+            [(event_id, (e + r) % 200 + 1, r) for r in range(nb_recipes)]
+        )
+        con.execute("INSERT INTO event_photo (event_id, photo_url) VALUES (?, ?)",
+                    (event_id, f"/static/images/events/{event_id}.jpg"))
+    con.commit()
+    con.close()
+
+
+def timed(label: str, runs: int):
+    """Exécute list_events() plusieurs fois et affiche la médiane"""
+    durations = []
+    count = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        count = len(list_events(lang="fr"))
+        durations.append((time.perf_counter() - start) * 1000)
+    median = statistics.median(durations)
+    print(f"  {label:<38} {median:9.1f} ms  ({count} événements, médiane sur {runs})")
+    return median
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list_events() avec/sans event_summary")
+    parser.add_argument("--events", type=int, default=1000, help="Nombre d'événements (défaut: 1000)")
+    parser.add_argument("--participants", type=int, default=20, help="Participants par événement (défaut: 20)")
+    parser.add_argument("--runs", type=int, default=5, help="Nombre de mesures (défaut: 5)")
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".sqlite3")
+    os.close(fd)
+    try:
+        print(f"📦 Création de la base de test : {args.events} événements x {args.participants} participants")
+        populate(path, args.events, args.participants)
+        db_core.DB_PATH = path
+
+        print("\n⏱️  list_events()")
+        before = timed("sous-requêtes corrélées", args.runs)
+
+        con = sqlite3.connect(path)
+        with open(MIGRATION, encoding="utf-8") as f:
+            con.executescript(f.read())
+        con.close()
+
+        timed("event_summary (construction initiale)", 1)
+        after = timed("event_summary", args.runs)
+
+        # Modification d'un seul événement : seul son résumé est reconstruit
+        con = sqlite3.connect(path)
+        con.execute("INSERT INTO event_photo (event_id, photo_url) VALUES (1, '/static/x.jpg')")
+        con.commit()
+        con.close()
+        timed("event_summary (1 événement modifié)", 1)
+
+        print(f"\n✅ Gain : x{before / after:.1f}")
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
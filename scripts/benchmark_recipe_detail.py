@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la page recette : sélecteurs embarqués vs API typeahead
+
+Avant /api/typeahead/*, recipe_detail.html embarquait toutes les recettes
+(un <select> "lier à une recette" par ingrédient, en version bureau et
+mobile) et tous les utilisateurs (sélecteur du créateur). Ce script génère
+une base synthétique (scripts/generate_dataset.py), puis mesure sur la
+recette qui a le plus d'ingrédients :
+  - le rendu actuel de la page (temps, taille HTML) ;
+  - le surcoût de l'ancien rendu : chargement de list_recipes() et
+    list_users() et balisage des <option> embarqués (temps, taille) ;
+  - la première page de /api/typeahead/recipes (temps, taille JSON),
+    chargée seulement quand l'utilisateur ouvre le sélecteur.
+
+Usage:
+    python scripts/benchmark_recipe_detail.py
+    python scripts/benchmark_recipe_detail.py --recipes 2000 --runs 20
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+# Ajouter le répertoire parent au path pour importer les modules
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from jinja2 import Template
+from starlette.requests import Request
+
+from app.models import db, db_core
+from app.routes.recipe_routes import recipe_detail
+from app.routes.typeahead_routes import TYPEAHEAD_DEFAULT_LIMIT, typeahead_recipes
+from generate_dataset import generate_dataset
+
+# Balisage des sélecteurs supprimé de recipe_detail.html (un <select> de
+# recettes par ingrédient et par mise en page, plus le sélecteur du créateur)
+EMBEDDED_SELECTORS = Template("""
+{% for user in all_users %}<option value="{{ user.id }}">{{ user.display_name or user.username }}</option>
+{% endfor %}
+{% for ing in ings %}{% for layout in ('desktop', 'mobile') %}
+<select x-model="ing.linked_recipe_id" class="flex-1 px-2 py-0.5 text-xs border border-gray-300 dark:border-gray-500 rounded bg-white dark:bg-gray-600 text-gray-900 dark:text-gray-100">
+  <option value="">— Aucun lien —</option>
+  {% for r in all_recipes_for_link %}{% if r['slug'] != slug %}
+  <option value="{{ r['id'] }}">{{ r['name'] }}</option>
+  {% endif %}{% endfor %}
+</select>
+{% endfor %}{% endfor %}
+""")
+
+
+def make_request(path: str) -> Request:
+    """Requête minimale d'un utilisateur connecté (admin)"""
+    return Request({
+        "type": "http", "method": "GET", "path": path, "root_path": "",
+        "query_string": b"", "headers": [],
+        "session": {"user_id": 1, "is_admin": True},
+    })
+
+
+def measure(function, runs: int):
+    """Une exécution d'échauffement puis `runs` mesures : (médiane ms, dernier résultat)"""
+    result = function()
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = function()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la page recette et du typeahead")
+    parser.add_argument("--recipes", type=int, default=500, help="Taille du jeu de données (défaut: 500)")
+    parser.add_argument("--seed", type=int, default=42, help="Graine du jeu de données (défaut: 42)")
+    parser.add_argument("--runs", type=int, default=10, help="Mesures par scénario (défaut: 10)")
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".sqlite3")
+    os.close(fd)
+    try:
+        print(f"📦 Génération du jeu de données : {args.recipes} recettes, graine {args.seed}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_dataset(path, recipes=args.recipes, seed=args.seed)
+        db_core.DB_PATH = path
+
+        con = sqlite3.connect(path)
+        slug, recipe_id = con.execute(
+            "SELECT slug, id FROM recipe ORDER BY ingredient_count DESC, id LIMIT 1"
+        ).fetchone()
+        con.close()
+
+        def render_page():
+            return asyncio.run(recipe_detail(make_request(f"/recipe/{slug}"), slug, "fr", None, None)).body
+
+        def render_embedded():
+            ings = db.get_recipe_by_slug(slug, "fr")[1]
+            return EMBEDDED_SELECTORS.render(
+                all_users=db.list_users(), all_recipes_for_link=db.list_recipes("fr"), ings=ings, slug=slug
+            ).encode()
+
+        def typeahead_page():
+            page = asyncio.run(typeahead_recipes(
+                make_request("/api/typeahead/recipes"), q="", lang="fr",
+                limit=TYPEAHEAD_DEFAULT_LIMIT, offset=0, exclude_id=recipe_id
+            ))
+            return json.dumps(page, ensure_ascii=False).encode()
+
+        page_ms, page = measure(render_page, args.runs)
+        embedded_ms, embedded = measure(render_embedded, args.runs)
+        typeahead_ms, payload = measure(typeahead_page, args.runs)
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+    before_kb = (len(page) + len(embedded)) / 1024
+    print(f"\nRecette '{slug}', médiane sur {args.runs} mesures\n")
+    print(f"  {'Page recette (typeahead)':<36} {page_ms:9.2f} ms {len(page) / 1024:9.1f} Ko")
+    print(f"  {'Sélecteurs embarqués (surcoût)':<36} {embedded_ms:9.2f} ms {len(embedded) / 1024:9.1f} Ko")
+    print(f"  {'Page recette (sélecteurs embarqués)':<36} {page_ms + embedded_ms:9.2f} ms {before_kb:9.1f} Ko")
+    print(f"  {'/api/typeahead/recipes (1re page)':<36} {typeahead_ms:9.2f} ms {len(payload) / 1024:9.1f} Ko")
+
+
+if __name__ == "__main__":
+    main()
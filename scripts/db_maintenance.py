@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Maintenance de la base SQLite (voir app/services/db_maintenance.py)
+
+Purge des logs d'accès anciens, incremental_vacuum, ANALYZE / optimize et
+checkpoint TRUNCATE du WAL. L'application lance la même maintenance
+automatiquement en période creuse ; ce script sert aux passages manuels
+(cron, avant une sauvegarde) et à la conversion ponctuelle de la base en
+auto_vacuum=INCREMENTAL.
+
+Usage:
+    python scripts/db_maintenance.py                       # toutes les tâches
+    python scripts/db_maintenance.py --tasks analyze,checkpoint
+    python scripts/db_maintenance.py --stats
+    python scripts/db_maintenance.py --enable-auto-vacuum  # VACUUM complet, hors heures d'utilisation
+"""
+
+import argparse
+import os
+import sys
+
+# Ajouter le répertoire parent au path pour importer les modules
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.models import db_core
+from app.services.db_maintenance import TASKS, database_stats, enable_incremental_vacuum, run_maintenance
+
+GREEN = '\033[92m'
+RED = '\033[91m'
+YELLOW = '\033[93m'
+RESET = '\033[0m'
+
+_OUTCOME_COLORS = {"ok": GREEN, "error": RED}
+
+
+def _mb(size: int) -> str:
+    return f"{size / 1048576:.1f} Mo"
+
+
+def print_stats(stats: dict):
+    print(f"   Base        {_mb(stats['db_bytes']):>10}  ({stats['page_count']} pages × {stats['page_size']} o)")
+    print(f"   WAL         {_mb(stats['wal_bytes']):>10}  ({stats['wal_frames']} cadres)")
+    print(f"   Pages libres {stats['freelist_count']:>9}  (auto_vacuum = {stats['auto_vacuum']})")
+    print(f"   Dernier checkpoint : {stats['last_checkpoint'] or '—'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintenance de la base SQLite")
+    parser.add_argument("--db", default=db_core.DB_PATH, help=f"Base de données (défaut: {db_core.DB_PATH})")
+    parser.add_argument("--tasks", default=",".join(TASKS),
+                        help=f"Tâches à exécuter, séparées par des virgules (défaut: {','.join(TASKS)})")
+    parser.add_argument("--stats", action="store_true", help="Afficher l'état de la base sans rien exécuter")
+    parser.add_argument("--enable-auto-vacuum", action="store_true",
+                        help="Passer la base en auto_vacuum=INCREMENTAL (VACUUM complet)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        parser.error(f"base introuvable : {args.db}")
+    db_core.DB_PATH = os.path.abspath(args.db)
+
+    if args.stats:
+        print(f"📊 {db_core.DB_PATH}")
+        print_stats(database_stats())
+        return
+
+    if args.enable_auto_vacuum:
+        print(f"🔧 Conversion de {db_core.DB_PATH} en auto_vacuum=INCREMENTAL")
+        result = enable_incremental_vacuum()
+        if not result["changed"]:
+            print(f"{GREEN}✓ Déjà en auto_vacuum=INCREMENTAL{RESET}")
+        else:
+            print(f"{GREEN}✓ {_mb(result['db_bytes_before'])} → {_mb(result['db_bytes_after'])} "
+                  f"({result['duration_ms'] / 1000:.1f} s){RESET}")
+        return
+
+    tasks = [task.strip() for task in args.tasks.split(",") if task.strip()]
+    try:
+        report = run_maintenance(tasks, trigger="cli")
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"🧹 Maintenance de {db_core.DB_PATH}\n")
+    for task in report["tasks"]:
+        details = ", ".join(f"{k}={v}" for k, v in task.items() if k not in ("task", "outcome", "duration_ms"))
+        color = _OUTCOME_COLORS.get(task["outcome"], YELLOW)
+        print(f"  {color}{task['outcome']:<8}{RESET} {task['task']:<11} {task['duration_ms']:9.1f} ms  {details}")
+    print()
+    print_stats(report["after"])
+    if any(task["outcome"] == "error" for task in report["tasks"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
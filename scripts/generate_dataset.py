@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""
+Générateur de jeux de données synthétiques reproductibles
+
+Crée une base SQLite au schéma courant (scripts/schema.sql) et la remplit de
+données réalistes proportionnelles au nombre de recettes demandé :
+recettes FR/JP (ingrédients, étapes, catégories, tags), catalogue de prix
+avec quasi-doublons, conversions d'unités et conversions spécifiques (ISC),
+événements avec participants, groupes, dates, dépenses et listes de courses,
+planning de repas, tickets de caisse et logs d'accès.
+
+La même graine produit toujours la même base, à l'exception des colonnes
+created_at remplies par SQLite et des dates des logs d'accès (les 7 jours
+précédant la génération).
+
+Usage:
+    python scripts/generate_dataset.py data/bench.sqlite3
+    python scripts/generate_dataset.py data/bench.sqlite3 --recipes 5000 --seed 7
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+# Ajouter le répertoire parent au path pour importer les modules
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SCHEMA_PATH = os.path.join(ROOT, "scripts", "schema.sql")
+MIGRATIONS_DIR = os.path.join(ROOT, "migrations")
+
+# Mot de passe commun à tous les utilisateurs générés (bench, bench1, ...)
+DATASET_PASSWORD = "recette-bench"
+
+# Date de référence fixe : les dates générées ne dépendent pas du jour d'exécution
+REFERENCE_DATE = date(2026, 10, 1)
+
+# (nom FR, nom JP, catégorie de conversion, unité du catalogue, quantité du
+#  paquet, prix EUR, prix JPY, unités utilisées dans les recettes)
+INGREDIENTS = [
+    ("carotte", "にんじん", "poids", "kg", 1, 1.8, 300, ["g", "pièce"]),
+    ("oignon", "玉ねぎ", "poids", "kg", 1, 2.2, 350, ["g", "pièce"]),
+    ("pomme de terre", "じゃがいも", "poids", "kg", 2, 3.5, 400, ["g", "kg", "pièce"]),
+    ("tomate", "トマト", "poids", "kg", 1, 3.9, 600, ["g", "pièce"]),
+    ("ail", "にんにく", "unite", "pièce", 3, 1.5, 200, ["pièce", "g"]),
+    ("poireau", "ねぎ", "unite", "pièce", 1, 1.2, 180, ["pièce"]),
+    ("courgette", "ズッキーニ", "poids", "kg", 1, 2.9, 500, ["g", "pièce"]),
+    ("champignon de Paris", "マッシュルーム", "poids", "g", 250, 2.5, 300, ["g"]),
+    ("épinard", "ほうれん草", "poids", "g", 500, 2.8, 250, ["g"]),
+    ("chou", "キャベツ", "unite", "pièce", 1, 2.0, 200, ["pièce", "g"]),
+    ("poulet", "鶏肉", "poids", "kg", 1, 9.5, 1200, ["g", "kg"]),
+    ("cuisse de poulet", "鶏もも肉", "poids", "kg", 1, 7.9, 1000, ["g", "pièce"]),
+    ("boeuf haché", "牛ひき肉", "poids", "g", 500, 6.5, 900, ["g"]),
+    ("porc", "豚肉", "poids", "kg", 1, 8.9, 1100, ["g"]),
+    ("saumon", "鮭", "poids", "g", 300, 7.5, 800, ["g", "pièce"]),
+    ("crevette", "えび", "poids", "g", 250, 6.0, 700, ["g"]),
+    ("tofu", "豆腐", "unite", "pièce", 1, 2.2, 100, ["pièce", "g"]),
+    ("oeuf", "卵", "unite", "pièce", 6, 2.4, 250, ["pièce"]),
+    ("lait", "牛乳", "volume", "l", 1, 1.1, 220, ["ml", "l", "tasse"]),
+    ("crème fraîche", "生クリーム", "volume", "ml", 200, 1.9, 300, ["ml", "c.s."]),
+    ("beurre", "バター", "poids", "g", 250, 2.6, 450, ["g", "c.s."]),
+    ("fromage râpé", "シュレッドチーズ", "poids", "g", 200, 2.3, 350, ["g"]),
+    ("farine", "小麦粉", "poids", "kg", 1, 1.0, 250, ["g", "tasse"]),
+    ("sucre", "砂糖", "poids", "kg", 1, 1.3, 220, ["g", "c.s.", "c.c."]),
+    ("sel", "塩", "poids", "kg", 1, 0.8, 150, ["g", "c.c."]),
+    ("poivre", "こしょう", "poids", "g", 50, 2.5, 300, ["g", "c.c."]),
+    ("riz", "米", "poids", "kg", 5, 9.0, 2200, ["g", "tasse"]),
+    ("pâtes", "パスタ", "poids", "g", 500, 1.4, 250, ["g"]),
+    ("huile d'olive", "オリーブオイル", "volume", "ml", 500, 6.5, 900, ["ml", "c.s."]),
+    ("sauce soja", "醤油", "volume", "ml", 500, 3.2, 300, ["ml", "c.s.", "c.c."]),
+    ("mirin", "みりん", "volume", "ml", 500, 4.5, 400, ["ml", "c.s."]),
+    ("saké de cuisine", "料理酒", "volume", "ml", 500, 4.0, 350, ["ml", "c.s."]),
+    ("vinaigre de riz", "米酢", "volume", "ml", 500, 3.0, 250, ["ml", "c.s."]),
+    ("miso", "味噌", "poids", "g", 750, 5.5, 450, ["g", "c.s."]),
+    ("dashi", "だし", "volume", "ml", 1000, 3.5, 300, ["ml", "tasse"]),
+    ("gingembre", "生姜", "poids", "g", 100, 1.5, 150, ["g", "c.c."]),
+    ("citron", "レモン", "unite", "pièce", 1, 0.6, 120, ["pièce", "c.s."]),
+    ("pomme", "りんご", "unite", "pièce", 1, 0.7, 150, ["pièce", "g"]),
+    ("chocolat noir", "ダークチョコレート", "poids", "g", 200, 2.9, 350, ["g"]),
+    ("levure chimique", "ベーキングパウダー", "poids", "g", 50, 1.0, 150, ["g", "c.c."]),
+    ("vin blanc", "白ワイン", "volume", "l", 0.75, 6.0, 1200, ["ml", "tasse"]),
+    ("bouillon de volaille", "鶏がらスープ", "volume", "ml", 1000, 2.0, 250, ["ml", "tasse"]),
+    ("persil", "パセリ", "unite", "botte", 1, 1.0, 150, ["botte", "g"]),
+    ("ciboulette", "あさつき", "unite", "botte", 1, 1.2, 150, ["botte"]),
+    ("algue nori", "海苔", "unite", "sachet", 10, 3.5, 400, ["sachet"]),
+    ("haricots verts", "いんげん", "poids", "g", 500, 3.2, 400, ["g"]),
+    ("aubergine", "なす", "unite", "pièce", 1, 1.1, 100, ["pièce", "g"]),
+    ("poivron", "ピーマン", "unite", "pièce", 1, 0.9, 80, ["pièce", "g"]),
+]
+
+# Variantes ajoutées au catalogue : quasi-doublons rencontrés en production
+# (pluriels, qualificatifs), cibles de detect_duplicate_groups()
+VARIANTS = [("s", ""), (" bio", "（有機）"), (" frais", "（生）"), (" surgelé", "（冷凍）")]
+
+# Provenances : entrées distinctes qui complètent le catalogue jusqu'à sa taille cible
+ORIGINS = [(" de Bretagne", "ブルターニュ産"), (" d'Espagne", "スペイン産"), (" du Japon", "国産"),
+           (" d'Italie", "イタリア産"), (" de Hokkaido", "北海道産"), (" du Maroc", "モロッコ産"),
+           (" de Normandie", "ノルマンディー産"), (" de Kyushu", "九州産")]
+
+# Unités de recette : (FR, JP)
+UNIT_JP = {"g": "g", "kg": "kg", "ml": "ml", "l": "L", "c.s.": "大さじ", "c.c.": "小さじ",
+           "tasse": "カップ", "pièce": "個", "botte": "束", "sachet": "袋"}
+
+# Poids moyen d'une pièce (ISC pièce → g / g → pièce)
+PIECE_WEIGHT_G = {"carotte": 150, "oignon": 180, "pomme de terre": 200, "tomate": 120,
+                  "ail": 5, "courgette": 250, "chou": 1000, "cuisse de poulet": 250,
+                  "saumon": 120, "tofu": 300, "pomme": 200, "aubergine": 150,
+                  "poivron": 40, "persil": 30}
+
+DISHES = [
+    ("Gratin de {fr}", "{jp}のグラタン"), ("Soupe de {fr}", "{jp}のスープ"),
+    ("Salade de {fr}", "{jp}のサラダ"), ("Poêlée de {fr}", "{jp}の炒め物"),
+    ("Tarte au {fr}", "{jp}のタルト"), ("Curry de {fr}", "{jp}のカレー"),
+    ("{fr} mijoté", "{jp}の煮物"), ("{fr} au four", "{jp}のオーブン焼き"),
+]
+
+STEP_TEXTS = [
+    ("Éplucher et couper {fr} en morceaux.", "{jp}の皮をむき、切る。"),
+    ("Faire chauffer la poêle et faire revenir {fr}.", "フライパンを熱し、{jp}を炒める。"),
+    ("Ajouter {fr} et laisser mijoter 10 minutes.", "{jp}を加え、10分煮込む。"),
+    ("Assaisonner avec {fr} et mélanger.", "{jp}で味を調え、混ぜる。"),
+    ("Enfourner 25 minutes à 180°C.", "180℃のオーブンで25分焼く。"),
+    ("Servir chaud.", "温かいうちに盛り付ける。"),
+]
+
+RECIPE_TYPES = ["PERSO", "PRO", "MASTER"]
+FIRST_NAMES = ["Marie", "Lucas", "Emma", "Hugo", "Léa", "Yuki", "Haruto", "Sakura", "Ren", "Aoi"]
+LAST_NAMES = ["Martin", "Bernard", "Dubois", "Moreau", "Laurent", "Sato", "Suzuki", "Tanaka", "Ito", "Watanabe"]
+STORES = ["Carrefour", "Monoprix", "Biocoop", "イオン", "西友", "ライフ"]
+
+ACCESS_PATHS = [
+    ("/recipes", 30), ("/recipe/{slug}", 25), ("/events", 10), ("/events/{event_id}", 8),
+    ("/events/{event_id}/budget", 5), ("/events/{event_id}/shopping-list", 6),
+    ("/calendar", 4), ("/search", 6), ("/ingredient-catalog", 3), ("/static/css/app.css", 20),
+]
+
+
+def _slug(i: int) -> str:
+    return f"recette-{i:05d}"
+
+
+def create_schema(con: sqlite3.Connection):
+    """Schéma courant, conversions d'unités standard (migration) et migrations marquées appliquées"""
+    from app.services.migration_runner import mark_applied
+    with open(SCHEMA_PATH, encoding="utf-8") as f:
+        con.executescript(f.read())
+    with open(os.path.join(MIGRATIONS_DIR, "add_standard_unit_conversions.sql"), encoding="utf-8") as f:
+        con.executescript(f.read())
+    mark_applied(con)
+
+
+def _insert_users(con, rng, count: int) -> list:
+    from app.models.db_users import hash_password
+    password_hash = hash_password(DATASET_PASSWORD)
+    users = [("bench", "bench@example.com", password_hash, "Bench Admin", 1, "fr")]
+    users += [(f"bench{i}", f"bench{i}@example.com", password_hash, f"Bench {i}", 0, rng.choice(["fr", "jp"]))
+              for i in range(1, count)]
+    con.executemany(
+        "INSERT INTO user (username, email, password_hash, display_name, is_admin, preferred_lang) "
+        "VALUES (?, ?, ?, ?, ?, ?)", users
+    )
+    return [row[0] for row in con.execute("SELECT id FROM user ORDER BY id")]
+
+
+def _insert_catalog(con, rng, size: int, user_ids: list) -> list:
+    """Catalogue de prix (ingrédients de base, variantes, provenances) et ISC"""
+    rows = []
+    extras = []
+    for fr, jp, category, unit, qty, eur, jpy, _units in INGREDIENTS:
+        rows.append((fr, jp, unit, UNIT_JP.get(unit, unit), eur, jpy, qty, category))
+        for suffix_fr, suffix_jp in rng.sample(VARIANTS, rng.randint(0, 2)):
+            factor = rng.uniform(0.9, 1.4)
+            rows.append((fr + suffix_fr, jp + suffix_jp, unit, UNIT_JP.get(unit, unit),
+                         round(eur * factor, 2), round(jpy * factor), qty, category))
+        for origin_fr, origin_jp in ORIGINS:
+            factor = rng.uniform(0.8, 1.8)
+            extras.append((fr + origin_fr, origin_jp + jp, unit, UNIT_JP.get(unit, unit),
+                           round(eur * factor, 2), round(jpy * factor), qty, category))
+    rng.shuffle(extras)
+    rows += extras[:max(0, size - len(rows))]
+    con.executemany(
+        """INSERT INTO ingredient_price_catalog
+           (ingredient_name_fr, ingredient_name_jp, unit_fr, unit_jp, price_eur, price_jpy, qty,
+            conversion_category, created_by)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        [row + (rng.choice(user_ids),) for row in rows]
+    )
+
+    isc = []
+    for fr, weight in PIECE_WEIGHT_G.items():
+        isc.append((fr, "pièce", "g", weight, f"1 pièce ≈ {weight} g"))
+        isc.append((fr, "g", "pièce", round(1 / weight, 5), f"1 g ≈ 1/{weight} pièce"))
+    isc += [("beurre", "c.s.", "g", 14, None), ("farine", "tasse", "g", 120, None),
+            ("riz", "tasse", "g", 180, None), ("miso", "c.s.", "g", 18, None),
+            ("sucre", "c.s.", "g", 12, None), ("sucre", "c.c.", "g", 4, None),
+            ("sel", "c.c.", "g", 6, None), ("gingembre", "c.c.", "g", 5, None),
+            ("citron", "c.s.", "pièce", 0.1, None), ("vin blanc", "tasse", "ml", 250, None)]
+    con.executemany(
+        "INSERT INTO ingredient_specific_conversions (ingredient_name_fr, from_unit, to_unit, factor, notes) "
+        "VALUES (?, ?, ?, ?, ?)", isc
+    )
+    return [(row[0], row[1]) for row in con.execute(
+        "SELECT id, ingredient_name_fr FROM ingredient_price_catalog ORDER BY id")]
+
+
+def _insert_taxonomy(con):
+    """Catégories, tags, types d'événement, de recette et de dépense"""
+    con.executemany("INSERT INTO category (name_fr, name_jp, display_order) VALUES (?, ?, ?)",
+                    [("Entrée", "前菜", 1), ("Plat", "メイン", 2), ("Dessert", "デザート", 3),
+                     ("Soupe", "スープ", 4), ("Accompagnement", "副菜", 5)])
+    con.executemany("INSERT INTO tag (name_fr, name_jp, color) VALUES (?, ?, ?)",
+                    [("Rapide", "時短", "#10B981"), ("Végétarien", "ベジタリアン", "#22C55E"),
+                     ("Familial", "家庭料理", "#F59E0B"), ("Fête", "パーティー", "#EF4444"),
+                     ("Japonais", "和食", "#3B82F6"), ("Français", "フレンチ", "#8B5CF6")])
+    con.executemany(
+        """INSERT INTO event_type (id, name_fr, name_jp, description_fr, description_jp, recipe_type_fr, recipe_type_jp)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        [(1, "Événement professionnel", "プロイベント", None, None, "PRO", "プロ"),
+         (2, "Cours de cuisine", "マスタークラス", None, None, "MASTER", "マイスター"),
+         (3, "Réception privée", "プライベートパーティー", None, None, "PERSO", "じぶん")])
+    con.executemany("INSERT INTO recipe_type (name_fr, name_jp, description) VALUES (?, ?, '')",
+                    [("Plat principal", "主菜"), ("Dessert", "デザート"), ("Apéritif", "前菜")])
+    for i, (fr, jp, icon) in enumerate([("Ingrédients", "食材", "🥕"), ("Location", "レンタル", "🏠"),
+                                         ("Boissons", "飲み物", "🍷"), ("Divers", "その他", "📋")], start=1):
+        con.execute("INSERT INTO expense_category (id, is_system, icon) VALUES (?, 1, ?)", (i, icon))
+        con.executemany("INSERT INTO expense_category_translation (category_id, lang, name) VALUES (?, ?, ?)",
+                        [(i, "fr", fr), (i, "jp", jp)])
+
+
+def _insert_recipes(con, rng, nb_recipes: int, user_ids: list) -> dict:
+    """Recettes FR/JP ; retourne {recipe_id: [(nom FR, quantité, unité)]}"""
+    recipes = {}
+    for i in range(nb_recipes):
+        main = rng.choice(INGREDIENTS)
+        dish_fr, dish_jp = rng.choice(DISHES)
+        cur = con.execute(
+            """INSERT INTO recipe (slug, servings_default, country, user_id, prep_time, cook_time,
+                                   created_at, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            (_slug(i), rng.choice([2, 4, 4, 6, 8]), rng.choice(["FR", "FR", "JP", "JP", "IT"]),
+             rng.choice(user_ids), rng.choice([10, 15, 20, 30]), rng.choice([0, 15, 30, 45, 90]),
+             f"{REFERENCE_DATE - timedelta(days=nb_recipes - i)} 12:00:00",
+             f"{REFERENCE_DATE - timedelta(days=nb_recipes - i)} 12:00:00")
+        )
+        recipe_id = cur.lastrowid
+        recipe_type = rng.choice(RECIPE_TYPES)
+        con.executemany(
+            "INSERT INTO recipe_translation (recipe_id, lang, name, recipe_type, description) VALUES (?, ?, ?, ?, ?)",
+            [(recipe_id, "fr", f"{dish_fr.format(fr=main[0])} n°{i}".capitalize(), recipe_type,
+              f"Une recette de {main[0]}."),
+             (recipe_id, "jp", f"{dish_jp.format(jp=main[1])} {i}号", recipe_type, f"{main[1]}のレシピ。")]
+        )
+
+        lines = []
+        chosen = [main] + [ing for ing in rng.sample(INGREDIENTS, rng.randint(4, 14)) if ing is not main]
+        for position, ingredient in enumerate(chosen, start=1):
+            fr, jp = ingredient[0], ingredient[1]
+            unit = rng.choice(ingredient[7])
+            quantity = {"g": rng.choice([50, 100, 150, 200, 250, 500]), "kg": rng.choice([0.5, 1, 1.5]),
+                        "ml": rng.choice([50, 100, 200, 250, 500]), "l": rng.choice([0.5, 1]),
+                        }.get(unit, rng.choice([1, 1, 2, 3, 4]))
+            cur = con.execute("INSERT INTO recipe_ingredient (recipe_id, position, quantity) VALUES (?, ?, ?)",
+                              (recipe_id, position, quantity))
+            con.executemany(
+                "INSERT INTO recipe_ingredient_translation (recipe_ingredient_id, lang, name, unit) VALUES (?, ?, ?, ?)",
+                [(cur.lastrowid, "fr", fr, unit), (cur.lastrowid, "jp", jp, UNIT_JP[unit])]
+            )
+            lines.append((fr, quantity, unit))
+        recipes[recipe_id] = lines
+
+        for position, (text_fr, text_jp) in enumerate(rng.sample(STEP_TEXTS, rng.randint(3, 6)), start=1):
+            fr, jp = rng.choice(INGREDIENTS)[:2]
+            cur = con.execute("INSERT INTO step (recipe_id, position) VALUES (?, ?)", (recipe_id, position))
+            con.executemany("INSERT INTO step_translation (step_id, lang, text) VALUES (?, ?, ?)",
+                            [(cur.lastrowid, "fr", text_fr.format(fr=fr)), (cur.lastrowid, "jp", text_jp.format(jp=jp))])
+
+        con.execute("INSERT INTO recipe_category (recipe_id, category_id) VALUES (?, ?)",
+                    (recipe_id, rng.randint(1, 5)))
+        con.executemany("INSERT INTO recipe_tag (recipe_id, tag_id) VALUES (?, ?)",
+                        [(recipe_id, tag_id) for tag_id in rng.sample(range(1, 7), rng.randint(0, 3))])
+        con.execute("INSERT INTO recipe_event_type (recipe_id, event_type_id) VALUES (?, ?)",
+                    (recipe_id, RECIPE_TYPES.index(recipe_type) % 3 + 1))
+        con.execute("INSERT INTO recipe_recipe_type (recipe_id, recipe_type_id) VALUES (?, ?)",
+                    (recipe_id, rng.randint(1, 3)))
+    return recipes
+
+
+def _insert_participants(con, rng, nb_participants: int, user_ids: list) -> tuple:
+    con.executemany(
+        "INSERT INTO participant (nom, prenom, email, user_id) VALUES (?, ?, ?, ?)",
+        [(rng.choice(LAST_NAMES), rng.choice(FIRST_NAMES), f"p{i}@example.com", rng.choice(user_ids))
+         for i in range(nb_participants)]
+    )
+    participant_ids = [row[0] for row in con.execute("SELECT id FROM participant ORDER BY id")]
+    nb_groups = max(2, nb_participants // 15)
+    con.executemany("INSERT INTO participant_group (nom, user_id) VALUES (?, ?)",
+                    [(f"Groupe {i}", rng.choice(user_ids)) for i in range(nb_groups)])
+    groups = {}
+    for group_id in range(1, nb_groups + 1):
+        members = rng.sample(participant_ids, min(len(participant_ids), rng.randint(3, 12)))
+        groups[group_id] = members
+        con.executemany("INSERT INTO participant_group_member (participant_id, group_id) VALUES (?, ?)",
+                        [(pid, group_id) for pid in members])
+    return participant_ids, groups
+
+
+def _insert_events(con, rng, nb_events: int, recipes: dict, names: dict,
+                   participant_ids: list, groups: dict, user_ids: list) -> int:
+    """Événements complets : recettes, participants, dates, dépenses, liste de courses"""
+    recipe_ids = list(recipes)
+    for e in range(nb_events):
+        start = REFERENCE_DATE - timedelta(days=rng.randint(-90, 3 * 365))
+        days = rng.choice([1, 1, 1, 2, 3])
+        currency = rng.choice(["EUR", "EUR", "JPY"])
+        cur = con.execute(
+            """INSERT INTO event (event_type_id, name, event_date, location, attendees, notes, budget_planned,
+                                  currency, user_id, date_debut, date_fin, nombre_jours)
+               VALUES (?, ?, ?, ?, ?, '', ?, ?, ?, ?, ?, ?)""",
+            (rng.randint(1, 3), f"Événement {e}", start.isoformat(), rng.choice(["Paris", "Lyon", "東京", "大阪"]),
+             rng.randint(4, 40), rng.choice([None, 200, 500, 30000]), currency, rng.choice(user_ids),
+             start.isoformat(), (start + timedelta(days=days - 1)).isoformat(), days)
+        )
+        event_id = cur.lastrowid
+
+        date_ids = []
+        for d in range(days):
+            cur = con.execute("INSERT INTO event_date (event_id, date, is_selected) VALUES (?, ?, 1)",
+                              (event_id, (start + timedelta(days=d)).isoformat()))
+            date_ids.append(cur.lastrowid)
+
+        event_recipes = rng.sample(recipe_ids, min(len(recipe_ids), rng.randint(2, 8)))
+        multipliers = {rid: rng.choice([0.5, 1.0, 1.0, 1.5, 2.0, 3.0]) for rid in event_recipes}
+        con.executemany(
+            "INSERT INTO event_recipe (event_id, recipe_id, servings_multiplier, position) VALUES (?, ?, ?, ?)",
+            [(event_id, rid, multipliers[rid], position) for position, rid in enumerate(event_recipes)]
+        )
+        con.executemany(
+            "INSERT INTO event_recipe_planning (event_id, recipe_id, event_date_id, position) VALUES (?, ?, ?, ?)",
+            [(event_id, rid, rng.choice(date_ids), position) for position, rid in enumerate(event_recipes)]
+        )
+
+        attendees = {pid: None for pid in rng.sample(participant_ids, min(len(participant_ids), rng.randint(3, 20)))}
+        if groups and rng.random() < 0.5:
+            group_id = rng.choice(list(groups))
+            attendees.update({pid: group_id for pid in groups[group_id]})
+        con.executemany(
+            "INSERT INTO event_participant (event_id, participant_id, added_via_group_id) VALUES (?, ?, ?)",
+            [(event_id, pid, gid) for pid, gid in attendees.items()]
+        )
+
+        if rng.random() < 0.3:
+            con.execute("INSERT INTO event_photo (event_id, photo_url) VALUES (?, ?)",
+                        (event_id, f"/static/images/events/{event_id}.jpg"))
+        con.executemany(
+            """INSERT INTO event_expense (event_id, category_id, description, planned_amount, actual_amount, is_paid)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [(event_id, category_id, f"Dépense {category_id}", rng.randint(20, 300),
+              rng.choice([None, rng.randint(20, 300)]), rng.random() < 0.5)
+             for category_id in rng.sample(range(2, 5), rng.randint(0, 3))]
+        )
+
+        # Liste de courses : somme par (ingrédient, unité) avec ses recettes sources
+        items = {}
+        for rid in event_recipes:
+            for fr, quantity, unit in recipes[rid]:
+                item = items.setdefault((fr, unit), {"quantity": 0, "sources": []})
+                item["quantity"] += quantity * multipliers[rid]
+                item["sources"].append((rid, names[rid], quantity * multipliers[rid], unit))
+        for position, ((fr, unit), item) in enumerate(items.items()):
+            cur = con.execute(
+                """INSERT INTO shopping_list_item (event_id, ingredient_name, needed_quantity, needed_unit,
+                                                   purchase_quantity, purchase_unit, is_checked, position,
+                                                   planned_unit_price, is_purchased)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (event_id, fr, item["quantity"], unit, item["quantity"], unit, rng.random() < 0.4,
+                 position, rng.choice([None, round(rng.uniform(0.5, 10), 2)]), rng.random() < 0.3)
+            )
+            con.executemany(
+                "INSERT INTO shopping_list_item_source (item_id, recipe_id, recipe_name, quantity, unit, position) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(cur.lastrowid,) + source + (n,) for n, source in enumerate(item["sources"])]
+            )
+    return nb_events
+
+
+def _insert_meal_plans(con, rng, recipe_ids: list, user_ids: list) -> int:
+    """Repas planifiés sur les six mois autour de la date de référence"""
+    rows = []
+    for user_id in user_ids:
+        for offset in range(-120, 60):
+            if rng.random() < 0.6:
+                day = (REFERENCE_DATE + timedelta(days=offset)).isoformat()
+                for meal_type in rng.sample(["lunch", "dinner"], rng.randint(1, 2)):
+                    free = rng.random() < 0.1
+                    rows.append((user_id, day, meal_type, None if free else rng.choice(recipe_ids),
+                                 "Restaurant" if free else None))
+    con.executemany("INSERT INTO meal_plan (user_id, date, meal_type, recipe_id, free_text) VALUES (?, ?, ?, ?, ?)",
+                    rows)
+    return len(rows)
+
+
+def _insert_receipts(con, rng, nb_receipts: int, catalog: list, user_ids: list) -> int:
+    """Tickets de caisse : libellés bruités, en partie rapprochés du catalogue"""
+    for r in range(nb_receipts):
+        currency = rng.choice(["EUR", "JPY"])
+        cur = con.execute(
+            """INSERT INTO receipt_upload_history (filename, receipt_name, store_name, receipt_date, status,
+                                                   currency, user_id, file_path)
+               VALUES (?, ?, ?, ?, 'processed', ?, ?, ?)""",
+            (f"ticket_{r}.pdf", f"Courses {r}", rng.choice(STORES),
+             (REFERENCE_DATE - timedelta(days=rng.randint(0, 365))).isoformat(), currency,
+             rng.choice(user_ids), f"data/receipts/ticket_{r}.pdf")
+        )
+        items = []
+        for catalog_id, name_fr in rng.sample(catalog, min(len(catalog), rng.randint(5, 25))):
+            label = rng.choice([name_fr, name_fr.upper(), f"{name_fr} 500G", f"{name_fr} x2"])
+            matched = catalog_id if label == name_fr or rng.random() < 0.3 else None
+            items.append((cur.lastrowid, label, label.lower(), round(rng.uniform(0.5, 15), 2)
+                          if currency == "EUR" else rng.randint(80, 1500), rng.choice([1, 1, 2]),
+                          matched, 1.0 if matched else 0.0, rng.choice(["pending", "validated"])))
+        con.executemany(
+            """INSERT INTO receipt_item_match (receipt_id, receipt_item_text_original, receipt_item_text_fr,
+                                               receipt_price, receipt_quantity, matched_ingredient_id,
+                                               confidence_score, status)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""", items
+        )
+        con.execute("UPDATE receipt_upload_history SET total_items = ? WHERE id = ?", (len(items), cur.lastrowid))
+    return nb_receipts
+
+
+def _insert_access_logs(con, rng, nb_logs: int, nb_recipes: int, nb_events: int) -> int:
+    """Logs d'accès bruts sur les 7 jours précédant la génération, puis agrégats horaires"""
+    paths, weights = zip(*ACCESS_PATHS)
+    # Seules données datées par l'horloge : get_access_stats() lit les dernières heures
+    end = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    rows = []
+    for _ in range(nb_logs):
+        path = rng.choices(paths, weights)[0].format(slug=_slug(rng.randrange(max(nb_recipes, 1))),
+                                                     event_id=rng.randint(1, max(nb_events, 1)))
+        status = rng.choices([200, 304, 302, 404, 500], [85, 6, 4, 4, 1])[0]
+        size = rng.randint(2_000, 120_000)
+        rows.append((f"192.168.{rng.randint(0, 3)}.{rng.randint(1, 254)}", "Mozilla/5.0 (bench)", path, "GET",
+                     status, round(rng.lognormvariate(3.5, 0.9), 1), rng.choice(["fr", "jp"]),
+                     (end - timedelta(seconds=rng.randint(0, 7 * 86400))).strftime("%Y-%m-%d %H:%M:%S"),
+                     size, size // 4))
+    con.executemany(
+        """INSERT INTO access_log (ip_address, user_agent, path, method, status_code, response_time_ms, lang,
+                                   accessed_at, response_size_bytes, transfer_size_bytes)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", rows
+    )
+    # La migration reconstruit les agrégats à partir des lignes brutes
+    with open(os.path.join(MIGRATIONS_DIR, "add_access_log_rollup.sql"), encoding="utf-8") as f:
+        con.executescript(f.read())
+    return nb_logs
+
+
+def generate_dataset(path: str, recipes: int = 500, seed: int = 42, users: int = 5) -> dict:
+    """
+    Crée une base de données synthétique à l'échelle demandée
+
+    Les autres volumes sont proportionnels au nombre de recettes
+    (événements = recettes / 5, participants = recettes / 2,
+    catalogue = recettes / 2 dans la limite des combinaisons disponibles,
+    tickets = recettes / 10, logs d'accès = recettes x 40).
+
+    Args:
+        path: Chemin de la base à créer (écrasée si elle existe)
+        recipes: Nombre de recettes
+        seed: Graine du générateur pseudo-aléatoire
+        users: Nombre d'utilisateurs ('bench' est administrateur)
+
+    Returns:
+        Dict {table: nombre de lignes}
+    """
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+    rng = random.Random(seed)
+    con = sqlite3.connect(path)
+    try:
+        create_schema(con)
+        user_ids = _insert_users(con, rng, users)
+        _insert_taxonomy(con)
+        catalog = _insert_catalog(con, rng, recipes // 2, user_ids)
+        recipe_lines = _insert_recipes(con, rng, recipes, user_ids)
+        names = dict(con.execute("SELECT recipe_id, name FROM recipe_translation WHERE lang = 'fr'").fetchall())
+        participant_ids, groups = _insert_participants(con, rng, max(10, recipes // 2), user_ids)
+        nb_events = max(1, recipes // 5)
+        _insert_events(con, rng, nb_events, recipe_lines, names, participant_ids, groups, user_ids)
+        _insert_meal_plans(con, rng, list(recipe_lines), user_ids)
+        _insert_receipts(con, rng, max(1, recipes // 10), catalog, user_ids)
+        _insert_access_logs(con, rng, recipes * 40, recipes, nb_events)
+        con.commit()
+
+        # Résumés d'événements reconstruits une fois pour toutes (voir add_event_summary.sql)
+        from app.models import db_core
+        from app.models.db_events import refresh_event_summaries
+        previous, db_core.DB_PATH = db_core.DB_PATH, path
+        try:
+            refresh_event_summaries()
+        finally:
+            db_core.DB_PATH = previous
+
+        con.execute("ANALYZE")
+        tables = [row[0] for row in con.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+        return {table: con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+    finally:
+        con.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère une base de données synthétique reproductible")
+    parser.add_argument("path", help="Chemin de la base à créer (écrasée si elle existe)")
+    parser.add_argument("--recipes", type=int, default=500, help="Nombre de recettes (défaut: 500)")
+    parser.add_argument("--seed", type=int, default=42, help="Graine aléatoire (défaut: 42)")
+    parser.add_argument("--users", type=int, default=5, help="Nombre d'utilisateurs (défaut: 5)")
+    args = parser.parse_args()
+
+    print(f"📦 Génération de {args.path} : {args.recipes} recettes, graine {args.seed}")
+    start = time.perf_counter()
+    counts = generate_dataset(args.path, recipes=args.recipes, seed=args.seed, users=args.users)
+    for table, count in counts.items():
+        if count:
+            print(f"  {table:<36} {count:>9}")
+    print(f"\n✅ Base générée en {time.perf_counter() - start:.1f} s "
+          f"(utilisateurs bench, bench1... / mot de passe : {DATASET_PASSWORD})")
+
+
+if __name__ == "__main__":
+    main()
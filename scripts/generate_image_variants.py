@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Script de génération des variantes d'images des recettes et des photos d'événements :
+- Thumbnail (320px) et taille moyenne (960px), en WebP et JPEG
+- Met à jour recipe.thumbnail_url pour pointer sur le thumbnail généré
+- Photos d'événements : variantes seules (retrouvées sur disque par la liste)
+
+Nécessite Pillow (pip install Pillow).
+
+Usage : python scripts/generate_image_variants.py [--force]
+"""
+import sys
+import os
+import argparse
+
+# Ajouter le répertoire racine au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.image_service import (
+    regenerate_missing_variants, regenerate_missing_event_variants, variants_available
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère les variantes manquantes des images de recettes et d'événements")
+    parser.add_argument("--force", action="store_true", help="Régénère aussi les variantes existantes")
+    args = parser.parse_args()
+
+    if not variants_available():
+        print("❌ Pillow n'est pas installé : pip install Pillow")
+        sys.exit(1)
+
+    print("🖼️  Génération des variantes d'images...")
+    results = [
+        ("Images de recettes", regenerate_missing_variants(force=args.force)),
+        ("Photos d'événements", regenerate_missing_event_variants(force=args.force)),
+    ]
+
+    print("\n" + "=" * 60)
+    for label, stats in results:
+        print(f"{label} : {stats['total']}")
+        print(f"  ✓ Générées       : {stats['generated']}")
+        print(f"  • Déjà à jour    : {stats['skipped']}")
+        if stats['failed']:
+            print(f"  ❌ En erreur      : {stats['failed']}")
+
+
+if __name__ == "__main__":
+    main()
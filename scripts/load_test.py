@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Test de charge de l'application avec des scénarios utilisateurs pondérés
+
+Des utilisateurs virtuels concurrents se connectent (POST /login, session
+conservée par utilisateur) puis enchaînent des scénarios tirés au sort selon
+leur poids : parcours des recettes, budget d'un événement, cochage d'articles
+de la liste de courses, recherche et calendrier du mois.
+
+Par défaut, l'application FastAPI est appelée en mémoire (transport ASGI de
+httpx, pile de middlewares complète, sans réseau) sur une base synthétique
+générée par scripts/generate_dataset.py. --serve lance un uvicorn local sur
+cette base (RECETTE_DB_PATH) et --url cible un serveur déjà démarré.
+
+Le rapport donne le débit global et, par route, le nombre de requêtes, les
+erreurs (statut >= 400 ou échec de connexion), le débit et les percentiles de
+latence (p50, p95, p99, max). Le scénario de cochage écrit dans la base.
+
+Usage:
+    python scripts/load_test.py
+    python scripts/load_test.py --users 20 --duration 60 --think-time 0.5
+    python scripts/load_test.py --serve --workers 4
+    python scripts/load_test.py --url http://localhost:8000 --db data/recette.sqlite3 \\
+        --username admin --password ...
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+# Ajouter le répertoire parent au path pour importer les modules
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from generate_dataset import DATASET_PASSWORD, generate_dataset
+
+RESULTS_DIR = os.path.join(ROOT, "data", "loadtests")
+
+# Nombre d'éléments lus dans la base pour alimenter les scénarios
+SAMPLE_SIZE = 200
+
+GREEN = '\033[92m'
+RED = '\033[91m'
+RESET = '\033[0m'
+
+
+# ============================================================================
+# STATISTIQUES
+# ============================================================================
+
+def percentile(values: list, p: float) -> float:
+    """Percentile p (0-100) par interpolation linéaire entre les rangs"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class LoadStats:
+    """Latences et statuts collectés par route (libellé 'MÉTHODE /gabarit')"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.scenarios = Counter()
+
+    def record(self, route: str, status: int, duration_ms: float):
+        self.latencies[route].append(duration_ms)
+        self.statuses[route][status] += 1
+
+    def report(self, elapsed: float) -> dict:
+        """Débit global et statistiques par route, triées par nombre de requêtes"""
+        routes = {}
+        for route in sorted(self.latencies, key=lambda r: (-len(self.latencies[r]), r)):
+            durations = self.latencies[route]
+            statuses = self.statuses[route]
+            routes[route] = {
+                "count": len(durations),
+                "errors": sum(n for status, n in statuses.items() if status == 0 or status >= 400),
+                "rps": round(len(durations) / elapsed, 2) if elapsed else 0.0,
+                "mean_ms": round(sum(durations) / len(durations), 2),
+                "p50_ms": round(percentile(durations, 50), 2),
+                "p95_ms": round(percentile(durations, 95), 2),
+                "p99_ms": round(percentile(durations, 99), 2),
+                "max_ms": round(max(durations), 2),
+                "statuses": {str(status): n for status, n in sorted(statuses.items())},
+            }
+        total = sum(r["count"] for r in routes.values())
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "requests": total,
+            "errors": sum(r["errors"] for r in routes.values()),
+            "rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "scenarios": dict(self.scenarios.most_common()),
+            "routes": routes,
+        }
+
+
+# ============================================================================
+# UTILISATEUR VIRTUEL
+# ============================================================================
+
+class VirtualUser:
+    """Client HTTP d'un utilisateur : cookies de session propres, tirages reproductibles"""
+
+    def __init__(self, client: httpx.AsyncClient, stats: LoadStats, rng: random.Random, ctx: dict):
+        self.client = client
+        self.stats = stats
+        self.rng = rng
+        self.ctx = ctx
+
+    async def request(self, method: str, url: str, route: str, **kwargs):
+        """Exécute et chronomètre une requête ; retourne la réponse (None si échec réseau)"""
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        self.stats.record(f"{method} {route}", response.status_code if response is not None else 0,
+                          (time.perf_counter() - start) * 1000)
+        return response
+
+    async def login(self, username: str, password: str):
+        """POST /login ; la connexion réussie répond 303 et pose le cookie de session"""
+        response = await self.request("POST", "/login", "/login",
+                                      data={"username": username, "password": password})
+        if response is None or response.status_code != 303:
+            raise RuntimeError(f"Connexion impossible pour '{username}'")
+
+
+# ============================================================================
+# SCÉNARIOS
+# ============================================================================
+
+async def browse_recipes(user: VirtualUser):
+    """Liste des recettes, page suivante (curseur), puis une fiche recette"""
+    lang = user.rng.choice(["fr", "jp"])
+    await user.request("GET", f"/recipes?lang={lang}", "/recipes")
+    response = await user.request("GET", f"/api/recipes/page?lang={lang}", "/api/recipes/page")
+    if response is not None and response.status_code == 200:
+        cursor = response.json().get("next_cursor")
+        if cursor:
+            await user.request("GET", "/api/recipes/page", "/api/recipes/page",
+                               params={"lang": lang, "cursor": cursor})
+    slug = user.rng.choice(user.ctx["slugs"])
+    await user.request("GET", f"/recipe/{slug}?lang={lang}", "/recipe/{slug}")
+
+
+async def event_budget(user: VirtualUser):
+    """Liste des événements puis budget de l'un d'eux"""
+    await user.request("GET", "/events?lang=fr", "/events")
+    event_id = user.rng.choice(user.ctx["event_ids"])
+    await user.request("GET", f"/events/{event_id}/budget?lang=fr", "/events/{event_id}/budget")
+
+
+async def toggle_shopping_items(user: VirtualUser):
+    """Liste de courses d'un événement, puis coche/décoche quelques articles"""
+    event_id = user.rng.choice(sorted(user.ctx["shopping_items"]))
+    await user.request("GET", f"/events/{event_id}/shopping-list?lang=fr", "/events/{event_id}/shopping-list")
+    items = user.ctx["shopping_items"][event_id]
+    for item_id in user.rng.sample(items, min(3, len(items))):
+        await user.request("POST", f"/api/shopping-list/items/{item_id}/update",
+                           "/api/shopping-list/items/{item_id}/update",
+                           data={"is_checked": user.rng.choice(["true", "false"])})
+
+
+async def search(user: VirtualUser):
+    """Recherche de recettes puis saisie semi-automatique"""
+    term = user.rng.choice(user.ctx["search_terms"])
+    await user.request("GET", "/api/recipes/search", "/api/recipes/search", params={"search": term, "lang": "fr"})
+    await user.request("GET", "/api/typeahead/recipes", "/api/typeahead/recipes", params={"q": term[:3], "lang": "fr"})
+
+
+async def calendar_month(user: VirtualUser):
+    """Page du calendrier puis données d'un mois"""
+    year, month = user.rng.choice(user.ctx["months"])
+    await user.request("GET", "/calendar?lang=fr", "/calendar")
+    await user.request("GET", f"/api/calendar/month?year={year}&month={month}&lang=fr", "/api/calendar/month")
+
+
+# Nom → (poids, scénario)
+SCENARIOS = {
+    "browse_recipes": (40, browse_recipes),
+    "event_budget": (15, event_budget),
+    "toggle_shopping_items": (15, toggle_shopping_items),
+    "search": (20, search),
+    "calendar_month": (10, calendar_month),
+}
+
+
+def build_context(path: str) -> dict:
+    """Identifiants réels (recettes, événements, articles, mois) lus dans la base cible"""
+    con = sqlite3.connect(path)
+    try:
+        shopping_items = defaultdict(list)
+        for event_id, item_id in con.execute(
+                """SELECT event_id, id FROM shopping_list_item
+                   WHERE event_id IN (SELECT DISTINCT event_id FROM shopping_list_item ORDER BY event_id LIMIT ?)
+                   ORDER BY event_id, id""", (SAMPLE_SIZE,)):
+            shopping_items[event_id].append(item_id)
+        names = [row[0] for row in con.execute(
+            "SELECT name FROM recipe_translation WHERE lang = 'fr' ORDER BY recipe_id LIMIT ?", (SAMPLE_SIZE,))]
+        return {
+            "slugs": [row[0] for row in con.execute("SELECT slug FROM recipe ORDER BY id LIMIT ?", (SAMPLE_SIZE,))],
+            "event_ids": [row[0] for row in con.execute("SELECT id FROM event ORDER BY id LIMIT ?", (SAMPLE_SIZE,))],
+            "shopping_items": dict(shopping_items),
+            "search_terms": sorted({name.split()[0].lower() for name in names if name.split()}),
+            "months": [(int(row[0][:4]), int(row[0][5:7])) for row in con.execute(
+                "SELECT DISTINCT substr(event_date, 1, 7) FROM event ORDER BY 1 LIMIT ?",
+                (SAMPLE_SIZE,))],
+        }
+    finally:
+        con.close()
+
+
+# ============================================================================
+# EXÉCUTION
+# ============================================================================
+
+async def run_load(make_client, ctx: dict, scenarios: dict = None, users: int = 10, duration: float = 30.0,
+                   seed: int = 42, think_time: float = 0.0, credentials: tuple = None) -> dict:
+    """
+    Lance `users` utilisateurs virtuels pendant `duration` secondes
+
+    Args:
+        make_client: Fabrique d'httpx.AsyncClient (un client, donc une session, par utilisateur)
+        ctx: Identifiants utilisés par les scénarios (build_context)
+        scenarios: Nom → (poids, scénario) ; SCENARIOS par défaut
+        seed: Graine des tirages (scénarios, recettes, articles...)
+        think_time: Pause moyenne entre deux scénarios, en secondes
+        credentials: (utilisateur, mot de passe) pour POST /login, ou None
+
+    Returns:
+        Rapport de LoadStats.report()
+    """
+    scenarios = scenarios or SCENARIOS
+    names = list(scenarios)
+    weights = [scenarios[name][0] for name in names]
+    stats = LoadStats()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+
+    async def virtual_user(index: int):
+        rng = random.Random(f"{seed}-{index}")
+        async with make_client() as client:
+            user = VirtualUser(client, stats, rng, ctx)
+            if credentials:
+                await user.login(*credentials)
+            while loop.time() < deadline:
+                name = rng.choices(names, weights)[0]
+                await scenarios[name][1](user)
+                stats.scenarios[name] += 1
+                if think_time:
+                    await asyncio.sleep(rng.uniform(0, 2 * think_time))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user(i) for i in range(users)))
+    return stats.report(time.perf_counter() - start)
+
+
+def asgi_client_factory(app):
+    """Clients appelant l'application en mémoire, sans serveur ni réseau"""
+    transport = httpx.ASGITransport(app=app)
+    return lambda: httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60)
+
+
+def url_client_factory(url: str):
+    return lambda: httpx.AsyncClient(base_url=url, timeout=60)
+
+
+def _start_uvicorn(path: str, port: int, workers: int) -> subprocess.Popen:
+    """Démarre uvicorn sur la base `path` et attend que /health réponde"""
+    env = dict(os.environ, RECETTE_DB_PATH=os.path.abspath(path))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning"],
+        cwd=ROOT, env=env)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn s'est arrêté (code {process.returncode})")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn n'a pas démarré en 30 s")
+
+
+def print_report(report: dict):
+    print(f"\n{'Route':<52} {'Req':>6} {'Err':>5} {'Req/s':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for route, r in report["routes"].items():
+        color = RED if r["errors"] else ""
+        print(f"{color}{route:<52} {r['count']:>6} {r['errors']:>5} {r['rps']:>7.1f} "
+              f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}{RESET if color else ''}")
+    print("\nScénarios : " + ", ".join(f"{name} ×{n}" for name, n in report["scenarios"].items()))
+    color = RED if report["errors"] else GREEN
+    print(f"{color}{report['requests']} requêtes en {report['elapsed_s']} s : "
+          f"{report['rps']} req/s, {report['errors']} erreur(s){RESET}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge avec scénarios utilisateurs")
+    parser.add_argument("--users", type=int, default=10, help="Utilisateurs virtuels simultanés (défaut: 10)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Durée en secondes (défaut: 30)")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="Pause moyenne entre deux scénarios, en secondes (défaut: 0)")
+    parser.add_argument("--seed", type=int, default=42, help="Graine des tirages et du jeu de données (défaut: 42)")
+    parser.add_argument("--only", help="Ne lancer que les scénarios dont le nom contient ce texte")
+    parser.add_argument("--recipes", type=int, default=500, help="Taille du jeu de données généré (défaut: 500)")
+    parser.add_argument("--db", help="Base existante à utiliser au lieu d'en générer une")
+    parser.add_argument("--serve", action="store_true", help="Démarrer un uvicorn local sur la base")
+    parser.add_argument("--port", type=int, default=8765, help="Port du uvicorn local (défaut: 8765)")
+    parser.add_argument("--workers", type=int, default=1, help="Workers du uvicorn local (défaut: 1)")
+    parser.add_argument("--url", help="Serveur déjà démarré (--db doit alors désigner sa base)")
+    parser.add_argument("--username", default="bench", help="Utilisateur de connexion (défaut: bench)")
+    parser.add_argument("--password", default=DATASET_PASSWORD, help="Mot de passe (défaut: celui du jeu généré)")
+    parser.add_argument("--output", help="Fichier JSON du rapport (défaut: data/loadtests/<date>.json)")
+    args = parser.parse_args()
+
+    scenarios = {name: s for name, s in SCENARIOS.items() if not args.only or args.only in name}
+    if not scenarios:
+        parser.error(f"aucun scénario ne correspond à '{args.only}'")
+    if args.url and not args.db:
+        parser.error("--url nécessite --db pour lire les identifiants utilisés par les scénarios")
+
+    temp_path = None
+    if args.db:
+        path = args.db
+    else:
+        fd, temp_path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(fd)
+        path = temp_path
+        print(f"📦 Génération du jeu de données : {args.recipes} recettes, graine {args.seed}")
+        generate_dataset(path, recipes=args.recipes, seed=args.seed)
+
+    server = None
+    try:
+        ctx = build_context(path)
+        if args.url:
+            target, make_client = args.url, url_client_factory(args.url)
+        elif args.serve:
+            server = _start_uvicorn(path, args.port, args.workers)
+            target = f"http://127.0.0.1:{args.port}"
+            make_client = url_client_factory(target)
+        else:
+            os.environ["RECETTE_DB_PATH"] = os.path.abspath(path)
+            from app.models import db_core
+            db_core.DB_PATH = os.path.abspath(path)
+            from main import app
+            target, make_client = "ASGI (en mémoire)", asgi_client_factory(app)
+
+        print(f"\n🚦 {args.users} utilisateurs, {args.duration:.0f} s → {target}")
+        report = asyncio.run(run_load(make_client, ctx, scenarios, users=args.users, duration=args.duration,
+                                      seed=args.seed, think_time=args.think_time,
+                                      credentials=(args.username, args.password)))
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=10)
+        if temp_path:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(temp_path + suffix):
+                    os.unlink(temp_path + suffix)
+
+    print_report(report)
+
+    report["meta"] = {
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "target": target,
+        "users": args.users,
+        "duration": args.duration,
+        "think_time": args.think_time,
+        "dataset": {"recipes": args.recipes, "seed": args.seed} if not args.db else {"db": args.db},
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+    }
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Rapport : {output}")
+    if report["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
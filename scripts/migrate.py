@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Migrations versionnées de la base (ordre : migrations/manifest.txt)
+
+Commandes :
+    status    Migrations appliquées, en attente, modifiées ; index manquants
+    apply     Applique les migrations en attente (une transaction chacune)
+    baseline  Marque des migrations comme appliquées sans les exécuter
+              (base existante dont les migrations ont été passées à la main)
+    init      Crée une base vide au schéma courant (scripts/schema.sql)
+              et marque toutes les migrations comme appliquées
+
+Usage:
+    python scripts/migrate.py status
+    python scripts/migrate.py apply --dry-run
+    python scripts/migrate.py apply
+    python scripts/migrate.py baseline --until add_access_log_rollup.sql
+    python scripts/migrate.py init --db data/new.sqlite3
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+
+# Ajouter le répertoire parent au path pour importer les modules
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.models import db_core
+from app.services.migration_runner import (
+    apply_migrations, check_schema, get_status, mark_applied,
+)
+
+SCHEMA_PATH = os.path.join(ROOT, "scripts", "schema.sql")
+
+GREEN = '\033[92m'
+RED = '\033[91m'
+YELLOW = '\033[93m'
+RESET = '\033[0m'
+
+
+def cmd_status(con, args):
+    status = get_status(con)
+    if not status["tracked"]:
+        print(f"{YELLOW}⚠️  Table schema_migrations absente : base non suivie{RESET}")
+    print(f"✓ {len(status['applied'])} migration(s) appliquée(s)")
+    for name in status["pending"]:
+        print(f"  {YELLOW}→ en attente{RESET}  {name}")
+    for name in status["modified"]:
+        print(f"  {RED}✗ modifiée{RESET}    {name}")
+    for name in status["unknown"]:
+        print(f"  {YELLOW}? inconnue{RESET}    {name}")
+
+    problems = [p for p in check_schema(args.db) if "index" in p]
+    for problem in problems:
+        print(f"{RED}✗ {problem}{RESET}")
+    if not status["pending"] and not status["modified"] and not problems and status["tracked"]:
+        print(f"{GREEN}✓ Schéma à jour{RESET}")
+
+
+def cmd_apply(con, args):
+    label = "Simulation" if args.dry_run else "Application"
+    results = apply_migrations(con, dry_run=args.dry_run, target=args.target)
+    if not results:
+        print(f"{GREEN}✓ Aucune migration en attente{RESET}")
+        return
+    print(f"🔧 {label} de {len(results)} migration(s)\n")
+    for result in results:
+        print(f"  ✓ {result['name']:<48} {result['statements']:>4} instr. {result['duration_ms']:9.1f} ms")
+    if args.dry_run:
+        print(f"\n{YELLOW}Simulation : aucune modification conservée{RESET}")
+    else:
+        print(f"\n{GREEN}✓ Migrations appliquées{RESET}")
+
+
+def cmd_baseline(con, args):
+    names = mark_applied(con, until=args.until)
+    print(f"{GREEN}✓ {len(names)} migration(s) marquée(s) comme appliquée(s) "
+          f"(jusqu'à {names[-1]}){RESET}")
+
+
+def cmd_init(con, args):
+    if con.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'").fetchone()[0]:
+        raise RuntimeError(f"La base {args.db} n'est pas vide")
+    with open(SCHEMA_PATH, encoding="utf-8") as f:
+        con.executescript(f.read())
+    names = mark_applied(con)
+    print(f"{GREEN}✓ Schéma créé, {len(names)} migration(s) marquée(s) comme appliquée(s){RESET}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrations versionnées de la base")
+    parser.add_argument("--db", default=db_core.DB_PATH, help=f"Base de données (défaut: {db_core.DB_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="État des migrations")
+    apply_parser = commands.add_parser("apply", help="Appliquer les migrations en attente")
+    apply_parser.add_argument("--dry-run", action="store_true", help="Exécuter puis annuler")
+    apply_parser.add_argument("--target", help="Dernière migration à appliquer")
+    baseline_parser = commands.add_parser("baseline", help="Marquer des migrations comme appliquées")
+    baseline_parser.add_argument("--until", help="Dernière migration à marquer (défaut: toutes)")
+    commands.add_parser("init", help="Créer une base vide au schéma courant")
+    args = parser.parse_args()
+
+    if args.command != "init" and not os.path.exists(args.db):
+        parser.error(f"base introuvable : {args.db}")
+
+    con = sqlite3.connect(args.db, timeout=30)
+    try:
+        {"status": cmd_status, "apply": cmd_apply, "baseline": cmd_baseline, "init": cmd_init}[args.command](con, args)
+    except RuntimeError as e:
+        print(f"{RED}❌ {e}{RESET}")
+        sys.exit(1)
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Benchmarks reproductibles des chemins critiques, comparés à une référence
+
+Génère une base synthétique (scripts/generate_dataset.py, graine fixe) puis
+mesure les fonctions les plus sollicitées : calcul de coût des recettes,
+budget et agrégation des ingrédients d'un événement, pages de liste,
+recherche, détection des doublons du catalogue, rapprochement des tickets
+et statistiques d'accès.
+
+Les résultats (médiane, min, max par benchmark) sont écrits en JSON dans
+data/benchmarks/ et comparés à scripts/benchmarks/baseline.json : un
+benchmark dont la médiane dépasse celle de la référence de plus de
+--tolerance (et de plus de MIN_REGRESSION_MS) est signalé, et le script
+se termine avec le code 1.
+
+La référence dépend de la machine : la régénérer (--update-baseline) sur la
+machine qui exécute la comparaison, à partir d'un commit de référence.
+
+Usage:
+    python scripts/run_benchmarks.py
+    python scripts/run_benchmarks.py --only recipe_cost --runs 10
+    python scripts/run_benchmarks.py --update-baseline
+    python scripts/run_benchmarks.py --db data/bench.sqlite3   # base déjà générée
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Ajouter le répertoire parent au path pour importer les modules
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.models import db_core
+from generate_dataset import generate_dataset
+
+BASELINE_PATH = os.path.join(ROOT, "scripts", "benchmarks", "baseline.json")
+RESULTS_DIR = os.path.join(ROOT, "data", "benchmarks")
+
+# Écart absolu en dessous duquel une médiane plus lente n'est pas signalée (bruit)
+MIN_REGRESSION_MS = 0.5
+
+# Nombre d'éléments échantillonnés par benchmark (recettes, événements, tickets)
+SAMPLE_SIZE = 10
+
+GREEN = '\033[92m'
+RED = '\033[91m'
+YELLOW = '\033[93m'
+RESET = '\033[0m'
+
+
+def build_context(path: str) -> dict:
+    """Échantillons déterministes (premières lignes) utilisés par les benchmarks"""
+    con = sqlite3.connect(path)
+    try:
+        return {
+            "slugs": [row[0] for row in con.execute(
+                "SELECT slug FROM recipe ORDER BY id LIMIT ?", (SAMPLE_SIZE,))],
+            "event_ids": [row[0] for row in con.execute(
+                "SELECT event_id FROM event_recipe GROUP BY event_id ORDER BY event_id LIMIT ?", (SAMPLE_SIZE,))],
+            "user_id": con.execute("SELECT MIN(id) FROM user").fetchone()[0],
+            "month": con.execute("SELECT MAX(date) FROM meal_plan").fetchone()[0][:7],
+            "receipt_items": [
+                {"name_original": row[0], "name_fr": row[1], "price": row[2], "quantity": row[3]}
+                for row in con.execute(
+                    """SELECT receipt_item_text_original, receipt_item_text_fr, receipt_price, receipt_quantity
+                       FROM receipt_item_match
+                       WHERE receipt_id IN (SELECT id FROM receipt_upload_history ORDER BY id LIMIT 5)
+                       ORDER BY id""")
+            ],
+        }
+    finally:
+        con.close()
+
+
+def _event_aggregation(ctx):
+    from app.models import get_event_recipes_with_ingredients
+    from app.services.ingredient_aggregator import get_ingredient_aggregator
+    aggregator = get_ingredient_aggregator()
+    for event_id in ctx["event_ids"]:
+        aggregator.aggregate_ingredients(get_event_recipes_with_ingredients(event_id, "fr"), "fr")
+
+
+def _recipe_cost(lang):
+    def run(ctx):
+        from app.models import calculate_recipe_cost
+        for slug in ctx["slugs"]:
+            calculate_recipe_cost(slug, lang)
+    return run
+
+
+def _receipt_matching(ctx):
+    from app.services.ingredient_matcher import IngredientMatcher
+    IngredientMatcher().match_all_items(ctx["receipt_items"], "fr")
+
+
+def _calendar_month(ctx):
+    from app.models import get_calendar_data
+    year, month = ctx["month"].split("-")
+    get_calendar_data(int(year), int(month), "fr", ctx["user_id"])
+
+
+def _each_event(function_name, *args):
+    def run(ctx):
+        import app.models
+        function = getattr(app.models, function_name)
+        for event_id in ctx["event_ids"]:
+            function(event_id, *args)
+    return run
+
+
+def _call(function_name, *args, **kwargs):
+    def run(ctx):
+        import app.models
+        getattr(app.models, function_name)(*args, **kwargs)
+    return run
+
+
+# Nom → fonction(ctx) ; l'ordre est celui de l'affichage
+BENCHMARKS = {
+    # Résolution des coûts (catalogue, UC, ISC)
+    "recipe_cost_fr": _recipe_cost("fr"),
+    "recipe_cost_jp": _recipe_cost("jp"),
+    "event_budget_summary": _each_event("get_event_budget_summary"),
+    # Agrégation des ingrédients d'un événement (liste de courses)
+    "event_aggregation": _event_aggregation,
+    # Pages de liste
+    "list_recipes": _call("list_recipes", "fr"),
+    "list_recipes_page": _call("list_recipes", "fr", limit=24),
+    "list_events": _call("list_events", lang="fr"),
+    "shopping_list_items": _each_event("get_shopping_list_items", "fr"),
+    "calendar_month": _calendar_month,
+    "ingredient_catalog": _call("list_ingredient_catalog"),
+    # Recherche
+    "search_recipe_names": _call("search_recipe_names", "fr", "gratin"),
+    "search_recipes_by_filters": _call("search_recipes_by_filters", search_text="poulet"),
+    "search_recipes_by_ingredients": _call("search_recipes_by_ingredients", ["carotte", "oignon"]),
+    # Maintenance du catalogue et tickets
+    "duplicate_detection": _call("detect_duplicate_groups"),
+    "receipt_matching": _receipt_matching,
+    # Monitoring
+    "access_stats": _call("get_access_stats", 24),
+}
+
+
+def run_benchmark(function, ctx: dict, runs: int) -> dict:
+    """Une exécution d'échauffement puis `runs` mesures (sorties console ignorées)"""
+    durations = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        function(ctx)
+        for _ in range(runs):
+            start = time.perf_counter()
+            function(ctx)
+            durations.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": round(statistics.median(durations), 3),
+        "min_ms": round(min(durations), 3),
+        "max_ms": round(max(durations), 3),
+        "runs": runs,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Benchmarks dont la médiane dépasse la référence : [(nom, référence, actuel)]"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        limit = reference["median_ms"] * (1 + tolerance)
+        if result["median_ms"] > limit and result["median_ms"] - reference["median_ms"] > MIN_REGRESSION_MS:
+            regressions.append((name, reference["median_ms"], result["median_ms"]))
+    return regressions
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks des chemins critiques")
+    parser.add_argument("--recipes", type=int, default=500, help="Taille du jeu de données (défaut: 500)")
+    parser.add_argument("--seed", type=int, default=42, help="Graine du jeu de données (défaut: 42)")
+    parser.add_argument("--runs", type=int, default=5, help="Mesures par benchmark (défaut: 5)")
+    parser.add_argument("--only", help="Ne lancer que les benchmarks dont le nom contient ce texte")
+    parser.add_argument("--db", help="Base existante à utiliser au lieu d'en générer une")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Fichier de référence")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Ralentissement toléré par rapport à la référence (défaut: 0.25 = +25%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="Remplacer la référence par ces résultats")
+    parser.add_argument("--output", help="Fichier JSON des résultats (défaut: data/benchmarks/<date>.json)")
+    args = parser.parse_args()
+
+    benchmarks = {name: fn for name, fn in BENCHMARKS.items() if not args.only or args.only in name}
+    if not benchmarks:
+        parser.error(f"aucun benchmark ne correspond à '{args.only}'")
+
+    temp_path = None
+    if args.db:
+        path = args.db
+    else:
+        fd, temp_path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(fd)
+        path = temp_path
+        print(f"📦 Génération du jeu de données : {args.recipes} recettes, graine {args.seed}")
+        generate_dataset(path, recipes=args.recipes, seed=args.seed)
+
+    try:
+        db_core.DB_PATH = path
+        ctx = build_context(path)
+
+        print(f"\n⏱️  {len(benchmarks)} benchmarks, médiane sur {args.runs} mesures\n")
+        results = {}
+        for name, function in benchmarks.items():
+            results[name] = run_benchmark(function, ctx, args.runs)
+            print(f"  {name:<32} {results[name]['median_ms']:9.2f} ms")
+    finally:
+        if temp_path:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(temp_path + suffix):
+                    os.unlink(temp_path + suffix)
+
+    report = {
+        "meta": {
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "commit": _git_commit(),
+            "dataset": {"recipes": args.recipes, "seed": args.seed} if not args.db else {"db": args.db},
+            "runs": args.runs,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "machine": f"{platform.system()} {platform.machine()}",
+        },
+        "results": results,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Résultats : {output}")
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline["meta"] = report["meta"]
+        baseline["results"] = {**baseline.get("results", {}), **results}
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"📌 Référence mise à jour : {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"{YELLOW}⚠️  Pas de référence ({args.baseline}) : lancer avec --update-baseline{RESET}")
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline["meta"].get("dataset") != report["meta"]["dataset"]:
+        print(f"{YELLOW}⚠️  Jeu de données différent de la référence {baseline['meta'].get('dataset')}{RESET}")
+
+    regressions = compare(results, baseline["results"], args.tolerance)
+    if not regressions:
+        print(f"{GREEN}✓ Aucune régression (tolérance +{args.tolerance:.0%}, "
+              f"référence {baseline['meta'].get('commit') or '?'}){RESET}")
+        return
+    print(f"{RED}✗ {len(regressions)} régression(s) par rapport à la référence :{RESET}")
+    for name, reference, current in regressions:
+        print(f"  {RED}→{RESET} {name:<32} {reference:9.2f} ms → {current:9.2f} ms (x{current / reference:.2f})")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1378 @@
+-- Schéma consolidé de la base (état après application de toutes les migrations)
+-- Date: 2026-10-19
+-- Description: Structure courante de data/recette.sqlite3 (sortie de .schema), sans données.
+--              Sert à créer des bases de test ou de benchmark (scripts/generate_dataset.py).
+--              À régénérer après chaque nouvelle migration :
+--                  sqlite3 data/recette.sqlite3 .schema | grep -v sqlite_sequence > scripts/schema.sql
+--              (puis remettre cet en-tête et le PRAGMA auto_vacuum ci-dessous)
+--              Colonnes présentes en production sans migration correspondante :
+--              event.ingredients_actual_total, shopping_list_item.actual_total_price
+
+-- Pages libres récupérables par PRAGMA incremental_vacuum (app/services/db_maintenance.py) ;
+-- doit précéder la création de la première table
+PRAGMA auto_vacuum = INCREMENTAL;
+
+CREATE TABLE recipe (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    slug TEXT NOT NULL UNIQUE,
+    servings_default INTEGER NOT NULL DEFAULT 4,
+    country TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    image_url TEXT DEFAULT NULL,
+    thumbnail_url TEXT DEFAULT NULL
+, user_id INTEGER REFERENCES user(id), prep_time INTEGER DEFAULT 0, cook_time INTEGER DEFAULT 0, ingredient_count INTEGER NOT NULL DEFAULT 0, step_count INTEGER NOT NULL DEFAULT 0, available_langs TEXT NOT NULL DEFAULT '', content_generation INTEGER NOT NULL DEFAULT 0, sort_name_fr TEXT NOT NULL DEFAULT '' COLLATE NOCASE, sort_name_jp TEXT NOT NULL DEFAULT '' COLLATE NOCASE);
+CREATE TABLE recipe_translation (
+    recipe_id INTEGER NOT NULL,
+    lang TEXT NOT NULL CHECK(lang IN ('fr', 'jp')),
+    name TEXT NOT NULL,
+    recipe_type TEXT, description TEXT DEFAULT '', tips TEXT,
+    PRIMARY KEY (recipe_id, lang),
+    FOREIGN KEY (recipe_id) REFERENCES recipe(id) ON DELETE CASCADE
+);
+CREATE TABLE recipe_ingredient (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recipe_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    quantity REAL, linked_recipe_id INTEGER REFERENCES recipe(id) ON DELETE SET NULL,
+    FOREIGN KEY (recipe_id) REFERENCES recipe(id) ON DELETE CASCADE
+);
+CREATE TABLE recipe_ingredient_translation (
+    recipe_ingredient_id INTEGER NOT NULL,
+    lang TEXT NOT NULL CHECK(lang IN ('fr', 'jp')),
+    name TEXT NOT NULL,
+    unit TEXT,
+    notes TEXT,
+    PRIMARY KEY (recipe_ingredient_id, lang),
+    FOREIGN KEY (recipe_ingredient_id) REFERENCES recipe_ingredient(id) ON DELETE CASCADE
+);
+CREATE TABLE step (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recipe_id INTEGER NOT NULL,
+    position INTEGER NOT NULL, type TEXT DEFAULT 'text' CHECK(type IN ('text', 'image')), image_url TEXT DEFAULT NULL,
+    FOREIGN KEY (recipe_id) REFERENCES recipe(id) ON DELETE CASCADE
+);
+CREATE TABLE step_translation (
+    step_id INTEGER NOT NULL,
+    lang TEXT NOT NULL CHECK(lang IN ('fr', 'jp')),
+    text TEXT NOT NULL,
+    PRIMARY KEY (step_id, lang),
+    FOREIGN KEY (step_id) REFERENCES step(id) ON DELETE CASCADE
+);
+CREATE TABLE event (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_type_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    event_date DATE NOT NULL,
+    location TEXT,
+    attendees INTEGER NOT NULL DEFAULT 1,
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, budget_planned REAL DEFAULT NULL, currency TEXT DEFAULT 'EUR', user_id INTEGER REFERENCES event(id), date_debut DATE, date_fin DATE, nombre_jours INTEGER DEFAULT 1, ingredients_actual_total REAL DEFAULT NULL,
+    FOREIGN KEY (event_type_id) REFERENCES event_type(id) ON DELETE RESTRICT
+);
+CREATE TABLE event_recipe (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id INTEGER NOT NULL,
+    recipe_id INTEGER NOT NULL,
+    servings_multiplier REAL NOT NULL DEFAULT 1.0,
+    position INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (event_id) REFERENCES event(id) ON DELETE CASCADE,
+    FOREIGN KEY (recipe_id) REFERENCES recipe(id) ON DELETE CASCADE,
+    UNIQUE(event_id, recipe_id)
+);
+CREATE TABLE shopping_list_item (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id INTEGER NOT NULL,
+    ingredient_name TEXT NOT NULL,
+    needed_quantity REAL,
+    needed_unit TEXT,
+    purchase_quantity REAL,
+    purchase_unit TEXT,
+    is_checked BOOLEAN DEFAULT 0,
+    notes TEXT,
+    source_recipes TEXT,
+    position INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, planned_unit_price REAL DEFAULT NULL, actual_unit_price REAL DEFAULT NULL, is_purchased BOOLEAN DEFAULT 0, actual_total_price REAL DEFAULT NULL,
+    FOREIGN KEY (event_id) REFERENCES event(id) ON DELETE CASCADE
+);
+CREATE TABLE expense_ingredient_detail (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    expense_id INTEGER NOT NULL,
+    shopping_list_item_id INTEGER NOT NULL,  -- Lien vers l'item de la liste de courses
+    ingredient_name TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    unit TEXT NOT NULL,
+    planned_unit_price REAL,     -- Prix unitaire prévu
+    actual_unit_price REAL,      -- Prix unitaire réel (après achat)
+    planned_total REAL,          -- Quantité × Prix prévu
+    actual_total REAL,           -- Quantité × Prix réel
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (expense_id) REFERENCES event_expense(id) ON DELETE CASCADE,
+    FOREIGN KEY (shopping_list_item_id) REFERENCES shopping_list_item(id) ON DELETE CASCADE
+);
+CREATE TABLE unit_conversion (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    from_unit TEXT NOT NULL,      -- Unité source (ex: c.s., ml, g)
+    to_unit TEXT NOT NULL,         -- Unité cible (ex: L, kg)
+    factor REAL NOT NULL,          -- Facteur de multiplication (from * factor = to)
+    category TEXT,                 -- Catégorie (volume, poids, quantité)
+    notes TEXT,                    -- Notes explicatives
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, from_unit_fr TEXT, to_unit_fr TEXT, from_unit_jp TEXT, to_unit_jp TEXT,
+    UNIQUE(from_unit, to_unit)
+);
+CREATE TABLE expense_category (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    is_system BOOLEAN DEFAULT 0,  -- Les catégories système ne peuvent pas être supprimées
+    icon TEXT DEFAULT '📋',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE expense_category_translation (
+    category_id INTEGER NOT NULL,
+    lang TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (category_id, lang),
+    FOREIGN KEY (category_id) REFERENCES expense_category(id) ON DELETE CASCADE
+);
+CREATE TABLE event_expense (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    planned_amount REAL NOT NULL,      -- Montant prévu
+    actual_amount REAL DEFAULT NULL,   -- Montant réel (NULL = pas encore payé)
+    is_paid BOOLEAN DEFAULT 0,
+    paid_date DATE DEFAULT NULL,
+    notes TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (event_id) REFERENCES event(id) ON DELETE CASCADE,
+    FOREIGN KEY (category_id) REFERENCES expense_category(id)
+);
+CREATE TABLE ingredient_price_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ingredient_name_normalized TEXT NOT NULL,  -- Nom normalisé (sans accents, minuscules)
+    ingredient_name_display TEXT NOT NULL,     -- Nom affiché (avec accents, casse correcte)
+    unit_price REAL NOT NULL,
+    unit TEXT NOT NULL,
+    source TEXT DEFAULT 'manual',  -- 'manual', 'shopping_list', 'import'
+    last_used_date DATE DEFAULT CURRENT_DATE,
+    usage_count INTEGER DEFAULT 1,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE access_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ip_address TEXT NOT NULL,           -- Adresse IP du client
+    user_agent TEXT,                     -- User-Agent du navigateur
+    path TEXT,                           -- Page/route accédée (ex: /recipes, /events)
+    method TEXT DEFAULT 'GET',           -- Méthode HTTP (GET, POST, etc.)
+    status_code INTEGER,                 -- Code de réponse HTTP (200, 404, etc.)
+    response_time_ms REAL,               -- Temps de réponse en millisecondes
+    referer TEXT,                        -- Page d'origine (referer)
+    lang TEXT,                           -- Langue utilisée (fr/jp)
+    accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,  -- Horodatage de l'accès
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+, response_size_bytes INTEGER, transfer_size_bytes INTEGER);
+CREATE TABLE category (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name_fr TEXT NOT NULL UNIQUE,
+    name_jp TEXT NOT NULL,
+    description_fr TEXT,
+    description_jp TEXT,
+    display_order INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE tag (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name_fr TEXT NOT NULL UNIQUE,
+    name_jp TEXT NOT NULL,
+    description_fr TEXT,
+    description_jp TEXT,
+    color TEXT DEFAULT '#3B82F6', -- Couleur hex pour l'affichage
+    is_system BOOLEAN DEFAULT 0,   -- Tags système (non supprimables)
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE recipe_category (
+    recipe_id INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    PRIMARY KEY (recipe_id, category_id),
+    FOREIGN KEY (recipe_id) REFERENCES recipe(id) ON DELETE CASCADE,
+    FOREIGN KEY (category_id) REFERENCES category(id) ON DELETE CASCADE
+);
+CREATE TABLE recipe_tag (
+    recipe_id INTEGER NOT NULL,
+    tag_id INTEGER NOT NULL,
+    PRIMARY KEY (recipe_id, tag_id),
+    FOREIGN KEY (recipe_id) REFERENCES recipe(id) ON DELETE CASCADE,
+    FOREIGN KEY (tag_id) REFERENCES tag(id) ON DELETE CASCADE
+);
+CREATE TABLE ingredient_specific_conversions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ingredient_name_fr TEXT NOT NULL,
+
+    -- Conversion
+    from_unit TEXT NOT NULL,
+    to_unit TEXT NOT NULL,
+    factor REAL NOT NULL,
+
+    -- Métadonnées
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    -- Contraintes
+    UNIQUE(ingredient_name_fr, from_unit, to_unit),
+    FOREIGN KEY (ingredient_name_fr) REFERENCES ingredient_price_catalog(ingredient_name_fr) ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS "ingredient_price_catalog" (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ingredient_name_fr TEXT NOT NULL,
+    ingredient_name_jp TEXT,
+    unit_fr TEXT NOT NULL,
+    unit_jp TEXT,
+    price_eur REAL,
+    price_jpy REAL,
+    qty REAL DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    conversion_category TEXT CHECK(conversion_category IN ('volume', 'poids', 'unite')), created_by INTEGER REFERENCES user(id), price_eur_source TEXT DEFAULT 'manual', price_eur_last_receipt_date TEXT, price_jpy_source TEXT DEFAULT 'manual', price_jpy_last_receipt_date TEXT, ingredient_name_jp_reading TEXT,
+    UNIQUE(ingredient_name_fr, unit_fr)
+);
+CREATE TABLE user (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL,
+    display_name TEXT,
+    is_active INTEGER DEFAULT 1,
+    is_admin INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_login TIMESTAMP, preferred_lang TEXT NOT NULL DEFAULT 'fr',
+    CONSTRAINT email_format CHECK (email LIKE '%@%')
+);
+CREATE TABLE event_date (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id INTEGER NOT NULL,
+    date DATE NOT NULL,
+    is_selected BOOLEAN DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (event_id) REFERENCES event(id) ON DELETE CASCADE,
+    UNIQUE(event_id, date)
+);
+CREATE TABLE event_recipe_planning (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id INTEGER NOT NULL,
+    recipe_id INTEGER NOT NULL,
+    event_date_id INTEGER NOT NULL,
+    position INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (event_id) REFERENCES event(id) ON DELETE CASCADE,
+    FOREIGN KEY (recipe_id) REFERENCES recipe(id) ON DELETE CASCADE,
+    FOREIGN KEY (event_date_id) REFERENCES event_date(id) ON DELETE CASCADE,
+    UNIQUE(event_id, recipe_id, event_date_id)
+);
+CREATE TABLE client_performance_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    page_url TEXT NOT NULL,                  -- URL de la page
+
+    -- Métriques réseau
+    network_time REAL,                       -- Temps réseau total (ms)
+    dns_time REAL,                           -- Temps de résolution DNS (ms)
+    tcp_time REAL,                           -- Temps de connexion TCP (ms)
+    server_time REAL,                        -- Temps de traitement serveur (ms)
+    download_time REAL,                      -- Temps de téléchargement de la réponse (ms)
+
+    -- Métriques de traitement
+    dom_processing_time REAL,                -- Temps de traitement DOM (ms)
+    total_load_time REAL,                    -- Temps de chargement total (ms)
+    dom_interactive_time REAL,               -- Temps jusqu'au DOM interactif (ms)
+
+    -- Informations de navigation
+    navigation_type INTEGER,                 -- 0: navigation, 1: reload, 2: back/forward
+    redirect_count INTEGER,                  -- Nombre de redirections
+
+    -- Métadonnées
+    user_agent TEXT,                         -- User agent du navigateur
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE participant (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nom TEXT NOT NULL,                    -- Obligatoire
+    prenom TEXT,                          -- Optionnel
+    role TEXT,                            -- Texte libre (ex: "invité", "organisateur", "famille")
+    telephone TEXT,                       -- Optionnel
+    email TEXT,                           -- Optionnel
+    adresse TEXT,                         -- Optionnel
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+, user_id INTEGER);
+CREATE TABLE participant_group (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nom TEXT NOT NULL UNIQUE,            -- Nom du groupe (unique)
+    description TEXT,                     -- Description optionnelle
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+, user_id INTEGER);
+CREATE TABLE participant_group_member (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    participant_id INTEGER NOT NULL,
+    group_id INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (participant_id) REFERENCES participant(id) ON DELETE CASCADE,
+    FOREIGN KEY (group_id) REFERENCES participant_group(id) ON DELETE CASCADE,
+    UNIQUE(participant_id, group_id)     -- Un participant ne peut être qu'une fois dans un groupe
+);
+CREATE TABLE event_participant (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id INTEGER NOT NULL,
+    participant_id INTEGER NOT NULL,
+    added_via_group_id INTEGER,          -- NULL si ajouté manuellement, sinon ID du groupe source
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (event_id) REFERENCES event(id) ON DELETE CASCADE,
+    FOREIGN KEY (participant_id) REFERENCES participant(id) ON DELETE CASCADE,
+    FOREIGN KEY (added_via_group_id) REFERENCES participant_group(id) ON DELETE SET NULL,
+    UNIQUE(event_id, participant_id)     -- Un participant ne peut être lié qu'une fois par événement
+);
+CREATE TABLE recipe_event_type (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recipe_id INTEGER NOT NULL,
+    event_type_id INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (recipe_id) REFERENCES recipe(id) ON DELETE CASCADE,
+    FOREIGN KEY (event_type_id) REFERENCES event_type(id) ON DELETE CASCADE,
+    UNIQUE(recipe_id, event_type_id)
+);
+CREATE TABLE IF NOT EXISTS "event_type" (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name_fr TEXT NOT NULL UNIQUE,
+    name_jp TEXT NOT NULL,
+    description_fr TEXT,
+    description_jp TEXT,
+    recipe_type_fr TEXT NOT NULL,
+    recipe_type_jp TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE event_photo (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id INTEGER NOT NULL,
+    photo_url TEXT NOT NULL,
+    position INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (event_id) REFERENCES event(id) ON DELETE CASCADE
+);
+CREATE TABLE meal_plan (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER,
+    date TEXT NOT NULL,
+    meal_type TEXT NOT NULL DEFAULT 'dinner',
+    recipe_id INTEGER,
+    free_text TEXT,
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES user(id),
+    FOREIGN KEY (recipe_id) REFERENCES recipe(id),
+    CHECK (recipe_id IS NOT NULL OR free_text IS NOT NULL)
+);
+CREATE TABLE receipt_upload_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    filename TEXT NOT NULL,                              -- Nom du fichier PDF uploadé
+    receipt_name TEXT,                                   -- Nom personnalisé donné par l'utilisateur
+    store_name TEXT,                                     -- Nom du commerce (extrait du PDF)
+    receipt_date DATE,                                   -- Date du ticket (extrait du PDF)
+    upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,     -- Date d'upload
+    processed_at TIMESTAMP,                              -- Date de traitement complet
+    total_items INTEGER DEFAULT 0,                       -- Nombre total d'articles extraits
+    matched_items INTEGER DEFAULT 0,                     -- Nombre d'articles matchés avec catalogue
+    validated_items INTEGER DEFAULT 0,                   -- Nombre d'articles validés par l'utilisateur
+    status TEXT DEFAULT 'pending',                       -- pending, processed, error
+    error_message TEXT,                                  -- Message d'erreur si extraction échoue
+    currency TEXT DEFAULT 'EUR',                         -- Devise détectée (EUR, JPY)
+    user_id INTEGER, file_path TEXT,                                     -- Utilisateur qui a uploadé
+    FOREIGN KEY (user_id) REFERENCES user(id) ON DELETE SET NULL
+);
+CREATE TABLE IF NOT EXISTS "receipt_item_match" (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    receipt_id INTEGER NOT NULL,
+    receipt_item_text_original TEXT NOT NULL,  -- Nouvelle colonne (ancien nom: receipt_item_text)
+    receipt_item_text_fr TEXT,                  -- Nouvelle colonne pour traduction FR
+    receipt_price REAL,
+    receipt_quantity REAL DEFAULT 1.0,
+    receipt_unit TEXT,
+    matched_ingredient_id INTEGER,
+    confidence_score REAL DEFAULT 0.0,
+    status TEXT DEFAULT 'pending',
+    validated_at TIMESTAMP,
+    notes TEXT,
+    FOREIGN KEY (receipt_id) REFERENCES receipt_upload_history(id) ON DELETE CASCADE,
+    FOREIGN KEY (matched_ingredient_id) REFERENCES ingredient_price_catalog(id) ON DELETE SET NULL
+);
+CREATE TABLE data_generation (
+    table_name TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE event_summary (
+    event_id INTEGER PRIMARY KEY,
+    groups TEXT,                          -- "Famille, Amis"
+    groups_raw TEXT,                      -- "1:Famille||2:Amis"
+    participants TEXT,                    -- "Jean Dupont, Marie"
+    participant_count INTEGER NOT NULL DEFAULT 0,
+    recipes_raw_fr TEXT,                  -- "slug::Nom FR||slug2::Nom FR 2"
+    recipes_raw_jp TEXT,                  -- "slug::名前||..."
+    recipe_count INTEGER NOT NULL DEFAULT 0,
+    first_photo TEXT,
+    stale INTEGER NOT NULL DEFAULT 1,     -- 1 = à reconstruire
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (event_id) REFERENCES event(id) ON DELETE CASCADE
+);
+CREATE TABLE shopping_list_item_source (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    item_id INTEGER NOT NULL,
+    recipe_id INTEGER,
+    recipe_name TEXT,                     -- Nom dans la langue de génération de la liste
+    quantity REAL,                        -- Quantité ajustée (NULL = sans quantité précise)
+    unit TEXT,
+    position INTEGER NOT NULL DEFAULT 0,  -- Ordre d'affichage des sources d'une ligne
+    FOREIGN KEY (item_id) REFERENCES shopping_list_item(id) ON DELETE CASCADE
+);
+CREATE TABLE access_log_hourly (
+    hour TEXT NOT NULL,                   -- Début de l'heure (UTC, 'YYYY-MM-DD HH:00:00')
+    path TEXT NOT NULL,
+    status_class INTEGER NOT NULL,        -- 2, 3, 4, 5 (0 = statut inconnu)
+    count INTEGER NOT NULL DEFAULT 0,
+    sized_count INTEGER NOT NULL DEFAULT 0,   -- Accès dont la taille est connue
+    bytes INTEGER NOT NULL DEFAULT 0,         -- Somme des tailles avant compression
+    transfer_bytes INTEGER NOT NULL DEFAULT 0,
+    timed_count INTEGER NOT NULL DEFAULT 0,   -- Accès dont le temps est connu
+    total_time_ms REAL NOT NULL DEFAULT 0,
+    b0 INTEGER NOT NULL DEFAULT 0,
+    b1 INTEGER NOT NULL DEFAULT 0,
+    b2 INTEGER NOT NULL DEFAULT 0,
+    b3 INTEGER NOT NULL DEFAULT 0,
+    b4 INTEGER NOT NULL DEFAULT 0,
+    b5 INTEGER NOT NULL DEFAULT 0,
+    b6 INTEGER NOT NULL DEFAULT 0,
+    b7 INTEGER NOT NULL DEFAULT 0,
+    b8 INTEGER NOT NULL DEFAULT 0,
+    b9 INTEGER NOT NULL DEFAULT 0,
+    b10 INTEGER NOT NULL DEFAULT 0,
+    b11 INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (hour, path, status_class)
+) WITHOUT ROWID;
+CREATE TABLE access_log_hourly_ip (
+    hour TEXT NOT NULL,
+    ip_address TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    first_access TIMESTAMP,
+    last_access TIMESTAMP,
+    PRIMARY KEY (hour, ip_address)
+) WITHOUT ROWID;
+CREATE TABLE recipe_type (id INTEGER PRIMARY KEY AUTOINCREMENT, name_fr TEXT NOT NULL UNIQUE, name_jp TEXT, description TEXT);
+CREATE TABLE recipe_recipe_type (recipe_id INTEGER NOT NULL, recipe_type_id INTEGER NOT NULL, PRIMARY KEY (recipe_id, recipe_type_id));
+CREATE INDEX idx_recipe_slug ON recipe(slug);
+CREATE INDEX idx_recipe_country ON recipe(country);
+CREATE INDEX idx_recipe_image ON recipe(image_url);
+CREATE INDEX idx_recipe_translation_lang ON recipe_translation(lang);
+CREATE INDEX idx_recipe_ingredient_recipe ON recipe_ingredient(recipe_id);
+CREATE INDEX idx_recipe_ingredient_position ON recipe_ingredient(recipe_id, position);
+CREATE INDEX idx_recipe_ingredient_translation_lang ON recipe_ingredient_translation(lang);
+CREATE INDEX idx_recipe_ingredient_translation_name ON recipe_ingredient_translation(name);
+CREATE INDEX idx_step_recipe ON step(recipe_id);
+CREATE INDEX idx_step_position ON step(recipe_id, position);
+CREATE INDEX idx_step_translation_lang ON step_translation(lang);
+CREATE INDEX idx_event_date ON event(event_date DESC);
+CREATE INDEX idx_event_type ON event(event_type_id);
+CREATE INDEX idx_event_recipe_event ON event_recipe(event_id);
+CREATE INDEX idx_event_recipe_recipe ON event_recipe(recipe_id);
+CREATE INDEX idx_expense_ingredient_expense ON expense_ingredient_detail(expense_id);
+CREATE INDEX idx_expense_ingredient_shopping ON expense_ingredient_detail(shopping_list_item_id);
+CREATE INDEX idx_unit_from ON unit_conversion(from_unit);
+CREATE INDEX idx_unit_to ON unit_conversion(to_unit);
+CREATE INDEX idx_unit_category ON unit_conversion(category);
+CREATE INDEX idx_event_expense_event_id ON event_expense(event_id);
+CREATE INDEX idx_event_expense_category_id ON event_expense(category_id);
+CREATE INDEX idx_ingredient_price_normalized ON ingredient_price_history(ingredient_name_normalized);
+CREATE INDEX idx_access_log_ip ON access_log(ip_address);
+CREATE INDEX idx_access_log_accessed_at ON access_log(accessed_at);
+CREATE INDEX idx_access_log_path ON access_log(path);
+CREATE INDEX idx_recipe_category_recipe ON recipe_category(recipe_id);
+CREATE INDEX idx_recipe_category_category ON recipe_category(category_id);
+CREATE INDEX idx_recipe_tag_recipe ON recipe_tag(recipe_id);
+CREATE INDEX idx_recipe_tag_tag ON recipe_tag(tag_id);
+CREATE INDEX idx_tag_name_fr ON tag(name_fr);
+CREATE INDEX idx_category_name_fr ON category(name_fr);
+CREATE INDEX idx_specific_conv_ingredient
+ON ingredient_specific_conversions(ingredient_name_fr);
+CREATE INDEX idx_specific_conv_units
+ON ingredient_specific_conversions(ingredient_name_fr, from_unit);
+CREATE INDEX idx_ingredient_name_fr ON ingredient_price_catalog(ingredient_name_fr);
+CREATE INDEX idx_ingredient_name_jp ON ingredient_price_catalog(ingredient_name_jp);
+CREATE INDEX idx_conversion_category ON ingredient_price_catalog(conversion_category);
+CREATE INDEX idx_user_username ON user(username);
+CREATE INDEX idx_user_email ON user(email);
+CREATE INDEX idx_recipe_user ON recipe(user_id);
+CREATE INDEX idx_event_user ON event(user_id);
+CREATE INDEX idx_event_date_event ON event_date(event_id);
+CREATE INDEX idx_event_date_date ON event_date(date);
+CREATE INDEX idx_event_recipe_planning_event ON event_recipe_planning(event_id);
+CREATE INDEX idx_event_recipe_planning_date ON event_recipe_planning(event_date_id);
+CREATE INDEX idx_event_recipe_planning_recipe ON event_recipe_planning(recipe_id);
+CREATE INDEX idx_access_log_ip_accessed
+ON access_log(ip_address, accessed_at DESC);
+CREATE INDEX idx_access_log_path_accessed
+ON access_log(path, accessed_at DESC);
+CREATE INDEX idx_event_user_date
+ON event(user_id, event_date DESC);
+CREATE INDEX idx_recipe_user_created
+ON recipe(user_id, created_at DESC);
+CREATE INDEX idx_shopping_list_event_date
+ON shopping_list_item(event_id, created_at DESC);
+CREATE INDEX idx_shopping_list_name
+ON shopping_list_item(ingredient_name);
+CREATE INDEX idx_event_expense_event_date
+ON event_expense(event_id, created_at DESC);
+CREATE INDEX idx_recipe_ingredient_trans_lang_name
+ON recipe_ingredient_translation(lang, name COLLATE NOCASE);
+CREATE INDEX idx_event_recipe_event_position
+ON event_recipe(event_id, position);
+CREATE INDEX idx_ingredient_catalog_name_fr
+ON ingredient_price_catalog(ingredient_name_fr COLLATE NOCASE);
+CREATE INDEX idx_ingredient_catalog_name_jp
+ON ingredient_price_catalog(ingredient_name_jp COLLATE NOCASE);
+CREATE INDEX idx_client_perf_page_url ON client_performance_log(page_url);
+CREATE INDEX idx_client_perf_created_at ON client_performance_log(created_at);
+CREATE INDEX idx_client_perf_total_load ON client_performance_log(total_load_time);
+CREATE INDEX idx_participant_nom ON participant(nom);
+CREATE INDEX idx_participant_email ON participant(email);
+CREATE INDEX idx_participant_group_nom ON participant_group(nom);
+CREATE INDEX idx_pgm_participant ON participant_group_member(participant_id);
+CREATE INDEX idx_pgm_group ON participant_group_member(group_id);
+CREATE INDEX idx_ep_event ON event_participant(event_id);
+CREATE INDEX idx_ep_participant ON event_participant(participant_id);
+CREATE INDEX idx_ep_group ON event_participant(added_via_group_id);
+CREATE INDEX idx_participant_user_id ON participant(user_id);
+CREATE INDEX idx_participant_group_user_id ON participant_group(user_id);
+CREATE INDEX idx_recipe_event_type_recipe ON recipe_event_type(recipe_id);
+CREATE INDEX idx_recipe_event_type_event_type ON recipe_event_type(event_type_id);
+CREATE INDEX idx_event_type_name_fr ON event_type(name_fr);
+CREATE INDEX idx_event_type_name_jp ON event_type(name_jp);
+CREATE INDEX idx_event_photo_event ON event_photo(event_id);
+CREATE INDEX idx_meal_plan_date ON meal_plan(date);
+CREATE INDEX idx_meal_plan_user_date ON meal_plan(user_id, date);
+CREATE INDEX idx_receipt_upload_date ON receipt_upload_history(upload_date DESC);
+CREATE INDEX idx_receipt_status ON receipt_upload_history(status);
+CREATE INDEX idx_receipt_user ON receipt_upload_history(user_id);
+CREATE INDEX idx_receipt_item_receipt_id ON receipt_item_match(receipt_id);
+CREATE INDEX idx_receipt_item_status ON receipt_item_match(status);
+CREATE INDEX idx_receipt_item_text_original ON receipt_item_match(receipt_item_text_original);
+CREATE INDEX idx_receipt_item_text_fr ON receipt_item_match(receipt_item_text_fr);
+CREATE INDEX idx_price_eur_source ON ingredient_price_catalog(price_eur_source);
+CREATE INDEX idx_price_jpy_source ON ingredient_price_catalog(price_jpy_source);
+CREATE INDEX idx_ingredient_name_jp_reading
+    ON ingredient_price_catalog(ingredient_name_jp_reading);
+CREATE INDEX idx_step_type ON step(type);
+CREATE INDEX idx_event_summary_stale
+ON event_summary(event_id) WHERE stale = 1;
+CREATE INDEX idx_recipe_sort_name_fr ON recipe(sort_name_fr, id);
+CREATE INDEX idx_recipe_sort_name_jp ON recipe(sort_name_jp, id);
+CREATE INDEX idx_recipe_user_sort_name_fr ON recipe(user_id, sort_name_fr, id);
+CREATE INDEX idx_recipe_user_sort_name_jp ON recipe(user_id, sort_name_jp, id);
+CREATE INDEX idx_event_date_id
+ON event(event_date DESC, id DESC);
+CREATE INDEX idx_event_user_date_id
+ON event(user_id, event_date DESC, id DESC);
+CREATE INDEX idx_receipt_upload_date_id
+ON receipt_upload_history(upload_date DESC, id DESC);
+CREATE INDEX idx_receipt_user_upload_date_id
+ON receipt_upload_history(user_id, upload_date DESC, id DESC);
+CREATE INDEX idx_access_log_accessed_at_id
+ON access_log(accessed_at DESC, id DESC);
+CREATE INDEX idx_shopping_list_item_source_item
+ON shopping_list_item_source(item_id, position);
+CREATE INDEX idx_shopping_list_item_source_recipe
+ON shopping_list_item_source(recipe_id, item_id);
+CREATE INDEX idx_client_perf_page_created
+ON client_performance_log(page_url, created_at DESC);
+CREATE INDEX idx_recipe_ingredient_linked_recipe
+ON recipe_ingredient(linked_recipe_id) WHERE linked_recipe_id IS NOT NULL;
+CREATE TRIGGER update_recipe_timestamp
+AFTER UPDATE ON recipe
+BEGIN
+    UPDATE recipe SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+END;
+CREATE TRIGGER update_catalog_after_actual_price
+AFTER UPDATE OF actual_unit_price ON expense_ingredient_detail
+WHEN NEW.actual_unit_price IS NOT NULL
+BEGIN
+    -- Récupérer la devise de l'événement
+    UPDATE ingredient_price_catalog
+    SET
+        price_eur = CASE
+            WHEN (SELECT currency FROM event WHERE id = (SELECT event_id FROM event_expense WHERE id = NEW.expense_id)) = 'EUR'
+            THEN NEW.actual_unit_price
+            ELSE price_eur
+        END,
+        price_jpy = CASE
+            WHEN (SELECT currency FROM event WHERE id = (SELECT event_id FROM event_expense WHERE id = NEW.expense_id)) = 'JPY'
+            THEN NEW.actual_unit_price
+            ELSE price_jpy
+        END,
+        last_updated = CURRENT_TIMESTAMP
+    WHERE ingredient_name = NEW.ingredient_name;
+
+    -- Si l'ingrédient n'existe pas, l'insérer
+    INSERT OR IGNORE INTO ingredient_price_catalog (ingredient_name, unit)
+    VALUES (NEW.ingredient_name, NEW.unit);
+END;
+CREATE VIEW v_unit_conversions_bidirectional AS
+SELECT
+    from_unit,
+    to_unit,
+    factor,
+    category,
+    notes
+FROM unit_conversion
+UNION ALL
+-- Ajouter les conversions inverses automatiquement (si pas déjà définies)
+SELECT
+    to_unit as from_unit,
+    from_unit as to_unit,
+    1.0 / factor as factor,
+    category,
+    'Conversion inverse de: ' || notes as notes
+FROM unit_conversion
+WHERE NOT EXISTS (
+    SELECT 1 FROM unit_conversion uc2
+    WHERE uc2.from_unit = unit_conversion.to_unit
+      AND uc2.to_unit = unit_conversion.from_unit
+)
+/* v_unit_conversions_bidirectional(from_unit,to_unit,factor,category,notes) */;
+CREATE TRIGGER update_event_expense_timestamp
+AFTER UPDATE ON event_expense
+FOR EACH ROW
+BEGIN
+    UPDATE event_expense SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+END;
+CREATE TRIGGER update_ingredient_price_timestamp
+AFTER UPDATE ON ingredient_price_history
+FOR EACH ROW
+BEGIN
+    UPDATE ingredient_price_history SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+END;
+CREATE TRIGGER save_actual_price_to_history
+AFTER UPDATE OF actual_unit_price, is_purchased ON shopping_list_item
+FOR EACH ROW
+WHEN NEW.actual_unit_price IS NOT NULL AND NEW.is_purchased = 1
+BEGIN
+    -- Normaliser le nom pour la recherche
+    INSERT OR REPLACE INTO ingredient_price_history (
+        ingredient_name_normalized,
+        ingredient_name_display,
+        unit_price,
+        unit,
+        source,
+        last_used_date,
+        usage_count
+    )
+    VALUES (
+        lower(replace(replace(NEW.ingredient_name, 'Œ', 'oe'), 'œ', 'oe')),
+        NEW.ingredient_name,
+        NEW.actual_unit_price,
+        NEW.purchase_unit,
+        'shopping_list',
+        CURRENT_DATE,
+        COALESCE(
+            (SELECT usage_count + 1
+             FROM ingredient_price_history
+             WHERE ingredient_name_normalized = lower(replace(replace(NEW.ingredient_name, 'Œ', 'oe'), 'œ', 'oe'))
+             AND unit = NEW.purchase_unit
+             LIMIT 1),
+            1
+        )
+    );
+END;
+CREATE VIEW v_access_by_ip_24h AS
+SELECT
+    ip_address,
+    COUNT(*) as access_count,
+    MIN(accessed_at) as first_access,
+    MAX(accessed_at) as last_access,
+    GROUP_CONCAT(DISTINCT path) as pages_accessed
+FROM access_log
+WHERE accessed_at >= datetime('now', '-1 day')
+GROUP BY ip_address
+ORDER BY access_count DESC
+/* v_access_by_ip_24h(ip_address,access_count,first_access,last_access,pages_accessed) */;
+CREATE TRIGGER update_specific_conv_timestamp
+AFTER UPDATE ON ingredient_specific_conversions
+FOR EACH ROW
+BEGIN
+    UPDATE ingredient_specific_conversions
+    SET updated_at = CURRENT_TIMESTAMP
+    WHERE id = NEW.id;
+END;
+CREATE VIEW v_popular_pages_24h AS
+SELECT
+    path,
+    COUNT(*) as visit_count,
+    AVG(response_time_ms) as avg_response_time,
+    AVG(response_size_bytes) as avg_response_size,
+    COUNT(DISTINCT ip_address) as unique_visitors
+FROM access_log
+WHERE accessed_at >= datetime('now', '-1 day')
+  AND path IS NOT NULL
+GROUP BY path
+ORDER BY visit_count DESC
+/* v_popular_pages_24h(path,visit_count,avg_response_time,avg_response_size,unique_visitors) */;
+CREATE VIEW v_client_performance_24h AS
+SELECT
+    page_url,
+    COUNT(*) as measurement_count,
+    AVG(network_time) as avg_network_time,
+    AVG(server_time) as avg_server_time,
+    AVG(download_time) as avg_download_time,
+    AVG(dom_processing_time) as avg_dom_time,
+    AVG(total_load_time) as avg_total_time,
+    MAX(total_load_time) as max_total_time,
+    MIN(total_load_time) as min_total_time
+FROM client_performance_log
+WHERE created_at >= datetime('now', '-1 day')
+GROUP BY page_url
+ORDER BY measurement_count DESC
+/* v_client_performance_24h(page_url,measurement_count,avg_network_time,avg_server_time,avg_download_time,avg_dom_time,avg_total_time,max_total_time,min_total_time) */;
+CREATE VIEW receipt_summary AS
+SELECT
+    r.id,
+    r.filename,
+    r.receipt_name,
+    r.store_name,
+    r.receipt_date,
+    r.upload_date,
+    r.processed_at,
+    r.status,
+    r.currency,
+    r.total_items,
+    r.matched_items,
+    r.validated_items,
+    r.user_id,
+    u.username,
+    -- Statistiques calculées
+    ROUND(CAST(r.matched_items AS REAL) / NULLIF(r.total_items, 0) * 100, 1) as match_percentage,
+    ROUND(CAST(r.validated_items AS REAL) / NULLIF(r.total_items, 0) * 100, 1) as validation_percentage
+FROM receipt_upload_history r
+LEFT JOIN user u ON r.user_id = u.id
+/* receipt_summary(id,filename,receipt_name,store_name,receipt_date,upload_date,processed_at,status,currency,total_items,matched_items,validated_items,user_id,username,match_percentage,validation_percentage) */;
+CREATE TRIGGER data_generation_recipe_insert
+AFTER INSERT ON recipe
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe';
+END;
+CREATE TRIGGER data_generation_recipe_update
+AFTER UPDATE ON recipe
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe';
+END;
+CREATE TRIGGER data_generation_recipe_delete
+AFTER DELETE ON recipe
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe';
+END;
+CREATE TRIGGER data_generation_recipe_translation_insert
+AFTER INSERT ON recipe_translation
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_translation';
+END;
+CREATE TRIGGER data_generation_recipe_translation_update
+AFTER UPDATE ON recipe_translation
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_translation';
+END;
+CREATE TRIGGER data_generation_recipe_translation_delete
+AFTER DELETE ON recipe_translation
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_translation';
+END;
+CREATE TRIGGER data_generation_recipe_ingredient_insert
+AFTER INSERT ON recipe_ingredient
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_ingredient';
+END;
+CREATE TRIGGER data_generation_recipe_ingredient_update
+AFTER UPDATE ON recipe_ingredient
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_ingredient';
+END;
+CREATE TRIGGER data_generation_recipe_ingredient_delete
+AFTER DELETE ON recipe_ingredient
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_ingredient';
+END;
+CREATE TRIGGER data_generation_recipe_ingredient_translation_insert
+AFTER INSERT ON recipe_ingredient_translation
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_ingredient_translation';
+END;
+CREATE TRIGGER data_generation_recipe_ingredient_translation_update
+AFTER UPDATE ON recipe_ingredient_translation
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_ingredient_translation';
+END;
+CREATE TRIGGER data_generation_recipe_ingredient_translation_delete
+AFTER DELETE ON recipe_ingredient_translation
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_ingredient_translation';
+END;
+CREATE TRIGGER data_generation_step_insert
+AFTER INSERT ON step
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'step';
+END;
+CREATE TRIGGER data_generation_step_update
+AFTER UPDATE ON step
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'step';
+END;
+CREATE TRIGGER data_generation_step_delete
+AFTER DELETE ON step
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'step';
+END;
+CREATE TRIGGER data_generation_step_translation_insert
+AFTER INSERT ON step_translation
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'step_translation';
+END;
+CREATE TRIGGER data_generation_step_translation_update
+AFTER UPDATE ON step_translation
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'step_translation';
+END;
+CREATE TRIGGER data_generation_step_translation_delete
+AFTER DELETE ON step_translation
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'step_translation';
+END;
+CREATE TRIGGER data_generation_recipe_category_insert
+AFTER INSERT ON recipe_category
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_category';
+END;
+CREATE TRIGGER data_generation_recipe_category_update
+AFTER UPDATE ON recipe_category
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_category';
+END;
+CREATE TRIGGER data_generation_recipe_category_delete
+AFTER DELETE ON recipe_category
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_category';
+END;
+CREATE TRIGGER data_generation_recipe_tag_insert
+AFTER INSERT ON recipe_tag
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_tag';
+END;
+CREATE TRIGGER data_generation_recipe_tag_update
+AFTER UPDATE ON recipe_tag
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_tag';
+END;
+CREATE TRIGGER data_generation_recipe_tag_delete
+AFTER DELETE ON recipe_tag
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_tag';
+END;
+CREATE TRIGGER data_generation_recipe_event_type_insert
+AFTER INSERT ON recipe_event_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_event_type';
+END;
+CREATE TRIGGER data_generation_recipe_event_type_update
+AFTER UPDATE ON recipe_event_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_event_type';
+END;
+CREATE TRIGGER data_generation_recipe_event_type_delete
+AFTER DELETE ON recipe_event_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_event_type';
+END;
+CREATE TRIGGER data_generation_category_insert
+AFTER INSERT ON category
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'category';
+END;
+CREATE TRIGGER data_generation_category_update
+AFTER UPDATE ON category
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'category';
+END;
+CREATE TRIGGER data_generation_category_delete
+AFTER DELETE ON category
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'category';
+END;
+CREATE TRIGGER data_generation_tag_insert
+AFTER INSERT ON tag
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'tag';
+END;
+CREATE TRIGGER data_generation_tag_update
+AFTER UPDATE ON tag
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'tag';
+END;
+CREATE TRIGGER data_generation_tag_delete
+AFTER DELETE ON tag
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'tag';
+END;
+CREATE TRIGGER data_generation_event_type_insert
+AFTER INSERT ON event_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_type';
+END;
+CREATE TRIGGER data_generation_event_type_update
+AFTER UPDATE ON event_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_type';
+END;
+CREATE TRIGGER data_generation_event_type_delete
+AFTER DELETE ON event_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_type';
+END;
+CREATE TRIGGER data_generation_event_insert
+AFTER INSERT ON event
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event';
+END;
+CREATE TRIGGER data_generation_event_update
+AFTER UPDATE ON event
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event';
+END;
+CREATE TRIGGER data_generation_event_delete
+AFTER DELETE ON event
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event';
+END;
+CREATE TRIGGER data_generation_event_date_insert
+AFTER INSERT ON event_date
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_date';
+END;
+CREATE TRIGGER data_generation_event_date_update
+AFTER UPDATE ON event_date
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_date';
+END;
+CREATE TRIGGER data_generation_event_date_delete
+AFTER DELETE ON event_date
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_date';
+END;
+CREATE TRIGGER data_generation_event_recipe_insert
+AFTER INSERT ON event_recipe
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_recipe';
+END;
+CREATE TRIGGER data_generation_event_recipe_update
+AFTER UPDATE ON event_recipe
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_recipe';
+END;
+CREATE TRIGGER data_generation_event_recipe_delete
+AFTER DELETE ON event_recipe
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_recipe';
+END;
+CREATE TRIGGER data_generation_event_recipe_planning_insert
+AFTER INSERT ON event_recipe_planning
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_recipe_planning';
+END;
+CREATE TRIGGER data_generation_event_recipe_planning_update
+AFTER UPDATE ON event_recipe_planning
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_recipe_planning';
+END;
+CREATE TRIGGER data_generation_event_recipe_planning_delete
+AFTER DELETE ON event_recipe_planning
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'event_recipe_planning';
+END;
+CREATE TRIGGER data_generation_meal_plan_insert
+AFTER INSERT ON meal_plan
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'meal_plan';
+END;
+CREATE TRIGGER data_generation_meal_plan_update
+AFTER UPDATE ON meal_plan
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'meal_plan';
+END;
+CREATE TRIGGER data_generation_meal_plan_delete
+AFTER DELETE ON meal_plan
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'meal_plan';
+END;
+CREATE TRIGGER data_generation_user_insert
+AFTER INSERT ON user
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'user';
+END;
+CREATE TRIGGER data_generation_user_update
+AFTER UPDATE ON user
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'user';
+END;
+CREATE TRIGGER data_generation_user_delete
+AFTER DELETE ON user
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'user';
+END;
+CREATE TRIGGER event_summary_event_insert
+AFTER INSERT ON event
+BEGIN
+    INSERT INTO event_summary (event_id, stale) VALUES (NEW.id, 1)
+    ON CONFLICT(event_id) DO UPDATE SET stale = 1;
+END;
+CREATE TRIGGER event_summary_event_delete
+AFTER DELETE ON event
+BEGIN
+    DELETE FROM event_summary WHERE event_id = OLD.id;
+END;
+CREATE TRIGGER event_summary_participant_insert
+AFTER INSERT ON event_participant
+BEGIN
+    INSERT INTO event_summary (event_id, stale) VALUES (NEW.event_id, 1)
+    ON CONFLICT(event_id) DO UPDATE SET stale = 1;
+END;
+CREATE TRIGGER event_summary_participant_update
+AFTER UPDATE ON event_participant
+BEGIN
+    UPDATE event_summary SET stale = 1 WHERE event_id IN (OLD.event_id, NEW.event_id);
+END;
+CREATE TRIGGER event_summary_participant_delete
+AFTER DELETE ON event_participant
+BEGIN
+    UPDATE event_summary SET stale = 1 WHERE event_id = OLD.event_id;
+END;
+CREATE TRIGGER event_summary_participant_rename
+AFTER UPDATE OF nom, prenom ON participant
+BEGIN
+    UPDATE event_summary SET stale = 1
+    WHERE event_id IN (SELECT event_id FROM event_participant WHERE participant_id = NEW.id);
+END;
+CREATE TRIGGER event_summary_group_rename
+AFTER UPDATE OF nom ON participant_group
+BEGIN
+    UPDATE event_summary SET stale = 1
+    WHERE event_id IN (SELECT event_id FROM event_participant WHERE added_via_group_id = NEW.id);
+END;
+CREATE TRIGGER event_summary_recipe_insert
+AFTER INSERT ON event_recipe
+BEGIN
+    INSERT INTO event_summary (event_id, stale) VALUES (NEW.event_id, 1)
+    ON CONFLICT(event_id) DO UPDATE SET stale = 1;
+END;
+CREATE TRIGGER event_summary_recipe_update
+AFTER UPDATE OF event_id, recipe_id ON event_recipe
+BEGIN
+    UPDATE event_summary SET stale = 1 WHERE event_id IN (OLD.event_id, NEW.event_id);
+END;
+CREATE TRIGGER event_summary_recipe_delete
+AFTER DELETE ON event_recipe
+BEGIN
+    UPDATE event_summary SET stale = 1 WHERE event_id = OLD.event_id;
+END;
+CREATE TRIGGER event_summary_recipe_slug
+AFTER UPDATE OF slug ON recipe
+BEGIN
+    UPDATE event_summary SET stale = 1
+    WHERE event_id IN (SELECT event_id FROM event_recipe WHERE recipe_id = NEW.id);
+END;
+CREATE TRIGGER event_summary_recipe_translation_insert
+AFTER INSERT ON recipe_translation
+BEGIN
+    UPDATE event_summary SET stale = 1
+    WHERE event_id IN (SELECT event_id FROM event_recipe WHERE recipe_id = NEW.recipe_id);
+END;
+CREATE TRIGGER event_summary_recipe_translation_update
+AFTER UPDATE OF name ON recipe_translation
+BEGIN
+    UPDATE event_summary SET stale = 1
+    WHERE event_id IN (SELECT event_id FROM event_recipe WHERE recipe_id = NEW.recipe_id);
+END;
+CREATE TRIGGER event_summary_recipe_translation_delete
+AFTER DELETE ON recipe_translation
+BEGIN
+    UPDATE event_summary SET stale = 1
+    WHERE event_id IN (SELECT event_id FROM event_recipe WHERE recipe_id = OLD.recipe_id);
+END;
+CREATE TRIGGER event_summary_photo_insert
+AFTER INSERT ON event_photo
+BEGIN
+    INSERT INTO event_summary (event_id, stale) VALUES (NEW.event_id, 1)
+    ON CONFLICT(event_id) DO UPDATE SET stale = 1;
+END;
+CREATE TRIGGER event_summary_photo_update
+AFTER UPDATE OF photo_url, position ON event_photo
+BEGIN
+    UPDATE event_summary SET stale = 1 WHERE event_id = NEW.event_id;
+END;
+CREATE TRIGGER event_summary_photo_delete
+AFTER DELETE ON event_photo
+BEGIN
+    UPDATE event_summary SET stale = 1 WHERE event_id = OLD.event_id;
+END;
+CREATE TRIGGER recipe_counter_ingredient_insert
+AFTER INSERT ON recipe_ingredient
+BEGIN
+    UPDATE recipe SET ingredient_count = ingredient_count + 1 WHERE id = NEW.recipe_id;
+END;
+CREATE TRIGGER recipe_counter_ingredient_delete
+AFTER DELETE ON recipe_ingredient
+BEGIN
+    UPDATE recipe SET ingredient_count = ingredient_count - 1 WHERE id = OLD.recipe_id;
+END;
+CREATE TRIGGER recipe_counter_ingredient_move
+AFTER UPDATE OF recipe_id ON recipe_ingredient
+WHEN OLD.recipe_id IS NOT NEW.recipe_id
+BEGIN
+    UPDATE recipe SET ingredient_count = ingredient_count - 1 WHERE id = OLD.recipe_id;
+    UPDATE recipe SET ingredient_count = ingredient_count + 1 WHERE id = NEW.recipe_id;
+END;
+CREATE TRIGGER recipe_counter_step_insert
+AFTER INSERT ON step
+WHEN NEW.type = 'text'
+BEGIN
+    UPDATE recipe SET step_count = step_count + 1 WHERE id = NEW.recipe_id;
+END;
+CREATE TRIGGER recipe_counter_step_delete
+AFTER DELETE ON step
+WHEN OLD.type = 'text'
+BEGIN
+    UPDATE recipe SET step_count = step_count - 1 WHERE id = OLD.recipe_id;
+END;
+CREATE TRIGGER recipe_counter_step_update
+AFTER UPDATE OF recipe_id, type ON step
+BEGIN
+    UPDATE recipe SET step_count = step_count - 1
+    WHERE id = OLD.recipe_id AND OLD.type = 'text';
+    UPDATE recipe SET step_count = step_count + 1
+    WHERE id = NEW.recipe_id AND NEW.type = 'text';
+END;
+CREATE TRIGGER recipe_counter_translation_insert
+AFTER INSERT ON recipe_translation
+BEGIN
+    UPDATE recipe SET available_langs = COALESCE((
+        SELECT GROUP_CONCAT(lang, ',') FROM (
+            SELECT lang FROM recipe_translation WHERE recipe_id = NEW.recipe_id ORDER BY lang
+        )
+    ), '')
+    WHERE id = NEW.recipe_id;
+END;
+CREATE TRIGGER recipe_counter_translation_delete
+AFTER DELETE ON recipe_translation
+BEGIN
+    UPDATE recipe SET available_langs = COALESCE((
+        SELECT GROUP_CONCAT(lang, ',') FROM (
+            SELECT lang FROM recipe_translation WHERE recipe_id = OLD.recipe_id ORDER BY lang
+        )
+    ), '')
+    WHERE id = OLD.recipe_id;
+END;
+CREATE TRIGGER recipe_counter_translation_update
+AFTER UPDATE OF recipe_id, lang ON recipe_translation
+BEGIN
+    UPDATE recipe SET available_langs = COALESCE((
+        SELECT GROUP_CONCAT(lang, ',') FROM (
+            SELECT lang FROM recipe_translation WHERE recipe_id = recipe.id ORDER BY lang
+        )
+    ), '')
+    WHERE id IN (OLD.recipe_id, NEW.recipe_id);
+END;
+CREATE TRIGGER shopping_list_item_source_cascade
+AFTER DELETE ON shopping_list_item
+BEGIN
+    DELETE FROM shopping_list_item_source WHERE item_id = OLD.id;
+END;
+CREATE TRIGGER data_generation_recipe_recipe_type_insert
+AFTER INSERT ON recipe_recipe_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_recipe_type';
+END;
+CREATE TRIGGER data_generation_recipe_recipe_type_update
+AFTER UPDATE ON recipe_recipe_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_recipe_type';
+END;
+CREATE TRIGGER data_generation_recipe_recipe_type_delete
+AFTER DELETE ON recipe_recipe_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_recipe_type';
+END;
+CREATE TRIGGER data_generation_recipe_type_insert
+AFTER INSERT ON recipe_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_type';
+END;
+CREATE TRIGGER data_generation_recipe_type_update
+AFTER UPDATE ON recipe_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_type';
+END;
+CREATE TRIGGER data_generation_recipe_type_delete
+AFTER DELETE ON recipe_type
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'recipe_type';
+END;
+CREATE TRIGGER recipe_generation_ingredient_insert
+AFTER INSERT ON recipe_ingredient
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1 WHERE id = NEW.recipe_id;
+END;
+CREATE TRIGGER recipe_generation_ingredient_update
+AFTER UPDATE ON recipe_ingredient
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id IN (OLD.recipe_id, NEW.recipe_id);
+END;
+CREATE TRIGGER recipe_generation_ingredient_delete
+AFTER DELETE ON recipe_ingredient
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1 WHERE id = OLD.recipe_id;
+END;
+CREATE TRIGGER recipe_generation_ingredient_translation_insert
+AFTER INSERT ON recipe_ingredient_translation
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id = (SELECT recipe_id FROM recipe_ingredient WHERE id = NEW.recipe_ingredient_id);
+END;
+CREATE TRIGGER recipe_generation_ingredient_translation_update
+AFTER UPDATE ON recipe_ingredient_translation
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id IN (SELECT recipe_id FROM recipe_ingredient
+                 WHERE id IN (OLD.recipe_ingredient_id, NEW.recipe_ingredient_id));
+END;
+CREATE TRIGGER recipe_generation_ingredient_translation_delete
+AFTER DELETE ON recipe_ingredient_translation
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id = (SELECT recipe_id FROM recipe_ingredient WHERE id = OLD.recipe_ingredient_id);
+END;
+CREATE TRIGGER recipe_generation_step_insert
+AFTER INSERT ON step
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1 WHERE id = NEW.recipe_id;
+END;
+CREATE TRIGGER recipe_generation_step_update
+AFTER UPDATE ON step
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id IN (OLD.recipe_id, NEW.recipe_id);
+END;
+CREATE TRIGGER recipe_generation_step_delete
+AFTER DELETE ON step
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1 WHERE id = OLD.recipe_id;
+END;
+CREATE TRIGGER recipe_generation_step_translation_insert
+AFTER INSERT ON step_translation
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id = (SELECT recipe_id FROM step WHERE id = NEW.step_id);
+END;
+CREATE TRIGGER recipe_generation_step_translation_update
+AFTER UPDATE ON step_translation
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id IN (SELECT recipe_id FROM step WHERE id IN (OLD.step_id, NEW.step_id));
+END;
+CREATE TRIGGER recipe_generation_step_translation_delete
+AFTER DELETE ON step_translation
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id = (SELECT recipe_id FROM step WHERE id = OLD.step_id);
+END;
+CREATE TRIGGER recipe_generation_linked_slug
+AFTER UPDATE OF slug ON recipe
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id IN (SELECT recipe_id FROM recipe_ingredient WHERE linked_recipe_id = NEW.id);
+END;
+CREATE TRIGGER recipe_generation_linked_translation_insert
+AFTER INSERT ON recipe_translation
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id IN (SELECT recipe_id FROM recipe_ingredient WHERE linked_recipe_id = NEW.recipe_id);
+END;
+CREATE TRIGGER recipe_generation_linked_translation_update
+AFTER UPDATE ON recipe_translation
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id IN (SELECT recipe_id FROM recipe_ingredient
+                 WHERE linked_recipe_id IN (OLD.recipe_id, NEW.recipe_id));
+END;
+CREATE TRIGGER recipe_generation_linked_translation_delete
+AFTER DELETE ON recipe_translation
+BEGIN
+    UPDATE recipe SET content_generation = content_generation + 1
+    WHERE id IN (SELECT recipe_id FROM recipe_ingredient WHERE linked_recipe_id = OLD.recipe_id);
+END;
+CREATE TRIGGER recipe_sort_name_insert
+AFTER INSERT ON recipe
+BEGIN
+    UPDATE recipe SET
+        sort_name_fr = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = NEW.id AND lang = 'fr'), NEW.slug),
+        sort_name_jp = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = NEW.id AND lang = 'jp'), NEW.slug)
+    WHERE id = NEW.id;
+END;
+CREATE TRIGGER recipe_sort_name_slug
+AFTER UPDATE OF slug ON recipe
+BEGIN
+    UPDATE recipe SET
+        sort_name_fr = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = NEW.id AND lang = 'fr'), NEW.slug),
+        sort_name_jp = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = NEW.id AND lang = 'jp'), NEW.slug)
+    WHERE id = NEW.id;
+END;
+CREATE TRIGGER recipe_sort_name_translation_insert
+AFTER INSERT ON recipe_translation
+BEGIN
+    UPDATE recipe SET
+        sort_name_fr = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = recipe.id AND lang = 'fr'), slug),
+        sort_name_jp = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = recipe.id AND lang = 'jp'), slug)
+    WHERE id = NEW.recipe_id;
+END;
+CREATE TRIGGER recipe_sort_name_translation_update
+AFTER UPDATE OF recipe_id, lang, name ON recipe_translation
+BEGIN
+    UPDATE recipe SET
+        sort_name_fr = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = recipe.id AND lang = 'fr'), slug),
+        sort_name_jp = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = recipe.id AND lang = 'jp'), slug)
+    WHERE id IN (OLD.recipe_id, NEW.recipe_id);
+END;
+CREATE TRIGGER recipe_sort_name_translation_delete
+AFTER DELETE ON recipe_translation
+BEGIN
+    UPDATE recipe SET
+        sort_name_fr = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = recipe.id AND lang = 'fr'), slug),
+        sort_name_jp = COALESCE((SELECT name FROM recipe_translation
+                                 WHERE recipe_id = recipe.id AND lang = 'jp'), slug)
+    WHERE id = OLD.recipe_id;
+END;
@@ -19,16 +19,23 @@ echo "💾 Étape 1/5 : Backup de la base locale actuelle..."
 mkdir -p "${LOCAL_ROOT}/backups"
 if [ -f "${LOCAL_DB}" ]; then
     BACKUP_FILE="${LOCAL_ROOT}/backups/recette_dev_backup_$(date +%Y%m%d_%H%M%S).sqlite3"
-    cp "${LOCAL_DB}" "${BACKUP_FILE}"
+    # Sauvegarde à chaud (cohérente même si l'app de dev tourne, WAL compris)
+    python3 "${LOCAL_ROOT}/scripts/backup_db.py" --db "${LOCAL_DB}" --output "${BACKUP_FILE}" --quiet > /dev/null || exit 1
     echo "   ✅ Backup local créé : ${BACKUP_FILE}"
 else
     echo "   ⚠️  Aucune base locale à sauvegarder"
 fi
 echo ""
 
-# Téléchargement de la base de production
+# Téléchargement de la base de production : instantané pris à chaud sur le
+# serveur (l'app de prod continue d'écrire), puis copie de l'instantané
 echo "📥 Étape 2/5 : Téléchargement de la base de production..."
-scp ${PROD_SERVER}:${PROD_PATH}/data/recette.sqlite3 "${LOCAL_DB}"
+PROD_SNAPSHOT="/tmp/recette_sync_$(date +%Y%m%d_%H%M%S).sqlite3.gz"
+ssh ${PROD_SERVER} "cd ${PROD_PATH} && venv/bin/python scripts/backup_db.py --output ${PROD_SNAPSHOT} --quiet" \
+    && scp ${PROD_SERVER}:${PROD_SNAPSHOT} "${LOCAL_DB}.gz" \
+    && ssh ${PROD_SERVER} "rm -f ${PROD_SNAPSHOT}" \
+    && rm -f "${LOCAL_DB}-wal" "${LOCAL_DB}-shm" \
+    && gunzip -f "${LOCAL_DB}.gz"
 
 if [ $? -eq 0 ]; then
     DB_SIZE=$(du -h "${LOCAL_DB}" | cut -f1)
@@ -0,0 +1,219 @@
+# tests/test_access_log_rollup.py
+"""
+Tests des agrégats horaires des logs d'accès (access_log_hourly)
+Teste l'alimentation incrémentale, les percentiles et la rétention, et
+l'écriture des logs sans la colonne transfer_size_bytes
+"""
+
+import os
+import sqlite3
+
+import pytest
+
+from app.models.db_logging import (
+    _latency_percentile,
+    cleanup_old_access_logs,
+    get_access_stats,
+    get_recent_access_logs,
+    log_access,
+)
+
+MIGRATION = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "migrations", "add_access_log_rollup.sql"
+)
+
+
+@pytest.fixture
+def access_db(tmp_path, monkeypatch):
+    """Base temporaire avec la table access_log (schéma avant migration)"""
+    from app.models import db_core
+    path = str(tmp_path / "access.sqlite3")
+    monkeypatch.setattr(db_core, "DB_PATH", path)
+
+    con = sqlite3.connect(path)
+    con.executescript("""
+        CREATE TABLE access_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, ip_address TEXT NOT NULL, user_agent TEXT,
+            path TEXT, method TEXT DEFAULT 'GET', status_code INTEGER, response_time_ms REAL,
+            referer TEXT, lang TEXT, accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            response_size_bytes INTEGER, transfer_size_bytes INTEGER
+        );
+    """)
+    con.commit()
+    yield con
+    con.close()
+
+
+def apply_migration(con):
+    with open(MIGRATION, encoding="utf-8") as f:
+        con.executescript(f.read())
+
+
+def log_requests():
+    """100 accès sur /recipes (1 à 100 ms) et 2 erreurs sur /events"""
+    for ms in range(1, 101):
+        log_access("10.0.0.1", path="/recipes", status_code=200, response_time_ms=ms,
+                   response_size_bytes=1000, transfer_size_bytes=250)
+    log_access("10.0.0.2", path="/events", status_code=500, response_time_ms=3000)
+    log_access("10.0.0.2", path="/events", status_code=404, response_time_ms=20000)
+
+
+@pytest.mark.unit
+class TestLatencyPercentile:
+    """Tests de l'estimation des percentiles sur l'histogramme"""
+
+    def test_interpolates_within_bucket(self):
+        """Rang au milieu du seau ]10, 25] → interpolation linéaire"""
+        buckets = [0, 0, 10] + [0] * 9
+        assert _latency_percentile(buckets, 0.5) == pytest.approx(17.5)
+
+    def test_open_bucket_returns_lower_bound(self):
+        """Dernier seau non borné : borne inférieure"""
+        assert _latency_percentile([0] * 11 + [3], 0.99) == 10000.0
+
+    def test_empty_histogram(self):
+        assert _latency_percentile([0] * 12, 0.5) is None
+
+
+@pytest.mark.database
+class TestAccessLogRollup:
+    """Tests de log_access(), get_access_stats() et cleanup_old_access_logs()"""
+
+    def test_stats_from_rollup(self, access_db):
+        """Les statistiques sont lues dans les agrégats horaires"""
+        apply_migration(access_db)
+        log_requests()
+
+        # Les agrégats suffisent : les logs bruts peuvent disparaître
+        access_db.execute("DELETE FROM access_log")
+        access_db.commit()
+
+        stats = get_access_stats(hours=24)
+        assert stats['total_accesses'] == 102
+        assert stats['unique_ips'] == 2
+        assert stats['by_ip'][0]['ip_address'] == "10.0.0.1"
+        assert stats['by_ip'][0]['count'] == 100
+        assert stats['popular_pages'][0] == {'path': "/recipes", 'count': 100}
+        assert stats['bandwidth'] == {'uncompressed_bytes': 100000, 'transferred_bytes': 25000}
+        assert stats['heavy_pages'][0]['avg_transfer_size'] == 250
+
+        assert stats['slow_pages'][0]['path'] == "/events"
+        assert stats['slow_pages'][0]['count'] == 2
+        recipes = stats['slow_pages'][1]
+        assert recipes['avg_time'] == pytest.approx(50.5)
+        assert 50 <= recipes['p95'] <= 100
+
+        assert 25 <= stats['latency']['p50'] <= 100
+        assert stats['latency']['p99'] >= 2500
+
+        status_classes = dict(access_db.execute(
+            "SELECT status_class, SUM(count) FROM access_log_hourly GROUP BY status_class"
+        ).fetchall())
+        assert status_classes == {2: 100, 4: 1, 5: 1}
+
+    def test_migration_backfills_raw_logs(self, access_db):
+        """La migration reprend les logs bruts existants"""
+        log_requests()
+        before = get_access_stats(hours=24)
+        assert before['latency'] is None
+
+        apply_migration(access_db)
+        after = get_access_stats(hours=24)
+
+        assert after['total_accesses'] == before['total_accesses'] == 102
+        assert after['unique_ips'] == before['unique_ips'] == 2
+        assert after['popular_pages'] == before['popular_pages']
+        assert after['bandwidth'] == before['bandwidth']
+        assert after['latency']['p50'] is not None
+
+    def test_cleanup_keeps_rollup_longer(self, access_db):
+        """Les logs bruts sont purgés avant les agrégats horaires"""
+        apply_migration(access_db)
+        log_requests()
+        access_db.execute("UPDATE access_log SET accessed_at = datetime('now', '-10 days')")
+        access_db.execute("UPDATE access_log_hourly SET hour = strftime('%Y-%m-%d %H:00:00', 'now', '-10 days')")
+        access_db.execute(
+            "INSERT INTO access_log_hourly (hour, path, status_class, count) "
+            "VALUES (datetime('now', '-400 days'), '/old', 2, 1)"
+        )
+        access_db.commit()
+
+        assert cleanup_old_access_logs(days=7) == 102
+
+        paths = [r[0] for r in access_db.execute("SELECT DISTINCT path FROM access_log_hourly")]
+        assert sorted(paths) == ["/events", "/recipes"]
+        assert access_db.execute("SELECT SUM(count) FROM access_log_hourly").fetchone()[0] == 102, \
+            "les heures déjà agrégées ne sont pas comptées deux fois"
+
+    def test_cleanup_rolls_up_before_delete(self, access_db):
+        """Les logs bruts absents des agrégats y sont reportés avant d'être supprimés"""
+        apply_migration(access_db)
+        access_db.executemany(
+            "INSERT INTO access_log (ip_address, path, status_code, response_time_ms, "
+            "response_size_bytes, transfer_size_bytes, accessed_at) "
+            "VALUES ('10.0.0.3', '/old', 200, ?, 100, 40, datetime('now', '-10 days'))",
+            [(3,), (30,), (None,)]
+        )
+        access_db.commit()
+
+        assert cleanup_old_access_logs() == 3
+
+        row = access_db.execute(
+            "SELECT count, sized_count, bytes, transfer_bytes, timed_count, total_time_ms, b0, b3 "
+            "FROM access_log_hourly WHERE path = '/old'"
+        ).fetchone()
+        assert row == (3, 3, 300, 120, 2, 33, 1, 1)
+        assert access_db.execute(
+            "SELECT count FROM access_log_hourly_ip WHERE ip_address = '10.0.0.3'"
+        ).fetchone() == (3,)
+
+    def test_default_retention_depends_on_rollup(self, access_db):
+        """Sans agrégats horaires, les logs bruts sont gardés 30 jours"""
+        for days in (10, 40):
+            access_db.execute(
+                "INSERT INTO access_log (ip_address, path, accessed_at) "
+                "VALUES ('10.0.0.1', '/recipes', datetime('now', ?))", (f"-{days} days",)
+            )
+        access_db.commit()
+
+        assert cleanup_old_access_logs() == 1
+        apply_migration(access_db)
+        assert cleanup_old_access_logs() == 1
+        assert access_db.execute("SELECT COUNT(*) FROM access_log").fetchone()[0] == 0
+
+
+@pytest.mark.database
+class TestWithoutTransferSize:
+    """Base sans add_transfer_size_to_access_log.sql"""
+
+    @pytest.fixture
+    def legacy_db(self, access_db, monkeypatch):
+        from app.models import db_logging
+        monkeypatch.setattr(db_logging, "_transfer_size_dbs", set())
+        access_db.execute("ALTER TABLE access_log DROP COLUMN transfer_size_bytes")
+        access_db.commit()
+        return access_db
+
+    def test_logs_written_without_column(self, legacy_db):
+        log_access("10.0.0.1", path="/recipes", status_code=200,
+                   response_size_bytes=1000, transfer_size_bytes=250)
+
+        assert legacy_db.execute("SELECT path, response_size_bytes FROM access_log").fetchall() == [("/recipes", 1000)]
+        assert get_recent_access_logs()[0]['transfer_size_bytes'] is None
+        stats = get_access_stats(hours=24)
+        assert stats['total_accesses'] == 1
+        assert stats['bandwidth'] == {'uncompressed_bytes': 0, 'transferred_bytes': 0}
+
+    def test_column_used_once_added(self, legacy_db):
+        from app.models import db_logging
+        log_access("10.0.0.1", path="/recipes", transfer_size_bytes=250)
+        assert not db_logging._transfer_size_dbs
+
+        legacy_db.execute("ALTER TABLE access_log ADD COLUMN transfer_size_bytes INTEGER")
+        legacy_db.commit()
+        log_access("10.0.0.1", path="/recipes", transfer_size_bytes=250)
+
+        assert db_logging._transfer_size_dbs
+        assert [r[0] for r in legacy_db.execute("SELECT transfer_size_bytes FROM access_log ORDER BY id")] == [None, 250]
@@ -0,0 +1,81 @@
+# tests/test_benchmark_suite.py
+"""
+Tests du générateur de jeux de données et du runner de benchmarks (scripts/)
+"""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).parent.parent / "scripts"
+
+
+@pytest.fixture
+def bench(monkeypatch):
+    """Modules generate_dataset et run_benchmarks importés depuis scripts/"""
+    monkeypatch.syspath_prepend(str(SCRIPTS_DIR))
+    import generate_dataset
+    import run_benchmarks
+    return generate_dataset, run_benchmarks
+
+
+def _content(path, query):
+    con = sqlite3.connect(path)
+    try:
+        return con.execute(query).fetchall()
+    finally:
+        con.close()
+
+
+@pytest.mark.database
+class TestGenerateDataset:
+    """Tests de generate_dataset()"""
+
+    def test_same_seed_same_data(self, bench, tmp_path):
+        """La même graine produit les mêmes recettes, prix et listes de courses"""
+        generate_dataset, _ = bench
+        queries = [
+            "SELECT r.slug, rt.lang, rt.name FROM recipe r JOIN recipe_translation rt ON rt.recipe_id = r.id ORDER BY 1, 2",
+            "SELECT ingredient_name_fr, ingredient_name_jp, price_eur, price_jpy FROM ingredient_price_catalog ORDER BY id",
+            "SELECT event_id, ingredient_name, needed_quantity, needed_unit FROM shopping_list_item ORDER BY id",
+        ]
+        counts_a = generate_dataset.generate_dataset(str(tmp_path / "a.sqlite3"), recipes=20, seed=1)
+        counts_b = generate_dataset.generate_dataset(str(tmp_path / "b.sqlite3"), recipes=20, seed=1)
+        generate_dataset.generate_dataset(str(tmp_path / "c.sqlite3"), recipes=20, seed=2)
+
+        assert counts_a == counts_b
+        assert counts_a["recipe"] == 20 and counts_a["recipe_translation"] == 40
+        for query in queries:
+            assert _content(tmp_path / "a.sqlite3", query) == _content(tmp_path / "b.sqlite3", query)
+        assert _content(tmp_path / "a.sqlite3", queries[0]) != _content(tmp_path / "c.sqlite3", queries[0])
+
+    def test_benchmarks_run_on_generated_schema(self, bench, tmp_path, monkeypatch):
+        """Chaque benchmark s'exécute sans erreur sur une petite base générée"""
+        generate_dataset, run_benchmarks = bench
+        from app.models import db_core
+        path = str(tmp_path / "bench.sqlite3")
+        generate_dataset.generate_dataset(path, recipes=20, seed=3)
+        monkeypatch.setattr(db_core, "DB_PATH", path)
+
+        ctx = run_benchmarks.build_context(path)
+        assert ctx["slugs"] and ctx["event_ids"] and ctx["receipt_items"]
+        for name, function in run_benchmarks.BENCHMARKS.items():
+            result = run_benchmarks.run_benchmark(function, ctx, runs=1)
+            assert result["median_ms"] >= 0, name
+
+
+@pytest.mark.unit
+class TestCompare:
+    """Tests de la détection des régressions"""
+
+    def test_regression_threshold(self, bench):
+        _, run_benchmarks = bench
+        baseline = {"slow": {"median_ms": 10.0}, "noise": {"median_ms": 0.2}, "ok": {"median_ms": 10.0}}
+        results = {
+            "slow": {"median_ms": 13.0},   # +30 % : régression
+            "noise": {"median_ms": 0.5},   # x2.5 mais +0.3 ms : bruit
+            "ok": {"median_ms": 12.0},     # +20 % : toléré
+            "new": {"median_ms": 99.0},    # absent de la référence
+        }
+        assert run_benchmarks.compare(results, baseline, tolerance=0.25) == [("slow", 10.0, 13.0)]
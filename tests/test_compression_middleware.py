@@ -0,0 +1,104 @@
+# tests/test_compression_middleware.py
+"""
+Tests unitaires pour le middleware de compression des réponses
+Teste le filtrage par type de contenu, la taille minimale et le streaming
+"""
+
+import asyncio
+import gzip
+
+import pytest
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+from app.middleware.compression import CompressionMiddleware, STATE_UNCOMPRESSED_BYTES
+
+
+async def call_app(app, accept_encoding="gzip"):
+    """Appelle une application ASGI et retourne (status, headers, corps, scope)"""
+    scope = {
+        "type": "http", "method": "GET", "path": "/", "query_string": b"",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    messages = []
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Le client reste connecté jusqu'à la fin de la réponse
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    headers = {k.decode().lower(): v.decode() for k, v in messages[0]["headers"]}
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return messages[0]["status"], headers, body, scope
+
+
+def wrap(response, minimum_size=100):
+    """Application ASGI renvoyant toujours la même réponse, compressée"""
+    async def app(scope, receive, send):
+        await response(scope, receive, send)
+    return CompressionMiddleware(app, minimum_size=minimum_size)
+
+
+class TestCompressionMiddleware:
+    """Tests pour CompressionMiddleware"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_json_compresse(self):
+        """Une réponse JSON au-delà du seuil est compressée en gzip"""
+        data = {"recipes": ["tarte aux pommes"] * 100}
+        status, headers, body, scope = await call_app(wrap(JSONResponse(data)))
+
+        assert headers["content-encoding"] == "gzip"
+        assert int(headers["content-length"]) == len(body)
+        raw = gzip.decompress(body)
+        assert raw == JSONResponse(data).body
+        assert scope["state"][STATE_UNCOMPRESSED_BYTES] == len(raw)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_petite_reponse_non_compressee(self):
+        """Une réponse plus petite que le seuil est envoyée telle quelle"""
+        status, headers, body, _ = await call_app(wrap(JSONResponse({"ok": True})))
+        assert "content-encoding" not in headers
+        assert body == b'{"ok":true}'
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_type_non_compressible(self):
+        """Les images ne sont pas recompressées"""
+        response = Response(b"\xff" * 5000, media_type="image/jpeg")
+        _, headers, body, _ = await call_app(wrap(response))
+        assert "content-encoding" not in headers
+        assert len(body) == 5000
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_client_sans_gzip(self):
+        """Sans Accept-Encoding compatible, la réponse n'est pas compressée"""
+        _, headers, body, _ = await call_app(wrap(JSONResponse(["x" * 500])), accept_encoding="identity")
+        assert "content-encoding" not in headers
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_streaming(self):
+        """Une réponse en streaming est compressée bloc par bloc"""
+        async def chunks():
+            for i in range(20):
+                yield f"<p>ligne {i}</p>\n" * 20
+
+        response = StreamingResponse(chunks(), media_type="text/html")
+        _, headers, body, scope = await call_app(wrap(response))
+
+        assert headers["content-encoding"] == "gzip"
+        assert "content-length" not in headers
+        expected = "".join(f"<p>ligne {i}</p>\n" * 20 for i in range(20)).encode()
+        assert gzip.decompress(body) == expected
+        assert scope["state"][STATE_UNCOMPRESSED_BYTES] == len(expected)
@@ -0,0 +1,106 @@
+# tests/test_db_backup.py
+"""
+Tests des sauvegardes à chaud (API de sauvegarde SQLite)
+"""
+
+import gzip
+import sqlite3
+import time
+
+import pytest
+
+from config import Config
+from app.services import db_backup
+
+
+@pytest.fixture
+def wal_db(tmp_path, monkeypatch):
+    """Base en mode WAL dont les dernières écritures ne sont pas reportées dans le fichier principal"""
+    monkeypatch.setattr(Config, "BACKUP_DIR", str(tmp_path / "backups"))
+    path = str(tmp_path / "recette.sqlite3")
+    con = sqlite3.connect(path)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA wal_autocheckpoint=0")
+    con.execute("CREATE TABLE recipe (id INTEGER PRIMARY KEY, slug TEXT)")
+    con.executemany("INSERT INTO recipe (slug) VALUES (?)", [(f"r{i}" * 50,) for i in range(500)])
+    con.commit()
+    yield path, con
+    con.close()
+
+
+def count_rows(path):
+    con = sqlite3.connect(path)
+    try:
+        return con.execute("SELECT COUNT(*) FROM recipe").fetchone()[0], con.execute("PRAGMA journal_mode").fetchone()[0]
+    finally:
+        con.close()
+
+
+@pytest.mark.database
+class TestBackupDatabase:
+    """Tests de backup_database()"""
+
+    def test_snapshot_includes_wal(self, wal_db, tmp_path):
+        """La copie contient les écritures encore dans le WAL et forme un fichier autonome"""
+        path, _ = wal_db
+        steps = []
+        result = db_backup.backup_database(path, pages=4, sleep=0, progress=lambda c, t: steps.append((c, t)))
+
+        assert db_backup.is_backup_name(result["name"])
+        assert count_rows(result["path"]) == (500, "delete")
+        assert result["steps"] == len(steps) > 1
+        assert steps[-1][0] == steps[-1][1] == result["pages"]
+
+    def test_writes_during_backup(self, wal_db):
+        """
+        Écritures concurrentes à chaque étape : elles ne sont pas bloquées, la
+        copie ne recommence pas et contient l'état de la base au démarrage
+        """
+        path, _ = wal_db
+        writer = sqlite3.connect(path, timeout=0.1)
+        written = []
+
+        def write_each_step(copied, total):
+            writer.execute("INSERT INTO recipe (slug) VALUES ('pendant')")
+            writer.commit()
+            written.append(copied)
+
+        result = db_backup.backup_database(path, pages=2, sleep=0, progress=write_each_step)
+        writer.close()
+
+        assert len(written) == result["steps"] > 1
+        # Une seule passe : la progression ne revient jamais en arrière
+        assert written == sorted(written)
+        assert result["steps"] == -(-result["pages"] // 2)
+        assert count_rows(result["path"])[0] == 500
+        assert count_rows(path)[0] == 500 + len(written)
+
+    def test_compression_and_rotation(self, wal_db, tmp_path):
+        """Seules les `keep` sauvegardes les plus récentes sont conservées ; les autres fichiers restent"""
+        path, _ = wal_db
+        other = tmp_path / "backups" / "recette_dev_backup_20251205_175001.sqlite3"
+        other.parent.mkdir()
+        other.write_bytes(b"")
+
+        results = [db_backup.backup_database(path, compress=True, keep=2, sleep=0) for _ in range(3)]
+
+        names = [b["name"] for b in db_backup.list_backups()]
+        assert names == sorted((r["name"] for r in results[1:]), reverse=True)
+        assert results[2]["removed"] == [results[0]["name"]]
+        assert other.exists()
+
+        restored = tmp_path / "restored.sqlite3"
+        with gzip.open(results[2]["path"], "rb") as f:
+            restored.write_bytes(f.read())
+        assert count_rows(str(restored))[0] == 500
+
+    def test_background_backup(self, wal_db):
+        path, _ = wal_db
+        assert db_backup.start_background_backup(path, sleep=0)
+        deadline = time.time() + 10
+        while db_backup.backup_status()["running"] and time.time() < deadline:
+            time.sleep(0.01)
+
+        status = db_backup.backup_status()
+        assert not status["running"] and "error" not in status
+        assert status["copied"] == status["total"] == status["result"]["pages"]
@@ -5,7 +5,13 @@ Teste la normalisation des ingrédients et la gestion de la connexion DB
 """
 
 import pytest
-from app.models.db_core import normalize_ingredient_name, get_db
+from app.models.db_core import (
+    normalize_ingredient_name,
+    get_db,
+    encode_cursor,
+    decode_cursor,
+    keyset_page,
+)
 
 
 # ============================================================================
@@ -199,3 +205,36 @@ def test_normalize_parametrized(input_text, expected):
     """
     result = normalize_ingredient_name(input_text)
     assert result == expected, f"'{input_text}' devrait donner '{expected}', obtenu '{result}'"
+
+
+# ============================================================================
+# TESTS DE PAGINATION PAR CURSEUR (KEYSET)
+# ============================================================================
+
+class TestKeysetPagination:
+    """Tests pour encode_cursor(), decode_cursor() et keyset_page()"""
+
+    @pytest.mark.unit
+    def test_aller_retour_curseur(self):
+        """Un curseur décodé redonne la clé d'origine (y compris non ASCII)"""
+        cursor = encode_cursor("Crème brûlée", 42)
+        assert decode_cursor(cursor, 2) == ("Crème brûlée", 42)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("cursor", [None, "", "pas-un-curseur!", encode_cursor("a", 1, 2)])
+    def test_curseur_invalide(self, cursor):
+        """Un curseur absent, corrompu ou de mauvaise taille ramène à la première page"""
+        assert decode_cursor(cursor, 2) is None
+
+    @pytest.mark.unit
+    def test_keyset_page(self):
+        """La ligne en trop indique une page suivante dont le curseur pointe sur la dernière ligne"""
+        rows = [{"name": n, "id": i} for i, n in enumerate(["a", "b", "c"], start=1)]
+
+        page, next_cursor = keyset_page(rows, 2, "name", "id")
+        assert page == rows[:2]
+        assert decode_cursor(next_cursor, 2) == ("b", 2)
+
+        page, next_cursor = keyset_page(rows, 3, "name", "id")
+        assert page == rows
+        assert next_cursor is None
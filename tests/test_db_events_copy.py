@@ -0,0 +1,114 @@
+# tests/test_db_events_copy.py
+"""
+Tests de la copie d'événements (copy_event) et des événements récurrents
+Teste la copie des recettes, des dates et du planning décalé
+"""
+
+import sqlite3
+
+import pytest
+
+from app.models.db_events import copy_event, create_recurring_events
+
+
+@pytest.fixture
+def events_db(tmp_path, monkeypatch):
+    """Base temporaire : événement source de 2 recettes sur 3 jours, jour 2 désélectionné"""
+    from app.models import db_core
+    path = str(tmp_path / "events.sqlite3")
+    monkeypatch.setattr(db_core, "DB_PATH", path)
+
+    con = sqlite3.connect(path)
+    con.executescript("""
+        CREATE TABLE event (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, event_type_id INTEGER NOT NULL,
+            name TEXT NOT NULL, event_date DATE NOT NULL, location TEXT,
+            attendees INTEGER DEFAULT 1, notes TEXT, budget_planned REAL, currency TEXT,
+            user_id INTEGER, date_debut DATE, date_fin DATE, nombre_jours INTEGER DEFAULT 1
+        );
+        CREATE TABLE event_recipe (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, event_id INTEGER NOT NULL,
+            recipe_id INTEGER NOT NULL, servings_multiplier REAL DEFAULT 1.0, position INTEGER DEFAULT 0
+        );
+        CREATE TABLE event_date (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, event_id INTEGER NOT NULL,
+            date DATE NOT NULL, is_selected BOOLEAN DEFAULT 1, UNIQUE(event_id, date)
+        );
+        CREATE TABLE event_recipe_planning (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, event_id INTEGER NOT NULL,
+            recipe_id INTEGER NOT NULL, event_date_id INTEGER NOT NULL, position INTEGER NOT NULL DEFAULT 0
+        );
+
+        INSERT INTO event (id, event_type_id, name, event_date, attendees, budget_planned, currency,
+                           user_id, date_debut, date_fin, nombre_jours)
+        VALUES (1, 1, 'Stage', '2026-07-01', 8, 200, 'EUR', 1, '2026-07-01', '2026-07-03', 3);
+        INSERT INTO event_recipe (event_id, recipe_id, servings_multiplier, position)
+        VALUES (1, 10, 2.0, 0), (1, 11, 1.5, 1);
+        INSERT INTO event_date (id, event_id, date, is_selected)
+        VALUES (1, 1, '2026-07-01', 1), (2, 1, '2026-07-02', 0), (3, 1, '2026-07-03', 1);
+        INSERT INTO event_recipe_planning (event_id, recipe_id, event_date_id, position)
+        VALUES (1, 10, 1, 0), (1, 11, 3, 0);
+    """)
+    con.commit()
+    yield con
+    con.close()
+
+
+def planning_dates(con, event_id):
+    """Planning d'un événement : [(recipe_id, date)]"""
+    return con.execute("""
+        SELECT p.recipe_id, d.date
+        FROM event_recipe_planning p JOIN event_date d ON d.id = p.event_date_id
+        WHERE p.event_id = ? ORDER BY d.date, p.recipe_id
+    """, (event_id,)).fetchall()
+
+
+@pytest.mark.database
+class TestCopyEvent:
+    """Tests de copy_event() et create_recurring_events()"""
+
+    def test_copy_same_duration_shifts_planning(self, events_db):
+        """Même durée : recettes, dates et planning décalé de l'écart entre les débuts"""
+        new_id = copy_event(1, "Stage 2", 1, "2026-09-10", "2026-09-12")
+
+        recipes = events_db.execute(
+            "SELECT recipe_id, servings_multiplier FROM event_recipe WHERE event_id = ? ORDER BY position",
+            (new_id,)
+        ).fetchall()
+        assert recipes == [(10, 2.0), (11, 1.5)]
+
+        dates = events_db.execute(
+            "SELECT date, is_selected FROM event_date WHERE event_id = ? ORDER BY date", (new_id,)
+        ).fetchall()
+        assert dates == [("2026-09-10", 1), ("2026-09-11", 1), ("2026-09-12", 1)]
+
+        assert planning_dates(events_db, new_id) == [(10, "2026-09-10"), (11, "2026-09-12")]
+
+    def test_copy_different_duration_skips_planning(self, events_db):
+        """Durée différente : le planning n'est pas copié"""
+        new_id = copy_event(1, "Stage court", 1, "2026-09-10", "2026-09-11")
+
+        assert planning_dates(events_db, new_id) == []
+        assert events_db.execute(
+            "SELECT nombre_jours FROM event WHERE id = ?", (new_id,)
+        ).fetchone()[0] == 2
+
+    def test_copy_unknown_event(self, events_db):
+        """Événement source inexistant"""
+        assert copy_event(999, "X", 1, "2026-09-10", "2026-09-10") is None
+        assert create_recurring_events(999, "X", 1, "2026-09-10", "2026-09-10", 3) == []
+
+    def test_recurring_events(self, events_db):
+        """Un événement par semaine, chacun avec son planning"""
+        ids = create_recurring_events(1, "Hebdo", 1, "2026-09-06", "2026-09-08", occurrences=3)
+
+        rows = events_db.execute(
+            f"SELECT date_debut, date_fin FROM event WHERE id IN ({','.join('?' * len(ids))}) ORDER BY id",
+            ids
+        ).fetchall()
+        assert rows == [
+            ("2026-09-06", "2026-09-08"),
+            ("2026-09-13", "2026-09-15"),
+            ("2026-09-20", "2026-09-22"),
+        ]
+        assert planning_dates(events_db, ids[-1]) == [(10, "2026-09-20"), (11, "2026-09-22")]
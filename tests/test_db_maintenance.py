@@ -0,0 +1,161 @@
+# tests/test_db_maintenance.py
+"""
+Tests de la maintenance de la base (ANALYZE, checkpoint, incremental_vacuum, planificateur)
+"""
+
+import sqlite3
+
+import pytest
+
+from config import Config
+from app.services import db_maintenance
+from app.services.metrics import DB_FILE_BYTES, DB_MAINTENANCE_RUNS
+
+
+@pytest.fixture
+def maintenance_db(tmp_path, monkeypatch):
+    """Base WAL en auto_vacuum=INCREMENTAL : logs d'accès anciens, pages libres, WAL non reporté"""
+    from app.models import db_core
+    path = str(tmp_path / "recette.sqlite3")
+    monkeypatch.setattr(db_core, "DB_PATH", path)
+    monkeypatch.setattr(Config, "MAINTENANCE_STATE_PATH", str(tmp_path / "maintenance.json"))
+    monkeypatch.setattr(Config, "MAINTENANCE_LOCK_PATH", str(tmp_path / "maintenance.lock"))
+
+    con = sqlite3.connect(path)
+    con.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA wal_autocheckpoint=0")
+    con.execute("""CREATE TABLE access_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, path TEXT,
+        accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)""")
+    con.execute("CREATE INDEX idx_access_log_accessed_at ON access_log(accessed_at)")
+    con.execute("CREATE TABLE recipe (id INTEGER PRIMARY KEY, slug TEXT)")
+    con.executemany("INSERT INTO recipe (slug) VALUES (?)", [(f"r{i}" * 100,) for i in range(500)])
+    con.executemany("INSERT INTO access_log (path, accessed_at) VALUES (?, datetime('now', ?))",
+                    [(f"/recipes/{i}", f"-{40 + i % 5} days") for i in range(300)])
+    con.execute("DELETE FROM recipe WHERE id > 100")
+    con.commit()
+    # Connexion gardée ouverte : à la fermeture de la dernière, SQLite reporterait le WAL
+    yield path
+    con.close()
+
+
+def set_last_access(path, modifier):
+    con = sqlite3.connect(path)
+    con.execute("INSERT INTO access_log (path, accessed_at) VALUES ('/recipes', datetime('now', ?))", (modifier,))
+    con.commit()
+    con.close()
+
+
+@pytest.mark.database
+class TestRunMaintenance:
+    """Tests de run_maintenance()"""
+
+    def test_full_run(self, maintenance_db):
+        """Purge, pages libres rendues, statistiques créées, WAL tronqué"""
+        before = db_maintenance.database_stats()
+        assert before["freelist_count"] > 0 and before["wal_bytes"] > 0
+
+        report = db_maintenance.run_maintenance()
+        tasks = {t["task"]: t for t in report["tasks"]}
+
+        assert [t["task"] for t in report["tasks"]] == list(db_maintenance.TASKS)
+        assert all(t["outcome"] == "ok" for t in report["tasks"]), report["tasks"]
+        assert tasks["purge"]["deleted"] == 300
+        assert tasks["vacuum"]["freed_pages"] > 0
+        assert report["after"]["freelist_count"] == 0
+        assert report["after"]["wal_bytes"] == 0
+        assert report["after"]["last_checkpoint"] is not None
+
+        con = sqlite3.connect(maintenance_db)
+        assert con.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+        con.close()
+
+        state = db_maintenance.load_state()
+        assert state["last_run"] and state["last_report"]["trigger"] == "manual"
+
+    def test_purge_keeps_raw_logs_without_rollup(self, maintenance_db):
+        """Sans agrégats horaires, les logs bruts de moins de 30 jours sont conservés"""
+        set_last_access(maintenance_db, "-10 days")
+
+        report = db_maintenance.run_maintenance(tasks=["purge"])
+
+        assert report["tasks"][0]["deleted"] == 300
+        assert report["tasks"][0]["retention_days"] == 30
+        con = sqlite3.connect(maintenance_db)
+        assert con.execute("SELECT COUNT(*) FROM access_log").fetchone()[0] == 1
+        con.close()
+
+    def test_vacuum_skipped_without_auto_vacuum(self, maintenance_db):
+        """Sans auto_vacuum INCREMENTAL, la tâche est sautée ; enable_incremental_vacuum convertit la base"""
+        con = sqlite3.connect(maintenance_db)
+        con.execute("PRAGMA auto_vacuum=NONE")
+        con.execute("VACUUM")
+        con.close()
+
+        report = db_maintenance.run_maintenance(["vacuum"])
+        assert report["tasks"][0]["outcome"] == "skipped"
+
+        assert db_maintenance.enable_incremental_vacuum()["changed"] is True
+        assert db_maintenance.database_stats()["auto_vacuum"] == "incremental"
+        assert db_maintenance.enable_incremental_vacuum() == {"changed": False}
+
+    def test_checkpoint_busy_with_reader(self, maintenance_db):
+        """Un lecteur actif empêche la troncature : busy, pas de date de checkpoint enregistrée"""
+        reader = sqlite3.connect(maintenance_db)
+        reader.execute("BEGIN")
+        reader.execute("SELECT COUNT(*) FROM recipe").fetchone()
+        try:
+            report = db_maintenance.run_maintenance(["checkpoint"])
+        finally:
+            reader.close()
+
+        assert report["tasks"][0]["outcome"] == "busy"
+        assert "last_checkpoint" not in db_maintenance.load_state()
+
+    def test_unknown_task(self, maintenance_db):
+        with pytest.raises(ValueError):
+            db_maintenance.run_maintenance(["reindex"])
+
+    def test_outcome_metrics(self, maintenance_db):
+        key = ("analyze", "ok")
+        before = DB_MAINTENANCE_RUNS._values.get(key, 0)
+        db_maintenance.run_maintenance(["analyze"])
+        assert DB_MAINTENANCE_RUNS._values[key] == before + 1
+
+
+@pytest.mark.database
+class TestScheduler:
+    """Tests du planificateur (périodes creuses, élection d'un seul worker)"""
+
+    def test_busy_period_skipped(self, maintenance_db, monkeypatch):
+        monkeypatch.setattr(Config, "MAINTENANCE_IDLE_SECONDS", 120)
+        set_last_access(maintenance_db, "-10 seconds")
+
+        assert db_maintenance.scheduler_tick() is None
+        assert "last_run" not in db_maintenance.load_state()
+        assert DB_FILE_BYTES.get(file="db") > 0
+
+    def test_idle_runs_maintenance_then_checkpoint(self, maintenance_db, monkeypatch):
+        """Première période creuse : maintenance complète ; ensuite checkpoint seul si le WAL grossit"""
+        monkeypatch.setattr(Config, "MAINTENANCE_IDLE_SECONDS", 120)
+        monkeypatch.setattr(Config, "MAINTENANCE_WAL_CHECKPOINT_MB", 0.001)
+        set_last_access(maintenance_db, "-1 hour")
+
+        assert db_maintenance.scheduler_tick() == "maintenance"
+        assert db_maintenance.scheduler_tick() is None
+
+        set_last_access(maintenance_db, "-1 hour")
+        assert db_maintenance.scheduler_tick() == "checkpoint"
+        assert db_maintenance.load_state()["last_report"]["trigger"] == "wal"
+
+    def test_single_leader(self, maintenance_db):
+        first = db_maintenance._acquire_leadership()
+        try:
+            assert first is not None
+            assert db_maintenance._acquire_leadership() is None
+        finally:
+            first.close()
+        second = db_maintenance._acquire_leadership()
+        assert second is not None
+        second.close()
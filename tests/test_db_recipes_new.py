@@ -12,6 +12,7 @@ from app.models.db_recipes import (
     check_translation_exists,
     get_source_language,
     delete_recipe,
+    search_recipe_names,
 )
 
 
@@ -173,6 +174,42 @@ class TestGetRecipeIdBySlug:
         assert result is None, "Un slug inexistant devrait retourner None"
 
 
+class TestSearchRecipeNames:
+    """Tests pour search_recipe_names() (sélecteurs typeahead)"""
+
+    @pytest.fixture
+    def recipes(self, temp_db):
+        """Insère trois recettes traduites en français (base vidée au préalable)"""
+        temp_db.execute("DELETE FROM recipe_translation")
+        temp_db.execute("DELETE FROM recipe")
+        ids = {}
+        for slug, name in [('tarte', 'Tarte aux pommes'), ('ramen', 'Ramen'), ('tartine', 'Tartine')]:
+            cur = temp_db.execute("INSERT INTO recipe (slug, servings_default) VALUES (?, 4)", (slug,))
+            ids[slug] = cur.lastrowid
+            temp_db.execute(
+                "INSERT INTO recipe_translation (recipe_id, lang, name) VALUES (?, 'fr', ?)",
+                (cur.lastrowid, name)
+            )
+        temp_db.commit()
+        return ids
+
+    @pytest.mark.database
+    def test_search_filtre_par_nom(self, recipes):
+        """Seules les recettes dont le nom contient le texte sont retournées, triées par nom"""
+        results = search_recipe_names("fr", query="tart")
+        assert [r['name'] for r in results] == ['Tarte aux pommes', 'Tartine']
+        assert results[0]['servings'] == 4
+
+    @pytest.mark.database
+    def test_search_pagination_et_exclusion(self, recipes):
+        """limit/offset paginent les résultats et exclude_id retire une recette"""
+        page = search_recipe_names("fr", limit=1, offset=1)
+        assert [r['name'] for r in page] == ['Tarte aux pommes']
+
+        results = search_recipe_names("fr", exclude_id=recipes['ramen'])
+        assert 'Ramen' not in [r['name'] for r in results]
+
+
 # ============================================================================
 # TESTS DE SUPPRESSION (Delete)
 # ============================================================================
@@ -0,0 +1,153 @@
+# tests/test_db_shopping_sources.py
+"""
+Tests des recettes sources de la liste de courses (table shopping_list_item_source)
+Teste la sauvegarde en lot, la relecture par jointure et la reprise du JSON
+"""
+
+import os
+import sqlite3
+
+import pytest
+
+from app.models.db_shopping import (
+    get_shopping_list_items,
+    get_shopping_list_items_for_recipe,
+    remove_recipe_from_shopping_list,
+    save_shopping_list_items,
+    scale_shopping_list_sources,
+)
+
+MIGRATION = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "migrations", "add_shopping_list_item_source.sql"
+)
+
+ITEMS = [
+    {
+        'ingredient_name': 'farine', 'total_quantity': 500, 'purchase_unit': 'g', 'notes': '',
+        'source_recipes': [
+            {'recipe_id': 1, 'recipe_name': 'Crêpes', 'quantity': 250.0, 'unit': 'g'},
+            {'recipe_id': 2, 'recipe_name': 'Gaufres', 'quantity': 250.0, 'unit': 'g'},
+        ],
+    },
+    {
+        'ingredient_name': 'sel', 'total_quantity': None, 'purchase_unit': '', 'notes': '',
+        'source_recipes': [{'recipe_id': 2, 'recipe_name': 'Gaufres', 'quantity': None, 'unit': ''}],
+    },
+]
+
+
+@pytest.fixture
+def shopping_db(tmp_path, monkeypatch):
+    """Base temporaire avec shopping_list_item (schéma avant migration)"""
+    from app.models import db_core
+    path = str(tmp_path / "shopping.sqlite3")
+    monkeypatch.setattr(db_core, "DB_PATH", path)
+
+    con = sqlite3.connect(path)
+    con.executescript("""
+        CREATE TABLE ingredient_price_catalog (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, ingredient_name_fr TEXT, ingredient_name_jp TEXT
+        );
+        CREATE TABLE shopping_list_item (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, event_id INTEGER NOT NULL,
+            ingredient_name TEXT NOT NULL, needed_quantity REAL, needed_unit TEXT,
+            purchase_quantity REAL, purchase_unit TEXT, is_checked BOOLEAN DEFAULT 0,
+            notes TEXT, source_recipes TEXT, position INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            planned_unit_price REAL, actual_total_price REAL
+        );
+        CREATE TABLE unit_conversion (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, from_unit TEXT, to_unit TEXT, factor REAL,
+            category TEXT, notes TEXT, from_unit_fr TEXT, to_unit_fr TEXT, from_unit_jp TEXT, to_unit_jp TEXT
+        );
+        INSERT INTO unit_conversion (from_unit, to_unit, factor, category) VALUES ('g', 'kg', 0.001, 'poids');
+    """)
+    con.commit()
+    # Conversions d'unités relues depuis cette base (cache de l'agrégateur)
+    from app.services.ingredient_aggregator import get_ingredient_aggregator
+    monkeypatch.setattr(get_ingredient_aggregator(), "_conversion_cache", None)
+    yield con
+    con.close()
+
+
+def apply_migration(con):
+    with open(MIGRATION, encoding="utf-8") as f:
+        con.executescript(f.read())
+
+
+@pytest.mark.database
+class TestShoppingListSources:
+    """Tests de la table fille shopping_list_item_source"""
+
+    def test_save_and_read_sources(self, shopping_db):
+        """Les sources sont stockées en lignes et relues dans l'ordre"""
+        apply_migration(shopping_db)
+        save_shopping_list_items(7, ITEMS)
+
+        assert shopping_db.execute(
+            "SELECT COUNT(*) FROM shopping_list_item WHERE source_recipes IS NOT NULL"
+        ).fetchone()[0] == 0
+
+        items = get_shopping_list_items(7)
+        assert [i['ingredient_name'] for i in items] == ['farine', 'sel']
+        assert items[0]['source_recipes'] == ITEMS[0]['source_recipes']
+        assert items[1]['source_recipes'] == ITEMS[1]['source_recipes']
+
+    def test_resave_replaces_sources(self, shopping_db):
+        """Une nouvelle sauvegarde supprime les anciennes sources (trigger)"""
+        apply_migration(shopping_db)
+        save_shopping_list_items(7, ITEMS)
+        save_shopping_list_items(7, ITEMS[:1])
+
+        assert shopping_db.execute("SELECT COUNT(*) FROM shopping_list_item_source").fetchone()[0] == 2
+
+    def test_migration_backfills_json(self, shopping_db):
+        """La migration reprend les sources JSON existantes"""
+        save_shopping_list_items(7, ITEMS)
+        assert get_shopping_list_items(7)[0]['source_recipes'] == ITEMS[0]['source_recipes']
+
+        apply_migration(shopping_db)
+
+        items = get_shopping_list_items(7)
+        assert items[0]['source_recipes'] == ITEMS[0]['source_recipes']
+        assert items[1]['source_recipes'] == ITEMS[1]['source_recipes']
+
+    def test_recipe_queries(self, shopping_db):
+        """Lignes d'une recette, mise à l'échelle et retrait"""
+        apply_migration(shopping_db)
+        save_shopping_list_items(7, ITEMS)
+
+        assert [i['ingredient_name'] for i in get_shopping_list_items_for_recipe(7, 2)] == ['farine', 'sel']
+
+        assert scale_shopping_list_sources(7, 1, 2.0) == 1
+        assert get_shopping_list_items(7)[0]['source_recipes'][0]['quantity'] == 500.0
+
+        # 'sel' ne venait que de la recette 2 : la ligne disparaît
+        assert remove_recipe_from_shopping_list(7, 2) == 1
+        items = get_shopping_list_items(7)
+        assert [i['ingredient_name'] for i in items] == ['farine']
+        assert [s['recipe_id'] for s in items[0]['source_recipes']] == [1]
+
+    def test_totals_follow_sources(self, shopping_db):
+        """Après mise à l'échelle ou retrait, le total d'une ligne reste la somme de ses sources"""
+        apply_migration(shopping_db)
+        save_shopping_list_items(7, ITEMS)
+
+        # 2 × 250 g + 250 g = 750 g, exprimés en unité d'achat
+        scale_shopping_list_sources(7, 1, 2.0)
+        farine = get_shopping_list_items(7)[0]
+        assert sum(s['quantity'] for s in farine['source_recipes']) == 750.0
+        assert (farine['needed_quantity'], farine['needed_unit']) == (0.75, 'kg')
+        assert (farine['purchase_quantity'], farine['purchase_unit']) == (0.75, 'kg')
+
+        remove_recipe_from_shopping_list(7, 2)
+        farine = get_shopping_list_items(7)[0]
+        assert sum(s['quantity'] for s in farine['source_recipes']) == 500.0
+        assert (farine['needed_quantity'], farine['needed_unit']) == (0.5, 'kg')
+
+    def test_without_migration(self, shopping_db):
+        """Sans table des sources, la liste doit être régénérée (None)"""
+        save_shopping_list_items(7, ITEMS)
+        assert scale_shopping_list_sources(7, 1, 2.0) is None
+        assert remove_recipe_from_shopping_list(7, 2) is None
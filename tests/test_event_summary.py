@@ -0,0 +1,147 @@
+# tests/test_event_summary.py
+"""
+Tests des résumés d'événements (migrations/add_event_summary.sql)
+
+Les triggers marquent le résumé obsolète (stale = 1) à chaque modification de
+ce qu'affiche la liste ; list_events() ne reconstruit que ces résumés et
+n'écrit rien quand aucun ne l'est.
+"""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from config import Config
+from app.models.db_events import list_events, refresh_event_summaries
+from app.services.sql_trace import start_trace, stop_trace
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def summary_db(tmp_path, monkeypatch):
+    """Schéma complet : 2 événements, un participant venu d'un groupe, une recette, une photo"""
+    from app.models import db_core
+    path = str(tmp_path / "summary.sqlite3")
+    monkeypatch.setattr(db_core, "DB_PATH", path)
+
+    con = sqlite3.connect(path)
+    con.executescript((ROOT / "scripts" / "schema.sql").read_text(encoding="utf-8"))
+    con.executescript("""
+        INSERT INTO event_type (id, name_fr, name_jp, recipe_type_fr, recipe_type_jp) VALUES (1, 'Repas', '食事', 'Plat', '料理');
+        INSERT INTO event (id, event_type_id, name, event_date) VALUES (1, 1, 'Fête', '2026-05-01'), (2, 1, 'Pique-nique', '2026-06-01');
+        INSERT INTO participant_group (id, nom) VALUES (1, 'Famille');
+        INSERT INTO participant (id, nom, prenom) VALUES (1, 'Dupont', 'Jean'), (2, 'Martin', NULL);
+        INSERT INTO event_participant (event_id, participant_id, added_via_group_id) VALUES (1, 1, 1);
+        INSERT INTO recipe (id, slug) VALUES (1, 'tarte');
+        INSERT INTO recipe_translation (recipe_id, lang, name) VALUES (1, 'fr', 'Tarte');
+        INSERT INTO event_recipe (event_id, recipe_id) VALUES (1, 1);
+        INSERT INTO event_photo (id, event_id, photo_url) VALUES (1, 1, '/static/images/events/a.jpg');
+    """)
+    con.commit()
+    refresh_event_summaries()
+    yield con
+    con.close()
+
+
+def stale(con, event_id=1):
+    return con.execute("SELECT stale FROM event_summary WHERE event_id = ?", (event_id,)).fetchone()[0]
+
+
+def summary(con, event_id=1):
+    con.row_factory = sqlite3.Row
+    try:
+        return dict(con.execute("SELECT * FROM event_summary WHERE event_id = ?", (event_id,)).fetchone())
+    finally:
+        con.row_factory = None
+
+
+@pytest.mark.database
+class TestStaleTriggers:
+    """Chaque modification affichée dans la liste marque le résumé obsolète"""
+
+    @pytest.mark.parametrize("sql", [
+        "INSERT INTO event_participant (event_id, participant_id) VALUES (1, 2)",
+        "UPDATE event_participant SET added_via_group_id = NULL WHERE event_id = 1",
+        "DELETE FROM event_participant WHERE event_id = 1",
+        "UPDATE participant SET prenom = 'Jeanne' WHERE id = 1",
+        "UPDATE participant_group SET nom = 'Cousins' WHERE id = 1",
+        "INSERT INTO recipe (id, slug) VALUES (2, 'flan'); INSERT INTO event_recipe (event_id, recipe_id) VALUES (1, 2)",
+        "DELETE FROM event_recipe WHERE event_id = 1",
+        "UPDATE recipe SET slug = 'tarte-fine' WHERE id = 1",
+        "INSERT INTO recipe_translation (recipe_id, lang, name) VALUES (1, 'jp', 'タルト')",
+        "UPDATE recipe_translation SET name = 'Tarte fine' WHERE recipe_id = 1",
+        "DELETE FROM recipe_translation WHERE recipe_id = 1",
+        "INSERT INTO event_photo (event_id, photo_url, position) VALUES (1, '/static/images/events/b.jpg', 1)",
+        "UPDATE event_photo SET position = 3 WHERE id = 1",
+        "DELETE FROM event_photo WHERE id = 1",
+    ])
+    def test_change_marks_event_stale(self, summary_db, sql):
+        assert stale(summary_db) == 0 and stale(summary_db, 2) == 0
+
+        summary_db.executescript(sql)
+
+        assert stale(summary_db) == 1
+        assert stale(summary_db, 2) == 0, "les autres événements ne sont pas touchés"
+
+    def test_unrelated_changes_keep_summary(self, summary_db):
+        summary_db.executescript("""
+            UPDATE participant SET telephone = '0600000000' WHERE id = 1;
+            UPDATE event_recipe SET servings_multiplier = 2 WHERE event_id = 1;
+            UPDATE recipe SET servings_default = 6 WHERE id = 1;
+        """)
+        assert stale(summary_db) == 0
+
+    def test_event_insert_and_delete(self, summary_db):
+        summary_db.execute("INSERT INTO event (id, event_type_id, name, event_date) VALUES (3, 1, 'Brunch', '2026-07-01')")
+        assert stale(summary_db, 3) == 1
+
+        summary_db.execute("DELETE FROM event WHERE id = 3")
+        assert summary_db.execute("SELECT COUNT(*) FROM event_summary WHERE event_id = 3").fetchone()[0] == 0
+
+
+@pytest.mark.database
+class TestRefresh:
+    """Tests de la reconstruction des résumés"""
+
+    def test_summary_values(self, summary_db):
+        row = summary(summary_db)
+        assert row["groups"] == "Famille" and row["groups_raw"] == "1:Famille"
+        assert row["participants"] == "Jean Dupont" and row["participant_count"] == 1
+        assert row["recipes_raw_fr"] == "tarte::Tarte" and row["recipes_raw_jp"] == "tarte::tarte"
+        assert row["recipe_count"] == 1
+        assert row["first_photo"] == "/static/images/events/a.jpg"
+
+    def test_list_events_rebuilds_stale_only(self, summary_db):
+        summary_db.execute("UPDATE participant SET prenom = 'Jeanne' WHERE id = 1")
+        summary_db.execute("UPDATE event_summary SET participants = 'intact' WHERE event_id = 2")
+        summary_db.commit()
+
+        events = {e["id"]: e for e in list_events(lang="fr")}
+
+        assert events[1]["participants"] == "Jeanne Dupont"
+        assert events[2]["participants"] == "intact", "un résumé à jour n'est pas reconstruit"
+        assert stale(summary_db) == 0
+
+    def test_list_events_without_stale_does_not_write(self, summary_db, monkeypatch):
+        """Aucun résumé obsolète : la lecture de la liste n'émet que des SELECT"""
+        monkeypatch.setattr(Config, "SQL_TRACE", True)
+        token, trace = start_trace()
+        try:
+            list_events(lang="fr")
+            assert refresh_event_summaries() == 0
+        finally:
+            stop_trace(token)
+
+        statements = [query.sql.split()[0].upper() for query in trace.queries]
+        assert "SELECT" in statements
+        assert not {"INSERT", "UPDATE", "DELETE"} & set(statements), statements
+
+    def test_explicit_refresh(self, summary_db):
+        summary_db.execute("UPDATE event_summary SET participants = NULL")
+        summary_db.commit()
+
+        assert refresh_event_summaries([1]) == 1
+        assert summary(summary_db)["participants"] == "Jean Dupont"
+        assert refresh_event_summaries([]) == 0
@@ -0,0 +1,139 @@
+# tests/test_fragment_cache.py
+"""
+Tests unitaires pour le cache de fragments HTML des pages recette
+Teste les succès/échecs, l'invalidation par recette, le plafond mémoire
+et la génération propre à chaque recette (recipe.content_generation)
+"""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.services.fragment_cache import FragmentCache
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def cache():
+    """Cache vide de 100 octets"""
+    return FragmentCache(max_bytes=100)
+
+
+@pytest.fixture
+def schema_db(tmp_path, monkeypatch):
+    """Base au schéma complet : tarte (liée à pâte comme ingrédient), pâte et soupe"""
+    from app.models import db_core
+    path = str(tmp_path / "fragments.sqlite3")
+    monkeypatch.setattr(db_core, "DB_PATH", path)
+
+    con = sqlite3.connect(path)
+    con.executescript((ROOT / "scripts" / "schema.sql").read_text(encoding="utf-8"))
+    con.executescript("""
+        INSERT INTO recipe (id, slug) VALUES (1, 'tarte'), (2, 'pate'), (3, 'soupe');
+        INSERT INTO recipe_translation (recipe_id, lang, name) VALUES
+            (1, 'fr', 'Tarte'), (2, 'fr', 'Pâte brisée'), (3, 'fr', 'Soupe');
+        INSERT INTO recipe_ingredient (id, recipe_id, position, quantity, linked_recipe_id)
+        VALUES (10, 1, 1, 1, 2);
+        INSERT INTO recipe_ingredient_translation (recipe_ingredient_id, lang, name)
+        VALUES (10, 'fr', 'pâte');
+        INSERT INTO step (id, recipe_id, position) VALUES (20, 3, 1);
+        INSERT INTO step_translation (step_id, lang, text) VALUES (20, 'fr', 'Chauffer');
+    """)
+    yield con
+    con.close()
+
+
+def generations(con) -> dict:
+    return dict(con.execute("SELECT slug, content_generation FROM recipe").fetchall())
+
+
+@pytest.mark.unit
+class TestFragmentCache:
+    """Tests du LRU de fragments"""
+
+    def test_second_render_is_a_hit(self, cache):
+        """Le deuxième affichage réutilise le HTML rendu"""
+        renders = []
+
+        def render():
+            renders.append(1)
+            return "<tr>riz</tr>"
+
+        assert cache.get_or_render(1, "fr", "ingredients", render) == "<tr>riz</tr>"
+        assert cache.get_or_render(1, "fr", "ingredients", render) == "<tr>riz</tr>"
+        assert len(renders) == 1
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+        assert stats["bytes"] == len("<tr>riz</tr>")
+
+    def test_invalidate_recipe(self, cache):
+        """L'invalidation ne touche que la recette concernée"""
+        cache.get_or_render(1, "fr", "steps", lambda: "a")
+        cache.get_or_render(1, "jp", "steps", lambda: "b")
+        cache.get_or_render(2, "fr", "steps", lambda: "c")
+
+        cache.invalidate_recipe(1)
+
+        assert cache.get_or_render(1, "fr", "steps", lambda: "a2") == "a2"
+        assert cache.get_or_render(2, "fr", "steps", lambda: "c2") == "c"
+
+    def test_generation_is_per_recipe(self, cache):
+        """Une nouvelle génération de la recette 1 ne touche pas la recette 2"""
+        cache.get_or_render(1, "fr", "steps", lambda: "a", generation=3)
+        cache.get_or_render(2, "fr", "steps", lambda: "b", generation=7)
+
+        assert cache.get_or_render(1, "fr", "steps", lambda: "a2", generation=4) == "a2"
+        assert cache.get_or_render(2, "fr", "steps", lambda: "b2", generation=7) == "b"
+
+    def test_memory_cap_evicts_least_recently_used(self, cache):
+        """Au-delà du plafond, les fragments les moins récents sont évincés"""
+        cache.get_or_render(1, "fr", "steps", lambda: "x" * 40)
+        cache.get_or_render(2, "fr", "steps", lambda: "y" * 40)
+        cache.get_or_render(1, "fr", "steps", lambda: "unused")  # 1 redevient récent
+        cache.get_or_render(3, "fr", "steps", lambda: "z" * 40)
+
+        stats = cache.stats()
+        assert stats["entries"] == 2
+        assert stats["bytes"] == 80
+        assert cache.get_or_render(2, "fr", "steps", lambda: "y2") == "y2"
+
+
+@pytest.mark.database
+class TestContentGeneration:
+    """Tests des triggers de migrations/add_recipe_content_generation.sql"""
+
+    def test_writes_bump_only_their_recipe(self, schema_db):
+        """Étapes et traductions d'ingrédients n'avancent que la recette concernée"""
+        before = generations(schema_db)
+
+        schema_db.execute("UPDATE step_translation SET text = 'Mijoter' WHERE step_id = 20")
+        schema_db.execute("UPDATE recipe_ingredient_translation SET name = 'pâte maison' "
+                          "WHERE recipe_ingredient_id = 10")
+        after = generations(schema_db)
+
+        assert after["soupe"] == before["soupe"] + 1
+        assert after["tarte"] == before["tarte"] + 1
+        assert after["pate"] == before["pate"]
+
+    def test_linked_recipe_rename(self, schema_db):
+        """Renommer une recette liée avance les recettes qui l'affichent comme ingrédient"""
+        before = generations(schema_db)
+
+        schema_db.execute("UPDATE recipe_translation SET name = 'Pâte sablée' WHERE recipe_id = 2")
+        schema_db.execute("UPDATE recipe SET slug = 'pate-sablee' WHERE id = 2")
+        after = generations(schema_db)
+
+        assert after["tarte"] == before["tarte"] + 2
+        assert after["soupe"] == before["soupe"]
+
+    def test_recipe_by_slug_returns_generation(self, schema_db):
+        from app.models.db_recipes import get_recipe_by_slug
+
+        schema_db.commit()
+        recipe, _, _ = get_recipe_by_slug("soupe", "fr")
+        assert recipe["content_generation"] == generations(schema_db)["soupe"]
@@ -0,0 +1,105 @@
+# tests/test_http_cache.py
+"""
+Tests unitaires pour les réponses conditionnelles (ETag / 304)
+Teste le calcul de l'ETag à partir des compteurs de génération
+"""
+
+import inspect
+import re
+import sqlite3
+
+import pytest
+from starlette.requests import Request
+
+from app.http_cache import CALENDAR_TABLES, conditional_get
+
+
+@pytest.fixture
+def generation_db(tmp_path, monkeypatch):
+    """Base temporaire avec la table data_generation et une table suivie"""
+    from app.models import db_core
+    path = str(tmp_path / "generation.sqlite3")
+    monkeypatch.setattr(db_core, "DB_PATH", path)
+
+    con = sqlite3.connect(path)
+    con.executescript("""
+        CREATE TABLE tag (id INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE data_generation (table_name TEXT PRIMARY KEY, generation INTEGER NOT NULL DEFAULT 0);
+        INSERT INTO data_generation VALUES ('tag', 0);
+        CREATE TRIGGER data_generation_tag_insert AFTER INSERT ON tag
+        BEGIN
+            UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'tag';
+        END;
+    """)
+    con.commit()
+    yield con
+    con.close()
+
+
+def make_request(if_none_match=None, user_id=1):
+    """Construit une requête GET /api/tags"""
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({
+        "type": "http", "method": "GET", "path": "/api/tags", "query_string": b"lang=fr",
+        "headers": headers, "session": {"user_id": user_id},
+    })
+
+
+calls = []
+
+
+@conditional_get("tag")
+async def list_tags(request):
+    calls.append(request)
+    return [{"id": 1, "name": "rapide"}]
+
+
+class TestConditionalGet:
+    """Tests pour le décorateur conditional_get"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_304_si_rien_na_change(self, generation_db):
+        """Le même ETag renvoyé par le client donne un 304 sans appeler la route"""
+        calls.clear()
+        first = await list_tags(request=make_request())
+        etag = first.headers["etag"]
+        assert first.status_code == 200
+
+        second = await list_tags(request=make_request(if_none_match=etag))
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
+        assert len(calls) == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_modification_invalide_letag(self, generation_db):
+        """Une écriture dans une table suivie change l'ETag"""
+        etag = (await list_tags(request=make_request())).headers["etag"]
+
+        generation_db.execute("INSERT INTO tag (name) VALUES ('nouveau')")
+        generation_db.commit()
+
+        response = await list_tags(request=make_request(if_none_match=etag))
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_etag_par_utilisateur(self, generation_db):
+        """Deux utilisateurs n'obtiennent pas le même ETag"""
+        etag_1 = (await list_tags(request=make_request(user_id=1))).headers["etag"]
+        etag_2 = (await list_tags(request=make_request(user_id=2))).headers["etag"]
+        assert etag_1 != etag_2
+
+
+class TestTableLists:
+    """Les listes de tables couvrent les tables lues par les routes"""
+
+    @pytest.mark.unit
+    def test_calendar_tables(self):
+        """Toute table lue par get_calendar_data invalide l'ETag de /api/calendar/month"""
+        from app.models import db_meal_plan
+        source = inspect.getsource(db_meal_plan.get_calendar_data)
+        tables = set(re.findall(r"\b(?:FROM|JOIN)\s+(\w+)", source))
+        assert tables - set(CALENDAR_TABLES) == set()
@@ -0,0 +1,169 @@
+# tests/test_image_variants.py
+"""
+Tests de la génération des variantes d'images (thumbnail, taille moyenne, WebP)
+pour les recettes et les photos d'événements
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services import image_service
+from app.services.image_service import (
+    IMAGE_VARIANTS, VARIANT_FORMATS, event_photo_thumbnail_url, generate_image_variants,
+    has_image_variants, image_variant_url, schedule_event_photo_variants,
+    schedule_recipe_image_variants, thumbnail_url_for,
+)
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def images_root(tmp_path, monkeypatch):
+    """BASE_DIR temporaire avec les répertoires d'images de recettes et d'événements"""
+    for folder in ("recipes", "events"):
+        (tmp_path / "static" / "images" / folder / "thumbnails").mkdir(parents=True)
+    monkeypatch.setattr(image_service, "BASE_DIR", tmp_path)
+    monkeypatch.setattr(image_service, "EVENTS_IMAGES_DIR", tmp_path / "static" / "images" / "events")
+    return tmp_path
+
+
+@pytest.fixture
+def thread_pool(monkeypatch):
+    """Pool de threads à la place du pool de processus (BASE_DIR patché visible)"""
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(image_service, "_get_variant_pool", lambda: pool)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+def write_image(root, url, size=(1600, 1200), mode="RGB"):
+    """Écrit une image unie à l'URL relative donnée"""
+    Image.new(mode, size, (200, 80, 40, 128)[:len(mode)]).save(root / url.lstrip("/"))
+    return url
+
+
+@pytest.mark.unit
+class TestGenerateImageVariants:
+    """Tests de generate_image_variants()"""
+
+    def test_all_variants_written(self, images_root):
+        url = write_image(images_root, "/static/images/recipes/abc.jpg")
+
+        variants = generate_image_variants(url)
+
+        assert set(variants) == {f"{n}.{f}" for n in IMAGE_VARIANTS for f in VARIANT_FORMATS}
+        assert variants["thumb.webp"] == "/static/images/recipes/thumbnails/abc_thumb.webp"
+        for name, max_side in IMAGE_VARIANTS.items():
+            with Image.open(images_root / variants[f"{name}.jpg"].lstrip("/")) as variant:
+                assert max(variant.size) == max_side
+        assert has_image_variants(url)
+        assert not list((images_root / "static/images/recipes/thumbnails").glob(".*.tmp"))
+
+    def test_small_image_not_upscaled(self, images_root):
+        url = write_image(images_root, "/static/images/recipes/small.png", size=(100, 50), mode="RGBA")
+
+        variants = generate_image_variants(url)
+
+        with Image.open(images_root / variants["medium.webp"].lstrip("/")) as variant:
+            assert variant.size == (100, 50)
+            assert variant.mode == "RGB"
+
+    def test_unreadable_image(self, images_root):
+        (images_root / "static/images/recipes/broken.jpg").write_bytes(b"pas une image")
+        assert generate_image_variants("/static/images/recipes/broken.jpg") is None
+        assert generate_image_variants("/static/images/recipes/absente.jpg") is None
+
+    def test_event_photo_variants_next_to_photo(self, images_root):
+        url = write_image(images_root, "/static/images/events/fete.jpg")
+
+        variants = generate_image_variants(url)
+
+        assert thumbnail_url_for(variants) == "/static/images/events/thumbnails/fete_thumb.webp"
+
+
+@pytest.mark.unit
+class TestImageVariantUrl:
+    """Tests de image_variant_url()"""
+
+    def test_other_variant_from_thumbnail(self):
+        thumb = "/static/images/recipes/thumbnails/abc_thumb.webp"
+        assert image_variant_url(thumb) == thumb
+        assert image_variant_url(thumb, "medium") == "/static/images/recipes/thumbnails/abc_medium.webp"
+        assert image_variant_url(thumb, "medium", "jpg") == "/static/images/recipes/thumbnails/abc_medium.jpg"
+
+    def test_original_returned_unchanged(self):
+        """Thumbnail pas encore généré (original) ou absent : URL inchangée"""
+        original = "/static/images/recipes/abc_thumb.jpg"
+        assert image_variant_url(original, "medium") == original
+        assert image_variant_url("/static/images/recipes/abc.jpg", "medium", "jpg") == "/static/images/recipes/abc.jpg"
+        assert image_variant_url(None) is None
+        assert image_variant_url("") == ""
+
+
+@pytest.mark.unit
+class TestScheduling:
+    """Tests de la planification en arrière-plan"""
+
+    def test_recipe_thumbnail_recorded(self, images_root, thread_pool, monkeypatch):
+        from app.models import db
+        recorded = []
+        monkeypatch.setattr(db, "update_recipe_thumbnail", lambda *args: recorded.append(args))
+        url = write_image(images_root, "/static/images/recipes/abc.jpg")
+
+        schedule_recipe_image_variants(7, url)
+        thread_pool.shutdown(wait=True)
+
+        assert recorded == [(7, url, "/static/images/recipes/thumbnails/abc_thumb.webp")]
+
+    def test_recipe_failure_keeps_original(self, images_root, thread_pool, monkeypatch):
+        from app.models import db
+        recorded = []
+        monkeypatch.setattr(db, "update_recipe_thumbnail", lambda *args: recorded.append(args))
+        (images_root / "static/images/recipes/broken.jpg").write_bytes(b"pas une image")
+
+        schedule_recipe_image_variants(7, "/static/images/recipes/broken.jpg")
+        thread_pool.shutdown(wait=True)
+
+        assert recorded == []
+
+    def test_without_pillow_nothing_scheduled(self, images_root, monkeypatch):
+        monkeypatch.setattr(image_service, "Image", None)
+        monkeypatch.setattr(image_service, "_get_variant_pool", lambda: pytest.fail("pool utilisé"))
+
+        schedule_recipe_image_variants(7, "/static/images/recipes/abc.jpg")
+        schedule_event_photo_variants("/static/images/events/fete.jpg")
+
+
+@pytest.mark.unit
+class TestEventPhotoVariants:
+    """Tests des variantes des photos d'événements"""
+
+    def test_thumbnail_once_generated(self, images_root, thread_pool):
+        """La liste sert l'original tant que le thumbnail n'existe pas, puis le thumbnail"""
+        url = write_image(images_root, "/static/images/events/fete.jpg")
+        assert event_photo_thumbnail_url(url) == url
+        assert event_photo_thumbnail_url(None) is None
+
+        schedule_event_photo_variants(url)
+        thread_pool.shutdown(wait=True)
+
+        assert event_photo_thumbnail_url(url) == "/static/images/events/thumbnails/fete_thumb.webp"
+
+    def test_delete_removes_variants(self, images_root):
+        url = write_image(images_root, "/static/images/events/fete.jpg")
+        generate_image_variants(url)
+
+        image_service.delete_event_photo_file(url)
+
+        assert not list((images_root / "static/images/events").rglob("fete*"))
+
+    def test_regenerate_missing(self, images_root, thread_pool):
+        write_image(images_root, "/static/images/events/a.jpg")
+        write_image(images_root, "/static/images/events/b.png")
+        generate_image_variants("/static/images/events/a.jpg")
+
+        stats = image_service.regenerate_missing_event_variants()
+
+        assert stats == {"total": 2, "generated": 1, "skipped": 1, "failed": 0}
+        assert has_image_variants("/static/images/events/b.png")
@@ -0,0 +1,120 @@
+# tests/test_load_test.py
+"""
+Tests du harnais de test de charge (scripts/load_test.py)
+"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, Form, Request
+from fastapi.responses import JSONResponse, RedirectResponse
+from starlette.middleware.sessions import SessionMiddleware
+
+SCRIPTS_DIR = Path(__file__).parent.parent / "scripts"
+
+
+@pytest.fixture
+def load_test(monkeypatch):
+    """Module load_test importé depuis scripts/"""
+    monkeypatch.syspath_prepend(str(SCRIPTS_DIR))
+    import load_test
+    return load_test
+
+
+def session_app():
+    """Application minimale : connexion par formulaire, toutes les routes exigent la session"""
+    app = FastAPI()
+    hits = []
+
+    @app.post("/login")
+    async def login(request: Request, username: str = Form(...), password: str = Form(...)):
+        if password != "secret":
+            return JSONResponse({"error": "bad password"})
+        request.session["user_id"] = 1
+        return RedirectResponse("/recipes", status_code=303)
+
+    @app.api_route("/{path:path}", methods=["GET", "POST"])
+    async def any_page(request: Request, path: str):
+        if not request.session.get("user_id"):
+            return JSONResponse({"error": "unauthenticated"}, status_code=401)
+        hits.append(f"{request.method} /{path}")
+        return {"items": [], "next_cursor": "abc" if path == "api/recipes/page" and "cursor" not in request.query_params else None}
+
+    app.add_middleware(SessionMiddleware, secret_key="test", session_cookie="recette_session")
+    return app, hits
+
+
+CTX = {
+    "slugs": ["recette-00001"],
+    "event_ids": [1, 2],
+    "shopping_items": {1: [10, 11, 12, 13]},
+    "search_terms": ["gratin"],
+    "months": [(2026, 10)],
+}
+
+
+@pytest.mark.unit
+class TestStats:
+    """Tests de percentile() et LoadStats"""
+
+    def test_percentile_interpolation(self, load_test):
+        values = list(range(1, 101))
+        assert load_test.percentile(values, 50) == pytest.approx(50.5)
+        assert load_test.percentile(values, 99) == pytest.approx(99.01)
+        assert load_test.percentile([7.0], 95) == 7.0
+        assert load_test.percentile([], 50) == 0.0
+
+    def test_report_per_route(self, load_test):
+        stats = load_test.LoadStats()
+        for ms in (10, 20, 30, 40):
+            stats.record("GET /recipes", 200, ms)
+        stats.record("GET /recipe/{slug}", 500, 5)
+        stats.record("GET /recipe/{slug}", 0, 7)
+
+        report = stats.report(elapsed=2.0)
+
+        assert report["requests"] == 6 and report["errors"] == 2 and report["rps"] == 3.0
+        assert list(report["routes"]) == ["GET /recipes", "GET /recipe/{slug}"]
+        recipes = report["routes"]["GET /recipes"]
+        assert recipes["p50_ms"] == 25.0 and recipes["max_ms"] == 40.0 and recipes["rps"] == 2.0
+        assert report["routes"]["GET /recipe/{slug}"]["statuses"] == {"0": 1, "500": 1}
+
+
+@pytest.mark.unit
+class TestRunLoad:
+    """Tests de run_load() en mémoire (transport ASGI)"""
+
+    def test_scenarios_with_session(self, load_test):
+        """Chaque utilisateur se connecte une fois ; les scénarios passent par sa session"""
+        app, hits = session_app()
+        report = asyncio.run(load_test.run_load(
+            load_test.asgi_client_factory(app), CTX, users=3, duration=0.3,
+            credentials=("bench", "secret")))
+
+        assert report["errors"] == 0
+        assert report["routes"]["POST /login"]["count"] == 3
+        assert set(report["scenarios"]) == set(load_test.SCENARIOS)
+        routes = set(report["routes"])
+        assert {"GET /recipe/{slug}", "GET /events/{event_id}/budget",
+                "POST /api/shopping-list/items/{item_id}/update", "GET /api/calendar/month"} <= routes
+        assert "GET /recipe/recette-00001" in hits
+        assert report["routes"]["GET /api/recipes/page"]["count"] == 2 * report["scenarios"]["browse_recipes"]
+
+    def test_failed_login(self, load_test):
+        app, _ = session_app()
+        with pytest.raises(RuntimeError):
+            asyncio.run(load_test.run_load(
+                load_test.asgi_client_factory(app), CTX, users=1, duration=0.1,
+                credentials=("bench", "wrong")))
+
+    def test_context_from_generated_dataset(self, load_test, tmp_path):
+        """build_context() trouve des identifiants pour tous les scénarios"""
+        import generate_dataset
+        path = str(tmp_path / "load.sqlite3")
+        generate_dataset.generate_dataset(path, recipes=20, seed=3)
+
+        ctx = load_test.build_context(path)
+
+        assert ctx["slugs"] and ctx["event_ids"] and ctx["search_terms"] and ctx["months"]
+        assert all(ctx["shopping_items"].values())
@@ -0,0 +1,133 @@
+# tests/test_metrics.py
+"""
+Tests unitaires du registre de métriques et du middleware HTTP
+Teste le format Prometheus, la fusion multi-workers et les gabarits de route
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+
+from app.middleware.metrics import MetricsMiddleware
+from app.services.metrics import DB_QUERIES, HTTP_REQUESTS, LLM_DURATION, MetricsRegistry, llm_call
+
+
+def call_asgi(app, path):
+    """Exécute une requête GET sur une application ASGI, retourne le statut"""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"", "headers": [],
+        "client": ("127.0.0.1", 1234), "server": ("testserver", 80),
+    }
+    asyncio.run(app(scope, receive, send))
+    return messages[0]["status"]
+
+
+@pytest.mark.unit
+class TestMetricsRegistry:
+    """Tests de MetricsRegistry"""
+
+    def test_render_prometheus_text(self):
+        """Compteurs et histogrammes cumulés au format texte"""
+        registry = MetricsRegistry()
+        counter = registry.counter("app_requests_total", "Requêtes", ("route",))
+        histogram = registry.histogram("app_duration_seconds", "Durée", ("route",), buckets=(0.1, 1.0))
+
+        counter.inc(route='/a"b')
+        counter.inc(2, route='/a"b')
+        for value in (0.05, 0.5, 3.0):
+            histogram.observe(value, route="/x")
+
+        text = registry.render()
+        assert '# TYPE app_requests_total counter' in text
+        assert 'app_requests_total{route="/a\\"b"} 3' in text
+        assert 'app_duration_seconds_bucket{route="/x",le="0.1"} 1' in text
+        assert 'app_duration_seconds_bucket{route="/x",le="1"} 2' in text
+        assert 'app_duration_seconds_bucket{route="/x",le="+Inf"} 3' in text
+        assert 'app_duration_seconds_sum{route="/x"} 3.55' in text
+        assert 'app_duration_seconds_count{route="/x"} 3' in text
+
+    def test_labels_are_checked(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("app_total", "Total", ("route",))
+        with pytest.raises(ValueError):
+            counter.inc(path="/x")
+
+    def test_merge_worker_snapshots(self, tmp_path):
+        """Les instantanés des autres workers sont additionnés (jauges : vivants seulement)"""
+        registry = MetricsRegistry(multiprocess_dir=str(tmp_path))
+        registry.counter("app_total", "Total", ("route",)).inc(route="/a")
+        registry.gauge("app_in_progress", "En cours").set(1)
+
+        peer = MetricsRegistry()
+        peer.counter("app_total", "Total", ("route",)).inc(4, route="/a")
+        peer.gauge("app_in_progress", "En cours").set(5)
+        # PID hors plage : processus considéré comme arrêté
+        (tmp_path / "metrics-99999999.json").write_text(json.dumps(peer.snapshot()))
+
+        text = registry.render()
+        assert 'app_total{route="/a"} 5' in text
+        assert 'app_in_progress 1' in text
+
+    def test_llm_call_outcome(self):
+        """Durée des appels LLM étiquetée par service et résultat"""
+        before = LLM_DURATION._values.get(("TestService", "error"), [0])[0:-1]
+        with pytest.raises(RuntimeError):
+            with llm_call("TestService"):
+                raise RuntimeError("quota")
+        after = LLM_DURATION._values[("TestService", "error")][0:-1]
+        assert sum(after) == sum(before) + 1
+
+
+@pytest.mark.unit
+class TestMetricsMiddleware:
+    """Tests de MetricsMiddleware"""
+
+    def test_route_template_label(self):
+        """L'étiquette route est le gabarit, pas le chemin brut"""
+        app = FastAPI()
+
+        @app.get("/events/{event_id}/budget")
+        async def event_budget(event_id: int):
+            return {"event_id": event_id}
+
+        wrapped = MetricsMiddleware(app)
+        key = ("GET", "/events/{event_id}/budget", "2xx")
+        before = HTTP_REQUESTS._values.get(key, 0)
+
+        assert call_asgi(wrapped, "/events/12/budget") == 200
+        assert call_asgi(wrapped, "/events/13/budget") == 200
+        assert call_asgi(wrapped, "/nowhere") == 404
+
+        assert HTTP_REQUESTS._values[key] == before + 2
+        assert HTTP_REQUESTS._values[("GET", "<unmatched>", "4xx")] >= 1
+        assert ("/events/{event_id}/budget",) in DB_QUERIES._values
+
+    def test_counts_sql_queries_per_request(self, tmp_path, monkeypatch):
+        """Les requêtes SQL exécutées pendant la requête (même en threadpool) sont comptées"""
+        from app.models import db_core
+        monkeypatch.setattr(db_core, "DB_PATH", str(tmp_path / "metrics.sqlite3"))
+        app = FastAPI()
+
+        @app.get("/recipes/{slug}")
+        def recipe_detail(slug: str):
+            with db_core.get_db() as con:
+                con.execute("SELECT 1").fetchone()
+                con.execute("SELECT 2").fetchone()
+            return {"slug": slug}
+
+        key = ("/recipes/{slug}",)
+        before = DB_QUERIES._values.get(key, [0.0])[-1]
+        assert call_asgi(MetricsMiddleware(app), "/recipes/tarte") == 200
+        assert DB_QUERIES._values[key][-1] == before + 2
@@ -0,0 +1,165 @@
+# tests/test_migration_runner.py
+"""
+Tests du runner de migrations versionnées et de la vérification au démarrage
+"""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.services.migration_runner import (
+    apply_migrations, check_schema, expected_indexes, get_status, load_manifest,
+    mark_applied, split_statements,
+)
+
+ROOT = Path(__file__).parent.parent
+
+
+def write_migrations(directory, files):
+    """Écrit les fichiers et un manifeste qui les liste dans l'ordre donné"""
+    directory.mkdir(exist_ok=True)
+    for name, sql in files.items():
+        (directory / name).write_text(sql, encoding="utf-8")
+    (directory / "manifest.txt").write_text("# ordre\n\n" + "\n".join(files) + "\n", encoding="utf-8")
+    return str(directory)
+
+
+MIGRATIONS = {
+    "001_recipe.sql": """
+-- Migration: recettes
+BEGIN TRANSACTION;
+CREATE TABLE recipe (id INTEGER PRIMARY KEY, slug TEXT, updated INTEGER DEFAULT 0);
+COMMIT;
+""",
+    "002_trigger.sql": """
+CREATE TRIGGER recipe_touch AFTER UPDATE OF slug ON recipe
+BEGIN
+    UPDATE recipe SET updated = 1 WHERE id = NEW.id;
+END;
+""",
+    "add_performance_indexes.sql": "CREATE INDEX IF NOT EXISTS idx_recipe_slug ON recipe(slug);\n",
+}
+
+
+def table_names(con):
+    return {row[0] for row in con.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger', 'index')")}
+
+
+@pytest.mark.unit
+class TestSplitStatements:
+    """Tests de split_statements()"""
+
+    def test_triggers_kept_transactions_dropped(self):
+        statements = split_statements(MIGRATIONS["001_recipe.sql"] + MIGRATIONS["002_trigger.sql"])
+        assert len(statements) == 2
+        assert statements[0].startswith("CREATE TABLE recipe")
+        assert statements[1].startswith("CREATE TRIGGER") and statements[1].endswith("END;")
+
+
+@pytest.mark.database
+class TestApplyMigrations:
+    """Tests de apply_migrations(), mark_applied() et get_status()"""
+
+    def test_apply_in_order_once(self, tmp_path):
+        directory = write_migrations(tmp_path / "migrations", MIGRATIONS)
+        con = sqlite3.connect(tmp_path / "db.sqlite3")
+
+        results = apply_migrations(con, directory)
+
+        assert [r["name"] for r in results] == list(MIGRATIONS)
+        assert {"recipe", "recipe_touch", "idx_recipe_slug", "schema_migrations"} <= table_names(con)
+        status = get_status(con, directory)
+        assert status["applied"] == list(MIGRATIONS) and status["pending"] == []
+        assert apply_migrations(con, directory) == []
+
+    def test_failed_migration_rolled_back(self, tmp_path):
+        files = dict(MIGRATIONS)
+        files["002_trigger.sql"] = "CREATE TABLE half_done (id INTEGER);\nINSERT INTO missing_table VALUES (1);\n"
+        directory = write_migrations(tmp_path / "migrations", files)
+        con = sqlite3.connect(tmp_path / "db.sqlite3")
+
+        with pytest.raises(RuntimeError, match="002_trigger.sql"):
+            apply_migrations(con, directory)
+
+        assert "recipe" in table_names(con) and "half_done" not in table_names(con)
+        assert get_status(con, directory)["pending"] == ["002_trigger.sql", "add_performance_indexes.sql"]
+
+    def test_dry_run_keeps_nothing(self, tmp_path):
+        directory = write_migrations(tmp_path / "migrations", MIGRATIONS)
+        con = sqlite3.connect(tmp_path / "db.sqlite3")
+
+        results = apply_migrations(con, directory, dry_run=True, target="002_trigger.sql")
+
+        assert [r["name"] for r in results] == ["001_recipe.sql", "002_trigger.sql"]
+        assert table_names(con) == set()
+
+    def test_modified_migration_blocks_apply(self, tmp_path):
+        directory = write_migrations(tmp_path / "migrations", MIGRATIONS)
+        con = sqlite3.connect(tmp_path / "db.sqlite3")
+        apply_migrations(con, directory, target="001_recipe.sql")
+        (tmp_path / "migrations" / "001_recipe.sql").write_text("CREATE TABLE other (id INTEGER);\n")
+
+        assert get_status(con, directory)["modified"] == ["001_recipe.sql"]
+        with pytest.raises(RuntimeError, match="modifiées"):
+            apply_migrations(con, directory)
+
+    def test_untracked_database_needs_baseline(self, tmp_path):
+        """Une base existante non suivie est d'abord marquée, puis seules les suivantes s'appliquent"""
+        directory = write_migrations(tmp_path / "migrations", MIGRATIONS)
+        con = sqlite3.connect(tmp_path / "db.sqlite3")
+        con.execute("CREATE TABLE recipe (id INTEGER PRIMARY KEY, slug TEXT, updated INTEGER DEFAULT 0)")
+        with pytest.raises(RuntimeError, match="mark_applied"):
+            apply_migrations(con, directory)
+
+        assert mark_applied(con, directory, until="001_recipe.sql") == ["001_recipe.sql"]
+        assert [r["name"] for r in apply_migrations(con, directory)] == ["002_trigger.sql", "add_performance_indexes.sql"]
+
+    def test_schema_then_apply_is_noop(self, tmp_path):
+        """Base créée comme `migrate.py init` : apply ne trouve rien à exécuter"""
+        con = sqlite3.connect(tmp_path / "init.sqlite3")
+        con.executescript((ROOT / "scripts" / "schema.sql").read_text(encoding="utf-8"))
+        mark_applied(con)
+        before = con.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name").fetchall()
+
+        assert apply_migrations(con) == []
+        assert get_status(con)["pending"] == []
+        assert con.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name").fetchall() == before
+        con.close()
+
+
+@pytest.mark.database
+class TestCheckSchema:
+    """Tests de check_schema()"""
+
+    def test_reports_missing_index_and_pending(self, tmp_path):
+        directory = write_migrations(tmp_path / "migrations", MIGRATIONS)
+        path = tmp_path / "db.sqlite3"
+        con = sqlite3.connect(path)
+        apply_migrations(con, directory, target="002_trigger.sql")
+        con.close()
+
+        problems = check_schema(str(path), directory)
+
+        assert any("idx_recipe_slug" in p for p in problems)
+        assert any("en attente : add_performance_indexes.sql" in p for p in problems)
+
+    def test_untracked_and_absent(self, tmp_path):
+        directory = write_migrations(tmp_path / "migrations", MIGRATIONS)
+        path = tmp_path / "db.sqlite3"
+        sqlite3.connect(path).execute("CREATE TABLE recipe (id INTEGER)")
+        assert any("schema_migrations" in p for p in check_schema(str(path), directory))
+        assert check_schema(str(tmp_path / "missing.sqlite3"), directory)[0].startswith("Base de données absente")
+
+    def test_real_manifest_matches_schema(self, tmp_path):
+        """Tous les fichiers du manifeste existent ; schema.sql contient les index de performance"""
+        assert len(load_manifest()) == len(list((ROOT / "migrations").glob("*.sql")))
+        path = tmp_path / "schema.sqlite3"
+        con = sqlite3.connect(path)
+        con.executescript((ROOT / "scripts" / "schema.sql").read_text(encoding="utf-8"))
+        mark_applied(con)
+        con.close()
+
+        assert expected_indexes()
+        assert check_schema(str(path)) == []
+
@@ -0,0 +1,136 @@
+# tests/test_paginated_lists.py
+"""
+Tests des listes paginées par curseur (recettes, événements)
+
+Recherche, filtres et tri sont appliqués en SQL : parcourir toutes les pages
+doit donner exactement les lignes filtrées, dans l'ordre demandé, quelle que
+soit la page où elles se trouvent.
+"""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.models.db_core import decode_cursor, keyset_page
+from app.models.db_events import list_events
+from app.models.db_recipes import list_recipes
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def lists_db(tmp_path, monkeypatch):
+    """Schéma complet : 12 recettes (une sans traduction), 9 événements"""
+    from app.models import db_core
+    path = str(tmp_path / "lists.sqlite3")
+    monkeypatch.setattr(db_core, "DB_PATH", path)
+
+    con = sqlite3.connect(path)
+    con.executescript((ROOT / "scripts" / "schema.sql").read_text(encoding="utf-8"))
+    con.executescript("""
+        INSERT INTO user (id, username, email, password_hash) VALUES (1, 'ana', 'a@x', 'h'), (2, 'bob', 'b@x', 'h');
+        INSERT INTO category (id, name_fr, name_jp) VALUES (1, 'Dessert', 'デザート'), (2, 'Soupe', 'スープ');
+        INSERT INTO event_type (id, name_fr, name_jp, recipe_type_fr, recipe_type_jp) VALUES (1, 'Repas', '食事', 'Plat', '料理');
+    """)
+    names = ["tarte", "Abricot", "crumble", "Banane", "dashi", "Éclair", "flan", "Gâteau", "miso", "Nougat", "pho"]
+    for i, name in enumerate(names, start=1):
+        con.execute("INSERT INTO recipe (id, slug, servings_default, user_id) VALUES (?, ?, ?, ?)",
+                    (i, f"r{i}", i % 4 + 1, 1 + i % 2))
+        con.execute("INSERT INTO recipe_translation (recipe_id, lang, name) VALUES (?, 'fr', ?)", (i, name))
+        con.execute("INSERT INTO recipe_category (recipe_id, category_id) VALUES (?, ?)", (i, 1 + i % 3 // 2))
+    con.execute("INSERT INTO recipe (id, slug, servings_default) VALUES (12, 'zz-sans-traduction', 2)")
+    for i in range(1, 10):
+        con.execute("INSERT INTO event (id, event_type_id, name, event_date, location, attendees, user_id) "
+                    "VALUES (?, 1, ?, ?, ?, ?, 1)",
+                    (i, f"Fête {i}", f"2026-0{i}-01", "Lyon" if i % 3 == 0 else "Paris", 10 - i))
+    con.commit()
+    yield con
+    con.close()
+
+
+def walk(fetch, page_size=3):
+    """Parcourt toutes les pages : fetch(after, limit) → lignes"""
+    rows, after = [], None
+    while True:
+        page, cursor = keyset_page(fetch(after, page_size + 1), page_size, "sort_key", "id")
+        rows.extend(page)
+        if cursor is None:
+            return rows
+        after = decode_cursor(cursor, 2)
+
+
+@pytest.mark.database
+class TestRecipeSortName:
+    """Tests des triggers de migrations/add_recipe_sort_name.sql"""
+
+    def test_sort_name_follows_translations(self, lists_db):
+        def sort_names():
+            return lists_db.execute("SELECT sort_name_fr, sort_name_jp FROM recipe WHERE id = 1").fetchone()
+
+        assert sort_names() == ("tarte", "r1")
+
+        lists_db.execute("INSERT INTO recipe_translation (recipe_id, lang, name) VALUES (1, 'jp', 'タルト')")
+        lists_db.execute("UPDATE recipe_translation SET name = 'Tarte fine' WHERE recipe_id = 1 AND lang = 'fr'")
+        assert sort_names() == ("Tarte fine", "タルト")
+
+        lists_db.execute("DELETE FROM recipe_translation WHERE recipe_id = 1 AND lang = 'jp'")
+        lists_db.execute("UPDATE recipe SET slug = 'tarte-fine' WHERE id = 1")
+        assert sort_names() == ("Tarte fine", "tarte-fine")
+
+    def test_untranslated_recipe_uses_slug(self, lists_db):
+        assert lists_db.execute("SELECT sort_name_fr FROM recipe WHERE id = 12").fetchone()[0] == "zz-sans-traduction"
+
+
+@pytest.mark.database
+class TestListRecipes:
+    """Tests de list_recipes() paginée"""
+
+    def test_pages_follow_name_order(self, lists_db):
+        """Ordre insensible à la casse, recette non traduite comprise"""
+        rows = walk(lambda after, limit: list_recipes("fr", limit=limit, after=after))
+        names = [r["name"] for r in rows]
+        assert len(rows) == 12
+        assert [n.lower() for n in names] == sorted(n.lower() for n in names)
+
+    def test_filters_apply_beyond_first_page(self, lists_db):
+        """Les recettes filtrées sont trouvées même au-delà de la première page"""
+        expected = {r[0] for r in lists_db.execute("SELECT recipe_id FROM recipe_category WHERE category_id = 2")}
+        rows = walk(lambda after, limit: list_recipes("fr", limit=limit, after=after, category_ids=[2]))
+        assert {r["id"] for r in rows} == expected
+
+        rows = walk(lambda after, limit: list_recipes("fr", limit=limit, after=after, search="NANE"))
+        assert {r["name"] for r in rows} == {"Banane"}
+
+    def test_descending_and_other_sorts(self, lists_db):
+        """Ordre décroissant et tri par nombre de personnes (curseur sort_key + id)"""
+        rows = walk(lambda after, limit: list_recipes("fr", limit=limit, after=after, descending=True))
+        assert [r["id"] for r in rows] == [r["id"] for r in reversed(
+            walk(lambda after, limit: list_recipes("fr", limit=limit, after=after)))]
+
+        rows = walk(lambda after, limit: list_recipes("fr", limit=limit, after=after, sort="servings"))
+        assert [(r["servings"], r["id"]) for r in rows] == sorted((r["servings"], r["id"]) for r in rows)
+        assert len(rows) == 12
+
+    def test_creator_filter_uses_sort_index(self, lists_db):
+        rows = walk(lambda after, limit: list_recipes("fr", user_id=2, limit=limit, after=after))
+        assert rows and all(r["user_id"] == 2 for r in rows)
+        assert len(rows) == lists_db.execute("SELECT COUNT(*) FROM recipe WHERE user_id = 2").fetchone()[0]
+
+
+@pytest.mark.database
+class TestListEvents:
+    """Tests de list_events() paginée"""
+
+    def test_default_order_is_most_recent_first(self, lists_db):
+        rows = walk(lambda after, limit: list_events(lang="fr", limit=limit, after=after))
+        assert [r["id"] for r in rows] == list(range(9, 0, -1))
+
+    def test_search_and_sort(self, lists_db):
+        """Recherche sur toutes les pages, tri par convives croissant"""
+        rows = walk(lambda after, limit: list_events(lang="fr", limit=limit, after=after, search="lyon"))
+        assert [r["id"] for r in rows] == [9, 6, 3]
+
+        rows = walk(lambda after, limit: list_events(lang="fr", limit=limit, after=after,
+                                                     sort="attendees", descending=False), page_size=2)
+        assert [r["attendees"] for r in rows] == list(range(1, 10))
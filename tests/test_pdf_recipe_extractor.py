@@ -0,0 +1,157 @@
+# tests/test_pdf_recipe_extractor.py
+"""
+Tests unitaires pour l'extracteur de recettes PDF
+Teste l'extraction par page (cache, plafond de pages), le découpage en blocs
+et le texte envoyé à l'IA
+"""
+
+import pytest
+import PyPDF2
+
+from app.services import pdf_recipe_extractor
+from app.services.pdf_recipe_extractor import PDFRecipeExtractor
+
+
+@pytest.fixture
+def extractor():
+    """Extracteur sans client Groq (pas d'appel IA dans ces tests)"""
+    instance = PDFRecipeExtractor()
+    instance.groq_client = None
+    return instance
+
+
+@pytest.fixture
+def blank_pdf(tmp_path):
+    """Crée un PDF de 3 pages blanches"""
+    writer = PyPDF2.PdfWriter()
+    for _ in range(3):
+        writer.add_blank_page(width=200, height=200)
+    path = tmp_path / "recette.pdf"
+    with open(path, "wb") as f:
+        writer.write(f)
+    return str(path)
+
+
+class TestExtractPages:
+    """Tests pour extract_pages_from_pdf()"""
+
+    @pytest.mark.unit
+    def test_cache_par_hash(self, extractor, blank_pdf, monkeypatch):
+        """Un même fichier n'est extrait qu'une seule fois"""
+        monkeypatch.setattr(pdf_recipe_extractor, "_text_cache", pdf_recipe_extractor.OrderedDict())
+        calls = []
+        original = pdf_recipe_extractor._extract_page_range
+
+        def counting(path, start, end):
+            calls.append((start, end))
+            return original(path, start, end)
+
+        monkeypatch.setattr(pdf_recipe_extractor, "_extract_page_range", counting)
+
+        first = extractor.extract_pages_from_pdf(blank_pdf)
+        second = extractor.extract_pages_from_pdf(blank_pdf)
+
+        assert first == second == ["", "", ""]
+        assert calls == [(0, 3)], "La deuxième extraction doit venir du cache"
+
+    @pytest.mark.unit
+    def test_plafond_de_pages(self, extractor, blank_pdf, monkeypatch):
+        """Les pages au-delà de MAX_PDF_PAGES sont ignorées"""
+        monkeypatch.setattr(pdf_recipe_extractor, "_text_cache", pdf_recipe_extractor.OrderedDict())
+        monkeypatch.setattr(pdf_recipe_extractor, "MAX_PDF_PAGES", 2)
+
+        assert len(extractor.extract_pages_from_pdf(blank_pdf)) == 2
+
+
+class TestIterTextChunks:
+    """Tests pour iter_text_chunks()"""
+
+    @pytest.mark.unit
+    def test_pages_regroupees(self, extractor):
+        """Les petites pages sont regroupées dans un même bloc"""
+        chunks = list(extractor.iter_text_chunks(["Tarte", "", "Quiche"], max_chars=100))
+        assert chunks == ["Tarte\n\nQuiche"]
+
+    @pytest.mark.unit
+    def test_blocs_bornes(self, extractor):
+        """Aucun bloc ne dépasse max_chars"""
+        pages = ["a" * 40, "b" * 40, "c" * 40]
+        chunks = list(extractor.iter_text_chunks(pages, max_chars=90))
+        assert chunks == ["a" * 40 + "\n\n" + "b" * 40, "c" * 40]
+
+    @pytest.mark.unit
+    def test_page_trop_longue_decoupee(self, extractor):
+        """Une page plus longue que max_chars est découpée sur les lignes"""
+        page = "\n".join(["ligne %02d" % i for i in range(10)])
+        chunks = list(extractor.iter_text_chunks([page], max_chars=30))
+        assert len(chunks) > 1
+        assert all(len(c) <= 30 for c in chunks)
+        assert "\n".join(chunks) == page
+
+    @pytest.mark.unit
+    def test_ligne_trop_longue_coupee(self, extractor):
+        """Une ligne plus longue que max_chars (texte sans retours) est coupée en tranches"""
+        line = "".join(chr(ord("a") + i % 26) for i in range(95))
+        chunks = list(extractor.iter_text_chunks(["court", "titre\n" + line], max_chars=30))
+        assert all(len(c) <= 30 for c in chunks)
+        assert chunks[0] == "court"
+        assert "".join(c.replace("\n", "") for c in chunks[1:]) == "titre" + line
+
+    @pytest.mark.unit
+    def test_bloc_suivant_borne(self, extractor):
+        """La fin d'une page découpée, complétée par la page suivante, reste sous max_chars"""
+        chunks = list(extractor.iter_text_chunks(["x" * 25 + "\n" + "y" * 10, "z" * 18], max_chars=30))
+        assert chunks == ["x" * 25, "y" * 10 + "\n\n" + "z" * 18]
+
+        chunks = list(extractor.iter_text_chunks(["x" * 25 + "\n" + "y" * 10, "z" * 19], max_chars=30))
+        assert chunks == ["x" * 25, "y" * 10, "z" * 19]
+
+
+class TestExtractRecipes:
+    """Tests du texte envoyé à l'IA (analyse remplacée par un enregistreur)"""
+
+    @pytest.fixture
+    def analyzed(self, extractor, monkeypatch):
+        sent = []
+
+        def analyze(text, target_lang="fr"):
+            sent.append(text)
+            return {"name": f"recette {len(sent)}"} if text.startswith("recette") else {}
+
+        monkeypatch.setattr(extractor, "analyze_recipe_with_ai", analyze)
+        return sent
+
+    @pytest.mark.unit
+    def test_texte_complet_s_il_tient(self, extractor, analyzed, monkeypatch):
+        monkeypatch.setattr(extractor, "extract_pages_from_pdf", lambda path: ["recette", "", "étapes"])
+
+        assert extractor.extract_recipe_from_pdf("x.pdf") == {"name": "recette 1"}
+        assert analyzed == ["recette\n\nétapes"]
+
+    @pytest.mark.unit
+    def test_texte_tronque_signale(self, extractor, analyzed, monkeypatch, caplog):
+        monkeypatch.setattr(extractor, "extract_pages_from_pdf", lambda path: ["recette" + "x" * 6993, "y" * 7000])
+
+        with caplog.at_level("WARNING", logger=pdf_recipe_extractor.__name__):
+            extractor.extract_recipe_from_pdf("x.pdf")
+
+        assert analyzed == ["recette" + "x" * 6993]
+        assert "7000 premiers sont analysés, 7002 ignorés" in caplog.text
+
+    @pytest.mark.unit
+    def test_pdf_sans_texte(self, extractor, analyzed, monkeypatch):
+        monkeypatch.setattr(extractor, "extract_pages_from_pdf", lambda path: ["", "  "])
+
+        assert extractor.extract_recipe_from_pdf("x.pdf") is None
+        assert analyzed == []
+
+    @pytest.mark.unit
+    def test_livre_analyse_bloc_par_bloc(self, extractor, analyzed, monkeypatch):
+        """Chaque bloc est analysé ; ceux sans recette sont ignorés"""
+        monkeypatch.setattr(extractor, "extract_pages_from_pdf",
+                            lambda path: ["recette tarte" + "x" * 7000, "sommaire" + "y" * 7000, "recette flan" + "z" * 7000])
+
+        recipes = list(extractor.extract_recipes_from_pdf("x.pdf"))
+
+        assert len(analyzed) == 3
+        assert recipes == [{"name": "recette 1"}, {"name": "recette 3"}]
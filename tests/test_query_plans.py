@@ -0,0 +1,192 @@
+# tests/test_query_plans.py
+"""
+Tests de non-régression des plans d'exécution des requêtes les plus sollicitées
+
+Les fonctions du modèle sont exécutées sur le schéma réel (scripts/schema.sql,
+base générée par scripts/generate_dataset.py puis ANALYZE) ; les instructions
+SQL émises sont capturées par le traçage SQL, puis leur EXPLAIN QUERY PLAN est
+examiné : aucun parcours complet (SCAN) d'une grande table n'est admis, hors
+exceptions listées dans EXPECTED_SCANS.
+"""
+
+import contextlib
+import io
+import re
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from config import Config
+from app.services.sql_trace import start_trace, stop_trace
+
+SCRIPTS_DIR = Path(__file__).parent.parent / "scripts"
+
+# Tables qui grossissent avec l'usage : un SCAN y est une régression
+LARGE_TABLES = {
+    "recipe", "recipe_translation", "recipe_ingredient", "recipe_ingredient_translation",
+    "step", "step_translation", "event", "event_recipe", "event_date", "event_participant",
+    "shopping_list_item", "shopping_list_item_source", "ingredient_price_catalog",
+    "meal_plan", "event_expense", "access_log", "user",
+}
+
+# Parcours attendus : (fonction, table) → raison
+# Les variantes paginées (_page) n'ont aucune exception : reprise après le
+# curseur par SEARCH sur l'index de tri, sans B-tree temporaire
+EXPECTED_SCANS = {
+    ("list_recipes", "recipe"): "liste complète parcourue dans l'ordre de idx_recipe_sort_name_fr",
+    ("list_events", "event"): "liste complète parcourue dans l'ordre de idx_event_date_id",
+}
+
+_TABLE_ALIAS = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(?!ON\b|WHERE\b|LEFT\b|JOIN\b|INNER\b|GROUP\b|ORDER\b|LIMIT\b)(\w+))?",
+                          re.IGNORECASE)
+
+
+@pytest.fixture(scope="module")
+def dataset(tmp_path_factory):
+    """Base générée une fois pour le module et échantillon d'identifiants"""
+    import sys
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    try:
+        from generate_dataset import generate_dataset
+    finally:
+        sys.path.remove(str(SCRIPTS_DIR))
+    path = str(tmp_path_factory.mktemp("plans") / "plans.sqlite3")
+    generate_dataset(path, recipes=100, seed=7)
+
+    con = sqlite3.connect(path)
+    try:
+        month = con.execute("SELECT MAX(date) FROM meal_plan").fetchone()[0]
+        sample = {
+            "path": path,
+            "event_id": con.execute(
+                "SELECT event_id FROM shopping_list_item GROUP BY event_id ORDER BY COUNT(*) DESC").fetchone()[0],
+            "slug": con.execute("SELECT slug FROM recipe ORDER BY id").fetchone()[0],
+            "user_id": con.execute("SELECT MIN(id) FROM user").fetchone()[0],
+            "event_date": con.execute("SELECT MAX(event_date) FROM event").fetchone()[0],
+            "ingredient": con.execute("SELECT ingredient_name_fr FROM ingredient_price_catalog ORDER BY id").fetchone()[0],
+            "year": int(month[:4]),
+            "month": int(month[5:7]),
+        }
+    finally:
+        con.close()
+    return sample
+
+
+@pytest.fixture
+def plans(dataset, monkeypatch):
+    """capture(fonction) → [(sql, [lignes du plan])] pour chaque SELECT émis"""
+    from app.models import db_core
+    monkeypatch.setattr(db_core, "DB_PATH", dataset["path"])
+    monkeypatch.setattr(Config, "SQL_TRACE", True)
+    con = sqlite3.connect(dataset["path"])
+
+    def capture(function):
+        token, trace = start_trace()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                function()
+        finally:
+            stop_trace(token)
+        result, seen = [], set()
+        for query in trace.queries:
+            sql = query.sql.strip()
+            if sql in seen or not sql.upper().startswith(("SELECT", "WITH")):
+                continue
+            seen.add(sql)
+            rows = con.execute("EXPLAIN QUERY PLAN " + sql, query.params or ()).fetchall()
+            result.append((sql, [row[3] for row in rows]))
+        assert result, "aucune requête capturée"
+        return result
+
+    yield capture
+    con.close()
+
+
+def unexpected_scans(name: str, captured: list) -> list:
+    """SCAN de grandes tables absents de EXPECTED_SCANS : [(table, détail, sql)]"""
+    found = []
+    for sql, details in captured:
+        aliases = {}
+        for table, alias in _TABLE_ALIAS.findall(sql):
+            aliases[table.lower()] = table.lower()
+            if alias:
+                aliases[alias.lower()] = table.lower()
+        for detail in details:
+            match = re.match(r"SCAN (\w+)", detail)
+            if not match:
+                continue
+            table = aliases.get(match.group(1).lower(), match.group(1).lower())
+            if table in LARGE_TABLES and (name, table) not in EXPECTED_SCANS:
+                found.append((table, detail, " ".join(sql.split())[:200]))
+    return found
+
+
+def _calls(sample):
+    import app.models as m
+    return {
+        "get_event_recipes_with_ingredients": lambda: m.get_event_recipes_with_ingredients(sample["event_id"], "fr"),
+        "list_events": lambda: m.list_events(lang="fr"),
+        "list_events_page": lambda: m.list_events(lang="fr", limit=20, after=(sample["event_date"], 0)),
+        "list_events_user": lambda: m.list_events(user_id=sample["user_id"], lang="jp"),
+        "list_events_user_page": lambda: m.list_events(user_id=sample["user_id"], lang="fr", limit=20,
+                                                       after=(sample["event_date"], 0)),
+        "list_recipes": lambda: m.list_recipes("fr"),
+        "list_recipes_page": lambda: m.list_recipes("jp", limit=24, after=("m", 0)),
+        "list_recipes_user_page": lambda: m.list_recipes("fr", user_id=sample["user_id"], limit=24,
+                                                         after=("m", 0)),
+        "get_shopping_list_items": lambda: m.get_shopping_list_items(sample["event_id"], "jp"),
+        "calculate_recipe_cost_fr": lambda: m.calculate_recipe_cost(sample["slug"], "fr"),
+        "calculate_recipe_cost_jp": lambda: m.calculate_recipe_cost(sample["slug"], "jp"),
+        "get_event_budget_summary": lambda: m.get_event_budget_summary(sample["event_id"]),
+        "get_ingredient_from_catalog": lambda: m.get_ingredient_from_catalog(ingredient_name=sample["ingredient"]),
+        "get_calendar_data": lambda: m.get_calendar_data(sample["year"], sample["month"], "fr", sample["user_id"]),
+    }
+
+
+HOT_FUNCTIONS = [
+    "get_event_recipes_with_ingredients", "list_events", "list_events_page", "list_events_user",
+    "list_events_user_page", "list_recipes", "list_recipes_page", "list_recipes_user_page",
+    "get_shopping_list_items", "calculate_recipe_cost_fr", "calculate_recipe_cost_jp",
+    "get_event_budget_summary", "get_ingredient_from_catalog", "get_calendar_data",
+]
+
+PAGINATED_FUNCTIONS = [call for call in HOT_FUNCTIONS if call.endswith("_page")]
+
+
+@pytest.mark.database
+class TestHotQueryPlans:
+    """Aucun parcours complet inattendu d'une grande table"""
+
+    @pytest.mark.parametrize("call", HOT_FUNCTIONS)
+    def test_no_unexpected_scan(self, call, plans, dataset):
+        name = re.sub(r"_(fr|jp)$", "", call)
+        scans = unexpected_scans(name, plans(_calls(dataset)[call]))
+        assert not scans, "\n".join(f"{table}: {detail}\n    {sql}" for table, detail, sql in scans)
+
+    @pytest.mark.parametrize("call", PAGINATED_FUNCTIONS)
+    def test_page_follows_sort_index(self, call, plans, dataset):
+        """Une page coûte le même prix que la première : ni SCAN ni tri temporaire"""
+        for sql, details in plans(_calls(dataset)[call]):
+            if "LIMIT" not in sql:
+                continue
+            bad = [d for d in details if d.startswith("SCAN") or "TEMP B-TREE" in d]
+            assert not bad, f"{bad}\n    {' '.join(sql.split())[:200]}"
+
+
+@pytest.mark.unit
+class TestUnexpectedScans:
+    """Tests de la détection des SCAN (alias résolus, exceptions)"""
+
+    def test_alias_resolution(self):
+        captured = [(
+            "SELECT * FROM shopping_list_item sli LEFT JOIN ingredient_price_catalog AS ipc ON 1 "
+            "JOIN unit_conversion uc ON 1",
+            ["SEARCH sli USING INDEX idx (event_id=?)", "SCAN ipc LEFT-JOIN", "SCAN uc"],
+        )]
+        assert [s[0] for s in unexpected_scans("get_shopping_list_items", captured)] == ["ingredient_price_catalog"]
+
+    def test_expected_scan_allowed(self):
+        captured = [("SELECT * FROM recipe r", ["SCAN r USING INDEX idx_recipe_user"])]
+        assert unexpected_scans("list_recipes", captured) == []
+        assert unexpected_scans("list_events", captured) != []
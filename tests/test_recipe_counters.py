@@ -0,0 +1,155 @@
+# tests/test_recipe_counters.py
+"""
+Tests des compteurs de recettes (migrations/add_recipe_counters.sql)
+
+ingredient_count, step_count (étapes texte) et available_langs sont tenus à
+jour par triggers à l'insertion, la modification et la suppression.
+"""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.models.db_recipes import list_recipes
+
+ROOT = Path(__file__).resolve().parent.parent
+MIGRATION = ROOT / "migrations" / "add_recipe_counters.sql"
+
+
+@pytest.fixture
+def counters_db(tmp_path, monkeypatch):
+    """Schéma complet : deux recettes sans contenu"""
+    from app.models import db_core
+    path = str(tmp_path / "counters.sqlite3")
+    monkeypatch.setattr(db_core, "DB_PATH", path)
+
+    con = sqlite3.connect(path)
+    con.executescript((ROOT / "scripts" / "schema.sql").read_text(encoding="utf-8"))
+    con.execute("INSERT INTO recipe (id, slug) VALUES (1, 'tarte'), (2, 'flan')")
+    con.commit()
+    yield con
+    con.close()
+
+
+def counters(con, recipe_id=1):
+    return con.execute(
+        "SELECT ingredient_count, step_count, available_langs FROM recipe WHERE id = ?", (recipe_id,)
+    ).fetchone()
+
+
+@pytest.mark.database
+class TestIngredientCount:
+    """Triggers recipe_counter_ingredient_*"""
+
+    def test_insert_delete(self, counters_db):
+        counters_db.executemany("INSERT INTO recipe_ingredient (recipe_id, position) VALUES (1, ?)", [(1,), (2,), (3,)])
+        assert counters(counters_db)[0] == 3
+
+        counters_db.execute("DELETE FROM recipe_ingredient WHERE position = 2")
+        assert counters(counters_db)[0] == 2
+
+    def test_move_between_recipes(self, counters_db):
+        counters_db.execute("INSERT INTO recipe_ingredient (id, recipe_id, position) VALUES (10, 1, 1)")
+
+        counters_db.execute("UPDATE recipe_ingredient SET quantity = 2, position = 5 WHERE id = 10")
+        assert counters(counters_db)[0] == 1 and counters(counters_db, 2)[0] == 0
+
+        counters_db.execute("UPDATE recipe_ingredient SET recipe_id = 2 WHERE id = 10")
+        assert counters(counters_db)[0] == 0 and counters(counters_db, 2)[0] == 1
+
+    def test_recipe_delete_cascades(self, counters_db):
+        """La suppression en cascade ne touche pas les compteurs des autres recettes"""
+        counters_db.execute("PRAGMA foreign_keys = ON")
+        counters_db.execute("INSERT INTO recipe_ingredient (recipe_id, position) VALUES (1, 1), (2, 1)")
+        counters_db.execute("DELETE FROM recipe WHERE id = 1")
+        assert counters(counters_db, 2)[0] == 1
+
+
+@pytest.mark.database
+class TestStepCount:
+    """Triggers recipe_counter_step_* : seules les étapes texte comptent"""
+
+    def test_insert_delete_text_only(self, counters_db):
+        counters_db.execute("INSERT INTO step (id, recipe_id, position, type) VALUES (1, 1, 1, 'text')")
+        counters_db.execute("INSERT INTO step (id, recipe_id, position, type) VALUES (2, 1, 2, 'image')")
+        counters_db.execute("INSERT INTO step (id, recipe_id, position) VALUES (3, 1, 3)")
+        assert counters(counters_db)[1] == 2
+
+        counters_db.execute("DELETE FROM step WHERE id = 2")
+        assert counters(counters_db)[1] == 2
+        counters_db.execute("DELETE FROM step WHERE id = 1")
+        assert counters(counters_db)[1] == 1
+
+    def test_type_change_and_move(self, counters_db):
+        counters_db.execute("INSERT INTO step (id, recipe_id, position, type) VALUES (1, 1, 1, 'image')")
+
+        counters_db.execute("UPDATE step SET type = 'text' WHERE id = 1")
+        assert counters(counters_db)[1] == 1
+
+        counters_db.execute("UPDATE step SET position = 4 WHERE id = 1")
+        assert counters(counters_db)[1] == 1
+
+        counters_db.execute("UPDATE step SET recipe_id = 2 WHERE id = 1")
+        assert counters(counters_db)[1] == 0 and counters(counters_db, 2)[1] == 1
+
+        counters_db.execute("UPDATE step SET type = 'image' WHERE id = 1")
+        assert counters(counters_db, 2)[1] == 0
+
+
+@pytest.mark.database
+class TestAvailableLangs:
+    """Triggers recipe_counter_translation_* : langues triées"""
+
+    def test_insert_update_delete(self, counters_db):
+        counters_db.execute("INSERT INTO recipe_translation (recipe_id, lang, name) VALUES (1, 'jp', 'タルト')")
+        assert counters(counters_db)[2] == "jp"
+        counters_db.execute("INSERT INTO recipe_translation (recipe_id, lang, name) VALUES (1, 'fr', 'Tarte')")
+        assert counters(counters_db)[2] == "fr,jp"
+
+        counters_db.execute("UPDATE recipe_translation SET name = 'Tarte fine' WHERE recipe_id = 1 AND lang = 'fr'")
+        assert counters(counters_db)[2] == "fr,jp"
+
+        counters_db.execute("UPDATE recipe_translation SET recipe_id = 2 WHERE recipe_id = 1 AND lang = 'jp'")
+        assert counters(counters_db)[2] == "fr" and counters(counters_db, 2)[2] == "jp"
+
+        counters_db.execute("DELETE FROM recipe_translation WHERE recipe_id = 1")
+        assert counters(counters_db)[2] == ""
+
+
+@pytest.mark.database
+class TestMigration:
+    """Backfill de la migration et lecture par list_recipes()"""
+
+    def test_backfill_existing_recipes(self, tmp_path):
+        """Appliquée à une base existante, la migration calcule les compteurs actuels"""
+        con = sqlite3.connect(str(tmp_path / "before.sqlite3"))
+        con.executescript("""
+            CREATE TABLE recipe (id INTEGER PRIMARY KEY, slug TEXT);
+            CREATE TABLE recipe_translation (recipe_id INTEGER, lang TEXT, name TEXT);
+            CREATE TABLE recipe_ingredient (id INTEGER PRIMARY KEY, recipe_id INTEGER, position INTEGER);
+            CREATE TABLE step (id INTEGER PRIMARY KEY, recipe_id INTEGER, position INTEGER, type TEXT DEFAULT 'text');
+            INSERT INTO recipe (id, slug) VALUES (1, 'tarte'), (2, 'flan');
+            INSERT INTO recipe_translation (recipe_id, lang, name) VALUES (1, 'jp', 'タルト'), (1, 'fr', 'Tarte');
+            INSERT INTO recipe_ingredient (recipe_id, position) VALUES (1, 1), (1, 2);
+            INSERT INTO step (recipe_id, position, type) VALUES (1, 1, 'text'), (1, 2, 'image');
+        """)
+
+        con.executescript(MIGRATION.read_text(encoding="utf-8"))
+
+        assert counters(con) == (2, 1, "fr,jp")
+        assert counters(con, 2) == (0, 0, "")
+        con.close()
+
+    def test_list_recipes_reads_counters(self, counters_db):
+        counters_db.executescript("""
+            INSERT INTO recipe_translation (recipe_id, lang, name) VALUES (1, 'fr', 'Tarte');
+            INSERT INTO recipe_ingredient (recipe_id, position) VALUES (1, 1);
+            INSERT INTO step (recipe_id, position) VALUES (1, 1), (1, 2);
+        """)
+        counters_db.commit()
+
+        recipe = next(r for r in list_recipes("fr") if r["id"] == 1)
+
+        assert recipe["ingredient_count"] == 1
+        assert recipe["step_count"] == 2
@@ -0,0 +1,153 @@
+# tests/test_request_profiler.py
+"""
+Tests du profilage à la demande (?__profile=1)
+"""
+
+import asyncio
+import cProfile
+import threading
+
+import pytest
+from fastapi import FastAPI
+
+from config import Config
+from app.middleware.profiler import ProfilerMiddleware
+from app.services.request_profiler import build_call_tree, list_profiles, load_profile
+
+
+def call_asgi(app, path, query=b"", session=None):
+    """Exécute une requête GET ; retourne le message http.response.start"""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": query, "headers": [],
+        "client": ("127.0.0.1", 1234), "server": ("testserver", 80),
+        "session": session or {},
+    }
+    asyncio.run(app(scope, receive, send))
+    return messages[0]
+
+
+def slow_leaf():
+    return sum(i * i for i in range(20000))
+
+
+def slow_parent():
+    return slow_leaf() + slow_leaf()
+
+
+@pytest.fixture
+def profiled_app(tmp_path, monkeypatch):
+    """Application minimale lisant la base ; profils écrits dans tmp_path"""
+    from app.models import db_core
+    monkeypatch.setattr(db_core, "DB_PATH", str(tmp_path / "profile.sqlite3"))
+    monkeypatch.setattr(Config, "PROFILES_DIR", str(tmp_path / "profiles"))
+    app = FastAPI()
+
+    @app.get("/events/{event_id}/budget")
+    async def event_budget(event_id: int):
+        with db_core.get_db() as con:
+            con.execute("SELECT ?", (event_id,)).fetchone()
+        return {"total": slow_parent()}
+
+    return ProfilerMiddleware(app)
+
+
+@pytest.mark.unit
+class TestCallTree:
+    """Tests de build_call_tree()"""
+
+    def test_tree_follows_calls(self):
+        profiler = cProfile.Profile()
+        profiler.enable()
+        slow_parent()
+        profiler.disable()
+
+        result = build_call_tree(profiler, min_fraction=0.0)
+
+        def find(nodes, name):
+            for node in nodes:
+                if node["function"].endswith(f"({name})"):
+                    return node
+                found = find(node["children"], name)
+                if found:
+                    return found
+
+        parent = find(result["tree"], "slow_parent")
+        assert parent["calls"] == 1
+        leaf = next(c for c in parent["children"] if c["function"].endswith("(slow_leaf)"))
+        assert leaf["calls"] == 2
+        assert leaf["function"].startswith("tests/test_request_profiler.py:")
+
+
+@pytest.mark.database
+class TestProfilerMiddleware:
+    """Tests de ProfilerMiddleware"""
+
+    def test_admin_request_is_profiled(self, profiled_app):
+        """Un admin avec ?__profile=1 obtient un profil avec la trace SQL"""
+        start = call_asgi(profiled_app, "/events/3/budget", b"__profile=1", {"is_admin": True})
+        headers = dict(start["headers"])
+        profile_url = headers[b"x-profile"].decode()
+        assert profile_url.startswith("/admin/profiles/")
+
+        profile = load_profile(profile_url.rsplit("/", 1)[1])
+        assert profile["path"] == "/events/3/budget"
+        assert profile["status"] == 200
+        assert any(q["sql"] == "SELECT ?" for q in profile["sql"])
+        assert profile["tree"] and profile["top"]
+        assert [p["id"] for p in list_profiles()] == [profile["id"]]
+
+    def test_flag_ignored_for_non_admin(self, profiled_app):
+        """Sans session admin, ou sans le paramètre : aucun profil"""
+        start = call_asgi(profiled_app, "/events/3/budget", b"__profile=1", {"is_admin": False})
+        assert b"x-profile" not in dict(start["headers"])
+        start = call_asgi(profiled_app, "/events/3/budget", b"", {"is_admin": True})
+        assert b"x-profile" not in dict(start["headers"])
+        assert list_profiles() == []
+
+    def test_one_profile_at_a_time(self, tmp_path, monkeypatch):
+        """Une demande de profil reçue pendant un profilage est servie sans profil"""
+        monkeypatch.setattr(Config, "PROFILES_DIR", str(tmp_path / "profiles"))
+        started, release = threading.Event(), threading.Event()
+        app = FastAPI()
+
+        @app.get("/slow")
+        async def slow():
+            started.set()
+            release.wait(timeout=5)
+            return {}
+
+        @app.get("/fast")
+        async def fast():
+            return {}
+
+        profiled = ProfilerMiddleware(app)
+        admin = {"is_admin": True}
+        results = {}
+        first = threading.Thread(target=lambda: results.update(
+            slow=call_asgi(profiled, "/slow", b"__profile=1", admin)))
+        first.start()
+        assert started.wait(timeout=5)
+
+        second = call_asgi(profiled, "/fast", b"__profile=1", admin)
+        release.set()
+        first.join(timeout=5)
+
+        assert second["status"] == results["slow"]["status"] == 200
+        assert b"x-profile" not in dict(second["headers"])
+        assert b"x-profile" in dict(results["slow"]["headers"])
+        assert [p["path"] for p in list_profiles()] == ["/slow"]
+        start = call_asgi(profiled, "/fast", b"__profile=1", admin)
+        assert b"x-profile" in dict(start["headers"]), "le verrou est libéré"
+
+    def test_invalid_profile_id(self, profiled_app):
+        assert load_profile("../../etc/passwd") is None
@@ -0,0 +1,249 @@
+# tests/test_single_flight.py
+"""
+Tests unitaires pour le regroupement des calculs simultanés (single-flight)
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    """Tests de SingleFlight.do()"""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Les appels simultanés de même clé partagent un seul calcul"""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def regenerate(event_id):
+            calls.append(event_id)
+            started.set()
+            release.wait(timeout=5)
+            return [f"item-{event_id}"]
+
+        results = []
+
+        def worker():
+            results.append(flight.do(("shopping_list", 1, "fr"), regenerate, 1))
+
+        leader = threading.Thread(target=worker)
+        leader.start()
+        assert started.wait(timeout=5)
+
+        followers = [threading.Thread(target=worker) for _ in range(3)]
+        for t in followers:
+            t.start()
+        # Attendre que les suiveurs soient enregistrés sur le calcul en cours
+        while flight.stats()["shared"] < 3:
+            time.sleep(0.001)
+        release.set()
+        for t in [leader] + followers:
+            t.join(timeout=5)
+
+        assert calls == [1]
+        assert results == [["item-1"]] * 4
+        assert flight.stats() == {"in_flight": 0, "executed": 1, "shared": 3}
+
+    def test_sequential_calls_are_not_cached(self):
+        """Un calcul terminé n'est pas réutilisé par l'appel suivant"""
+        flight = SingleFlight()
+        calls = []
+
+        flight.do(("budget", 1, "fr"), calls.append, "a")
+        flight.do(("budget", 1, "fr"), calls.append, "b")
+
+        assert calls == ["a", "b"]
+
+    def test_error_is_propagated_and_key_released(self):
+        """Une exception est propagée et la clé est libérée"""
+        flight = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            flight.do(("shopping_list", 2, "jp"), fail)
+
+        assert flight.do(("shopping_list", 2, "jp"), lambda: "ok") == "ok"
+
+    def test_exclusive_waits_and_runs_its_own(self):
+        """Un appel avec ses propres données attend le calcul en cours puis exécute le sien"""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def regenerate(data):
+            calls.append(data)
+            if data == "ancien":
+                started.set()
+                release.wait(timeout=5)
+            return data
+
+        results = {}
+        leader = threading.Thread(target=lambda: results.update(
+            leader=flight.do(("shopping_list", 1, "fr"), regenerate, "ancien")))
+        leader.start()
+        assert started.wait(timeout=5)
+
+        fresh = threading.Thread(target=lambda: results.update(
+            fresh=flight.do_exclusive(("shopping_list", 1, "fr"), regenerate, "frais")))
+        fresh.start()
+        time.sleep(0.02)
+        assert calls == ["ancien"]
+        release.set()
+        for t in (leader, fresh):
+            t.join(timeout=5)
+
+        assert calls == ["ancien", "frais"]
+        assert results == {"leader": "ancien", "fresh": "frais"}
+        assert flight.stats() == {"in_flight": 0, "executed": 2, "shared": 0}
+
+    def test_exclusive_result_is_not_shared(self):
+        """Un appel arrivé pendant un calcul exclusif ne reçoit pas son résultat"""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def regenerate(data):
+            calls.append(data)
+            if data == "frais":
+                started.set()
+                release.wait(timeout=5)
+            return data
+
+        results = {}
+        fresh = threading.Thread(target=lambda: results.update(
+            fresh=flight.do_exclusive(("shopping_list", 1, "fr"), regenerate, "frais")))
+        fresh.start()
+        assert started.wait(timeout=5)
+
+        loader = threading.Thread(target=lambda: results.update(
+            loader=flight.do(("shopping_list", 1, "fr"), regenerate, "rechargé")))
+        loader.start()
+        time.sleep(0.02)
+        release.set()
+        for t in (fresh, loader):
+            t.join(timeout=5)
+
+        assert calls == ["frais", "rechargé"]
+        assert results == {"fresh": "frais", "loader": "rechargé"}
+
+
+@pytest.mark.unit
+class TestRegenerateShoppingList:
+    """regenerate_shopping_list() ne regroupe que les appels qui chargent leurs recettes"""
+
+    def test_supplied_recipes_run_exclusively(self, monkeypatch):
+        from app.models import db_shopping
+        flight = SingleFlight()
+        monkeypatch.setattr(db_shopping, "single_flight", flight)
+        monkeypatch.setattr(db_shopping, "_regenerate_shopping_list",
+                            lambda event_id, lang, recipes_data=None: recipes_data)
+        exclusive = []
+        monkeypatch.setattr(flight, "do_exclusive",
+                            lambda key, fn, *args: exclusive.append(key) or fn(*args))
+
+        assert db_shopping.regenerate_shopping_list(1, "fr", [{"recipe": 1}]) == [{"recipe": 1}]
+        assert db_shopping.regenerate_shopping_list(1, "fr") is None
+        assert exclusive == [("shopping_list", 1)]
+
+
+@pytest.fixture
+def shopping_store(monkeypatch):
+    """Liste de courses en mémoire : {event_id: (langue, items)} ; régénérations comptées"""
+    from app.models import db_shopping
+    flight = SingleFlight()
+    monkeypatch.setattr(db_shopping, "single_flight", flight)
+    store = {"lists": {}, "regenerations": [], "started": threading.Event(), "release": threading.Event()}
+    store["release"].set()
+
+    def get_items(event_id, lang="fr"):
+        built_lang, items = store["lists"].get(event_id, (None, []))
+        return list(items)
+
+    def regenerate(event_id, lang, recipes_data=None):
+        store["regenerations"].append(lang)
+        store["started"].set()
+        store["release"].wait(timeout=5)
+        store["lists"][event_id] = (lang, [{"ingredient_name": f"item-{lang}", "lang": lang}])
+
+    monkeypatch.setattr(db_shopping, "get_shopping_list_items", get_items)
+    monkeypatch.setattr(db_shopping, "_regenerate_shopping_list", regenerate)
+    store["flight"] = flight
+    return store
+
+
+def stale_unless(lang):
+    """is_stale : liste vide ou enregistrée dans une autre langue"""
+    return lambda items: not items or items[0]["lang"] != lang
+
+
+@pytest.mark.unit
+class TestEnsureShoppingList:
+    """ensure_shopping_list() : vérification et régénération dans un même calcul partagé"""
+
+    def test_concurrent_opens_regenerate_once(self, shopping_store):
+        from app.models import db_shopping
+        shopping_store["release"].clear()
+        results = []
+
+        def open_list():
+            results.append(db_shopping.ensure_shopping_list(1, "fr", stale_unless("fr"), [{"recipe": 1}]))
+
+        threads = [threading.Thread(target=open_list) for _ in range(4)]
+        threads[0].start()
+        assert shopping_store["started"].wait(timeout=5)
+        for t in threads[1:]:
+            t.start()
+        while shopping_store["flight"].stats()["shared"] < 3:
+            time.sleep(0.001)
+        shopping_store["release"].set()
+        for t in threads:
+            t.join(timeout=5)
+
+        assert shopping_store["regenerations"] == ["fr"]
+        assert results == [[{"ingredient_name": "item-fr", "lang": "fr"}]] * 4
+
+    def test_fresh_list_not_rewritten(self, shopping_store):
+        """Après une régénération, l'ouverture suivante relit la liste à jour sans réécrire"""
+        from app.models import db_shopping
+        db_shopping.ensure_shopping_list(1, "fr", stale_unless("fr"), [{"recipe": 1}])
+        db_shopping.ensure_shopping_list(1, "fr", stale_unless("fr"), [{"recipe": 1}])
+
+        assert shopping_store["regenerations"] == ["fr"]
+
+    def test_other_language_rechecks_after_flight(self, shopping_store):
+        """Un appel dans une autre langue ne reçoit pas la liste d'un calcul en cours"""
+        from app.models import db_shopping
+        shopping_store["release"].clear()
+        results = {}
+
+        fr = threading.Thread(target=lambda: results.update(
+            fr=db_shopping.ensure_shopping_list(1, "fr", stale_unless("fr"), [{"recipe": 1}])))
+        fr.start()
+        assert shopping_store["started"].wait(timeout=5)
+        jp = threading.Thread(target=lambda: results.update(
+            jp=db_shopping.ensure_shopping_list(1, "jp", stale_unless("jp"), [{"recipe": 1}])))
+        jp.start()
+        while shopping_store["flight"].stats()["shared"] < 1:
+            time.sleep(0.001)
+        shopping_store["release"].set()
+        for t in (fr, jp):
+            t.join(timeout=5)
+
+        assert shopping_store["regenerations"] == ["fr", "jp"]
+        assert results["fr"][0]["lang"] == "fr" and results["jp"][0]["lang"] == "jp"
+
+    def test_no_recipes_no_write(self, shopping_store):
+        from app.models import db_shopping
+        assert db_shopping.ensure_shopping_list(1, "fr", stale_unless("fr"), []) == []
+        assert shopping_store["regenerations"] == []
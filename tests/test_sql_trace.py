@@ -0,0 +1,110 @@
+# tests/test_sql_trace.py
+"""
+Tests du traçage SQL par requête et du journal des requêtes lentes
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+
+from config import Config
+from app.middleware.sql_trace import SqlTraceMiddleware
+from app.services import sql_trace
+from app.services.sql_trace import normalize_sql, start_trace, stop_trace
+
+
+@pytest.fixture
+def traced_db(tmp_path, monkeypatch):
+    """Base temporaire avec traçage activé ; journal des requêtes lentes dans tmp_path"""
+    from app.models import db_core
+    monkeypatch.setattr(db_core, "DB_PATH", str(tmp_path / "trace.sqlite3"))
+    monkeypatch.setattr(Config, "SQL_TRACE", True)
+    monkeypatch.setattr(Config, "SLOW_QUERY_LOG_PATH", str(tmp_path / "slow.log"))
+    for handler in list(sql_trace._slow_logger.handlers):
+        sql_trace._slow_logger.removeHandler(handler)
+
+    with db_core.get_db() as con:
+        con.execute("CREATE TABLE recipe (id INTEGER PRIMARY KEY, slug TEXT)")
+        con.executemany("INSERT INTO recipe (slug) VALUES (?)", [(f"r{i}",) for i in range(5)])
+
+    yield db_core
+    for handler in list(sql_trace._slow_logger.handlers):
+        handler.close()
+        sql_trace._slow_logger.removeHandler(handler)
+
+
+@pytest.mark.unit
+class TestNormalizeSql:
+    """Tests de normalize_sql()"""
+
+    def test_literals_and_in_lists(self):
+        sql = "SELECT *  FROM recipe\n WHERE id IN (?, ?, ?) AND lang = 'fr' LIMIT 10"
+        assert normalize_sql(sql) == "SELECT * FROM recipe WHERE id IN (?...) AND lang = ? LIMIT ?"
+
+
+@pytest.mark.database
+class TestSqlTrace:
+    """Tests des connexions tracées et du middleware"""
+
+    def test_records_statements_and_rows(self, traced_db):
+        """Chaque instruction est enregistrée avec son nombre de lignes"""
+        token, trace = start_trace()
+        try:
+            with traced_db.get_db() as con:
+                cursor = con.cursor()
+                cursor.execute("SELECT id FROM recipe ORDER BY id")
+                assert len(cursor.fetchall()) == 5
+                assert con.execute("SELECT slug FROM recipe WHERE id = ?", (2,)).fetchone()[0] == "r1"
+                assert len([row for row in con.execute("SELECT * FROM recipe WHERE id > ?", (3,))]) == 2
+                con.execute("UPDATE recipe SET slug = 'x' WHERE id <= ?", (3,))
+        finally:
+            stop_trace(token)
+
+        traced = [(normalize_sql(q.sql), q.rows) for q in trace.queries if not q.sql.startswith("PRAGMA")]
+        assert traced == [
+            ("SELECT id FROM recipe ORDER BY id", 5),
+            ("SELECT slug FROM recipe WHERE id = ?", 1),
+            ("SELECT * FROM recipe WHERE id > ?", 2),
+            ("UPDATE recipe SET slug = ? WHERE id <= ?", 3),
+        ]
+        assert 'desc="' in trace.server_timing()
+
+    def test_slow_query_log_includes_plan(self, traced_db, monkeypatch, tmp_path):
+        """Les instructions au-delà du seuil sont journalisées avec leur plan"""
+        monkeypatch.setattr(Config, "SLOW_QUERY_MS", 0)
+        with traced_db.get_db() as con:
+            con.execute("SELECT slug FROM recipe WHERE id = ?", (1,)).fetchall()
+
+        log = (tmp_path / "slow.log").read_text(encoding="utf-8")
+        assert "SELECT slug FROM recipe WHERE id = ?" in log
+        assert "SEARCH recipe USING INTEGER PRIMARY KEY" in log
+
+    def test_middleware_adds_server_timing(self, traced_db):
+        """L'en-tête Server-Timing reflète les requêtes SQL de la requête"""
+        app = FastAPI()
+
+        @app.get("/recipes")
+        def recipes():
+            with traced_db.get_db() as con:
+                return {"count": con.execute("SELECT COUNT(*) FROM recipe").fetchone()[0]}
+
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": "/recipes", "raw_path": b"/recipes",
+            "root_path": "", "query_string": b"", "headers": [],
+            "client": ("127.0.0.1", 1234), "server": ("testserver", 80),
+        }
+        asyncio.run(SqlTraceMiddleware(app)(scope, receive, send))
+
+        headers = dict(messages[0]["headers"])
+        assert headers[b"server-timing"].startswith(b"db;dur=")
+        assert b'SQL", total;dur=' in headers[b"server-timing"]
@@ -0,0 +1,141 @@
+# tests/test_static_assets.py
+"""
+Tests unitaires pour les assets statiques versionnés
+Teste le hash des noms de fichiers, la précompression et le service des
+fichiers (cache, négociation de l'encodage, requêtes conditionnelles)
+"""
+
+import gzip
+
+import pytest
+
+from app import static_assets
+from app.static_assets import AssetFiles, AssetManifest, IMMUTABLE_CACHE_CONTROL, _choose_encoding
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    """Manifeste construit sur un répertoire static/ temporaire"""
+    static_dir = tmp_path / "static"
+    (static_dir / "css").mkdir(parents=True)
+    (static_dir / "css" / "app.css").write_text("body { color: red; }\n" * 50)
+    return AssetManifest(static_dir=static_dir, cache_dir=tmp_path / "cache").build()
+
+
+class TestAssetManifest:
+    """Tests pour AssetManifest"""
+
+    @pytest.mark.unit
+    def test_url_contient_le_hash(self, manifest):
+        """L'URL d'un asset connu contient le hash de son contenu"""
+        url = manifest.url("css/app.css")
+        assert url.startswith("/assets/css/app.")
+        assert url.endswith(".css")
+        assert url.split("/")[-1] != "app.css"
+
+    @pytest.mark.unit
+    def test_asset_inconnu(self, manifest):
+        """Un asset inconnu garde son URL /static classique"""
+        assert manifest.url("images/logo.png") == "/static/images/logo.png"
+
+    @pytest.mark.unit
+    def test_version_gzip_precalculee(self, manifest):
+        """La version gzip est écrite et identique au fichier original une fois décompressée"""
+        hashed = manifest.url("css/app.css")[len("/assets/"):]
+        entry = manifest.files[hashed]
+        gz_path = entry["encodings"]["gzip"]
+        assert gzip.decompress(gz_path.read_bytes()) == entry["path"].read_bytes()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("accept,expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip;q=1.0", "gzip"),
+    ("", None),
+    ("identity", None),
+])
+def test_choose_encoding(tmp_path, accept, expected):
+    """Brotli est préféré à gzip lorsque les deux sont disponibles et acceptés"""
+    available = {"gzip": tmp_path / "a.gz", "br": tmp_path / "a.br"}
+    assert _choose_encoding(accept, available) == expected
+
+
+async def serve(path, headers=(), method="GET"):
+    """Appelle AssetFiles et retourne (statut, en-têtes, corps)"""
+    scope = {"type": "http", "method": method, "path": path,
+             "headers": [(k.encode(), v.encode()) for k, v in headers]}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await AssetFiles()(scope, receive, send)
+    start = messages[0]
+    response_headers = {k.decode(): v.decode() for k, v in start["headers"]}
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return start["status"], response_headers, body
+
+
+class TestAssetFiles:
+    """Tests du service des assets versionnés (/assets)"""
+
+    @pytest.fixture
+    def served(self, manifest, monkeypatch):
+        """Manifeste de test utilisé par AssetFiles ; retourne le chemin hashé de app.css"""
+        monkeypatch.setattr(static_assets, "_manifest", manifest)
+        return manifest.url("css/app.css")[len("/assets"):]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fichier_servi_en_cache_immuable(self, served, manifest):
+        status, headers, body = await serve(served)
+
+        assert status == 200
+        assert headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert headers["vary"] == "Accept-Encoding"
+        assert "content-encoding" not in headers
+        assert body == manifest.files[served.lstrip("/")]["path"].read_bytes()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_encodage_negocie(self, served, manifest):
+        status, headers, body = await serve(served, [("accept-encoding", "gzip, deflate")])
+
+        assert status == 200
+        assert headers["content-encoding"] == "gzip"
+        assert gzip.decompress(body) == manifest.files[served.lstrip("/")]["path"].read_bytes()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_etag_propre_a_chaque_encodage(self, served):
+        _, identity, _ = await serve(served)
+        _, gzipped, _ = await serve(served, [("accept-encoding", "gzip")])
+
+        assert identity["etag"] != gzipped["etag"]
+        assert not gzipped["etag"].startswith("W/")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_if_none_match(self, served):
+        """304 si l'ETag de la représentation négociée correspond, sinon le fichier"""
+        _, headers, _ = await serve(served, [("accept-encoding", "gzip")])
+        etag = headers["etag"]
+
+        status, headers, body = await serve(served, [("accept-encoding", "gzip"), ("if-none-match", etag)])
+        assert status == 304 and body == b""
+        assert headers["etag"] == etag and headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+        status, _, _ = await serve(served, [("accept-encoding", "gzip"), ("if-none-match", f'"autre", W/{etag}')])
+        assert status == 304
+
+        status, _, _ = await serve(served, [("if-none-match", etag)])
+        assert status == 200, "l'ETag gzip ne valide pas la version non compressée"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_inconnu_ou_methode(self, served):
+        assert (await serve("/css/absent.css"))[0] == 404
+        assert (await serve(served, method="POST"))[0] == 404
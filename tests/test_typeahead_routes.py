@@ -0,0 +1,47 @@
+# tests/test_typeahead_routes.py
+"""
+Tests de l'API typeahead : toutes les recherches exigent une session
+"""
+
+import pytest
+from starlette.requests import Request
+
+from app.routes import typeahead_routes
+
+
+def make_request(session: dict) -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/api/typeahead", "query_string": b"",
+                    "headers": [], "session": session})
+
+
+@pytest.mark.unit
+class TestTypeaheadSession:
+    """Tests du contrôle de session des routes /api/typeahead/*"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("route", ["typeahead_recipes", "typeahead_users",
+                                       "typeahead_participants", "typeahead_groups"])
+    async def test_anonymous_rejected(self, route, monkeypatch):
+        for search in ("search_recipe_names", "search_users", "search_participants", "search_groups"):
+            monkeypatch.setattr(typeahead_routes.db, search, lambda **kwargs: pytest.fail("recherche exécutée"))
+
+        response = await getattr(typeahead_routes, route)(make_request({}), q="", limit=20, offset=0)
+
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_recipes_paginated(self, monkeypatch):
+        calls = []
+
+        def search_recipe_names(**kwargs):
+            calls.append(kwargs)
+            return [{"id": i, "name": f"r{i}"} for i in range(3)]
+
+        monkeypatch.setattr(typeahead_routes.db, "search_recipe_names", search_recipe_names)
+
+        page = await typeahead_routes.typeahead_recipes(make_request({"user_id": 1}), q=" tar ", lang="fr",
+                                                        limit=2, offset=0, exclude_id=5)
+
+        assert page == {"items": [{"id": 0, "name": "r0"}, {"id": 1, "name": "r1"}],
+                        "offset": 0, "limit": 2, "has_more": True}
+        assert calls == [{"limit": 3, "offset": 0, "lang": "fr", "query": "tar", "exclude_id": 5}]
@@ -0,0 +1,62 @@
+# tests/test_upload_service.py
+"""
+Tests unitaires pour l'écriture des fichiers uploadés
+Teste l'écriture par blocs, la limite de taille et l'absence de fichier partiel
+"""
+
+import io
+
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.services import upload_service
+from app.services.upload_service import stream_upload_to_file
+
+
+def make_upload(data: bytes, filename: str = "photo.jpg") -> UploadFile:
+    """Crée un UploadFile en mémoire (taille inconnue, comme un upload chunké)"""
+    return UploadFile(io.BytesIO(data), filename=filename)
+
+
+class TestStreamUploadToFile:
+    """Tests pour stream_upload_to_file()"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_ecriture_par_blocs(self, tmp_path, monkeypatch):
+        """Le fichier est écrit intégralement, bloc par bloc"""
+        monkeypatch.setattr(upload_service, "UPLOAD_CHUNK_SIZE", 10)
+        data = b"x" * 95
+        dest = tmp_path / "image.jpg"
+
+        written = await stream_upload_to_file(make_upload(data), dest, max_size=100)
+
+        assert written == 95
+        assert dest.read_bytes() == data
+        assert list(tmp_path.iterdir()) == [dest], "Aucun fichier temporaire ne doit subsister"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_depassement_taille(self, tmp_path, monkeypatch):
+        """L'upload est interrompu dès que la taille maximale est dépassée"""
+        monkeypatch.setattr(upload_service, "UPLOAD_CHUNK_SIZE", 10)
+        upload = make_upload(b"x" * 1000)
+        dest = tmp_path / "image.jpg"
+
+        with pytest.raises(ValueError, match="trop volumineux"):
+            await stream_upload_to_file(upload, dest, max_size=50)
+
+        assert not dest.exists()
+        assert list(tmp_path.iterdir()) == [], "Le fichier partiel doit être supprimé"
+        assert upload.file.tell() < 1000, "La lecture doit s'arrêter avant la fin du fichier"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_taille_connue_rejetee_sans_lecture(self, tmp_path):
+        """Une taille déclarée trop grande est rejetée avant toute écriture"""
+        upload = UploadFile(io.BytesIO(b"x" * 200), size=200, filename="photo.jpg")
+
+        with pytest.raises(ValueError):
+            await stream_upload_to_file(upload, tmp_path / "image.jpg", max_size=100)
+
+        assert upload.file.tell() == 0